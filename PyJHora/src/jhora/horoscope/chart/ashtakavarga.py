@@ -20,10 +20,32 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import numpy as np
 from jhora import const, utils
+from jhora.panchanga import drik
+from jhora.horoscope.chart import charts
 
 planet_list = ['sun','moon','mars','mercury','jupiter','venus','saturn','lagnam']
 raasi_list=['Mesham','Rishabam','Mithunam','Katakam','Simmam','Kanni','Thulaam','Vrichigam','Dhanusu','Makaram','Kumbam','Meenam']
 raasi_index = lambda planet,planet_positions_in_chart: [i for i,raasi in enumerate(planet_positions_in_chart) if planet !=const._ascendant_symbol and planet.lower() in raasi.lower() ][0]
+""" _ashtaka_varga_table[p][op][h] = 1 if planet op gives bindu to planet p in (h+1)th house from op (op=7 for Lagnam) """
+_ashtaka_varga_table = np.zeros((8,8,12),dtype=int)
+for _p,_op_houses in const.ashtaka_varga_dict.items():
+    for _op,_houses in enumerate(_op_houses):
+        _ashtaka_varga_table[int(_p),_op,np.array(_houses)-1] = 1
+_rasimana_multipliers = np.array([7,10,8,4,10,6,7,8,9,5,11,12])
+_grahamana_multipliers = np.array([5,5,8,5,10,7,5])
+""" Signs owned by Mars, Mercury, Jupiter, Venus and Saturn used in ekadhipatya sodhana """
+_ekadhipatya_planets = np.arange(2,7)
+_ekadhipatya_rasi_owners = np.array([(0,7),(2,5),(8,11),(1,6),(9,10)])
+def _prastara_ashtaka_varga(planet_rasis):
+    """
+        Prastara ashtaka varga as bindu array by table lookup
+        @param planet_rasis: rasi of Sun to Saturn and Lagnam (8,) or of many charts (charts,8)
+        @return: prastara[...,p,op,r] = 1 if planet/lagnam op gives bindu to planet p in rasi r (...,8,8,12)
+    """
+    planet_rasis = np.asarray(planet_rasis)
+    houses_from_op = (np.arange(12) - planet_rasis[...,:,None]) % 12 # (...,8,12)
+    planets = np.arange(8)
+    return _ashtaka_varga_table[planets[:,None,None],planets[None,:,None],houses_from_op[...,None,:,:]]
 def get_ashtaka_varga(house_to_planet_list):
     """
         get binna, samudhaya and prastara varga from the given horoscope chart
@@ -34,86 +56,55 @@ def get_ashtaka_varga(house_to_planet_list):
             samudhaya ashtaka varga - 1D List [0..11] 0=Aries 11=Pisces
             prastara ashtaka varga - 3D List [0..7][0..7][0..11]
     """
-    #print('get_ashtaka_varga','house_to_planet_list',house_to_planet_list)
     p_to_h = utils.get_planet_to_house_dict_from_chart(house_to_planet_list)
-    #print('get_ashtaka_varga','p_to_h',p_to_h)
-    raasi_ashtaka = [[0 for r in range(12)] for p in range(8)]
-    prastara_ashtaka_varga  = [[[0 for r in range(12)] for p1 in range(10)] for p2 in range(8)]
-    for key in const.ashtaka_varga_dict.keys():
-        p = int(key)
-        #planet = planet_list[p]
-        planet_raasi_list = const.ashtaka_varga_dict[key]
-        for op,other_planet in enumerate(planet_raasi_list):
-            pr = p_to_h[op]
-            if op == 7: #Lagnam
-                pr = p_to_h[const._ascendant_symbol]
-            for raasi in other_planet:
-                r = (raasi-1+pr) % 12
-                raasi_ashtaka[p][r] +=1
-                prastara_ashtaka_varga[p][op][r] = 1
-                prastara_ashtaka_varga[p][-1][r] += 1
-    binna_ashtaka_varga = raasi_ashtaka[0:8][:]
-    prastara_ashtaka_varga = prastara_ashtaka_varga[0:8][0:9][:]
-    samudhaya_ashtaka_varga = np.asarray(binna_ashtaka_varga[:-1]).sum(axis=0).tolist() # [0:-1] to exlcude Lagnam
-    return binna_ashtaka_varga, samudhaya_ashtaka_varga,prastara_ashtaka_varga
+    planet_rasis = [p_to_h[p] for p in range(7)]+[p_to_h[const._ascendant_symbol]]
+    prastara = _prastara_ashtaka_varga(planet_rasis)
+    binna_ashtaka_varga = prastara.sum(axis=1)
+    samudhaya_ashtaka_varga = binna_ashtaka_varga[:-1].sum(axis=0) # [0:-1] to exlcude Lagnam
+    """ prastara rows are 0=Sun..7=Lagnam, 8=(unused) and 9=total of bindus """
+    prastara_ashtaka_varga = np.concatenate([prastara,np.zeros((8,1,12),dtype=int),binna_ashtaka_varga[:,None,:]],axis=1)
+    return binna_ashtaka_varga.tolist(), samudhaya_ashtaka_varga.tolist(),prastara_ashtaka_varga.tolist()
+def _trikona_sodhana_array(binna_ashtaka_varga):
+    """ Trikona sodhana of Sun to Saturn rows of BAV array (...,rows,12). Lagnam row (if any) is not reduced """
+    bav = np.array(binna_ashtaka_varga)
+    trines = bav[...,:7,:].reshape(bav.shape[:-2]+(7,3,4))
+    """ Rule 1: If atleast one rasi has zero, no reduction is necessary.
+        Rule 2/3: Take the lowest value out of the three. Subtract it from all the values
+            (If the three rasis have the same value, they all become zero)
+    """
+    min_value = trines.min(axis=-2,keepdims=True)
+    bav[...,:7,:] = (trines - min_value).reshape(bav.shape[:-2]+(7,12))
+    return bav
 def _trikona_sodhana(binna_ashtaka_varga):
-    bav = binna_ashtaka_varga[:]
-    for p in range(7):
-        for r in range(4):
-            if bav[p][r]==0 or bav[p][r+4]==0 or bav[p][r+8]==0:
-                #print('Rule 1:If atleast one rasi has zero, no reduction is necessary.',p,r,bav[p][r],bav[p][r+4],bav[p][r+8])
-                continue
-            elif bav[p][r]==bav[p][r+4] and bav[p][r+4]==bav[p][r+8]:
-                #print('Rule (2) If the three rasis have the same value, make them all zero.',p,r,bav[p][r],bav[p][r+4],bav[p][r+8])
-                bav[p][r]=0
-                bav[p][r+4]=0
-                bav[p][r+8]=0
-            else:
-                #print('Rule (3) Take the lowest value out of the three. Subtract it from all the values.',p,r,bav[p][r],bav[p][r+4],bav[p][r+8])
-                min_value = min([bav[p][r],bav[p][r+4],bav[p][r+8]])
-                #print('before',p,r,min_value,bav[p][r],bav[p][r+4],bav[p][r+8])
-                bav[p][r] -= min_value
-                bav[p][r+4] -= min_value
-                bav[p][r+8] -= min_value
-                #print('after',p,r,min_value,bav[p][r],bav[p][r+4],bav[p][r+8])
+    return _trikona_sodhana_array(binna_ashtaka_varga).tolist()
+def _ekadhipatya_sodhana_array(binna_ashtaka_varga_after_trikona,rasi_occupied):
+    """
+        Ekadhipatya sodhana of BAV array (...,rows,12)
+        @param rasi_occupied: boolean array (...,12) True if rasi has any planet/lagnam in it
+    """
+    bav = np.array(binna_ashtaka_varga_after_trikona)
+    rasi_occupied = np.asarray(rasi_occupied)
+    r1,r2 = _ekadhipatya_rasi_owners[:,0],_ekadhipatya_rasi_owners[:,1]
+    b1 = bav[...,_ekadhipatya_planets,r1]; b2 = bav[...,_ekadhipatya_planets,r2]
+    o1 = rasi_occupied[...,r1]; o2 = rasi_occupied[...,r2]
+    """ Rule 1: either bav is 0. Rule 2: both rasis are occupied - no reduction """
+    reduce = ~((b1==0) | (b2==0) | (o1 & o2))
+    both_empty = ~o1 & ~o2
+    """ Rule 4: both rasi are empty (a) same values => zero (b) different values => lower value in both """
+    rule4 = np.where(b1==b2,0,np.minimum(b1,b2))
+    """ Rule 3: one rasi is occupied and other is empty
+            (a) If the empty rasi has a lower value, replace the value with a zero.
+            (b) If the empty rasi has a higher value, replace the value with the value in the other rasi.
+    """
+    rule3_r1 = np.where(b1<b2,0,b2); rule3_r2 = np.where(b2<b1,0,b1)
+    new_b1 = np.where(both_empty,rule4,np.where(o1,b1,rule3_r1))
+    new_b2 = np.where(both_empty,rule4,np.where(o2,b2,rule3_r2))
+    bav[...,_ekadhipatya_planets,r1] = np.where(reduce,new_b1,b1)
+    bav[...,_ekadhipatya_planets,r2] = np.where(reduce,new_b2,b2)
     return bav
 def _ekadhipatya_sodhana(binna_ashtaka_varga_after_trikona,chart_1d):
-    bav = binna_ashtaka_varga_after_trikona[:]
-    rasi_owners=[4,3,(0,7),(2,5),(8,11),(1,6),(9,10)]
-    for p in range(2,7):
-        r1,r2 = rasi_owners[p]
-        r1_occupied = not (chart_1d[r1].strip() == '')
-        r2_occupied = not (chart_1d[r2].strip() == '')
-        # Rule 1 (either bav is 0. Rule 2: either rasi is occupied by a planet
-        if (bav[p][r1]==0 or bav[p][r2]==0) or (r1_occupied and r2_occupied) :
-            continue
-        elif (not r1_occupied) and (not r2_occupied ): # Rule 4 - both rasi are empty
-            # Rule 4(b) (b) If they have different values, replace the higher value with the lower value.
-            if bav[p][r1] != bav[p][r2]: 
-                min_value = min([bav[p][r1],bav[p][r2]])
-                bav[p][r1] = min_value
-                bav[p][r2] = min_value
-            # Rule 4(a) If both the rasis have the same value, replace both with zero.
-            else:
-                bav[p][r1] = 0
-                bav[p][r2] = 0
-        else:
-            # Rule (3) If one rasi is occupied by a planet (or planets) and the other is empty
-            if (r1_occupied): #r2 is empty
-                # Rule 3(a) If the empty rasi has a lower value, replace the value with a zero.
-                if (bav[p][r2] < bav[p][r1]):
-                    bav[p][r2] = 0
-                # Rule 3(b) If the empty rasi has a higher value, replace the value with the value in the other rasi.
-                else:
-                    bav[p][r2] = bav[p][r1]
-            else: #r1 is empty
-                # Rule 3(a) If the empty rasi has a lower value, replace the value with a zero. 
-                if (bav[p][r1] < bav[p][r2]):
-                    bav[p][r1] = 0
-                # Rule 3(b) If the empty rasi has a higher value, replace the value with the value in the other rasi.
-                else:
-                    bav[p][r1] = bav[p][r2]
-    return bav
+    rasi_occupied = [chart_1d[r].strip() != '' for r in range(12)]
+    return _ekadhipatya_sodhana_array(binna_ashtaka_varga_after_trikona, rasi_occupied).tolist()
 def _get_planet_positions(chart_1d):
     planet_houses = [-1 for p in range(7)]
     for p,planet in enumerate(planet_list[0:-1]): # Excluding Lagnam
@@ -122,21 +113,19 @@ def _get_planet_positions(chart_1d):
                 planet_houses[p] = house
                 break
     return planet_houses
+def _sodhya_pindas_array(binna_ashtaka_varga_after_ekadhipatya,planet_rasis):
+    """
+        Raasi, graha and sodhya pindas of Sun to Saturn from sodhita BAV array (...,rows,12)
+        @param planet_rasis: rasis of Sun to Saturn (...,7)
+    """
+    bav = np.asarray(binna_ashtaka_varga_after_ekadhipatya)[...,:7,:]
+    raasi_pindas = bav @ _rasimana_multipliers
+    graha_pindas = np.take_along_axis(bav,np.asarray(planet_rasis)[...,None,:7],axis=-1) @ _grahamana_multipliers
+    return raasi_pindas,graha_pindas,raasi_pindas+graha_pindas
 def _sodhya_pindas(binna_ashtaka_varga_after_ekadhipatya,chart_1d):
-    rasimana_multipliers = [7,10,8,4,10,6,7,8,9,5,11,12]
-    grahamana_multipliers = [5,5,8,5,10,7,5]
-    bav = binna_ashtaka_varga_after_ekadhipatya[:]
-    raasi_pindas = [0 for p in range(7)]
-    graha_pindas = [0 for p in range(7)]
-    sodhya_pindas = [0 for p in range(7)]
-    for p in range(7):
-        raasi_pindas[p] = sum(np.multiply(bav[p][:],rasimana_multipliers))
-    #planet_houses = _get_planet_positions(chart_1d)
     planet_houses = list(utils.get_planet_to_house_dict_from_chart(chart_1d).values())[:7] # Exclude Rahu, Ketu and Lagnam
-    for p in range(7):
-        graha_pindas[p] = sum([ grahamana_multipliers[i]*bav[p][pr] for i,pr in enumerate(planet_houses)])
-        sodhya_pindas[p] = raasi_pindas[p]+graha_pindas[p]
-    return raasi_pindas,graha_pindas,sodhya_pindas
+    raasi_pindas,graha_pindas,sodhya_pindas = _sodhya_pindas_array(binna_ashtaka_varga_after_ekadhipatya,planet_houses)
+    return raasi_pindas.tolist(),graha_pindas.tolist(),sodhya_pindas.tolist()
 def sodhaya_pindas(binna_ashtaka_varga,house_to_planet_chart):
     """
         Get sodhaya pindas from binna ashtaka varga
@@ -155,6 +144,35 @@ def sodhaya_pindas(binna_ashtaka_varga,house_to_planet_chart):
     #print('Sodhita Ashtakavarga\n',binna_ashtaka_varga_after_ekadhipatya)
     raasi_pindas,graha_pindas,sodhya_pindas = _sodhya_pindas(binna_ashtaka_varga_after_ekadhipatya,house_to_planet_chart)
     return raasi_pindas,graha_pindas,sodhya_pindas
+def gochara_ashtaka_varga_scores(jd_at_dob,place,jd_start,jd_end,step_days=1.0):
+    """
+        Score transiting planets (Sun to Saturn) against the natal ashtaka varga over a date range
+        Natal binna/samudhaya ashtaka varga is calculated once and transit rasis of all dates are
+            scored by table lookup. Example: daily gochara strength for a year
+        @param jd_at_dob: Julian day number at the date/time of birth
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @param jd_start: Julian day number of the first transit date/time
+        @param jd_end: Julian day number of the end of transit range (not included)
+        @param step_days: interval between transit dates in days. Default = 1 day
+        @return: jds, transit_rasis, bav_scores, sav_scores - numpy arrays
+            jds: julian day numbers of transit dates (n,)
+            transit_rasis: transit rasi of Sun to Saturn (n,7)
+            bav_scores: bindus of the transit rasi in natal binna ashtaka varga of the transiting planet (n,7)
+            sav_scores: bindus of the transit rasi in natal samudhaya ashtaka varga (n,7)
+    """
+    planet_positions = charts.rasi_chart(jd_at_dob, place)
+    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
+    planet_rasis = [p_to_h[p] for p in range(7)]+[p_to_h[const._ascendant_symbol]]
+    binna_ashtaka_varga = _prastara_ashtaka_varga(planet_rasis).sum(axis=1)[:7]
+    samudhaya_ashtaka_varga = binna_ashtaka_varga.sum(axis=0)
+    jds = np.arange(jd_start,jd_end,step_days)
+    jds_utc = jds - place.timezone/24.
+    transit_longitudes = np.array([[drik.sidereal_longitude(jd_utc, planet) for planet in drik.planet_list[:7]]
+                                   for jd_utc in jds_utc]).reshape(-1,7)
+    transit_rasis = (transit_longitudes // 30).astype(int) % 12
+    bav_scores = binna_ashtaka_varga[np.arange(7),transit_rasis]
+    sav_scores = samudhaya_ashtaka_varga[transit_rasis]
+    return jds, transit_rasis, bav_scores, sav_scores
 if __name__ == "__main__":
     from jhora.tests.pvr_tests import test_example
     # Chart 7 from the book
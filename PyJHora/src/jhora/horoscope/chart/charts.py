@@ -36,6 +36,9 @@
             1st/10th/7th/4th from base (fire,earth,air/water)
           count N divisions from end of the sign if sign is even
 """
+import copy
+from contextlib import contextmanager
+import numpy as np
 from jhora.panchanga import drik
 from jhora import const,utils
 from jhora.horoscope.chart import house
@@ -54,14 +57,10 @@ def get_amsa_resources(language='en'):
         get raja yoga names from raja_yoga_msgs_<lang>.txt
         @param language: Two letter language code. en, hi, ka, ta, te
         Note: this argument is not required it language was already set using utils.set_language
-        @return json strings from the resource file as dictionary 
-    """
-    import json
-    json_file = _lang_path + "amsa_rulers_"+language+'.json'
-    #print('opening json file',json_file)
-    f = open(json_file,"r",encoding="utf-8")
-    msgs = json.load(f)
-    return msgs
+        The resource file is read only once per language and shared (read-only) by all callers
+        @return json strings from the resource file as read-only dictionary 
+    """
+    return utils.get_language_json_resources("amsa_rulers_",language)
 def rasi_chart(jd_at_dob,place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,years=1,months=1,sixty_hours=1
                ,calculation_type='drik',pravesha_type=0):
     """
@@ -78,6 +77,10 @@ def rasi_chart(jd_at_dob,place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MO
                 First element is that of Lagnam
             Example: [ ['L',(0,13.4)],[0,(11,12.7)],...]] Lagnam in Aries 13.4 degrees, Sun in Taurus 12.7 degrees
     """
+    snapshot = drik._chart_snapshot.get()
+    if snapshot is not None and _is_snapshot_chart(snapshot, jd_at_dob, place_as_tuple, ayanamsa_mode, years, months,
+                                                   sixty_hours, calculation_type, pravesha_type):
+        return snapshot.rasi_chart()
     jd_years = jd_at_dob if (years==1 and months==1 and sixty_hours==1) else drik.next_solar_date(jd_at_dob, place_as_tuple, years, months,sixty_hours)
     if pravesha_type==2:
         from jhora.panchanga import vratha
@@ -1121,10 +1124,78 @@ def divisional_chart(jd_at_dob,place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANA
                 First element is that of Lagnam
             Example: [ ['L',(0,123.4)],[0,(11,32.7)],...]] Lagnam in Aries 123.4 degrees, Sun in Taurus 32.7 degrees
     """
+    snapshot = drik._chart_snapshot.get()
+    if snapshot is not None and _is_snapshot_chart(snapshot, jd_at_dob, place_as_tuple, ayanamsa_mode, years, months,
+                                                   sixty_hours, calculation_type, pravesha_type):
+        return snapshot.divisional_chart(divisional_chart_factor, chart_method, base_rasi, count_from_end_of_sign)
     planet_positions_in_rasi = rasi_chart(jd_at_dob, place_as_tuple, ayanamsa_mode,years,months,sixty_hours,
                                   calculation_type=calculation_type,pravesha_type=pravesha_type)
     return divisional_positions_from_rasi_positions(planet_positions_in_rasi, divisional_chart_factor=divisional_chart_factor,
                     chart_method=chart_method, base_rasi=base_rasi, count_from_end_of_sign=count_from_end_of_sign)
+class ChartSnapshot:
+    """
+        Birth chart positions (rasi and vargas) and panchanga (sunrise, tithi, yogam, nakshatra) computed once.
+        While a snapshot is active (see use_chart_snapshot) rasi_chart/divisional_chart calls for the same
+            jd, place and ayanamsa_mode, and drik.sunrise/tithi/yogam/nakshatra calls for the same jd and place,
+            return copies of the snapshot values instead of recomputing them.
+        The snapshot is a plain picklable object and can be sent to worker processes.
+        @param jd_at_dob: Julian day number at the date/time of birth
+        @param place_as_tuple - panjanga.place format
+        @param ayanamsa_mode Default:const._DEFAULT_AYANAMSA_MODE
+        @param divisional_chart_factors: vargas to precompute (Default=None => const.division_chart_factors)
+            Other vargas/chart methods are computed from the snapshot rasi positions when asked for
+    """
+    def __init__(self,jd_at_dob,place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factors=None):
+        self.jd = jd_at_dob; self.place = place_as_tuple; self.ayanamsa_mode = ayanamsa_mode
+        self.rasi_positions = rasi_chart(jd_at_dob, place_as_tuple, ayanamsa_mode)
+        dcfs = const.division_chart_factors if divisional_chart_factors is None else divisional_chart_factors
+        self.varga_positions = {(dcf,1,None,None):divisional_positions_from_rasi_positions(self.rasi_positions,dcf)
+                                for dcf in dcfs}
+        " drik panchanga values depend on the ayanamsa set when they are computed "
+        self.panchanga_ayanamsa_mode = drik._ayanamsa_mode
+        self.panchanga = {'sunrise':drik.sunrise(jd_at_dob, place_as_tuple),'tithi':drik.tithi(jd_at_dob, place_as_tuple),
+                          'yogam':drik.yogam(jd_at_dob, place_as_tuple),'nakshatra':drik.nakshatra(jd_at_dob, place_as_tuple)}
+    def matches(self,jd,place,ayanamsa_mode=None):
+        """ @return: True if (jd, place[, ayanamsa_mode]) are those of this snapshot """
+        return jd == self.jd and tuple(place) == tuple(self.place) and \
+                (ayanamsa_mode is None or ayanamsa_mode == self.ayanamsa_mode)
+    def rasi_chart(self):
+        """ @return: copy of the rasi chart planet positions """
+        drik.set_ayanamsa_mode(self.ayanamsa_mode) # same side effect as rasi_chart()
+        return copy.deepcopy(self.rasi_positions)
+    def divisional_chart(self,divisional_chart_factor=1,chart_method=1,base_rasi=None,count_from_end_of_sign=None):
+        """ @return: copy of the varga planet positions. See divisional_chart for the arguments """
+        drik.set_ayanamsa_mode(self.ayanamsa_mode)
+        key = (divisional_chart_factor,chart_method,base_rasi,count_from_end_of_sign)
+        if key not in self.varga_positions:
+            self.varga_positions[key] = divisional_positions_from_rasi_positions(copy.deepcopy(self.rasi_positions),
+                        divisional_chart_factor=divisional_chart_factor, chart_method=chart_method, base_rasi=base_rasi,
+                        count_from_end_of_sign=count_from_end_of_sign)
+        return copy.deepcopy(self.varga_positions[key])
+    def panchanga_value(self,name,jd,place):
+        """ @return: copy of snapshot panchanga value name ('sunrise','tithi','yogam','nakshatra') or None if not applicable """
+        if name not in self.panchanga or not self.matches(jd, place) or drik._ayanamsa_mode != self.panchanga_ayanamsa_mode:
+            return None
+        return copy.deepcopy(self.panchanga[name])
+def _is_snapshot_chart(snapshot,jd_at_dob,place_as_tuple,ayanamsa_mode,years,months,sixty_hours,calculation_type,pravesha_type):
+    return years==1 and months==1 and sixty_hours==1 and calculation_type.lower()=='drik' and pravesha_type==0 \
+            and snapshot.matches(jd_at_dob, place_as_tuple, ayanamsa_mode)
+@contextmanager
+def use_chart_snapshot(snapshot):
+    """
+        Context manager that makes snapshot (ChartSnapshot) the active chart snapshot
+        The snapshot is held in a context variable - it is active only in the current thread/task context,
+            so concurrent requests in other threads or tasks do not see it
+        Example:
+            snapshot = ChartSnapshot(jd, place)
+            with use_chart_snapshot(snapshot):
+                vimsottari.get_vimsottari_dhasa_bhukthi(jd, place) # no chart/panchanga recomputation for (jd,place)
+    """
+    token = drik._chart_snapshot.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        drik._chart_snapshot.reset(token)
 def _planets_in_retrograde_old(planet_positions):
     """
         Get the list of planets that are in retrograde - based on the planet positions returned by the divisional_chart()
@@ -1257,55 +1328,96 @@ def vaiseshikamsa_shodhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_m
             Vidrumaamsa – 13, Indraasanaamsa – 14, Golokaamsa – 15, Sree Vallabhaamsa – 16.
     """
     return _vaiseshikamsa_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode,const.shodhasa_varga_amsa_vaiseshikamsa)
-def _vaiseshikamsa_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,
-                                   amsa_vaiseshikamsa=None):
+_varga_bala_groups = {'dhasavarga':(const.dhasavarga_amsa_vimsopaka,const.dhasavarga_amsa_vaiseshikamsa),
+                      'shadvarga':(const.shadvarga_amsa_vimsopaka,const.shadvarga_amsa_vaiseshikamsa),
+                      'sapthavarga':(const.sapthavarga_amsa_vimsopaka,const.sapthavarga_amsa_vaiseshikamsa),
+                      'shodhasavarga':(const.shodhasa_varga_amsa_vimsopaka,const.shodhasa_varga_amsa_vaiseshikamsa)}
+def _varga_rasis_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factors=None):
+    """
+        Rasis of planets (Sun to Ketu) in the given vargas from one rasi chart calculation
+        @return: varga_rasis - dict {dcf:row index}, numpy array (vargas,9) of rasis of planets
+                 and compound relationships of planets in rasi chart (9,9)
+    """
+    if divisional_chart_factors is None: divisional_chart_factors = const.division_chart_factors
+    planet_positions_in_rasi = rasi_chart(jd_at_dob, place_as_tuple, ayanamsa_mode)[:const._pp_count_upto_ketu]
+    varga_rasis = np.array([[h for _,(h,_) in divisional_positions_from_rasi_positions(planet_positions_in_rasi,
+                                                        divisional_chart_factor=dcf)[1:const._pp_count_upto_ketu]]
+                            for dcf in divisional_chart_factors])
+    h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions_in_rasi)
+    compound_relations = np.array(house._get_compound_relationships_of_planets(h_to_p))
+    return {dcf:i for i,dcf in enumerate(divisional_chart_factors)}, varga_rasis, compound_relations
+def _varga_dignities_of_planets(varga_rasis,compound_relations):
+    """
+        Dignity lookups of planets in all vargas at once
+        @param varga_rasis: numpy array (vargas,9) of rasis of planets Sun to Ketu
+        @param compound_relations: compound relationships of planets in rasi chart (9,9)
+        @return: own_or_exalted (vargas,9) - True if planet is in moola trikona, own or exalted sign
+                 vimsopaka_score (vargas,9) - 20 if planet is in own sign else 5,7,10,15,18 based on 
+                    compound relationship with the lord of the sign
+    """
+    planets = np.arange(9)
+    strengths = np.array(const.house_strengths_of_planets)[planets,varga_rasis]
+    own_or_exalted = (varga_rasis == np.array(const.moola_trikona_of_planets)[:9]) | (strengths > const._FRIEND)
+    scores = np.array([5,7,10,15,18])
+    sign_lords = np.array(const.house_owners)[varga_rasis]
+    vimsopaka_score = np.where(strengths==const._OWNER_RULER,20,scores[compound_relations[planets,sign_lords]])
+    return own_or_exalted, vimsopaka_score
+def _varga_bala_of_planets(varga_index,own_or_exalted,amsa_factors,vimsopaka_score=None):
+    """
+        count, charts and score of planets for the vargas in amsa_factors
+        vimsopaka_score = None => vaiseshikamsa score (amsa factor of the vargas where planets are own/exalted)
+    """
+    own_or_exalted = own_or_exalted.tolist()
+    if vimsopaka_score is not None: vimsopaka_score = vimsopaka_score.tolist()
     p_d = [0 for _ in range(9)]
     p_d_s = [0 for _ in range(9)]
-    p_d_c = ['' for _ in range(9)]
-    for dcf in amsa_vaiseshikamsa.keys():
-        planet_positions = divisional_chart(jd_at_dob, place_as_tuple,ayanamsa_mode,
-                                            divisional_chart_factor=dcf)[:const._pp_count_upto_ketu]
-        for p,(h,_) in planet_positions:
-            if p == const._ascendant_symbol:
-                continue
-            elif h==const.moola_trikona_of_planets[p] or const.house_strengths_of_planets[p][h] > const._FRIEND:
+    p_d_c = [[] for _ in range(9)]
+    for dcf,amsa in amsa_factors.items():
+        v = varga_index[dcf]
+        for p in range(9):
+            if own_or_exalted[v][p]:
                 p_d[p] += 1
-                p_d_c[p] += 'D'+str(dcf)+'/'
-                p_d_s[p] += amsa_vaiseshikamsa[dcf]#*vv
-    pdc = {}
-    for p in range(9):
-        p_d_c[p] = p_d_c[p][:-1]
-        pdc[p] = [p_d[p],p_d_c[p],p_d_s[p]]
-    return pdc
+                p_d_c[p].append('D'+str(dcf))
+                if vimsopaka_score is None:
+                    p_d_s[p] += amsa
+            if vimsopaka_score is not None:
+                p_d_s[p] += amsa*vimsopaka_score[v][p]/20
+    return {p:[p_d[p],'/'.join(p_d_c[p]),p_d_s[p]] for p in range(9)}
+def _vaiseshikamsa_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,
+                                   amsa_vaiseshikamsa=None):
+    varga_index, varga_rasis, compound_relations = _varga_rasis_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode,
+                                                                           list(amsa_vaiseshikamsa.keys()))
+    own_or_exalted,_ = _varga_dignities_of_planets(varga_rasis, compound_relations)
+    return _varga_bala_of_planets(varga_index, own_or_exalted, amsa_vaiseshikamsa)
 def _vimsopaka_bala_of_planets(jd_at_dob, place_as_tuple,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,amsa_vimsopaka=None):
-    p_d = [0 for _ in range(9)]
-    p_d_s = [0 for _ in range(9)]
-    p_d_c = ['' for _ in range(9)]
-    scores = [5,7,10,15,18]
-    for dcf in amsa_vimsopaka.keys():
-        planet_positions = divisional_chart(jd_at_dob, place_as_tuple,ayanamsa_mode,divisional_chart_factor=dcf)[:const._pp_count_upto_ketu]
-        h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
-        if dcf == 1:
-            cr = house._get_compound_relationships_of_planets(h_to_p)
-        for p,(h,_) in planet_positions:
-            if p == const._ascendant_symbol:
-                continue
-            elif h==const.moola_trikona_of_planets[p] or const.house_strengths_of_planets[p][h] > const._FRIEND:
-                p_d[p] += 1
-                p_d_c[p] += 'D'+str(dcf)+'/'
-            if const.house_strengths_of_planets[p][h]==const._OWNER_RULER:
-                vv = 20
-            else:
-                d = const.house_owners[h]
-                vv = scores[cr[p][d]]
-            p_d_s[p] += amsa_vimsopaka[dcf]*vv/20
-    pdc = {}
-    for p in range(9):
-        p_d_c[p] = p_d_c[p][:-1]
-        pdc[p] = [p_d[p],p_d_c[p],p_d_s[p]]
-        #print(house.planet_list[p],pdc[p])
-    return pdc
-    
+    varga_index, varga_rasis, compound_relations = _varga_rasis_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode,
+                                                                           list(amsa_vimsopaka.keys()))
+    own_or_exalted,vimsopaka_score = _varga_dignities_of_planets(varga_rasis, compound_relations)
+    return _varga_bala_of_planets(varga_index, own_or_exalted, amsa_vimsopaka, vimsopaka_score)
+def varga_balas_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
+    """
+        Get vimsopaka and vaiseshikamsa balas of all four varga groupings and vimsamsa varga counts in one call
+        Planet positions are calculated once and the rasis of planets in all the vargas are looked up as one matrix
+        @param jd_at_dob:Julian day number at the date/time of birth
+            Note: It can be obtained from utils.julian_day_number(...)
+        @param place_as_tuple - panjanga.place format
+                example drik.place('Chennai,IN',13.0,78.0,+5.5)
+        @param ayanamsa_mode Default:const._DEFAULT_AYANAMSA_MODE - See const.available_ayanamsa_modes for more options
+        @return dict {'vimsopaka':{'dhasavarga':..,'shadvarga':..,'sapthavarga':..,'shodhasavarga':..},
+                      'vaiseshikamsa':{'dhasavarga':..,'shadvarga':..,'sapthavarga':..,'shodhasavarga':..},
+                      'vimsamsavarga':[count for each planet]}
+            vimsopaka/vaiseshikamsa values are same as returned by vimsopaka_<varga>_of_planets 
+                and vaiseshikamsa_<varga>_of_planets functions
+            vimsamsavarga is same as returned by vimsamsavarga_of_planets 
+    """
+    varga_index, varga_rasis, compound_relations = _varga_rasis_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode)
+    own_or_exalted,vimsopaka_score = _varga_dignities_of_planets(varga_rasis, compound_relations)
+    vimsopaka = {}; vaiseshikamsa = {}
+    for varga_group,(amsa_vimsopaka,amsa_vaiseshikamsa) in _varga_bala_groups.items():
+        vimsopaka[varga_group] = _varga_bala_of_planets(varga_index, own_or_exalted, amsa_vimsopaka, vimsopaka_score)
+        vaiseshikamsa[varga_group] = _varga_bala_of_planets(varga_index, own_or_exalted, amsa_vaiseshikamsa)
+    vimsamsavarga = own_or_exalted[[varga_index[dcf] for dcf in const.vimsamsa_varga_amsa_factors]].sum(axis=0).tolist()
+    return {'vimsopaka':vimsopaka,'vaiseshikamsa':vaiseshikamsa,'vimsamsavarga':vimsamsavarga}
 def vimsopaka_dhasavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE):
     """
         Get the count - in how many dhasa varga charts the planets are in their own raasi or exalted
@@ -1378,16 +1490,10 @@ def vimsamsavarga_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode=const._DEF
             Uchchaisravaamsa – 10, Dhanvantaryamsa – 11, Sooryakaantaamsa – 12,
             Vidrumaamsa – 13, Indraasanaamsa – 14, Golokaamsa – 15, Sree Vallabhaamsa – 16.
     """
-    planet_vimsamsa = [0 for p in range(9)]
-    for _, dcf in enumerate(const.vimsamsa_varga_amsa_factors):
-        planet_positions = divisional_chart(jd_at_dob, place_as_tuple, ayanamsa_mode, divisional_chart_factor=dcf)
-        for p,(h,_) in planet_positions:
-            if p == const._ascendant_symbol:
-                continue
-            elif h==const.moola_trikona_of_planets[p] or const.house_strengths_of_planets[p][h] > const._FRIEND:
-                #print('D'+str(_world_city_db_df),p,h,const.moola_trikona_of_planets[p],const.house_strengths_of_planets[p][h],di+1)
-                planet_vimsamsa[p] += 1
-    return planet_vimsamsa
+    varga_index, varga_rasis, compound_relations = _varga_rasis_of_planets(jd_at_dob, place_as_tuple, ayanamsa_mode,
+                                                                           const.vimsamsa_varga_amsa_factors)
+    own_or_exalted,_ = _varga_dignities_of_planets(varga_rasis, compound_relations)
+    return own_or_exalted.sum(axis=0).tolist()
 def _varnada_lagna_sanjay_rath_mixed_chart(dob,tob, place,house_index=1,varga_factor_1=1,chart_method_1=1,
                                            varga_factor_2=1,chart_method_2=1):
     jd_at_dob = utils.julian_day_number(dob, tob)
@@ -18,7 +18,6 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import json
 from jhora.horoscope.chart import charts, house
 from jhora import utils, const
 from jhora.panchanga import drik
@@ -26,14 +25,12 @@ _lang_path = const._LANGUAGE_PATH
 
 def get_dosha_resources(language='en'):
     """
-        get yoga names from yoga_msgs_<lang>.txt
+        get dosha names from dosha_msgs_<lang>.txt
+        The resource file is read only once per language and shared (read-only) by all callers
         @param language: Two letter language code. en, hi, ka, ta, te
-        @return json strings from the resource file as dictionary 
+        @return json strings from the resource file as read-only dictionary 
     """
-    json_file = _lang_path + const._DEFAULT_DOSHA_JSON_FILE_PREFIX+language+'.json'
-    f = open(json_file,"r",encoding="utf-8")
-    msgs = json.load(f)
-    return msgs
+    return utils.get_language_json_resources(const._DEFAULT_DOSHA_JSON_FILE_PREFIX,language)
 def kala_sarpa(house_to_planet_list):
     """ Returns kala Sarpa Dosha True or False 
         If True type kala sarpa dosha can be obtained from the Rahu's house number (1..12)
@@ -183,73 +180,41 @@ def kalathra(planet_positions,reference_planet='L'):
     kc = all([any([planet_positions[p+1][1][0]==(reference_house+h-1)%12 for h in [1,2,4,7,8,12] ]) for p in const.natural_malefics ])
     #print(kc)
     return kc
-def _get_kalathra_results(planet_positions,dosha_msgs,key_str, reference_planet='L'):
-    ks_results = {}
-    """ get kalathra dosha """
-    next_line = "<br><br>"
+def _kalathra_messages(planet_positions, reference_planet='L'):
     ks = 'kalathra'
-    ks_key = key_str
-    ks_msgs = dosha_msgs[ks]
-    kpd = kalathra(planet_positions, reference_planet=reference_planet)
-    ks_results[ks_key] = "<html>"+ks_msgs[0]+next_line
-    if kpd:
-        ks_results[ks_key] = "<html>"+ks_msgs[-1]+next_line
-    ks_results[ks_key] += "</html>"
-    return ks_results
+    if not kalathra(planet_positions, reference_planet=reference_planet):
+        return [(ks,0)]
+    return [(ks,-1)]
 def ganda_moola(moon_star):
     return moon_star in const.ganda_moola_stars
-def _get_ganda_moola_results(jd_at_dob,place,dosha_msgs,key_str):
-    m_results = {}
-    next_line = "<br><br>"
+def _ganda_moola_messages(moon_star):
     m = "ganda_moola"
-    m_key = key_str
-    m_msgs = dosha_msgs[m]
-    moon_star = drik.nakshatra(jd_at_dob, place)
-    _gm = ganda_moola(moon_star)
-    #print('_gc',_gc)
-    m_results[m_key] = "<html>"+m_msgs[0]+next_line
-    if _gm:
-        m_results[m_key] = m_msgs[-1]+next_line
-        m_results[m_key] += m_msgs[const.ganda_moola_stars.index(moon_star)+1]
-    return m_results 
-def _get_guru_chandala_results(planet_positions,dosha_msgs,key_str):
-    m_results = {}
-    next_line = "<br><br>"
+    if not ganda_moola(moon_star):
+        return [(m,0)]
+    return [(m,-1),(m,const.ganda_moola_stars.index(moon_star)+1)]
+def _guru_chandala_messages(planet_positions):
     m = "guru_chandal"
-    m_key = key_str
-    m_msgs = dosha_msgs[m]
     rahu_house = planet_positions[8][1][0] ; ketu_house = planet_positions[9][1][0]
     jupiter_house = planet_positions[5][1][0]
     _gc = guru_chandala_dosha(planet_positions)
     #print('_gc',_gc)
-    m_results[m_key] = "<html>"+m_msgs[0]+next_line
-    if _gc[0]:
-        m_results[m_key] = "<html>"+m_msgs[-1]+next_line
-        if _gc[1]:
-            if jupiter_house==rahu_house:
-                m_results[m_key] += utils.resource_strings['guru_stronger_than_rahu']+next_line
-            elif jupiter_house==ketu_house:
-                m_results[m_key] += utils.resource_strings['guru_stronger_than_ketu']+next_line
-            m_results[m_key] += m_msgs[planet_positions[5][1][0]+1] + next_line
-    m_results[m_key] += "</html>"
+    if not _gc[0]:
+        return [(m,0)]
+    m_results = [(m,-1)]
+    if _gc[1]:
+        if jupiter_house==rahu_house:
+            m_results.append((None,'guru_stronger_than_rahu'))
+        elif jupiter_house==ketu_house:
+            m_results.append((None,'guru_stronger_than_ketu'))
+        m_results.append((m,jupiter_house+1))
     return m_results
-def _get_kala_sarpa_results(planet_positions,dosha_msgs,key_str):
+def _kala_sarpa_messages(planet_positions):
     house_to_planet_list = utils.get_house_planet_list_from_planet_positions(planet_positions)
-    ks_results = {}
-    """ get kala sarpa dosha """
-    next_line = "<br><br>"
     ks = 'kala_sarpa'
-    ks_key = key_str
-    ks_msgs = dosha_msgs[ks]
-    kpd = kala_sarpa(house_to_planet_list)
-    ks_results[ks_key] = "<html>"+ks_msgs[0]+next_line
-    if kpd:
-        ks_results[ks_key] = "<html>"+ks_msgs[-1]+next_line
-        rahu_house = house.get_relative_house_of_planet(planet_positions[0][1][0],planet_positions[8][1][0])
-        #print('rahu house',rahu_house,ks_msgs[rahu_house])
-        ks_results[ks_key] += ks_msgs[rahu_house]+next_line
-    ks_results[ks_key] += "</html>"
-    return ks_results
+    if not kala_sarpa(house_to_planet_list):
+        return [(ks,0)]
+    rahu_house = house.get_relative_house_of_planet(planet_positions[0][1][0],planet_positions[8][1][0])
+    return [(ks,-1),(ks,rahu_house)]
 def ghata(planet_positions):
     """
         Mars/Saturn conjunction results in ghata dosha
@@ -262,115 +227,86 @@ def shrapit(planet_positions):
         @return: True/False
     """
     return planet_positions[8][1][0]==planet_positions[7][1][0]
-def _get_ghata_results(planet_positions,dosha_msgs,key_str):
-    house_to_planet_list = utils.get_house_planet_list_from_planet_positions(planet_positions)
-    ks_results = {}
-    """ get ghata dosha """
-    next_line = "<br><br>"
+def _ghata_messages(planet_positions):
     ks = 'ghata'
-    ks_key = key_str
-    ks_msgs = dosha_msgs[ks]
-    kpd = ghata(planet_positions)
-    ks_results[ks_key] = "<html>"+ks_msgs[0]+next_line
-    if kpd:
-        ks_results[ks_key] = "<html>"+ks_msgs[-1]+next_line
-        mars_house = house.get_relative_house_of_planet(planet_positions[0][1][0], planet_positions[3][1][0])
-        ks_results[ks_key] += ks_msgs[mars_house]+next_line
-    ks_results[ks_key] += "</html>"
-    return ks_results
-def _get_shrapit_results(planet_positions,dosha_msgs,key_str):
-    house_to_planet_list = utils.get_house_planet_list_from_planet_positions(planet_positions)
-    ks_results = {}
-    """ get shrapt dosha """
-    next_line = "<br><br>"
+    if not ghata(planet_positions):
+        return [(ks,0)]
+    mars_house = house.get_relative_house_of_planet(planet_positions[0][1][0], planet_positions[3][1][0])
+    return [(ks,-1),(ks,mars_house)]
+def _shrapit_messages(planet_positions):
     ks = 'shrapit'
-    ks_key = key_str
-    ks_msgs = dosha_msgs[ks]
-    kpd = shrapit(planet_positions)
-    ks_results[ks_key] = "<html>"+ks_msgs[0]+next_line
-    if kpd:
-        ks_results[ks_key] = "<html>"+ks_msgs[-1]+next_line
-        saturn_house = house.get_relative_house_of_planet(planet_positions[0][1][0], planet_positions[7][1][0])
-        ks_results[ks_key] += ks_msgs[saturn_house]+next_line
-    ks_results[ks_key] += "</html>"
-    return ks_results
-def _get_manglik_results(planet_positions, dosha_msgs,key_str):
-    m_results = {}
-    next_line = "<br><br>"
-    m = "manglik"
-    m_key = key_str
-    m_msgs = dosha_msgs[m]
+    if not shrapit(planet_positions):
+        return [(ks,0)]
+    saturn_house = house.get_relative_house_of_planet(planet_positions[0][1][0], planet_positions[7][1][0])
+    return [(ks,-1),(ks,saturn_house)]
+def _manglik_messages(planet_positions):
+    m = "manglik"; e = 'manglik_exceptions'
     _manglik = manglik(planet_positions)
-    m_results[m_key] = "<html>"+m_msgs[0]+next_line
-    if _manglik[0]:
-        m_results[m_key] = "<html>"+m_msgs[-1]+next_line
-        mars_house = house.get_relative_house_of_planet(planet_positions[0][1][0],planet_positions[3][1][0])
-        #print('mars_house',mars_house)
-        m_results[m_key] += m_msgs[mars_house]+next_line
-        """ Check exceptions """
-        e_msgs = dosha_msgs['manglik_exceptions']
-        exp = e_msgs[0]
-        if _manglik[1]:
-            exp = e_msgs[-1]+next_line
-            for _me in _manglik[2]:
-                exp += "\t"+e_msgs[_me]+next_line
-        m_results[m_key] += exp
-    m_results[m_key] += "</html>"
-    return m_results
-def _get_pitru_results(planet_positions,dosha_msgs,key_str):
-    house_to_planet_list = utils.get_house_planet_list_from_planet_positions(planet_positions)
-    ks_results = {}
-    next_line = "<br><br>"
+    if not _manglik[0]:
+        return [(m,0)]
+    mars_house = house.get_relative_house_of_planet(planet_positions[0][1][0],planet_positions[3][1][0])
+    #print('mars_house',mars_house)
+    m_results = [(m,-1),(m,mars_house)]
+    """ Check exceptions """
+    if not _manglik[1]:
+        return m_results+[(e,0)]
+    return m_results+[(e,-1)]+[(e,_me) for _me in _manglik[2]]
+def _pitru_messages(planet_positions):
     ks = 'pitru'
-    ks_key = key_str
-    ks_msgs = dosha_msgs[ks]
     kpd = pitru_dosha(planet_positions)
-    ks_results[ks_key] = "<html>"+ks_msgs[0]+next_line
-    if kpd[0]:
-        ks_results[ks_key] = "<html>"+ks_msgs[-1]+next_line
-        for m in kpd[1]:
-            ks_results[ks_key] += ks_msgs[m]+next_line
-    ks_results[ks_key] += "</html>"
-    return ks_results
-def get_dosha_details(jd_at_dob,place_as_tuple,language=const._DEFAULT_LANGUAGE):
-    dosha_msgs = get_dosha_resources(language)
-    #print(dosha_msgs)
+    if not kpd[0]:
+        return [(ks,0)]
+    return [(ks,-1)]+[(ks,m) for m in kpd[1]]
+""" dosha_msgs_<lang>.json key => msg_strings_<lang>.txt key of dosha title """
+_dosha_title_keys = {'kala_sarpa':'kala_sarpa_dosha_str','manglik':'manglik_dosha_str','pitru':'pitru_dosha_str',
+                     'guru_chandal':'guru_chandala_dosha_str','ganda_moola':'ganda_moola_dosha_str',
+                     'kalathra':'kalathra_dosha_str','ghata':'ghata_dosha_str','shrapit':'shrapit_dosha_str'}
+def find_doshas(jd_at_dob,place_as_tuple):
+    """
+        Get the language independent dosha results for a given julian day and place
+        Use render_dosha_results to get the language specific details of the doshas
+        @param jd_at_dob: Julian day number at the date/time of birth
+        @param place_as_tuple: struct (plave name, latitude, longitude, timezone)
+        @return: dict of {dosha_name:[(msg_key,msg_index),...]} 
+            msg_key/msg_index refer to dosha_msgs_<lang>.json. 
+            If msg_key is None msg_index is the key of msg_strings_<lang>.txt
+            msg_index = 0 => dosha not present; msg_index=-1 => dosha present
+    """
     planet_positions = charts.rasi_chart(jd_at_dob, place_as_tuple)
-    house_to_planet_list = utils.get_house_planet_list_from_planet_positions(planet_positions)
+    moon_star = drik.nakshatra(jd_at_dob, place_as_tuple)
+    return {'kala_sarpa':_kala_sarpa_messages(planet_positions),
+            'manglik':_manglik_messages(planet_positions),
+            'pitru':_pitru_messages(planet_positions),
+            'guru_chandal':_guru_chandala_messages(planet_positions),
+            'ganda_moola':_ganda_moola_messages(moon_star),
+            'kalathra':_kalathra_messages(planet_positions, reference_planet='L'),
+            'ghata':_ghata_messages(planet_positions),
+            'shrapit':_shrapit_messages(planet_positions),
+            }
+def render_dosha_results(found_doshas,language=const._DEFAULT_LANGUAGE):
+    """
+        Get language specific dosha details from the language independent results of find_doshas
+        @param found_doshas: dict returned by find_doshas
+        @param language: two letter language code (en, hi, ka, ta, te)
+        @return: dict of {dosha title in language: dosha details as html string}
+    """
+    next_line = "<br><br>"
+    dosha_msgs = get_dosha_resources(language)
+    res = utils.get_language_messages(language)
     dosha_results = {}
-    """ get kala sarpa dosha """
-    key_str = utils.resource_strings['kala_sarpa_dosha_str']
-    ks_results = _get_kala_sarpa_results(planet_positions, dosha_msgs,key_str)
-    dosha_results.update(ks_results)
-    """ get manglik """
-    key_str = utils.resource_strings['manglik_dosha_str']
-    m_results = _get_manglik_results(planet_positions, dosha_msgs,key_str)
-    dosha_results.update(m_results)
-    """ get pitru """
-    key_str = utils.resource_strings['pitru_dosha_str']
-    m_results = _get_pitru_results(planet_positions,dosha_msgs,key_str)
-    dosha_results.update(m_results)
-    """ get guru chandala """
-    key_str = utils.resource_strings['guru_chandala_dosha_str']
-    m_results = _get_guru_chandala_results(planet_positions,dosha_msgs,key_str)
-    dosha_results.update(m_results)
-    """ get ganda moola """
-    key_str = utils.resource_strings['ganda_moola_dosha_str']
-    m_results = _get_ganda_moola_results(jd_at_dob,place_as_tuple,dosha_msgs,key_str)
-    dosha_results.update(m_results)
-    """ get kalathra """
-    key_str = utils.resource_strings['kalathra_dosha_str']
-    m_results = _get_kalathra_results(planet_positions, dosha_msgs, key_str, reference_planet='L')
-    dosha_results.update(m_results)
-    """ get ghata """
-    key_str = utils.resource_strings['ghata_dosha_str']
-    m_results = _get_ghata_results(planet_positions, dosha_msgs, key_str)
-    dosha_results.update(m_results)
-    """ get shrapit """
-    key_str = utils.resource_strings['shrapit_dosha_str']
-    m_results = _get_shrapit_results(planet_positions, dosha_msgs, key_str)
-    dosha_results.update(m_results)
+    for dosha_name, dosha_messages in found_doshas.items():
+        dosha_str = "<html>"
+        for msg_key,msg_index in dosha_messages:
+            if msg_key is None:
+                dosha_str += res[msg_index]+next_line
+            elif msg_key == 'manglik_exceptions' and msg_index not in [0,-1]:
+                dosha_str += "\t"+dosha_msgs[msg_key][msg_index]+next_line
+            else:
+                dosha_str += dosha_msgs[msg_key][msg_index]+next_line
+        dosha_results[res[_dosha_title_keys[dosha_name]]] = dosha_str + "</html>"
     return dosha_results
+def get_dosha_details(jd_at_dob,place_as_tuple,language=const._DEFAULT_LANGUAGE):
+    return render_dosha_results(find_doshas(jd_at_dob, place_as_tuple), language=language)
 if __name__ == "__main__":
     lang = 'ta'
     utils.set_language(lang)
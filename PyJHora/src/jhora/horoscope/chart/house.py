@@ -18,6 +18,7 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import numpy as np
 from jhora import const, utils
 from jhora.panchanga import drik
 chara_karaka_names = const.chara_karaka_names
@@ -1208,6 +1209,129 @@ def order_of_planets_by_strength(planet_positions):
         sp = stronger_planet_from_planet_positions(planet_positions, planet1,planet2)
         return -1 if sp==planet1 else 1 #Left stronger = -1 ; right stronger = +1
     return sorted(planets, key=cmp_to_key(compare))
+def _stronger_rasi_tables(planet_rasis,planet_longitudes,lords):
+    """
+        Rules of stronger_rasi_from_planet_positions evaluated for all pairs of rasis of one or more charts
+        @param planet_rasis: (N,9) rasi of Sun..Ketu of each chart
+        @param planet_longitudes: (N,9) longitude within the rasi of Sun..Ketu of each chart
+        @param lords: (N,12) lord of each sign of each chart - same as house_owner_from_planet_positions
+        @return: (N,12,12) stronger of the two rasis of each chart
+    """
+    planet_rasis = np.asarray(planet_rasis); lords = np.asarray(lords); n_charts = len(planet_rasis)
+    rasis = np.arange(12); odd_signs = np.isin(rasis, const.odd_signs)
+    house_owners = np.array(const.house_owners); house_strengths = np.array(const.house_strengths_of_planets)
+    raasi_drishti = np.zeros((12,12),dtype=bool)
+    for r,aspected_rasis in _get_raasi_drishti().items():
+        raasi_drishti[r,aspected_rasis] = True
+    in_rasi = planet_rasis[:,:,None] == rasis # (N,9,12)
+    planet_count = in_rasi.sum(axis=1)
+    aspects = raasi_drishti[planet_rasis] # (N,9,12) planet has raasi drishti on rasi
+    """
+        Mercury, Jupiter and the (natural) lord of the rasi conjoining or aspecting the rasi
+        As in stronger_rasi the lord is counted as conjoining when its planet index equals the rasi index
+    """
+    lord_in = house_owners == rasis
+    lord_aspects = np.take_along_axis(aspects, np.broadcast_to(house_owners,(n_charts,12))[:,None,:], axis=1)[:,0,:]
+    co_planet_count = in_rasi[:,3,:].astype(int) + in_rasi[:,4,:] + lord_in + aspects[:,3,:] + aspects[:,4,:] + lord_aspects
+    exalted = house_strengths[np.arange(9)[None,:], planet_rasis] == const._EXALTED_UCCHAM # (N,9)
+    exalted_count = (in_rasi & exalted[:,:,None]).sum(axis=1)
+    has_oddity = odd_signs != np.isin(planet_rasis[:,house_owners], const.odd_signs)
+    """ Rule 6: rasi whose (co-lord resolved) lord has advanced more in its sign """
+    lord_longitudes = np.take_along_axis(np.asarray(planet_longitudes), lords, axis=1)
+    r1 = rasis[:,None]; r2 = rasis[None,:]
+    pair = lambda values: (values[:,:,None], values[:,None,:])
+    stronger = np.where(lord_longitudes[:,:,None] > lord_longitudes[:,None,:], r1, r2)
+    """ Rule 5: dual > fixed > movable (dual vs dual goes to the second rasi, as in stronger_rasi) """
+    modality = np.where(np.isin(rasis, const.dual_signs), 2, np.where(np.isin(rasis, const.fixed_signs), 1, 0))
+    m1 = modality[:,None]; m2 = modality[None,:]
+    rule5 = np.where(m1 > m2, r1, np.where(m1 < m2, r2, np.where(m1==2, r2, -1)))
+    stronger = np.where(rule5 >= 0, rule5, stronger)
+    for values in [has_oddity, exalted_count > 0]:
+        v1,v2 = pair(values)
+        stronger = np.where(v1 & ~v2, r1, np.where(v2 & ~v1, r2, stronger))
+    for values in [co_planet_count, planet_count]:
+        v1,v2 = pair(values)
+        stronger = np.where(v1 > v2, r1, np.where(v2 > v1, r2, stronger))
+    return stronger
+class ChartRelations():
+    """
+        Aspect, argala, friendship and strength tables of a chart built once from the planet positions.
+        Use this when the same chart is queried repeatedly (e.g. stronger rasi in rasi dhasas)
+        All the tables are indexed by planet (0=Sun..8=Ketu) and/or rasi (0=Aries..11=Pisces)
+        @param planet_positions list in the format [[planet,(raasi,planet_longitude)],...]] 
+            First element is that of Lagnam. Example: [ ['L',(0,123.4)],[0,(11,32.7)],...]]
+        Tables:
+            planet_rasis: (9,) rasi of planets
+            planets_in_rasi: (9,12) True if planet is in the rasi
+            graha_drishti_rasis: (9,12) True if planet has graha drishti on the rasi
+            graha_drishti_planets: (9,9) True if planet has graha drishti on the other planet
+            raasi_drishti: (12,12) True if rasi has raasi drishti on the other rasi
+            raasi_drishti_rasis: (9,12) True if planet has raasi drishti on the rasi
+            raasi_drishti_planets: (9,9) True if planet has raasi drishti on the other planet
+            argala_planets, virodhargala_planets: (12,9) True if planet causes argala/virodhargala on the rasi
+            natural_relations: (9,9) 2=friend, 1=neutral, 0=enemy
+            temporary_relations: (9,9) 1=temporary friend 0=temporary enemy
+            compound_relations: (9,9) 4=Adhimitra,3=Mitra,2=Neutral,1=Enemy,0=Adhisathru
+            stronger_rasis: (12,12) stronger of the two rasis - same as stronger_rasi_from_planet_positions
+    """
+    def __init__(self,planet_positions):
+        self.planet_positions = planet_positions
+        self.h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
+        self.p_to_h = utils.get_planet_to_house_dict_from_chart(self.h_to_p)
+        self.asc_house = self.p_to_h[const._ascendant_symbol]
+        planets = np.arange(9); rasis = np.arange(12)
+        self.planet_rasis = np.array([self.p_to_h[p] for p in planets])
+        self.planets_in_rasi = self.planet_rasis[:,None] == rasis[None,:]
+        gd_arp,_,gd_app = graha_drishti_from_chart(self.h_to_p)
+        rd_arp,_,rd_app = raasi_drishti_from_chart(self.h_to_p)
+        self.graha_drishti_rasis = np.zeros((9,12),dtype=bool)
+        self.graha_drishti_planets = np.zeros((9,9),dtype=bool)
+        self.raasi_drishti_rasis = np.zeros((9,12),dtype=bool)
+        self.raasi_drishti_planets = np.zeros((9,9),dtype=bool)
+        for p in planets:
+            self.graha_drishti_rasis[p,gd_arp[p]] = True; self.graha_drishti_planets[p,gd_app[p]] = True
+            self.raasi_drishti_rasis[p,rd_arp[p]] = True; self.raasi_drishti_planets[p,rd_app[p]] = True
+        self.raasi_drishti = np.zeros((12,12),dtype=bool)
+        for r,aspected_rasis in _get_raasi_drishti().items():
+            self.raasi_drishti[r,aspected_rasis] = True
+        argala_houses = lambda houses: (rasis[:,None]+np.array(houses)[None,:]-1)%12
+        self.argala_planets = self.planets_in_rasi.T[argala_houses(const.argala_houses)].any(axis=1)
+        self.virodhargala_planets = self.planets_in_rasi.T[argala_houses(const.virodhargala_houses)].any(axis=1)
+        self.natural_relations = np.ones((9,9),dtype=int)
+        for p in planets:
+            self.natural_relations[p,const.friendly_planets[p]] = 2
+            self.natural_relations[p,const.enemy_planets[p]] = 0
+        self.temporary_relations = np.zeros((9,9),dtype=int)
+        for p,temp_friends in _get_temporary_friends_of_planets(self.h_to_p).items():
+            self.temporary_relations[p,temp_friends] = 1
+        self.compound_relations = np.array(_get_compound_relationships_of_planets(self.h_to_p))
+        self.lords = [house_owner_from_planet_positions(planet_positions, r) for r in rasis]
+        self._stronger_planets = {}; self._dhasa_lords = {}
+        planet_longitudes = np.array([planet_positions[p+1][1][1] for p in planets])
+        self.stronger_rasis = _stronger_rasi_tables(self.planet_rasis[None,:], planet_longitudes[None,:],
+                                                    np.array(self.lords)[None,:])[0]
+    def stronger_rasi(self,rasi1,rasi2):
+        """ stronger of rasi1 and rasi2. Same as stronger_rasi_from_planet_positions """
+        return int(self.stronger_rasis[rasi1,rasi2])
+    def stronger_planet(self,planet1,planet2,check_during_dhasa=False):
+        """ stronger of planet1 and planet2. Same as stronger_planet_from_planet_positions """
+        key = (planet1,planet2,check_during_dhasa)
+        if key not in self._stronger_planets:
+            self._stronger_planets[key] = stronger_planet_from_planet_positions(self.planet_positions, planet1, planet2,
+                                                                                check_during_dhasa=check_during_dhasa)
+        return self._stronger_planets[key]
+    def house_owner(self,sign,check_during_dhasa=False):
+        """ lord of the sign. Same as house_owner_from_planet_positions """
+        if not check_during_dhasa:
+            return self.lords[sign]
+        if sign not in self._dhasa_lords:
+            self._dhasa_lords[sign] = house_owner_from_planet_positions(self.planet_positions, sign, check_during_dhasa=True)
+        return self._dhasa_lords[sign]
+    def order_of_planets_by_strength(self):
+        """ Same as order_of_planets_by_strength """
+        from functools import cmp_to_key
+        compare = lambda planet1,planet2: -1 if self.stronger_planet(planet1,planet2)==planet1 else 1
+        return sorted(range(9), key=cmp_to_key(compare))
 if __name__ == "__main__":
     from jhora.horoscope.chart import charts
     utils.set_language('en')
@@ -19,7 +19,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import itertools
-import json
+import numpy as np
 from jhora import const,utils
 from jhora.panchanga import drik
 from jhora.horoscope.chart import house, charts
@@ -49,15 +49,63 @@ lords_of_trines_from_planet_positions = lambda planet_positions, raasi:[house.ho
 def get_raja_yoga_resources(language='en'):
     """
         get raja yoga names from raja_yoga_msgs_<lang>.txt
+        The resource file is read only once per language and shared (read-only) by all callers
         @param language: Two letter language code. en, hi, ka, ta, te
-        @return json strings from the resource file as dictionary 
-    """
-    json_file = _lang_path + const._DEFAULT_RAJA_YOGA_JSON_FILE_PREFIX+language+'.json'
-    #print('opening json file',json_file)
-    f = open(json_file,"r",encoding="utf-8")
-    msgs = json.load(f)
-    #print('json msgs collected')
-    return msgs
+        @return json strings from the resource file as read-only dictionary 
+    """
+    return utils.get_language_json_resources(const._DEFAULT_RAJA_YOGA_JSON_FILE_PREFIX,language)
+def _raja_yoga_names():
+    """ raja yoga function names are same in all language resources. English resource is used as reference """
+    return tuple(get_raja_yoga_resources('en').keys())
+def find_raja_yogas_from_planet_positions(planet_positions):
+    """
+        Get the language independent raja yogas present in the chart
+        @param planet_positions: Planet positions in the format [['L',(7,12.7)],[0,(3,12.3)],...]
+        @return: dict of {raja_yoga_name:[(planet1,planet2),...]} for the raja yogas present in the chart
+    """
+    return find_raja_yogas_for_planet_positions_list([planet_positions])[0]
+def find_raja_yogas(jd,place,divisional_chart_factor=None):
+    """
+        Get the language independent raja yogas present in the divisional charts for a given julian day and place
+        Planet longitudes are calculated once and raja yogas of all the divisional charts are evaluated together
+        Use render_raja_yoga_results to get the language specific details of the raja yogas
+        @param jd: Julian day number
+        @param place: struct (plave name, latitude, longitude, timezone)
+        @param divisional_chart_factor: None => Get for all varga charts. Or specify divisional chart number 
+        @return: dict of {divisional_chart_factor:{raja_yoga_name:[(planet1,planet2),...]},...} 
+    """
+    dcfs = division_chart_factors if divisional_chart_factor is None else [divisional_chart_factor]
+    ascendant_index = const._ascendant_symbol
+    ascendant_longitude = drik.ascendant(jd,place)[1]
+    jd_utc = jd - place.timezone / 24.
+    planet_longitudes = [drik.sidereal_longitude(jd_utc, planet) for planet in drik.planet_list[:-1]]
+    planet_longitudes.append(drik.ketu(drik.sidereal_longitude(jd_utc, const._RAHU)))
+    planet_positions_list = []
+    for dv in dcfs:
+        planet_positions = [[ascendant_index,drik.dasavarga_from_long(ascendant_longitude,dv)]]
+        planet_positions += [[p,drik.dasavarga_from_long(long,dv)] for p,long in enumerate(planet_longitudes)]
+        planet_positions_list.append(planet_positions)
+    return dict(zip(dcfs,find_raja_yogas_for_planet_positions_list(planet_positions_list)))
+def render_raja_yoga_results(found_raja_yogas,language='en'):
+    """
+        Get language specific raja yoga details from the language independent results of find_raja_yogas
+        @param found_raja_yogas: dict returned by find_raja_yogas
+        @param language: two letter language code (en, hi, ka, ta, te)
+        @return: dict of {raja_yoga_name:[chart_ID and raja yoga pairs, raja_yoga_name, raja_yoga_desription, raja_yoga_benfits]}
+            If a raja yoga is present in more than one chart, the first chart in found_raja_yogas is returned
+    """
+    msgs = get_raja_yoga_resources(language=language)
+    res = utils.get_language_messages(language)
+    planet_names = utils.get_language_lists(language)['PLANET_NAMES']
+    raja_yoga_results = {}
+    for dv,raja_yogas in found_raja_yogas.items():
+        for raja_yoga_function,pairs in raja_yogas.items():
+            if raja_yoga_function in raja_yoga_results:
+                continue
+            rp_str = ''.join(' '+'[' +planet_names[rp1]+'-'+planet_names[rp2]+'] ' for rp1,rp2 in pairs)
+            details_str = 'D'+str(dv)+'-'+res['raja_yoga_pairs'] + rp_str
+            raja_yoga_results[raja_yoga_function] = [details_str]+list(msgs[raja_yoga_function])
+    return raja_yoga_results
 def get_raja_yoga_details_for_all_charts(jd,place,language='en',divisional_chart_factor=None):
     """
         Get all the raja yoga information that are present in the divisional charts for a given julian day and place
@@ -68,24 +116,10 @@ def get_raja_yoga_details_for_all_charts(jd,place,language='en',divisional_chart
             raja yoga_name in language
             raja yoga_details: [chart_ID, raja_yoga_name, raja_yoga_desription, raja_yoga_benfits] 
     """
-    msgs = get_raja_yoga_resources(language=language)
-    raja_yoga_results_combined = {}
-    ascendant_index = const._ascendant_symbol
-    planet_positions_navamsa = drik.dhasavarga(jd,place,divisional_chart_factor=9)
-    ascendant_longitude = drik.ascendant(jd,place)[1]
-    asc_house_navamsa,asc_long = drik.dasavarga_from_long(ascendant_longitude,divisional_chart_factor=9)
-    planet_positions_navamsa += [[ascendant_index,(asc_house_navamsa,asc_long)]]
-    if divisional_chart_factor==None:
-        for dv in division_chart_factors:
-            raja_yoga_results,_,_ = get_raja_yoga_details(jd,place,divisional_chart_factor=dv,language=language)
-            raja_yoga_results.update(raja_yoga_results_combined)
-            raja_yoga_results_combined = raja_yoga_results
-    else:
-        raja_yoga_results,_,_ = get_raja_yoga_details(jd,place,divisional_chart_factor=divisional_chart_factor,language=language)
-        raja_yoga_results.update(raja_yoga_results_combined)
-        raja_yoga_results_combined = raja_yoga_results
+    raja_yoga_results_combined = render_raja_yoga_results(find_raja_yogas(jd, place, divisional_chart_factor),
+                                                          language=language)
     #print('Found',len(yoga_results_combined),'out of',len(msgs)*len(division_chart_factors),'yogas')
-    return raja_yoga_results_combined,len(raja_yoga_results_combined),len(msgs)*len(division_chart_factors)
+    return raja_yoga_results_combined,len(raja_yoga_results_combined),len(_raja_yoga_names())*len(division_chart_factors)
 def get_raja_yoga_details(jd,place,divisional_chart_factor=1,language='en'):
     """
         Get all the raja yoga information that are present in the requested divisional charts for a given julian day and place
@@ -97,33 +131,10 @@ def get_raja_yoga_details(jd,place,divisional_chart_factor=1,language='en'):
             raja yoga_name in language
             raja yoga_details: [chart_ID, raja_yoga_name, raja_yoga_desription, raja_yoga_benfits] 
     """
-    #utils.set_language(language)
-    msgs = get_raja_yoga_resources(language=language)
-    res = utils.get_resource_messages()
-    ascendant_index = const._ascendant_symbol
-    planet_positions = drik.dhasavarga(jd,place,divisional_chart_factor)
-    ascendant_longitude = drik.ascendant(jd,place)[1]
-    asc_house,asc_long = drik.dasavarga_from_long(ascendant_longitude,divisional_chart_factor)
-    planet_positions += [[ascendant_index,(asc_house,asc_long)]]
-    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
-    h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
-    raja_yoga_results = {}
-    for raja_yoga_function,details in msgs.items():
-        details_str = 'D'+str(divisional_chart_factor)+'-'
-        raja_yoga_pairs = get_raja_yoga_pairs_from_planet_positions(planet_positions)
-        if raja_yoga_pairs:
-            rp_str = ''
-            for rp1,rp2 in raja_yoga_pairs:
-                raja_yoga_exists = eval(raja_yoga_function+'_from_planet_positions')(planet_positions,rp1,rp2)
-                if raja_yoga_exists:
-                    rp_str += ' '+'[' +utils.PLANET_NAMES[rp1]+'-'+utils.PLANET_NAMES[rp2]+'] '
-                    #details_str += rp_str
-            if rp_str != '':
-                details_str += res['raja_yoga_pairs'] + rp_str
-                details.insert(0,details_str)
-                raja_yoga_results[raja_yoga_function] = details
+    raja_yoga_results = render_raja_yoga_results(find_raja_yogas(jd, place, divisional_chart_factor),
+                                                 language=language)
     #print('Found',len(raja_yoga_results),'out of',len(msgs),'raja_yogas in D'+str(divisional_chart_factor),'chart')
-    return raja_yoga_results,len(raja_yoga_results),len(msgs)
+    return raja_yoga_results,len(raja_yoga_results),len(_raja_yoga_names())
 def _check_association(h_to_p,lord1,lord2):
     p_to_h = utils.get_planet_to_house_dict_from_chart(h_to_p)
     """ (1) The two lords are conjoined, """
@@ -133,7 +144,7 @@ def _check_association(h_to_p,lord1,lord2):
         return True
     """ (2) The two lords aspect each other with graha drishti Rahu/Ketu dont form graha drishti"""
     chk2_1 = lord1 not in [7,8] and lord2 not in [7,8] 
-    chk2 = chk2_1 and str(lord1) in house.graha_drishti_of_the_planet(h_to_p, lord2) and str(lord2) in house.graha_drishti_of_the_planet(h_to_p, lord1)
+    chk2 = chk2_1 and lord1 in house.graha_drishti_of_the_planet(h_to_p, lord2) and lord2 in house.graha_drishti_of_the_planet(h_to_p, lord1)
     if chk2:
         #print('graha drishti',lord1,house.graha_drishti_of_the_planet(h_to_p, lord2),lord2,house.graha_drishti_of_the_planet(h_to_p, lord1))
         return True
@@ -150,7 +161,7 @@ def _check_association_from_planet_positions(planet_positions,lord1,lord2):
         return True
     """ (2) The two lords aspect each other with graha drishti Rahu/Ketu dont form graha drishti"""
     chk2_1 = lord1 not in [7,8] and lord2 not in [7,8] 
-    chk2 = chk2_1 and str(lord1) in house.graha_drishti_of_the_planet(h_to_p, lord2) and str(lord2) in house.graha_drishti_of_the_planet(h_to_p, lord1)
+    chk2 = chk2_1 and lord1 in house.graha_drishti_of_the_planet(h_to_p, lord2) and lord2 in house.graha_drishti_of_the_planet(h_to_p, lord1)
     if chk2:
         #print('graha drishti',lord1,house.graha_drishti_of_the_planet(h_to_p, lord2),lord2,house.graha_drishti_of_the_planet(h_to_p, lord1))
         return True
@@ -392,10 +403,10 @@ def neecha_bhanga_raja_yoga(p_to_h,raja_yoga_planet1, raja_yoga_planet2):
     if chk2:
         return True
     " Rule 3"
-    chk3_1 = (const.house_strengths_of_planets[raja_yoga_planet1][rp2_rasi] <= const._DEBILITATED_NEECHAM) and \
-             (str(raja_yoga_planet1) in house.graha_drishti_of_the_planet(house_to_planet_list, rp1_lord))
+    chk3_1 = (const.house_strengths_of_planets[raja_yoga_planet1][rp1_rasi] <= const._DEBILITATED_NEECHAM) and \
+             (raja_yoga_planet1 in house.graha_drishti_of_the_planet(house_to_planet_list, rp1_lord))
     chk3_2 = (const.house_strengths_of_planets[raja_yoga_planet2][rp2_rasi] <= const._DEBILITATED_NEECHAM) and \
-             (str(raja_yoga_planet1) in house.graha_drishti_of_the_planet(house_to_planet_list, rp2_lord))
+             (raja_yoga_planet2 in house.graha_drishti_of_the_planet(house_to_planet_list, rp2_lord))
     chk3 = chk3_1 or chk3_2
     return chk3
 def neecha_bhanga_raja_yoga_from_planet_positions(planet_positions,raja_yoga_planet1, raja_yoga_planet2):
@@ -445,12 +456,111 @@ def neecha_bhanga_raja_yoga_from_planet_positions(planet_positions,raja_yoga_pla
     if chk2:
         return True
     " Rule 3"
-    chk3_1 = (const.house_strengths_of_planets[raja_yoga_planet1][rp2_rasi] <= const._DEBILITATED_NEECHAM) and \
-             (str(raja_yoga_planet1) in house.graha_drishti_of_the_planet(house_to_planet_list, rp1_lord))
+    chk3_1 = (const.house_strengths_of_planets[raja_yoga_planet1][rp1_rasi] <= const._DEBILITATED_NEECHAM) and \
+             (raja_yoga_planet1 in house.graha_drishti_of_the_planet(house_to_planet_list, rp1_lord))
     chk3_2 = (const.house_strengths_of_planets[raja_yoga_planet2][rp2_rasi] <= const._DEBILITATED_NEECHAM) and \
-             (str(raja_yoga_planet1) in house.graha_drishti_of_the_planet(house_to_planet_list, rp2_lord))
+             (raja_yoga_planet2 in house.graha_drishti_of_the_planet(house_to_planet_list, rp2_lord))
     chk3 = chk3_1 or chk3_2
     return chk3
+def _raja_yoga_tables(planet_positions):
+    """
+        Build once per chart the tables required to evaluate raja yogas of all planet pairs
+        @param planet_positions list in the format [[planet,(raasi,planet_longitude)],...]] 
+            Should contain Sun to Ketu and Lagnam. Example: [ ['L',(0,123.4)],[0,(11,32.7)],...]]
+        @return: dict of numpy arrays
+            'rasi': rasi of planets Sun..Ketu (9,)
+            'lords': lord of each sign (12,) (stronger of Mars/Ketu and Saturn/Rahu for Scorpio/Aquarius)
+            'lordship': lordship[p,s] = True if planet p is lord of sign s (9,12)
+            'aspects': aspects[p1,p2] = True if p1 has graha/raasi drishti on p2 (9,9)
+            'association': association[p1,p2] = True if p1,p2 are conjoined, mutually aspected or exchanged (9,9)
+            'kendra','trikona','dushthana': masks of quadrant/trine/dushthana signs from lagna (12,)
+    """
+    h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
+    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
+    asc_house = p_to_h[const._ascendant_symbol]
+    planets = np.arange(9)
+    rasi = np.array([p_to_h[p] for p in planets])
+    lords = np.array([house.house_owner_from_planet_positions(planet_positions,s) for s in range(12)])
+    lordship = lords[None,:] == planets[:,None]
+    """ same as house.graha_drishti_of_the_planet - but for all planets from one drishti calculation """
+    _,_,graha_app = house.graha_drishti_from_chart(h_to_p)
+    raasi_arp,_,raasi_app = house.raasi_drishti_from_chart(h_to_p)
+    aspects = np.zeros((9,9),dtype=bool)
+    for p in planets:
+        aspected_planets = graha_app[p] + raasi_app[p]
+        for h in raasi_arp[p]:
+            aspected_planets += [int(p1) for p1 in h_to_p[(h+rasi[p]-1)%12].split('/') if p1 not in ['',const._ascendant_symbol]]
+        aspects[p,aspected_planets] = True
+    """ Rahu/Ketu dont form graha drishti """
+    not_node = ~np.isin(planets,[const.RAHU_ID,const.KETU_ID])
+    conjoined = rasi[:,None] == rasi[None,:]
+    mutual_aspect = aspects & aspects.T & not_node[:,None] & not_node[None,:]
+    dispositor = lords[rasi]
+    exchange = (dispositor[None,:] == planets[:,None]) & (dispositor[:,None] == planets[None,:])
+    sign_mask = lambda signs: np.isin(np.arange(12),signs)
+    return {'rasi':rasi,'lords':lords,'lordship':lordship,'aspects':aspects,
+            'association':conjoined | mutual_aspect | exchange,
+            'kendra':sign_mask(house.quadrants_of_the_raasi(asc_house)),
+            'trikona':sign_mask(house.trines_of_the_raasi(asc_house)),
+            'dushthana':sign_mask(house.dushthanas_of_the_raasi(asc_house)),
+            'dharma_karma':sign_mask([(asc_house+const.HOUSE_9)%12,(asc_house+const.HOUSE_10)%12])}
+def _evaluate_raja_yogas(tables):
+    """
+        Evaluate raja yoga pairs, dharma karmadhipati, vipareetha and neecha bhanga raja yogas
+        for all planet pairs of many charts at once.
+        @param tables: dict of _raja_yoga_tables stacked along a first (chart) axis
+        @return: dict of boolean arrays of shape (charts,9,9) (only upper triangle p1<p2 is set)
+            'raja_yoga_pairs' and one array per raja yoga name of raja_yoga_msgs_<lang>.json
+    """
+    rasi = tables['rasi']; lords = tables['lords']; lordship = tables['lordship']; aspects = tables['aspects']
+    charts_count = rasi.shape[0]; planets = np.arange(9)
+    pair_of = lambda planet_mask: planet_mask[:,:,None] & planet_mask[:,None,:]
+    upper = planets[:,None] < planets[None,:]
+    lord_of = lambda sign_mask: (lordship & sign_mask[:,None,:]).any(axis=-1)
+    kendra_lord = lord_of(tables['kendra']); trikona_lord = lord_of(tables['trikona'])
+    candidate = (kendra_lord[:,:,None] & trikona_lord[:,None,:]) | (trikona_lord[:,:,None] & kendra_lord[:,None,:])
+    raja_yoga_pairs = candidate & upper & tables['association']
+    dharma_karmadhipati = pair_of(lord_of(tables['dharma_karma']))
+    vipareetha = pair_of(np.take_along_axis(tables['dushthana'],rasi,axis=1))
+    """ Neecha Bhanga - Rules 1 to 3 of neecha_bhanga_raja_yoga """
+    strengths = np.array(const.house_strengths_of_planets)
+    planet_strength = strengths[planets[None,:],rasi]
+    debilitated = planet_strength <= const._DEBILITATED_NEECHAM
+    exalted = planet_strength >= const._EXALTED_UCCHAM
+    dispositor = np.take_along_axis(lords,rasi,axis=1)
+    in_kendra_from_moon = (rasi - rasi[:,const.MOON_ID:const.MOON_ID+1]) % 3 == 0
+    rule1 = debilitated & ((strengths[dispositor,rasi] >= const._EXALTED_UCCHAM) | in_kendra_from_moon)
+    rule2 = (rasi[:,:,None] == rasi[:,None,:]) & ((exalted[:,:,None] & debilitated[:,None,:]) | \
+                                                  (debilitated[:,:,None] & exalted[:,None,:]))
+    rule3 = debilitated & aspects[np.arange(charts_count)[:,None],dispositor,planets[None,:]]
+    neecha_planet = rule1 | rule3
+    neecha_bhanga = neecha_planet[:,:,None] | neecha_planet[:,None,:] | rule2
+    return {'raja_yoga_pairs':raja_yoga_pairs,
+            'dharma_karmadhipati_raja_yoga':raja_yoga_pairs & dharma_karmadhipati,
+            'vipareetha_raja_yoga':raja_yoga_pairs & vipareetha,
+            'neecha_bhanga_raja_yoga':raja_yoga_pairs & neecha_bhanga}
+def find_raja_yogas_for_planet_positions_list(planet_positions_list):
+    """
+        Get the language independent raja yogas of many charts (e.g. all vargas of a chart) at once
+        Lordship, association/aspect and kendra/trikona tables are built once per chart and
+        raja yogas of all planet pairs of all the charts are evaluated with array operations
+        @param planet_positions_list: list of planet positions each in the format [['L',(7,12.7)],[0,(3,12.3)],...]
+        @return: list of {raja_yoga_name:[(planet1,planet2),...]} for each chart
+    """
+    if len(planet_positions_list)==0:
+        return []
+    tables = [_raja_yoga_tables(planet_positions) for planet_positions in planet_positions_list]
+    tables = {key:np.stack([t[key] for t in tables]) for key in tables[0]}
+    raja_yogas = _evaluate_raja_yogas(tables)
+    results = []
+    for c in range(len(planet_positions_list)):
+        chart_results = {}
+        for raja_yoga_function in _raja_yoga_names():
+            pairs = [(int(p1),int(p2)) for p1,p2 in np.argwhere(raja_yogas[raja_yoga_function][c])]
+            if pairs:
+                chart_results[raja_yoga_function] = pairs
+        results.append(chart_results)
+    return results
 def check_other_raja_yoga_1(jd,place,divisional_chart_factor=1):
     planet_positions = charts.divisional_chart(jd, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE, divisional_chart_factor=divisional_chart_factor)
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
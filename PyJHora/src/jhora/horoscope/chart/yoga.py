@@ -18,7 +18,6 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import json
 from jhora import const,utils
 from jhora.panchanga import drik
 from jhora.horoscope.chart import house
@@ -44,13 +43,74 @@ def _is_mercury_benefic(chart_1d):
 def get_yoga_resources(language='en'):
     """
         get yoga names from yoga_msgs_<lang>.txt
+        The resource file is read only once per language and shared (read-only) by all callers
         @param language: Two letter language code. en, hi, ka, ta, te
-        @return json strings from the resource file as dictionary 
+        @return json strings from the resource file as read-only dictionary 
     """
-    json_file = _lang_path + const._DEFAULT_YOGA_JSON_FILE_PREFIX+language+'.json'
-    f = open(json_file,"r",encoding="utf-8")
-    msgs = json.load(f)
-    return msgs
+    return utils.get_language_json_resources(const._DEFAULT_YOGA_JSON_FILE_PREFIX,language)
+def _yoga_names():
+    """ yoga function names are same in all language resources. English resource is used as reference """
+    return tuple(get_yoga_resources('en').keys())
+def _get_yoga_planet_positions(jd,place,divisional_chart_factor=1):
+    ascendant_index = const._ascendant_symbol
+    planet_positions = drik.dhasavarga(jd,place,divisional_chart_factor)
+    ascendant_longitude = drik.ascendant(jd,place)[1]
+    asc_house,asc_long = drik.dasavarga_from_long(ascendant_longitude,divisional_chart_factor)
+    planet_positions = [[ascendant_index,(asc_house,asc_long)]] + planet_positions
+    return planet_positions[:const._pp_count_upto_ketu]
+def _yoga_needs_navamsa(yoga_check):
+    return 'planet_positions_navamsa' in yoga_check.__code__.co_varnames[:yoga_check.__code__.co_argcount]
+def find_yogas_from_planet_positions(planet_positions,planet_positions_navamsa=None):
+    """
+        Get the language independent list of yogas present in the chart
+        @param planet_positions: Planet positions in the format [['L',(7,12.7)],[0,(3,12.3)],...]
+        @param planet_positions_navamsa: navamsa planet positions required for yogas such as kalpadruma yoga 
+            If None such yogas are skipped
+        @return: list of yoga names (keys of yoga_msgs_<lang>.json) that are present in the chart
+        NOTE: yogas that do not have <yoga_name>_from_planet_positions function are skipped 
+    """
+    found_yogas = []
+    for yoga_function in _yoga_names():
+        _yoga_check = globals().get(yoga_function+'_from_planet_positions')
+        if _yoga_check is None:
+            continue
+        if _yoga_needs_navamsa(_yoga_check):
+            if planet_positions_navamsa is None:
+                continue
+            yoga_exists = _yoga_check(planet_positions,planet_positions_navamsa)
+        else:
+            yoga_exists = _yoga_check(planet_positions)
+        if yoga_exists:
+            found_yogas.append(yoga_function)
+    return found_yogas
+def find_yogas(jd,place,divisional_chart_factor=None):
+    """
+        Get the language independent yogas present in the divisional charts for a given julian day and place
+        Use render_yoga_results to get the language specific details of the yogas
+        @param jd: Julian day number
+        @param place: struct (plave name, latitude, longitude, timezone)
+        @param divisional_chart_factor: None => Get for all varga charts. Or specify divisional chart number 
+        @return: dict of {divisional_chart_factor:[yoga_name,...],...} 
+    """
+    dcfs = division_chart_factors if divisional_chart_factor is None else [divisional_chart_factor]
+    planet_positions_navamsa = _get_yoga_planet_positions(jd, place, 9)
+    return {dv:find_yogas_from_planet_positions(_get_yoga_planet_positions(jd, place, dv),planet_positions_navamsa)
+                for dv in dcfs}
+def render_yoga_results(found_yogas,language='en'):
+    """
+        Get language specific yoga details from the language independent results of find_yogas
+        @param found_yogas: dict of {divisional_chart_factor:[yoga_name,...],...} returned by find_yogas
+        @param language: two letter language code (en, hi, ka, ta, te)
+        @return: dict of {yoga_name:[chart_ID, yoga_name, yoga_desription, yoga_benfits]}
+            If a yoga is present in more than one chart, the first chart in found_yogas is returned
+    """
+    msgs = get_yoga_resources(language=language)
+    yoga_results = {}
+    for dv,yoga_names in found_yogas.items():
+        for yoga_function in yoga_names:
+            if yoga_function not in yoga_results:
+                yoga_results[yoga_function] = ['D'+str(dv)]+list(msgs[yoga_function])
+    return yoga_results
 def get_yoga_details_for_all_charts(jd,place,language='en',divisional_chart_factor=None):
     """
         Get all the yoga information that are present in the divisional charts for a given julian day and place
@@ -62,28 +122,9 @@ def get_yoga_details_for_all_charts(jd,place,language='en',divisional_chart_fact
             yoga_name in language
             yoga_details: [chart_ID, yoga_name, yoga_desription, yoga_benfits] 
     """
-    global p_to_h_navamsa, h_to_p_navamsa, asc_house_navamsa,planet_positions
-    msgs = get_yoga_resources(language=language)
-    yoga_results_combined = {}
-    ascendant_index = const._ascendant_symbol
-    planet_positions_navamsa = drik.dhasavarga(jd,place,divisional_chart_factor=9)
-    ascendant_longitude = drik.ascendant(jd,place)[1]
-    asc_house_navamsa,asc_long = drik.dasavarga_from_long(ascendant_longitude,divisional_chart_factor=9)
-    planet_positions_navamsa += [[ascendant_index,(asc_house_navamsa,asc_long)]]
-    p_to_h_navamsa = utils.get_planet_house_dictionary_from_planet_positions(planet_positions_navamsa)
-    h_to_p_navamsa = utils.get_house_planet_list_from_planet_positions(planet_positions_navamsa)
-    if divisional_chart_factor==None:
-        for dv in division_chart_factors:
-            yoga_results,_,_ = get_yoga_details(jd,place,divisional_chart_factor=dv,language=language)
-            yoga_results.update(yoga_results_combined)
-            yoga_results_combined = yoga_results
-    else:
-        yoga_results,_,_ = get_yoga_details(jd,place,divisional_chart_factor=divisional_chart_factor,language=language)
-        yoga_results.update(yoga_results_combined)
-        yoga_results_combined = yoga_results
-        
+    yoga_results_combined = render_yoga_results(find_yogas(jd, place, divisional_chart_factor),language=language)
     #print('Found',len(yoga_results_combined),'out of',len(msgs)*len(division_chart_factors),'yogas')
-    return yoga_results_combined,len(yoga_results_combined),len(msgs)*len(division_chart_factors)
+    return yoga_results_combined,len(yoga_results_combined),len(_yoga_names())*len(division_chart_factors)
 def get_yoga_details(jd,place,divisional_chart_factor=1,language='en'):
     """
         Get all the yoga information that are present in the requested divisional charts for a given julian day and place
@@ -95,29 +136,9 @@ def get_yoga_details(jd,place,divisional_chart_factor=1,language='en'):
             yoga_name in language
             yoga_details: [chart_ID, yoga_name, yoga_desription, yoga_benfits] 
     """
-    global p_to_h, h_to_p, asc_house, planet_positions
-    msgs = get_yoga_resources(language=language)
-    ascendant_index = const._ascendant_symbol
-    planet_positions = drik.dhasavarga(jd,place,divisional_chart_factor)
-    ascendant_longitude = drik.ascendant(jd,place)[1]
-    asc_house,asc_long = drik.dasavarga_from_long(ascendant_longitude,divisional_chart_factor)
-    planet_positions = [[ascendant_index,(asc_house,asc_long)]] + planet_positions
-    planet_positions = planet_positions[:const._pp_count_upto_ketu]
-    p_to_h = { p:h for p,(h,_) in planet_positions}
-    h_to_p = ['' for h in range(12)] 
-    for sublist in planet_positions:
-        p = sublist[0]
-        h = sublist[1][0]
-        h_to_p[h] += str(p) + '/'
-    yoga_results = {}
-    for yoga_function,details in msgs.items():
-        """ TODO: yoga functions have only one argument h_to_p. Here we call 3 args - need to synch"""
-        yoga_exists = eval(yoga_function+'_from_planet_positions')(planet_positions)#(h_to_p)#
-        if yoga_exists:
-            details.insert(0,'D'+str(divisional_chart_factor))
-            yoga_results[yoga_function] = details
+    yoga_results = render_yoga_results(find_yogas(jd, place, divisional_chart_factor),language=language)
     #print('Found',len(yoga_results),'out of',len(msgs),'yogas in D'+str(divisional_chart_factor),'chart')
-    return yoga_results,len(yoga_results),len(msgs)
+    return yoga_results,len(yoga_results),len(_yoga_names())
 """ Sun/Ravi Yogas """
 def vesi_yoga_from_planet_positions(planet_positions):
     """  If there is a planet other than Moon in the 2nd house from Sun, then this yoga is present. """
@@ -130,7 +151,7 @@ def vesi_yoga(chart_1d):
     p_to_h = utils.get_planet_to_house_dict_from_chart(chart_1d)
     yoga_house = (p_to_h[yoga_planet] + house_from_yoga_planet) % 12
     yoga_house_planets = chart_1d[yoga_house].split('/')
-    planet_ids = [int(p) for p in yoga_house_planets if p != const._ascendant_symbol]
+    planet_ids = [int(p) for p in yoga_house_planets if p not in ['', const._ascendant_symbol]]
     return (len(planet_ids) >= 1) and (excluded_planet not in planet_ids)
 def vosi_yoga_from_planet_positions(planet_positions):
     """ If there is a planet other than Moon in the 12th house from Sun, then this yoga is present. """ 
@@ -143,7 +164,7 @@ def vosi_yoga(chart_1d):
     p_to_h = utils.get_planet_to_house_dict_from_chart(chart_1d)
     yoga_house = (p_to_h[yoga_planet] + house_from_yoga_planet) % 12
     yoga_house_planets = chart_1d[yoga_house].split('/')
-    planet_ids = [int(p) for p in yoga_house_planets if p != const._ascendant_symbol]
+    planet_ids = [int(p) for p in yoga_house_planets if p not in ['', const._ascendant_symbol]]
     return (len(planet_ids) >= 1) and (excluded_planet not in planet_ids)
 def ubhayachara_yoga_from_planet_positions(planet_positions):
     """ Ubhayachara  Yoga - There is a planet other than Moon in the 2nd and 12th house from Sun. """
@@ -183,7 +204,7 @@ def sunaphaa_yoga(chart_1d):
     p_to_h = utils.get_planet_to_house_dict_from_chart(chart_1d)
     yoga_house = (p_to_h[yoga_planet] + house_from_yoga_planet) % 12
     yoga_house_planets = chart_1d[yoga_house].split('/')
-    planet_ids = [int(p) for p in yoga_house_planets if p != const._ascendant_symbol]
+    planet_ids = [int(p) for p in yoga_house_planets if p not in ['', const._ascendant_symbol]]
     return (len(planet_ids) >= 1) and (excluded_planet not in planet_ids)
 def sunaphaa_yoga_from_jd_place(jd,place,divisional_chart_factor=1):
     from jhora.horoscope.chart import charts
@@ -200,7 +221,7 @@ def anaphaa_yoga(chart_1d):
     p_to_h = utils.get_planet_to_house_dict_from_chart(chart_1d)
     yoga_house = (p_to_h[yoga_planet] + house_from_yoga_planet) % 12
     yoga_house_planets = chart_1d[yoga_house].split('/')
-    planet_ids = [int(p) for p in yoga_house_planets if p != const._ascendant_symbol]
+    planet_ids = [int(p) for p in yoga_house_planets if p not in ['', const._ascendant_symbol]]
     return (len(planet_ids) >= 1) and (excluded_planet not in planet_ids)
 def anaphaa_yoga_from_jd_place(jd,place,divisional_chart_factor=1):
     from jhora.horoscope.chart import charts
@@ -2550,8 +2571,12 @@ def _bhaarathi_yoga_calculation(chart_1d_rasi=None, chart_1d_navamsa=None,
                                 planet_positions_rasi=None,planet_positions_navamsa=None):
     """ Bhaarathi Yoga: If the lord of the sign occupied in navamsa by 2nd, 5th or 11th lord
         exalted and joins the 9th lord """
-    p_to_h = utils.get_planet_to_house_dict_from_chart(chart_1d_rasi)
-    p_to_h_navamsa = utils.get_planet_to_house_dict_from_chart(chart_1d_navamsa)
+    if planet_positions_rasi is not None and planet_positions_navamsa is not None:
+        p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions_rasi)
+        p_to_h_navamsa = utils.get_planet_house_dictionary_from_planet_positions(planet_positions_navamsa)
+    else:
+        p_to_h = utils.get_planet_to_house_dict_from_chart(chart_1d_rasi)
+        p_to_h_navamsa = utils.get_planet_to_house_dict_from_chart(chart_1d_navamsa)
     asc_house = p_to_h[const._ascendant_symbol]
     h_offsets = [const.HOUSE_2, const.HOUSE_5, const.HOUSE_11]
     h9_offset = const.HOUSE_9
@@ -24,6 +24,7 @@ Calculates Varsha Vimshottari (also called Mudda dhasa) Dasha-bhukthi-antara-suk
 
 import datetime
 from collections import OrderedDict as Dict
+from functools import lru_cache
 import swisseph as swe
 from jhora import const, utils
 from jhora.panchanga import drik
@@ -39,6 +40,27 @@ def varsha_vimsottari_next_adhipati(lord):
     next_index = (current + 1) % len(const.varsha_vimsottari_adhipati_list)
     next_lord = const.varsha_vimsottari_adhipati_list[next_index]
     return next_lord
+@lru_cache(maxsize=None)
+def _varsha_vimsottari_durations(maha_lord,bhukthi_lord=None,level=1):
+    """
+        Precomputed (read only) duration table of varsha vimsottari
+        @param level: 1 => maha dhasas of a year starting from maha_lord
+                      2 => bhukthis of maha_lord 3=> antaras of (maha_lord,bhukthi_lord)
+        @return: tuple of (lord, duration in days)
+    """
+    days = const.varsha_vimsottari_days; life_span = const.human_life_span_for_varsha_vimsottari_dhasa
+    lord = bhukthi_lord if level==3 else maha_lord
+    retval = []
+    for _ in range(len(const.varsha_vimsottari_adhipati_list)):
+        if level == 1:
+            duration = days[lord] * year_duration / 360.0
+        elif level == 2:
+            duration = days[lord] * days[maha_lord] / life_span * year_duration / 360.0
+        else:
+            duration = days[lord] * (days[maha_lord] / life_span) * (days[bhukthi_lord] / life_span)
+        retval.append((lord,duration))
+        lord = varsha_vimsottari_next_adhipati(lord)
+    return tuple(retval)
 
 def varsha_vimsottari_dasha_start_date(jd,place,years,divisional_chart_factor=1,chart_method=1):
     """Returns the start date of the mahadasa which occured on or before `jd`"""
@@ -61,24 +83,18 @@ def varsha_vimsottari_mahadasa(jdut1,place,years,divisional_chart_factor=1,chart
     lord, start_date = varsha_vimsottari_dasha_start_date(jdut1,place,years,
                                 divisional_chart_factor=divisional_chart_factor,chart_method=chart_method)
     retval = []
-    for i in range(9):
-        duration = const.varsha_vimsottari_days[lord] * year_duration / 360.0
+    for lord,duration in _varsha_vimsottari_durations(lord):
         retval.append((lord,start_date,duration))
         start_date += duration
-        lord = varsha_vimsottari_next_adhipati(lord)
     return retval
 
 def varsha_vimsottari_bhukti(maha_lord, start_date):
     """Compute all bhuktis of given nakshatra-lord of Mahadasa
     and its start date"""
-    lord = maha_lord
     retval = []
-    for i in range(9):
-        factor = const.varsha_vimsottari_days[lord] * const.varsha_vimsottari_days[maha_lord] / const.human_life_span_for_varsha_vimsottari_dhasa
-        duration = factor * year_duration / 360.0
+    for lord,duration in _varsha_vimsottari_durations(maha_lord,level=2):
         retval.append((lord,start_date,round(duration,2)))
         start_date += duration
-        lord = varsha_vimsottari_next_adhipati(lord)
     return retval
 
 # North Indian tradition: dasa-antardasa-pratyantardasa
@@ -86,14 +102,10 @@ def varsha_vimsottari_bhukti(maha_lord, start_date):
 def varsha_vimsottari_antara(maha_lord, bhukti_lord, start_date):
     """Compute all antaradasas from given bhukit's start date.
     The bhukti's lord and its lord (mahadasa lord) must be given"""
-    lord = bhukti_lord
     retval = []
-    for i in range(9):
-        factor = const.varsha_vimsottari_days[lord] * (const.varsha_vimsottari_days[maha_lord] / const.human_life_span_for_varsha_vimsottari_dhasa)
-        duration = factor * (const.varsha_vimsottari_days[bhukti_lord] / const.human_life_span_for_varsha_vimsottari_dhasa)
+    for lord,duration in _varsha_vimsottari_durations(maha_lord,bhukti_lord,level=3):
         retval.append((lord,start_date,round(duration,2)))
         start_date += duration
-        lord = varsha_vimsottari_next_adhipati(lord)
     return retval
 
 
@@ -119,12 +131,13 @@ def compute_varsha_vimsottari_antara_from(jd, mahadashas):
     return (i, j, antara)
 
 # ---------------------- ALL TESTS ------------------------------
-def varsha_vimsottari_dhasa_bhukthi(jd,place,years,include_antardhasa=True,divisional_chart_factor=1,chart_method=1):
+def varsha_vimsottari_dhasa_bhukthi(jd,place,years,include_antardhasa=True,divisional_chart_factor=1,chart_method=1,as_jd=False):
     """
         Calculates Varsha Vimshottari (also called Mudda dhasa) Dasha-bhukthi-antara-sukshma-prana
         @param jd: Julian day for birthdate and birth time
         @param place: pancganga.Place Struct ('place_name',latitude,longitude,timezone)
         @param years: # years of from year of birth
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: 2D list of [ (dhasa_lord,Bhukthi_lord,bhukthi_start date, bhukthi_duration_days),...
           Example: [(7, 7, '1993-06-03', 8.22), (7, 4, '1993-06-11', 7.31), ...]
     """
@@ -136,17 +149,22 @@ def varsha_vimsottari_dhasa_bhukthi(jd,place,years,include_antardhasa=True,divis
         dhasa_lord = lord
         if include_antardhasa:
             bhuktis = varsha_vimsottari_bhukti(dhasa_lord, dhasa_start)
-            for bhukthi_lord,bhukthi_start,bhukthi_durn in bhuktis:
-                y, m, d, h = swe.revjul(bhukthi_start)
-                date_str = '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
-                dhasa_bukthi.append((dhasa_lord,bhukthi_lord,date_str,round(bhukthi_durn,2)))             
+            bhukthi_durations = _varsha_vimsottari_durations(dhasa_lord,level=2)
+            for (bhukthi_lord,bhukthi_start,bhukthi_durn),(_,bhukthi_days) in zip(bhuktis,bhukthi_durations):
+                if as_jd:
+                    dhasa_bukthi.append((dhasa_lord,bhukthi_lord,bhukthi_start,bhukthi_days/const.sidereal_year))
+                else:
+                    dhasa_bukthi.append((dhasa_lord,bhukthi_lord,utils.julian_day_to_date_time_string(bhukthi_start),
+                                         round(bhukthi_durn,2)))
         else:
-            y, m, d, h = swe.revjul(dhasa_start)
-            date_str = '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
-            dhasa_bukthi.append((dhasa_lord,date_str,round(durn,2)))             
-    return dhasa_bukthi
-def mudda_dhasa_bhukthi(jd,place,years,include_antardhasa=True,divisional_chart_factor=1):
-    return varsha_vimsottari_dhasa_bhukthi(jd,place,years,include_antardhasa,divisional_chart_factor=divisional_chart_factor)
+            if as_jd:
+                dhasa_bukthi.append((dhasa_lord,dhasa_start,durn/const.sidereal_year))
+            else:
+                dhasa_bukthi.append((dhasa_lord,utils.julian_day_to_date_time_string(dhasa_start),round(durn,2)))
+    """ durations of the rows are in days - numeric rows carry them in years of const.sidereal_year """
+    return utils.dhasa_rows_as_jd(dhasa_bukthi,const.sidereal_year,end_jd=dashas[-1][1]+dashas[-1][2]) if as_jd else dhasa_bukthi
+def mudda_dhasa_bhukthi(jd,place,years,include_antardhasa=True,divisional_chart_factor=1,as_jd=False):
+    return varsha_vimsottari_dhasa_bhukthi(jd,place,years,include_antardhasa,divisional_chart_factor=divisional_chart_factor,as_jd=as_jd)
 '------ main -----------'
 if __name__ == "__main__":
     dob = drik.Date(1996,12,7); tob = (10,34,0); place = drik.Place('Chennai,IN',13.0389, 80.2619, +5.5)
@@ -21,7 +21,7 @@
 from jhora import const, utils
 from jhora.panchanga import drik
 from jhora.horoscope.chart import charts
-def patyayini_dhasa(jd_years,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1):
+def patyayini_dhasa(jd_years,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,divisional_chart_factor=1,chart_method=1,as_jd=False):
     """
         Compute Patyaayini Dhasa
         Should be used for Tajaka Annual charts
@@ -30,6 +30,7 @@ def patyayini_dhasa(jd_years,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,di
         @param ayanamsa_mode: Default = const._DEFAULT_AYANAMSA_MODE
         @param divisional_chart_factor: Default = 1 (Raasi) - See const.division_chart_factors for other possible values
         @param chart_method: default=1, various methods available for each division chart. See charts module 
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return patyayini dhasa values as a list [planet, dhasa_duration in days]
         Example: [[5, (1993, 6, 26), 24.9], [3, (1993, 8, 13), 48.1], [1, (1993, 8, 14), 0.57],...]]
     """
@@ -51,21 +52,22 @@ def patyayini_dhasa(jd_years,place,ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE,di
     #for p,long in _dhasas:
     #    print('_dhasas',p,long)
     jd_start = jd_years
-    dhasas = []
+    dhasas = []; jd_rows = []
     for d,(p,dd) in enumerate(_dhasas):
         #print(d,p,dd)
         bn = d
         db = []
         for b in enumerate(_dhasa_lords):
             pa = _dhasa_lords[bn]
-            y,m,d,fh = utils.jd_to_gregorian(jd_start)
-            date_str = '%04d-%02d-%02d' %(y,m,d)
-            time_str = utils.to_dms(fh,as_string=True)
-            bhukthi_start = date_str + ' '+time_str
-            db.append([pa,bhukthi_start])
+            if as_jd:
+                jd_rows.append((p,pa,jd_start,_dhasa_period_factors[pa]*dd/const.average_gregorian_year))
+            else:
+                db.append([pa,utils.julian_day_to_date_time_string(jd_start)])
             jd_start += _dhasa_period_factors[pa]*dd
             bn = (bn+1)%len(_dhasa_lords)
         dhasas.append([p,db,dd])
+    if as_jd:
+        return utils.dhasa_rows_as_jd(jd_rows,const.average_gregorian_year,end_jd=jd_start)
     return dhasas
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Copyright (C) Open Astro Technologies, USA.
+# Modified by Sundar Sundaresan, USA. carnaticmusicguru2015@comcast.net
+# Downloaded from https://github.com/naturalstupid/PyJHora
+
+# This file is part of the "PyJHora" Python library
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Lazy multi-level dhasa period tree shared by the graha dhasas.
+    Level 1 = Maha dhasa, 2 = Antardhasa (bhukthi), 3 = Pratyantardhasa (antara), 4 = Sookshma, 5 = Prana
+    Period boundaries are float julian days. Sub periods of a period are generated only when they are
+    asked for and the running period at a julian day is found by bisection at every level, so
+    a deep query for one date does not need the whole lifetime to be expanded.
+"""
+from bisect import bisect_right
+from itertools import accumulate
+from jhora import const, utils
+dhasa_level_names = {1:'maha_dhasa',2:'antardhasa',3:'pratyantardhasa',4:'sookshma',5:'prana'}
+class DhasaPeriod:
+    """
+        One dhasa period of a DhasaTree.
+        lord: dhasa lord of this period; start/end: julian days; level: 1=maha dhasa, 2=antardhasa ...
+    """
+    __slots__ = ('lord','start','end','level','parent','_tree','_children','_child_starts')
+    def __init__(self,tree,lord,start,end,level,parent=None):
+        self._tree = tree; self.lord = lord; self.start = start; self.end = end
+        self.level = level; self.parent = parent
+        self._children = None; self._child_starts = None
+    @property
+    def duration(self):
+        """ @return: duration of the period in days """
+        return self.end - self.start
+    @property
+    def lords(self):
+        """ @return: tuple of lords from maha dhasa down to this period """
+        lords = []; period = self
+        while period is not None and period.level > 0:
+            lords.append(period.lord); period = period.parent
+        return tuple(reversed(lords))
+    def sub_periods(self):
+        """ @return: list of sub periods of this period (expanded on first call and cached) """
+        if self._children is None:
+            self._tree._expand(self)
+        return self._children
+    def sub_period_at(self,jd):
+        """ @return: sub period running at julian day jd or None if jd is outside this period """
+        if not (self.start <= jd < self.end): return None
+        children = self.sub_periods()
+        if not children: return None
+        child = children[max(bisect_right(self._child_starts, jd)-1,0)]
+        return child if jd < child.end else None
+    def __repr__(self):
+        return 'DhasaPeriod(lords=%s, start=%s, end=%s)' % (self.lords, self.start, self.end)
+class DhasaTree:
+    """
+        Lazy multi-level dhasa period tree.
+        @param maha_dhasas: list of (dhasa_lord, start_jd, duration_in_days) in chronological order
+        @param sub_periods: function(DhasaPeriod) returning [(sub_lord, fraction_of_period),...] in order
+            See equal_sub_periods and proportional_sub_periods
+        @param max_level: deepest level that will be expanded (Default=5 Prana)
+    """
+    def __init__(self,maha_dhasas,sub_periods,max_level=5):
+        self._sub_periods = sub_periods; self.max_level = max_level
+        maha_dhasas = list(maha_dhasas)
+        start = maha_dhasas[0][1] if maha_dhasas else 0.0
+        end = maha_dhasas[-1][1]+maha_dhasas[-1][2] if maha_dhasas else 0.0
+        self._root = DhasaPeriod(self,None,start,end,0)
+        self._root._children = [DhasaPeriod(self,lord,ds,ds+dd,1,self._root) for lord,ds,dd in maha_dhasas]
+        self._root._child_starts = [p.start for p in self._root._children]
+    @property
+    def start(self):
+        return self._root.start
+    @property
+    def end(self):
+        return self._root.end
+    def _expand(self,period):
+        if period.level >= self.max_level:
+            period._children = []; period._child_starts = []; return
+        subs = self._sub_periods(period)
+        cum_fractions = list(accumulate(fraction for _,fraction in subs))
+        starts = [period.start] + [period.start + period.duration*f for f in cum_fractions[:-1]]
+        if subs:
+            # Fractions adding up to 1 close exactly at the end of the period
+            last_end = period.end if abs(cum_fractions[-1]-1.0) < 1e-9 else period.start + period.duration*cum_fractions[-1]
+            ends = starts[1:] + [last_end]
+        else:
+            ends = []
+        period._children = [DhasaPeriod(self,lord,s,e,period.level+1,period)
+                            for (lord,_),s,e in zip(subs,starts,ends)]
+        period._child_starts = starts if subs else []
+    def maha_dhasas(self):
+        """ @return: list of maha dhasa periods """
+        return self._root._children
+    def periods(self,level=1,maha_dhasa_lords=None):
+        """
+            Generator of all periods at given level in chronological order (expands the tree down to level)
+            @param level: 1=maha dhasa 2=antardhasa 3=pratyantardhasa 4=sookshma 5=prana
+            @param maha_dhasa_lords: restrict to the maha dhasas of these lords (Default=None all)
+        """
+        def _walk(period):
+            if period.level == level:
+                yield period; return
+            for child in period.sub_periods():
+                yield from _walk(child)
+        for maha in self.maha_dhasas():
+            if maha_dhasa_lords is not None and maha.lord not in maha_dhasa_lords: continue
+            yield from _walk(maha)
+    def periods_at(self,jd,level=None):
+        """
+            @param jd: julian day
+            @param level: deepest level required (Default=None => max_level of the tree)
+            @return: list of running periods [maha_dhasa, antardhasa, ...] at jd ([] if jd outside the tree)
+        """
+        level = self.max_level if level is None else min(level,self.max_level)
+        running = []; period = self._root
+        while period.level < level:
+            period = period.sub_period_at(jd)
+            if period is None: break
+            running.append(period)
+        return running
+    def period_at(self,jd,level=1):
+        """ @return: period of given level running at jd or None """
+        running = self.periods_at(jd, level)
+        return running[level-1] if len(running) >= level else None
+    def to_list(self,level=2,as_string=False):
+        """
+            @param level: level of the periods to list
+            @param as_string: False => start julian day, True => 'YYYY-MM-DD hh:mm:ss' strings
+            @return: list of [lord_1,...,lord_level,start] for all periods at level
+        """
+        rows = []
+        for period in self.periods(level):
+            start = period.start
+            if as_string:
+                y,m,d,h = utils.jd_to_gregorian(start)
+                start = '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
+            rows.append([*period.lords,start])
+        return rows
+def cyclic_maha_dhasas(dhasa_lord,start_jd,dhasa_years,next_lord,dhasa_cycles=1,tribhagi_factor=1.0,
+                       year_duration=const.sidereal_year):
+    """
+        Maha dhasas cycling through the lords of dhasa_years starting from dhasa_lord
+        @param dhasa_years: dict {lord:dhasa years}
+        @param next_lord: function(lord) returning the next maha dhasa lord
+        @param dhasa_cycles: number of times the cycle of lords is repeated
+        @param tribhagi_factor: 1.0 or 1/3 for tribhagi variation (tribhagi durations rounded to 2 decimals as in dhasa modules)
+            dhasa_years already scaled for a variation are used as they are with tribhagi_factor=1.0
+        @return: list of (dhasa_lord, start_jd, duration_in_days) that can be passed to DhasaTree
+    """
+    maha_dhasas = []
+    for _ in range(dhasa_cycles):
+        for _ in range(len(dhasa_years)):
+            dhasa_duration = dhasa_years[dhasa_lord] if tribhagi_factor == 1 else round(dhasa_years[dhasa_lord]*tribhagi_factor,2)
+            duration = dhasa_duration*year_duration
+            maha_dhasas.append((dhasa_lord,start_jd,duration))
+            start_jd += duration
+            dhasa_lord = next_lord(dhasa_lord)
+    return maha_dhasas
+def equal_sub_periods(sub_lords):
+    """
+        @param sub_lords: function(DhasaPeriod) returning list of sub period lords
+        @return: sub period function for DhasaTree dividing a period equally among its sub lords
+    """
+    def _sub_periods(period):
+        lords = sub_lords(period)
+        return [(lord,1.0/len(lords)) for lord in lords]
+    return _sub_periods
+def proportional_sub_periods(sub_lords,dhasa_years,total_years=None):
+    """
+        @param sub_lords: function(DhasaPeriod) returning list of sub period lords
+        @param dhasa_years: dict {lord:dhasa years}
+        @param total_years: full cycle years (Default=None => sum of dhasa_years)
+        @return: sub period function for DhasaTree giving each sub lord dhasa_years[lord]/total_years of the period
+    """
+    total_years = sum(dhasa_years.values()) if total_years is None else total_years
+    def _sub_periods(period):
+        return [(lord,dhasa_years[lord]/total_years) for lord in sub_lords(period)]
+    return _sub_periods
@@ -24,6 +24,7 @@
     NOTE: !!! DO NOT USE THIS YET - NOT FULLY IMPLEMENTED YET !!!
     
 """
+import numpy as np
 from jhora import const, utils
 from jhora.horoscope.chart import charts,house
 from jhora.panchanga import drik
@@ -31,6 +32,10 @@ one_year_days = const.sidereal_year
 _TOTAL_PINDAYU = sum(const.pindayu_full_longevity_of_planets)
 _TOTAL_NISARGAYU = sum(const.nisargayu_full_longevity_of_planets)
 _TOTAL_AMSAYU = 120
+_aayu_type_lords = [0,1,const._ascendant_symbol] # Pindayu - Sun, Nisargayu - Moon, Amsayu - Lagna
+_deep_exaltation_longitudes = np.array(const.planet_deep_exaltation_longitudes)
+_pindayu_full_years = np.array(const.pindayu_full_longevity_of_planets)
+_nisargayu_full_years = np.array(const.nisargayu_full_longevity_of_planets)
 _DEBUG = False
 """
     Method = 1 => Santhanam (Ref: Santhanam, Brihat Parasara Hora Shastra)
@@ -384,9 +389,11 @@ def _lagna_longevity_santhanam(jd,place):
     return _lagna_aayu
 def _lagna_longevity(jd,place,divisional_chart_factor=9,chart_method=1):
     pp_chart = charts.rasi_chart(jd, place)
+    pp_navamsa = charts.divisional_chart(jd, place, divisional_chart_factor=divisional_chart_factor,chart_method=chart_method)
+    return _lagna_longevity_from_positions(pp_chart, pp_navamsa)
+def _lagna_longevity_from_positions(pp_chart,pp_navamsa):
     asc_chart = pp_chart[0][1][0]; asc_chart_lord = house.house_owner_from_planet_positions(pp_chart, asc_chart)
     asc_chart_long = asc_chart*30+pp_chart[0][1][1]
-    pp_navamsa = charts.divisional_chart(jd, place, divisional_chart_factor=divisional_chart_factor,chart_method=chart_method)
     asc_nava = pp_navamsa[0][1][0]; asc_navamsa_lord = house.house_owner_from_planet_positions(pp_navamsa, asc_nava)
     asc_nava_long = asc_nava*30+pp_navamsa[0][1][1]
     _lagna_aayu = asc_chart_long/30.0;
@@ -406,8 +413,104 @@ def _get_global_constants(jd,place):
     bhava_starts = [(bhava_madhya[i]-0.5*bhava_lengths[i])%30 for i in range(12) ]
     """
     return
+def _chart_data(jd,place,divisional_chart_factor=9,chart_method=1):
+    """
+        Charts and chart constants needed by all three aayus - computed once per chart
+        @return: (jd, planet_positions, subha_grahas, asubha_grahas, bhava_houses, lagna_longevity)
+    """
+    planet_positions = charts.rasi_chart(jd, place)
+    _subha_grahas, _asubha_grahas = charts.benefics_and_malefics(jd, place, method=1)#BV Raman's method
+    _bhava_houses = charts.bhava_houses(jd, place)
+    pp_navamsa = charts.divisional_positions_from_rasi_positions(planet_positions, divisional_chart_factor, chart_method)
+    _lagna_aayu = _lagna_longevity_from_positions(planet_positions, pp_navamsa)
+    return jd, planet_positions, _subha_grahas, _asubha_grahas, _bhava_houses, _lagna_aayu
+def _harana_factors(planet_positions,method=2,include_bharana=True):
+    """
+        All haranas (and bharana) of a chart evaluated once and shared by pindayu, nisargayu and amsayu
+        NOTE: subha_grahas, asubha_grahas and bhava_houses of the chart should be set before calling this
+        @return: (graha_harana, amsa_harana, bharana) - arrays of factors for Sun to Saturn
+            graha_harana: minimum of astangata, shatru kshetra, chakrapata and krurodaya haranas (pindayu/nisargayu)
+            amsa_harana: minimum of astangata, shatru kshetra and chakrapata haranas (amsayu)
+            bharana: bharana factors (amsayu) - all 1.0 if include_bharana=False
+    """
+    _planets = [*range(7)]
+    ah = _astangata_harana(planet_positions); skh = _shatru_kshetra_harana(planet_positions)
+    ch2 = _chakrapata_harana(planet_positions)
+    ch = ch2 if method==2 else _chakrapata_harana_santhanam(planet_positions)
+    kh = _krurodaya_harana(planet_positions)
+    ah_skh = np.minimum([ah[p] for p in _planets],[skh[p] for p in _planets])
+    graha_harana = np.minimum(np.minimum(ah_skh,[ch[p] for p in _planets]),[kh[p] for p in _planets])
+    """ Amsayu: no Krurodaya harana and chakrapata harana as per method 2 """
+    amsa_harana = np.minimum(ah_skh,[ch2[p] for p in _planets])
+    bharana = np.ones(7)
+    if include_bharana:
+        bh = _bharana(planet_positions); bharana = np.array([bh[p] for p in _planets])
+    return graha_harana, amsa_harana, bharana
+def _base_longevities(planet_longitudes,dhasa_method=2):
+    """
+        Base (un-haranaed) longevities of Sun to Saturn of one or more charts
+        @param planet_longitudes: (N,7) absolute longitudes of Sun to Saturn
+        @return: (N,3,7) base pindayu, nisargayu and amsayu years
+    """
+    arc_of_longevity = utils.norm360(360+planet_longitudes - _deep_exaltation_longitudes)
+    full_years = np.stack([_pindayu_full_years,_nisargayu_full_years])[:,None,:]
+    base = np.where(arc_of_longevity > 180.0, full_years*arc_of_longevity/360.0, full_years - full_years*arc_of_longevity/360.0)
+    amsayu = (planet_longitudes*108) % 12 if dhasa_method!=2 else (planet_longitudes*60/200) % 12 # Varhamihira
+    return np.stack([base[0],base[1],amsayu],axis=1)
+def _dhasa_progression(planet_positions,aayu_lord):
+    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
+    dhasa_progression = charts.order_planets_from_kendras_of_raasi(planet_positions[:8], p_to_h[aayu_lord],include_lagna=True)
+    if aayu_lord in [0,1,const._ascendant_symbol]:
+        dhasa_progression = [aayu_lord] + [p for p in dhasa_progression if p!=aayu_lord]
+    return dhasa_progression
+def _aayu_table(chart_data_list,aayu_types=[0,1,2],include_antardhasa=True,apply_haranas=True,dhasa_method=2,as_jd=False):
+    """
+        Aayu durations, longevities and dhasa periods of the given aayu types for a batch of charts
+        @param chart_data_list: list of _chart_data() tuples
+        @return: list (one per chart) of (aayur_type,{aayu_type:(longevity,dhasa_rows)})
+    """
+    global subha_grahas, asubha_grahas, bhava_houses
+    n_charts = len(chart_data_list)
+    planet_longitudes = np.array([[h*30+p_long for _,(h,p_long) in cd[1][1:8]] for cd in chart_data_list]).reshape(n_charts,7)
+    base = _base_longevities(planet_longitudes, dhasa_method)
+    factors = np.ones((n_charts,3,7)); bharana = np.ones((n_charts,7))
+    aayur_types = []
+    for c,(_,planet_positions,_subha_grahas,_asubha_grahas,_bhava_houses,_) in enumerate(chart_data_list):
+        sp = _get_aayur_type(planet_positions)
+        aayur_types.append(_aayu_type_lords.index(sp))
+        if not apply_haranas: continue
+        subha_grahas, asubha_grahas, bhava_houses = _subha_grahas, _asubha_grahas, _bhava_houses
+        graha_harana, amsa_harana, bharana[c] = _harana_factors(planet_positions, dhasa_method, include_bharana=2 in aayu_types)
+        factors[c] = [graha_harana,graha_harana,amsa_harana]
+    durations = base*factors
+    durations[:,2] = durations[:,2]*bharana
+    """ Lagna aayu is the last column """
+    durations = np.concatenate([durations,np.broadcast_to(np.array([cd[-1] for cd in chart_data_list])[:,None,None],(n_charts,3,1))],axis=2)
+    aayu_table = []
+    for c,chart_data in enumerate(chart_data_list):
+        jd, planet_positions = chart_data[:2]
+        chart_aayus = {}
+        for aayu_type in aayu_types:
+            dhasa_progression = _dhasa_progression(planet_positions, _aayu_type_lords[aayu_type])
+            _column = lambda lord: 7 if lord==const._ascendant_symbol else lord
+            dhasa_durations = durations[c,aayu_type,[_column(lord) for lord in dhasa_progression]]
+            _longevity = sum(round(float(dd),2) for dd in dhasa_durations)
+            n_bhukthis = len(dhasa_progression) if include_antardhasa else 1
+            period_durations = np.repeat(dhasa_durations/n_bhukthis,n_bhukthis)
+            """ np.cumsum adds sequentially from birth jd - same start jds as adding one period at a time """
+            start_jds = np.cumsum(np.concatenate([[jd],period_durations*one_year_days]))
+            if include_antardhasa:
+                lords = [(lord,bhukthi) for lord in dhasa_progression for bhukthi in dhasa_progression]
+            else:
+                lords = [(lord,) for lord in dhasa_progression]
+            dhasas = [(*lords[i],float(start_jds[i]) if as_jd else utils.julian_day_to_date_time_string(float(start_jds[i])),
+                       float(period_durations[i]) if as_jd else round(float(period_durations[i]),2)) for i in range(len(lords))]
+            if as_jd: dhasas = utils.dhasa_rows_as_jd(dhasas,one_year_days,end_jd=float(start_jds[-1]))
+            chart_aayus[aayu_type] = (_longevity,dhasas)
+        aayu_table.append((aayur_types[c],chart_aayus))
+    return aayu_table
 def get_dhasa_antardhasa(jd,place,aayur_type=None,include_antardhasa=True,apply_haranas=True,dhasa_method=2,
-                         divisional_chart_factor=9,chart_method=1):
+                         divisional_chart_factor=9,chart_method=1,as_jd=False):
     """
         provides Aayu dhasa bhukthi for a given date in julian day (includes birth time)
         @param jd: Julian day for birthdate and birth time
@@ -415,86 +518,63 @@ def get_dhasa_antardhasa(jd,place,aayur_type=None,include_antardhasa=True,apply_
         @param aayur_type (0=Pindayu, 1=Nisargayu, 2=Amsayu, None=Automatically determine whichever is applicable)
         @param include_antardhasa: True (include) False (exclude) antardhasa (Default=True)
         @param apply_haranas: (True/False) whether to or not to apply haranas (Default=True)
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start] if include_antardhasa=True
         @return: a list of [dhasa_lord,dhasa_start] if include_antardhasa=False
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
     """
-    planet_positions = charts.rasi_chart(jd, place)
-    if _DEBUG: print('planet_positions',planet_positions)
-    global subha_grahas, asubha_grahas, bhava_houses
-    bhava_houses = charts.bhava_houses(jd, place)
-    subha_grahas, asubha_grahas = charts.benefics_and_malefics(jd, place, method=1)#BV Raman's method
-    bm1 = drik.bhaava_madhya(jd, place,const.bhaava_madhya_method); bhava_madhya = bm1[:]+[bm1[0]]
-    if _DEBUG: print('bhava madhya',[utils.to_dms(bm,is_lat_long='plong') for bm in bhava_madhya])
-    bhava_lengths = [(bhava_madhya[i+1]-bhava_madhya[i])%60 for i in range(len(bhava_madhya)-1)]
-    bhava_starts = [bhava_madhya[i]-0.5*bhava_lengths[i] for i in range(12) ]
-    if _DEBUG: print('bhava length',[utils.to_dms(bm,is_lat_long='plong') for bm in bhava_lengths])
-    if _DEBUG: print('bhava start',[utils.to_dms(bs%30,is_lat_long='plong') for bs in bhava_starts])
-    _lagna_duration = _lagna_longevity(jd,place,divisional_chart_factor=divisional_chart_factor,chart_method=chart_method)
-    sp = aayur_type if aayur_type!=None else _get_aayur_type(planet_positions)
-    if _DEBUG: print('stronger of lagna/Sun/Moon',sp)
-    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
-    _dhasa_seed = p_to_h[sp]
-    if _DEBUG: print('dhasa seed',_dhasa_seed)
-    dhasa_progression = charts.order_planets_from_kendras_of_raasi(planet_positions[:8], _dhasa_seed,include_lagna=True)
-    if sp in [0,1,const._ascendant_symbol]:
-        dhasa_progression = [sp] + [p for p in dhasa_progression if p!=sp]
-    if _DEBUG: print('dhasa progression',dhasa_progression)
-    start_jd = jd
-    dhasas = []
-    
-    if sp == 0:
-        if _DEBUG: print('Aayu type Pindayu')
-        _dhasa_duration = _pindayu(planet_positions,apply_haranas,method=dhasa_method)
-        _total_duration = _TOTAL_PINDAYU
-        _dhasa_type = 0 # Pindyayu = Sun is the lord
-    elif sp == 1:
-        if _DEBUG: print('aayu type nisargayu')
-        _dhasa_duration = _nisargayu(planet_positions,apply_haranas,method=dhasa_method)
-        _total_duration = _TOTAL_NISARGAYU
-        _dhasa_type = 1 # Nisargayu Moon is the lord
-    else: # sp == const._ascendant_symbol:
-        if _DEBUG: print('aayu type amsayu')
-        _dhasa_duration = _amsayu(planet_positions,apply_haranas,method=dhasa_method)
-        _total_duration = _TOTAL_AMSAYU
-        _dhasa_type = 2 # Amsayu - Lagna is the lord
-    _dhasa_duration[const._ascendant_symbol] = _lagna_longevity(jd, place)
-    if _DEBUG: print('dhasa duration',_dhasa_duration)
-    for lord in dhasa_progression:
-        dd = _dhasa_duration[lord]
-        bhukthis = dhasa_progression # Antardhasa follows same dhasa progression
-        if include_antardhasa:
-            ddb = dd/(len(dhasa_progression))
-            for bhukthi in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-                dhasas.append((lord,bhukthi,dhasa_start,round(ddb,2)))
-                start_jd += ddb * one_year_days
-        else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-            dhasas.append((lord,dhasa_start,round(dd,2)))
-            start_jd += dd * one_year_days
-    return _dhasa_type, dhasas
+    chart_data = _chart_data(jd, place, divisional_chart_factor=divisional_chart_factor, chart_method=chart_method)
+    if aayur_type==None: aayur_type = _aayu_type_lords.index(_get_aayur_type(chart_data[1]))
+    _,chart_aayus = _aayu_table([chart_data], aayu_types=[aayur_type], include_antardhasa=include_antardhasa,
+                                apply_haranas=apply_haranas, dhasa_method=dhasa_method, as_jd=as_jd)[0]
+    return aayur_type, chart_aayus[aayur_type][1]
 def pindayu_dhasa_bhukthi(jd,place,include_antardhasa=True,apply_haranas=True,dhasa_method=2,
-                          divisional_chart_factor=9,chart_method=1):
+                          divisional_chart_factor=9,chart_method=1,as_jd=False):
     return get_dhasa_antardhasa(jd, place, aayur_type=0, include_antardhasa=include_antardhasa, 
                                 apply_haranas=apply_haranas, dhasa_method=dhasa_method,
-                                divisional_chart_factor=divisional_chart_factor,chart_method=chart_method)[1]
+                                divisional_chart_factor=divisional_chart_factor,chart_method=chart_method,as_jd=as_jd)[1]
 def nisargayu_dhasa_bhukthi(jd,place,include_antardhasa=True,apply_haranas=True,dhasa_method=2,
-                          divisional_chart_factor=9,chart_method=1):
+                          divisional_chart_factor=9,chart_method=1,as_jd=False):
     return get_dhasa_antardhasa(jd, place, aayur_type=1, include_antardhasa=include_antardhasa, 
                                 apply_haranas=apply_haranas, dhasa_method=dhasa_method,
-                                divisional_chart_factor=divisional_chart_factor,chart_method=chart_method)[1]
+                                divisional_chart_factor=divisional_chart_factor,chart_method=chart_method,as_jd=as_jd)[1]
 def amsayu_dhasa_bhukthi(jd,place,include_antardhasa=True,apply_haranas=True,dhasa_method=2,
-                          divisional_chart_factor=9,chart_method=1):
+                          divisional_chart_factor=9,chart_method=1,as_jd=False):
     return get_dhasa_antardhasa(jd, place, aayur_type=2, include_antardhasa=include_antardhasa, 
                                 apply_haranas=apply_haranas, dhasa_method=dhasa_method,
-                                divisional_chart_factor=divisional_chart_factor,chart_method=chart_method)[1]
+                                divisional_chart_factor=divisional_chart_factor,chart_method=chart_method,as_jd=as_jd)[1]
 def longevity(jd,place,aayu_type=None,dhasa_method=2):
-    _at,_adb = get_dhasa_antardhasa(jd, place, aayur_type=aayu_type, include_antardhasa=False, apply_haranas=True, dhasa_method=dhasa_method)
-    _longevity = sum(d for _,_,d in _adb)
-    return _longevity,_at
+    aayur_type,chart_aayus = all_longevities(jd, place, include_antardhasa=False, dhasa_method=dhasa_method)
+    _at = aayur_type if aayu_type==None else aayu_type
+    return chart_aayus[_at][0],_at
+def all_longevities(jd,place,include_antardhasa=True,apply_haranas=True,dhasa_method=2,
+                    divisional_chart_factor=9,chart_method=1,as_jd=False):
+    """
+        Pindayu, Nisargayu and Amsayu of a chart with their dhasa periods - haranas are computed only once
+        @param jd: Julian day for birthdate and birth time
+        @param place: Place as tuple (place name, latitude, longitude, timezone) 
+        @param include_antardhasa: True (include) False (exclude) antardhasa (Default=True)
+        @param apply_haranas: (True/False) whether to or not to apply haranas (Default=True)
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
+        @return: aayur_type, {aayu_type:(longevity_years,dhasa_rows)} for aayu_type 0=Pindayu, 1=Nisargayu, 2=Amsayu
+            aayur_type is the aayu type applicable to the chart
+            dhasa_rows are same as get_dhasa_antardhasa(...,aayur_type=aayu_type)
+    """
+    return longevity_table([jd], place, include_antardhasa=include_antardhasa, apply_haranas=apply_haranas,
+                           dhasa_method=dhasa_method, divisional_chart_factor=divisional_chart_factor,
+                           chart_method=chart_method, as_jd=as_jd)[0]
+def longevity_table(jds,places,include_antardhasa=True,apply_haranas=True,dhasa_method=2,
+                    divisional_chart_factor=9,chart_method=1,as_jd=False):
+    """
+        all_longevities for a batch of charts. Base aayus and haranas of all charts are combined as arrays.
+        @param jds: list of julian days (birthdate and birth time)
+        @param places: a Place or list of Places (one per julian day)
+        @return: list (one per julian day) of all_longevities results
+    """
+    if not isinstance(places,list): places = [places]*len(jds)
+    chart_data_list = [_chart_data(jd, place, divisional_chart_factor, chart_method) for jd,place in zip(jds,places)]
+    return _aayu_table(chart_data_list, include_antardhasa=include_antardhasa, apply_haranas=apply_haranas,
+                       dhasa_method=dhasa_method, as_jd=as_jd)
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests._STOP_IF_ANY_TEST_FAILED = False
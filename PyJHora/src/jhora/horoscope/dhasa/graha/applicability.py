@@ -23,31 +23,59 @@ from jhora.horoscope.chart import charts
 from jhora.panchanga import drik
 _conditional_dhasas = ['ashtottari','chaturaaseeti_sama','dwadasottari','dwisatpathi','panchottari','satabdika',
                     'shashtisama','shattrimsa_sama','shodasottari']
+_absolute_longitude = lambda planet_positions,index: planet_positions[index][1][0]*30+planet_positions[index][1][1]
+""" Planet at index p2 is in the visible half (houses 7 to 12) counted from the longitude of the planet at index p1 """
+_in_visible_half_from = lambda planet_positions,p1,p2: \
+            (_absolute_longitude(planet_positions,p2)-_absolute_longitude(planet_positions,p1))%360 >= 180
+def lagna_in_sun_hora(planet_positions):
+    """ True if Lagna is in Sun's hora (Parasara hora: 1st half of odd / 2nd half of even signs) else Moon's hora """
+    return charts._hora_traditional_parasara_chart(planet_positions[:1])[0][1][0]==4
+def is_daytime(planet_positions):
+    """ Day time: Sun in the visible half from lagna """
+    return _in_visible_half_from(planet_positions,0,1)
+def is_sukla_paksha(planet_positions):
+    """ Sukla paksha: Sun in the visible half from Moon """
+    return _in_visible_half_from(planet_positions,2,1)
+def applicability_snapshot(jd,place,divisional_chart_factor=1):
+    """
+        Chart values needed by all the applicability rules - computed once (one rasi chart calculation)
+        @param jd: Julian day number of birth
+        @param place: drik.Place struct
+        @param divisional_chart_factor: varga used for the lagna/lord based rules (Default=1 Raasi)
+        @return: dict with keys
+            'planet_positions': positions of the divisional_chart_factor chart
+            'rasi','navamsa','dwadasamsa': D1, D9 and D12 positions
+            'lagna_in_sun_hora','is_daytime','is_sukla_paksha': flags from the rasi chart (birth time values - not varga)
+    """
+    rasi = charts.rasi_chart(jd, place)
+    planet_positions = charts.divisional_positions_from_rasi_positions(rasi, divisional_chart_factor=divisional_chart_factor)
+    return {'planet_positions':planet_positions, 'rasi':rasi,
+            'navamsa':charts.divisional_positions_from_rasi_positions(rasi, divisional_chart_factor=9),
+            'dwadasamsa':charts.divisional_positions_from_rasi_positions(rasi, divisional_chart_factor=12),
+            'lagna_in_sun_hora':lagna_in_sun_hora(rasi),
+            'is_daytime':is_daytime(rasi),'is_sukla_paksha':is_sukla_paksha(rasi)}
+def _applicability_rules():
+    from jhora.horoscope.dhasa.graha import ashtottari, chathuraaseethi_sama, dwadasottari, dwisatpathi, \
+                    panchottari, sataatbika, shastihayani, shattrimsa_sama, shodasottari
+    return {'ashtottari':lambda s: ashtottari.applicability_check(s['planet_positions']),
+            'chaturaaseeti_sama':lambda s: chathuraaseethi_sama.applicability_check(s['planet_positions']),
+            'dwadasottari':lambda s: dwadasottari.applicability_check(s['navamsa']),
+            'dwisatpathi':lambda s: dwisatpathi.applicability_check(s['planet_positions']),
+            'panchottari':lambda s: panchottari.applicability_check(s['dwadasamsa']),
+            'satabdika':lambda s: sataatbika._applicability_check(s['rasi'],s['navamsa']),
+            'shashtisama':lambda s: shastihayani.applicability_check(s['planet_positions']),
+            'shattrimsa_sama':lambda s: shattrimsa_sama._applicability_check(s['lagna_in_sun_hora'],s['is_daytime']),
+            'shodasottari':lambda s: shodasottari._applicability_check(s['lagna_in_sun_hora'],s['is_sukla_paksha']),
+            }
 def applicability_check(dob,tob,place,divisional_chart_factor=1):
-    jd = utils.julian_day_number(dob, tob)
-    planet_positions = charts.divisional_chart(jd, place,divisional_chart_factor=divisional_chart_factor)
-    """ First check ashtottari dhasa applicability """
-    applicable_dhasas = []
-    from jhora.horoscope.dhasa.graha import ashtottari
-    if ashtottari.applicability_check(planet_positions): applicable_dhasas.append('ashtottari')
-    from jhora.horoscope.dhasa.graha import chathuraaseethi_sama
-    if chathuraaseethi_sama.applicability_check(planet_positions): applicable_dhasas.append('chaturaaseeti_sama')
-    from jhora.horoscope.dhasa.graha import dwadasottari
-    navamsa_planet_positions = charts.divisional_chart(jd, place,divisional_chart_factor=9)
-    if dwadasottari.applicability_check(navamsa_planet_positions): applicable_dhasas.append('dwadasottari')
-    from jhora.horoscope.dhasa.graha import dwisatpathi
-    if dwisatpathi.applicability_check(planet_positions): applicable_dhasas.append('dwisatpathi')
-    dwadasamsa_planet_positions = charts.divisional_chart(jd, place,divisional_chart_factor=12)
-    from jhora.horoscope.dhasa.graha import panchottari
-    if panchottari.applicability_check(dwadasamsa_planet_positions): applicable_dhasas.append('panchottari')
-    from jhora.horoscope.dhasa.graha import sataatbika
-    if sataatbika.applicability_check(dob, tob, place): applicable_dhasas.append('satabdika')
-    from jhora.horoscope.dhasa.graha import shastihayani
-    if shastihayani.applicability_check(planet_positions): applicable_dhasas.append('shashtisama')
-    """ TODO: To implement applicability for Shattrimsa Sama and Shodasottari dhasas
-        Both involve understanding deva/pitri hora day/nigh time etc
     """
-    return applicable_dhasas
+        Conditional dhasas applicable for the chart. All rules are evaluated from one applicability_snapshot
+        @return: list of applicable dhasa names in the order of _conditional_dhasas
+    """
+    jd = utils.julian_day_number(dob, tob)
+    snapshot = applicability_snapshot(jd, place, divisional_chart_factor)
+    rules = _applicability_rules()
+    return [dhasa for dhasa in _conditional_dhasas if rules[dhasa](snapshot)]
 
 '------ main -----------'
 if __name__ == "__main__":
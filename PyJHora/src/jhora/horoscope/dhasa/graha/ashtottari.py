@@ -24,8 +24,11 @@ Calculates Ashtottari (=108) Dasha-bhukthi-antara-sukshma-prana
 """
 
 from collections import OrderedDict as Dict
+from functools import lru_cache
+from types import MappingProxyType
 from jhora import const,utils
 from jhora.panchanga import drik
+from jhora.horoscope.dhasa import dhasa_tree
 from jhora.horoscope.chart import house
 year_duration = const.sidereal_year# const.tropical_year  # some say 360 days, others 365.25 or 365.2563 etc
 human_life_span_for_ashtottari_dhasa = 108
@@ -55,7 +58,20 @@ def _get_dhasa_dict(seed_star=6):
         ashtottari_adhipathi_dict[p] = [(nsb,nse),durn]
         nak = (nse+1)%28
     return ashtottari_adhipathi_dict
-def ashtottari_adhipathi(nak):
+@lru_cache(maxsize=None)
+def ashtottari_period_table(seed_star=6,use_tribhagi_variation=False):
+    """
+        Period table of an ashtottari variation. Tables are read only and shared, never rescaled in place.
+        @param seed_star 1..27. Default = 6
+        @param use_tribhagi_variation: True => dhasa durations are 1/3rd and repeat thrice
+        @return: (adhipathi_dict, human_life_span, dhasa_cycles)
+            adhipathi_dict: read only {ashtottari adhipati:((starting_star_number,ending_star_number),dasa_length)}
+    """
+    _tribhagi_factor = 1./3. if use_tribhagi_variation else 1
+    adhipathi_dict = MappingProxyType({k:(v1,v2*_tribhagi_factor) for k,(v1,v2) in _get_dhasa_dict(seed_star).items()})
+    return adhipathi_dict, human_life_span_for_ashtottari_dhasa*_tribhagi_factor, int(1/_tribhagi_factor)
+def ashtottari_adhipathi(nak,seed_star=6,use_tribhagi_variation=False):
+    ashtottari_adhipathi_dict,_,_ = ashtottari_period_table(seed_star,use_tribhagi_variation)
     for key,value in ashtottari_adhipathi_dict.items():
         starting_star = value[0][0]
         ending_star = value[0][1]
@@ -67,7 +83,7 @@ def ashtottari_adhipathi(nak):
         if nak1 >= starting_star and nak1 <= ending_star:
             return key,value
 def ashtottari_dasha_start_date(jd,place,divisional_chart_factor=1,chart_method=1,star_position_from_moon=1,
-                                dhasa_starting_planet=1):
+                                dhasa_starting_planet=1,seed_star=6,use_tribhagi_variation=False):
     y,m,d,fh = utils.jd_to_gregorian(jd); dob=drik.Date(y,m,d); tob=(fh,0,0)
     one_star = (360 / 27.)        # 27 nakshatras span 360°
     from jhora.horoscope.chart import charts,sphuta
@@ -101,7 +117,7 @@ def ashtottari_dasha_start_date(jd,place,divisional_chart_factor=1,chart_method=
     if dhasa_starting_planet==1:
         planet_long += (star_position_from_moon-1)*one_star
     nak = int(planet_long / one_star)
-    lord,res = ashtottari_adhipathi(nak+1)          # ruler of current nakshatra
+    lord,res = ashtottari_adhipathi(nak+1,seed_star,use_tribhagi_variation)          # ruler of current nakshatra
     period = res[1]; start_nak = res[0][0]; end_nak = res[0][1]
     period_elapsed = ( planet_long - (start_nak-1)*one_star)/((end_nak-start_nak+1)*one_star)
     period_elapsed *= (period*year_duration)        # days
@@ -115,14 +131,16 @@ def ashtottari_next_adhipati(lord,dirn=1):
     #print(next_index)
     return ashtottari_adhipathi_list[next_index]
 def ashtottari_mahadasa(jd,place,divisional_chart_factor=1,chart_method=1,star_position_from_moon=1,
-                        dhasa_starting_planet=1):
+                        dhasa_starting_planet=1,seed_star=6,use_tribhagi_variation=False):
     """
         returns a dictionary of all mahadashas and their start dates
         @return {mahadhasa_lord_index, (starting_year,starting_month,starting_day,starting_time_in_hours)}
     """
     lord, start_date = ashtottari_dasha_start_date(jd,place,divisional_chart_factor=divisional_chart_factor,
                                 chart_method=chart_method,star_position_from_moon=star_position_from_moon,
-                                dhasa_starting_planet=dhasa_starting_planet)
+                                dhasa_starting_planet=dhasa_starting_planet,seed_star=seed_star,
+                                use_tribhagi_variation=use_tribhagi_variation)
+    ashtottari_adhipathi_dict,_,_ = ashtottari_period_table(seed_star,use_tribhagi_variation)
     retval = Dict()
     for _ in range(len(ashtottari_adhipathi_list)):
         retval[lord] = start_date
@@ -130,10 +148,11 @@ def ashtottari_mahadasa(jd,place,divisional_chart_factor=1,chart_method=1,star_p
         start_date += lord_duration * year_duration
         lord = ashtottari_next_adhipati(lord)
     return retval
-def ashtottari_bhukthi(dhasa_lord, start_date,antardhasa_option=1):
+def ashtottari_bhukthi(dhasa_lord, start_date,antardhasa_option=1,seed_star=6,use_tribhagi_variation=False):
     """
         Compute all bhukthis of given nakshatra-lord of Mahadasa and its start date
     """
+    ashtottari_adhipathi_dict,human_life_span,_ = ashtottari_period_table(seed_star,use_tribhagi_variation)
     lord = dhasa_lord
     if antardhasa_option in [3,4]:
         lord = ashtottari_next_adhipati(dhasa_lord, dirn=1) 
@@ -142,31 +161,32 @@ def ashtottari_bhukthi(dhasa_lord, start_date,antardhasa_option=1):
     dirn = 1 if antardhasa_option in [1,3,5] else -1
     retval = Dict()
     #lord = dhasa_lord if const.ashtottari_bhukthi_starts_from_dhasa_lord else ashtottari_next_adhipati(dhasa_lord)
-    dhasa_lord_duration = ashtottari_adhipathi_dict[lord][1]
+    dhasa_lord_duration = ashtottari_adhipathi_dict[dhasa_lord][1]
     for _ in range(len(ashtottari_adhipathi_list)):
         retval[lord] = start_date
         lord_duration = ashtottari_adhipathi_dict[lord][1]
-        factor = lord_duration * dhasa_lord_duration / human_life_span_for_ashtottari_dhasa
+        factor = lord_duration * dhasa_lord_duration / human_life_span
         start_date += factor * year_duration
         lord = ashtottari_next_adhipati(lord,dirn)
     return retval
-def ashtottari_anthara(dhasa_lord, bhukthi_lord,bhukthi_lord_start_date):
+def ashtottari_anthara(dhasa_lord, bhukthi_lord,bhukthi_lord_start_date,seed_star=6,use_tribhagi_variation=False):
     """
         Compute all bhukthis of given nakshatra-lord of Mahadasa, its bhukthi lord and bhukthi_lord's start date
     """
+    ashtottari_adhipathi_dict,human_life_span,_ = ashtottari_period_table(seed_star,use_tribhagi_variation)
     dhasa_lord_duration = ashtottari_adhipathi_dict[dhasa_lord][1]
     retval = Dict()
     lord = bhukthi_lord# if const.ashtottari_bhukthi_starts_from_dhasa_lord else ashtottari_next_adhipati(bhukthi_lord)
     for i in range(len(ashtottari_adhipathi_list)):
         retval[lord] = bhukthi_lord_start_date
         lord_duration = ashtottari_adhipathi_dict[lord][1]
-        factor = lord_duration * dhasa_lord_duration / human_life_span_for_ashtottari_dhasa
+        factor = lord_duration * dhasa_lord_duration / human_life_span
         bhukthi_lord_start_date += factor * year_duration
         lord = ashtottari_next_adhipati(lord)
     return retval
 def get_ashtottari_dhasa_bhukthi(jd, place,divisional_chart_factor=1,chart_method=1,star_position_from_moon=1,
                                  use_tribhagi_variation=False,include_antardhasa=True,
-                                 antardhasa_option=1,dhasa_starting_planet=1,seed_star=6):
+                                 antardhasa_option=1,dhasa_starting_planet=1,seed_star=6,as_jd=False):
     """
         provides Ashtottari dhasa bhukthi for a given date in julian day (includes birth time)
         @param jd: Julian day for birthdate and birth time
@@ -191,42 +211,71 @@ def get_ashtottari_dhasa_bhukthi(jd, place,divisional_chart_factor=1,chart_metho
         @param dhasa_starting_planet 0=Sun 1=Moon(default)...8=Ketu, 'L'=Lagna
                                     M=Maandi, G=Gulika, T=Trisphuta, B=Bhindu, I=Indu, P=Pranapada
         @param seed_star 1..27. Default = 6
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start]
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
     """
-    global human_life_span_for_ashtottari_dhasa, ashtottari_adhipathi_dict
-    ashtottari_adhipathi_dict = _get_dhasa_dict(seed_star)
-    _dhasa_cycles = 1
-    _tribhagi_factor = 1
-    if use_tribhagi_variation:
-        _tribhagi_factor = 1./3.
-        _dhasa_cycles = int(_dhasa_cycles/_tribhagi_factor)
-        human_life_span_for_ashtottari_dhasa *= _tribhagi_factor
-        for k,(v1,v2) in ashtottari_adhipathi_dict.items():
-            ashtottari_adhipathi_dict[k] = [v1,v2*_tribhagi_factor]#[v1,round(v2*_tribhagi_factor,2)]
+    ashtottari_adhipathi_dict,_life_span,_dhasa_cycles = ashtottari_period_table(seed_star,use_tribhagi_variation)
     dashas = ashtottari_mahadasa(jd,place,divisional_chart_factor=divisional_chart_factor,
                                  star_position_from_moon=star_position_from_moon,
-                                 dhasa_starting_planet=dhasa_starting_planet)
+                                 dhasa_starting_planet=dhasa_starting_planet,seed_star=seed_star,
+                                 use_tribhagi_variation=use_tribhagi_variation)
     dhasa_bhukthi=[]
     for _ in range(_dhasa_cycles):
         for i in dashas:
             dhasa_lord = i
             if include_antardhasa:
-                bhukthis = ashtottari_bhukthi(i, dashas[i],antardhasa_option)
+                bhukthis = ashtottari_bhukthi(i, dashas[i],antardhasa_option,seed_star=seed_star,
+                                              use_tribhagi_variation=use_tribhagi_variation)
                 for j in bhukthis:
                     bhukthi_lord = j
                     jd1 = bhukthis[j]
-                    y, m, d, h = utils.jd_to_gregorian(jd1)
-                    """ TODO: Need to figure out passing date and time string to UI, main.py and pvr_tests.py """
-                    date_str = '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
-                    dhasa_bhukthi.append([dhasa_lord,bhukthi_lord,date_str]) 
+                    if as_jd:
+                        bhukthi_duration = ashtottari_adhipathi_dict[j][1]*ashtottari_adhipathi_dict[i][1]/_life_span
+                        dhasa_bhukthi.append([dhasa_lord,bhukthi_lord,jd1,bhukthi_duration])
+                    else:
+                        dhasa_bhukthi.append([dhasa_lord,bhukthi_lord,utils.julian_day_to_date_time_string(jd1)]) 
             else:
                 jd1 = dashas[i]
-                y, m, d, h = utils.jd_to_gregorian(jd1)
-                """ TODO: Need to figure out passing date and time string to UI, main.py and pvr_tests.py """
-                date_str = '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
-                dhasa_bhukthi.append([dhasa_lord,date_str])                 
+                if as_jd:
+                    dhasa_bhukthi.append([dhasa_lord,jd1,ashtottari_adhipathi_dict[i][1]])
+                else:
+                    dhasa_bhukthi.append([dhasa_lord,utils.julian_day_to_date_time_string(jd1)])                 
+    if as_jd:
+        dhasa_bhukthi = utils.dhasa_rows_as_jd(dhasa_bhukthi,year_duration)
     return dhasa_bhukthi
+def get_ashtottari_dhasa_tree(jd, place,divisional_chart_factor=1,chart_method=1,star_position_from_moon=1,
+                              use_tribhagi_variation=False,antardhasa_option=1,dhasa_starting_planet=1,seed_star=6,
+                              max_level=5):
+    """
+        provides Ashtottari dhasa as a lazy multi-level dhasa_tree.DhasaTree
+        Parameters are same as get_ashtottari_dhasa_bhukthi
+        @param max_level: deepest level of the tree (Default=5 Prana)
+        @return: dhasa_tree.DhasaTree
+    """
+    ashtottari_adhipathi_dict,_life_span,_dhasa_cycles = ashtottari_period_table(seed_star,use_tribhagi_variation)
+    _dhasa_years = {k:v[1] for k,v in ashtottari_adhipathi_dict.items()}
+    lord, start_jd = ashtottari_dasha_start_date(jd,place,divisional_chart_factor=divisional_chart_factor,
+                                chart_method=chart_method,star_position_from_moon=star_position_from_moon,
+                                dhasa_starting_planet=dhasa_starting_planet,seed_star=seed_star,
+                                use_tribhagi_variation=use_tribhagi_variation)
+    maha_dhasas = dhasa_tree.cyclic_maha_dhasas(lord, start_jd, _dhasa_years, ashtottari_next_adhipati,
+                                dhasa_cycles=_dhasa_cycles,year_duration=year_duration)
+    def _sub_lords(period):
+        _option = antardhasa_option if period.level==1 else 1
+        lord = period.lord
+        if _option in [3,4]:
+            lord = ashtottari_next_adhipati(lord, dirn=1)
+        elif _option in [5,6]:
+            lord = ashtottari_next_adhipati(lord, dirn=-1)
+        dirn = 1 if _option in [1,3,5] else -1
+        lords = []
+        for _ in range(len(ashtottari_adhipathi_list)):
+            lords.append(lord); lord = ashtottari_next_adhipati(lord,dirn)
+        return lords
+    return dhasa_tree.DhasaTree(maha_dhasas,
+                    dhasa_tree.proportional_sub_periods(_sub_lords, _dhasa_years, total_years=_life_span),
+                    max_level=max_level)
 '------ main -----------'
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
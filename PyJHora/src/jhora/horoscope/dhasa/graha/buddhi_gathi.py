@@ -22,7 +22,7 @@ from jhora import utils, const
 from jhora.horoscope.chart import charts
 from jhora.panchanga import drik
 def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,years=1,months=1,sixty_hours=1,
-                      include_antardhasa=True):
+                      include_antardhasa=True,as_jd=False):
     """
         provides Buddhi Gathi dhasa bhukthi for a given date in julian day (includes birth time)
         @param dob: Date Struct (year,month,day)
@@ -35,6 +35,7 @@ def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,yea
         @param months: Monthly chart. number of months from date of birth
         @param sixty_hours: 60-hour chart. number of 60 hours from date of birth
         @param include_antardhasa: True (include) False (exclude) antardhasa (Default=True)
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start] if include_antardhasa=True
         @return: a list of [dhasa_lord,dhasa_start] if include_antardhasa=False
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
@@ -69,19 +70,17 @@ def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,yea
             if include_antardhasa:
                 bhukthi_duration = dhasa_duration/dhasa_len
                 for bhukthi in range(dhasa_len):
-                    y,m,d,h = utils.jd_to_gregorian(start_jd)
-                    dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                    dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                     bhukthi_lord = dhasa_progression[(dhasa+bhukthi)%dhasa_len][0]
                     dhasa_bhukthi_info.append((dhasa_lord,bhukthi_lord,dhasa_start,round(bhukthi_duration,2)))
                     start_jd += bhukthi_duration*const.sidereal_year
             else:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_bhukthi_info.append((dhasa_lord,dhasa_start,dhasa_duration))
                 start_jd += dhasa_duration*const.sidereal_year
             if total_dhasa_duration >= const.human_life_span_for_narayana_dhasa:
                 break
-    return dhasa_bhukthi_info
+    return utils.dhasa_rows_as_jd(dhasa_bhukthi_info,const.sidereal_year,end_jd=start_jd) if as_jd else dhasa_bhukthi_info
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests._STOP_IF_ANY_TEST_FAILED = False
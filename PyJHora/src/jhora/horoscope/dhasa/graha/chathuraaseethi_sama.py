@@ -20,6 +20,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 from jhora import const, utils
 from jhora.panchanga import drik
+from jhora.horoscope.dhasa import dhasa_tree
 sidereal_year = const.sidereal_year
 """ Applicability: The 10th lord in 10th """
 
@@ -113,7 +114,7 @@ def _dhasa_start(jd,place,divisional_chart_factor=1,chart_method=1,star_position
     return [lord, start_date,res]
 def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,include_antardhasa=True,
                       star_position_from_moon=1,use_tribhagi_variation=False,
-                      seed_star=15,dhasa_starting_planet=1,antardhasa_option=1):
+                      seed_star=15,dhasa_starting_planet=1,antardhasa_option=1,as_jd=False):
     """
         returns a dictionary of all mahadashas and their start dates
         @param dob: Date Struct (year,month,day)
@@ -139,6 +140,7 @@ def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,inc
             6 => prev dhasa lord - backward
         @param dhasa_starting_planet 0=Sun 1=Moon(default)...8=Ketu, 'L'=Lagna
                                     M=Maandi, G=Gulika, T=Trisphuta, B=Bhindu, I=Indu, P=Pranapada
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start]
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
     """
@@ -158,18 +160,38 @@ def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,inc
                 bhukthis = _antardhasa(dhasa_lord,antardhasa_option)
                 _dhasa_duration /= len(bhukthis)
                 for bhukthi_lord in bhukthis:
-                    y,m,d,h = utils.jd_to_gregorian(start_jd)
-                    dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                    dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                     retval.append((dhasa_lord,bhukthi_lord,dhasa_start,_dhasa_duration))
                     start_jd += _dhasa_duration * sidereal_year
             else:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 retval.append((dhasa_lord,dhasa_start,_dhasa_duration))
                 lord_duration = round(dhasa_adhipathi_list[dhasa_lord]*_tribhagi_factor,2)
                 start_jd += lord_duration * sidereal_year
             dhasa_lord = _next_adhipati(dhasa_lord)
-    return retval
+    return utils.dhasa_rows_as_jd(retval,sidereal_year,end_jd=start_jd) if as_jd else retval
+def get_dhasa_tree(dob,tob,place,divisional_chart_factor=1,chart_method=1,
+                   star_position_from_moon=1,use_tribhagi_variation=False,
+                   seed_star=15,dhasa_starting_planet=1,antardhasa_option=1,max_level=5):
+    """
+        provides the dhasa as a lazy multi-level dhasa_tree.DhasaTree
+        Parameters are same as get_dhasa_bhukthi; each level is divided equally among its lords like antardhasa
+        @param max_level: deepest level of the tree (Default=5 Prana)
+        @return: dhasa_tree.DhasaTree
+    """
+    _tribhagi_factor = 1.
+    _dhasa_cycles = 1
+    if use_tribhagi_variation:
+        _tribhagi_factor = 1./3.; _dhasa_cycles = int(_dhasa_cycles/_tribhagi_factor)
+    jd = utils.julian_day_number(dob, tob)
+    dhasa_lord, start_jd,_ = _dhasa_start(jd,place,divisional_chart_factor=divisional_chart_factor,
+                                chart_method=chart_method,star_position_from_moon=star_position_from_moon,
+                                seed_star=seed_star,dhasa_starting_planet=dhasa_starting_planet)
+    maha_dhasas = dhasa_tree.cyclic_maha_dhasas(dhasa_lord, start_jd, dhasa_adhipathi_list, _next_adhipati,
+                                    dhasa_cycles=_dhasa_cycles,tribhagi_factor=_tribhagi_factor,
+                                    year_duration=sidereal_year)
+    _sub_lords = lambda period: _antardhasa(period.lord,antardhasa_option if period.level==1 else 1)
+    return dhasa_tree.DhasaTree(maha_dhasas, dhasa_tree.equal_sub_periods(_sub_lords), max_level=max_level)
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests._STOP_IF_ANY_TEST_FAILED = False
@@ -59,7 +59,7 @@ def _dhasa_progression_and_periods(jd,place):
     _kaala_dhasa_life_span_second_cycle = _kaala_dhasa_life_span - _kaala_dhasa_life_span_first_cycle
     _dhasas2 = [(p+1)*_kaala_dhasa_life_span_second_cycle/45.0 for p in range(9)]
     return kaala_type, kaala_frac,_dhasas1,_dhasas2
-def get_dhasa_antardhasa(dob,tob,place,years=1,months=1,sixty_hours=1,include_antardhasa=False):
+def get_dhasa_antardhasa(dob,tob,place,years=1,months=1,sixty_hours=1,include_antardhasa=False,as_jd=False):
     """
         provides kaala dhasa bhukthi for a given date in julian day (includes birth time)
         @param dob: Date Struct (year,month,day)
@@ -71,6 +71,7 @@ def get_dhasa_antardhasa(dob,tob,place,years=1,months=1,sixty_hours=1,include_an
         @param months: Monthly chart. number of months from date of birth
         @param sixty_hours: 60-hour chart. number of 60 hours from date of birth
         @param include_antardhasa: True (include) False (exclude) antardhasa (Default=True)
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start] if include_antardhasa=True
         @return: a list of [dhasa_lord,dhasa_start] if include_antardhasa=False
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
@@ -86,21 +87,18 @@ def get_dhasa_antardhasa(dob,tob,place,years=1,months=1,sixty_hours=1,include_an
             _dhasa_duration = kaala_frac*dhasas_first[dhasa_lord]
             for bhukthi_lord in range(9):
                 _bhukthi_duration = (bhukthi_lord+1)*_dhasa_duration/45.0
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,round(_bhukthi_duration,2)))
                 start_jd += _bhukthi_duration * const.sidereal_year
             # Second cycle of Antardhasa
             _dhasa_duration = (1.0-kaala_frac)*dhasas_first[dhasa_lord]
             for bhukthi_lord in range(9):
                 _bhukthi_duration = (bhukthi_lord+1)*_dhasa_duration/45.0
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,round(_bhukthi_duration,2)))
                 start_jd += _bhukthi_duration * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,round(_dhasa_duration,2)))
             start_jd += _dhasa_duration * const.sidereal_year
     # Second Cycle
@@ -110,24 +108,21 @@ def get_dhasa_antardhasa(dob,tob,place,years=1,months=1,sixty_hours=1,include_an
             _dhasa_duration = kaala_frac*dhasas_second[dhasa_lord]
             for bhukthi_lord in range(9):
                 _bhukthi_duration = (bhukthi_lord+1)*_dhasa_duration/45.0
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,round(_bhukthi_duration,2)))
                 start_jd += _bhukthi_duration * const.sidereal_year
             # Second cycle of Antardhasa
             _dhasa_duration = (1.0-kaala_frac)*dhasas_second[dhasa_lord]
             for bhukthi_lord in range(9):
                 _bhukthi_duration = (bhukthi_lord+1)*_dhasa_duration/45.0
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,round(_bhukthi_duration,2)))
                 start_jd += _bhukthi_duration * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,round(_dhasa_duration,2)))
             start_jd += _dhasa_duration * const.sidereal_year
-    return kaala_type, dhasa_info
+    return kaala_type, (utils.dhasa_rows_as_jd(dhasa_info,const.sidereal_year,end_jd=start_jd) if as_jd else dhasa_info)
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests._STOP_IF_ANY_TEST_FAILED = False
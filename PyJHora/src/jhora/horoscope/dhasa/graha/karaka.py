@@ -25,7 +25,7 @@ from jhora.horoscope.chart import charts, house
 year_duration = const.sidereal_year
 
 def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,chart_method=1,years=1,months=1,
-                         sixty_hours=1,include_antardhasa=True):
+                         sixty_hours=1,include_antardhasa=True,as_jd=False):
     """
         provides karaka dhasa bhukthi for a given date in julian day (includes birth time)
         @param dob: Date Struct (year,month,day)
@@ -38,6 +38,7 @@ def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,chart_method=1,
         @param months: Monthly chart. number of months from date of birth
         @param sixty_hours: 60-hour chart. number of 60 hours from date of birth
         @param include_antardhasa: True (include) False (exclude) antardhasa (Default=True)
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start] if include_antardhasa=True
         @return: a list of [dhasa_lord,dhasa_start] if include_antardhasa=False
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
@@ -61,16 +62,14 @@ def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,chart_method=1,
                 b_h = planet_positions[bhukthi_lord+1][1][0]
                 dd = (b_h - asc_house + 12)%12
                 factor = dd *  duration / human_life_span
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-                dhasa_info.append((k,bhukthi_lord,dhasa_start,dd))
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
+                dhasa_info.append((k,bhukthi_lord,dhasa_start,factor if as_jd else dd))
                 start_jd += factor * year_duration
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((k,dhasa_start,duration))
             start_jd += duration * year_duration
-    return dhasa_info
+    return utils.dhasa_rows_as_jd(dhasa_info,year_duration,end_jd=start_jd) if as_jd else dhasa_info
         
 
 if __name__ == "__main__":
@@ -27,7 +27,7 @@ _bhukthi_exempt_list_2 = [1,5,10,11]
 dhasa_adhipathi_dict = {1:1,2:2,3:9,5:20,4:18,0:20,6:50,'L':12} 
 def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,years=1,months=1,sixty_hours=1,
                       include_antardhasa=True,mahadhasa_lord_has_no_antardhasa=True,
-                      antardhasa_option1=False,antardhasa_option2=False):
+                      antardhasa_option1=False,antardhasa_option2=False,as_jd=False):
     """
         provides Naisargika dhasa bhukthi for a given date in julian day (includes birth time)
         @param dob: Date Struct (year,month,day)
@@ -43,6 +43,7 @@ def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,yea
         @param mahadhasa_lord_has_no_antardhasa=True => Mahadhasa lord has no antardhasa. Default=True
         @param antardhasa_option1=True => Planets in 3rd and 10th from dasa lord have no antardhasa. Default=False
         @param antardhasa_option2=True => Planets in 2nd,6th,11th and 12th from dasa lord have no antardhasa. Default=False
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start] if include_antardhasa=True
         @return: a list of [dhasa_lord,dhasa_start] if include_antardhasa=False
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
@@ -75,16 +76,14 @@ def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,yea
             """
             dd = round(duration/len(bhukthis),2)
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,duration))
             start_jd += duration * const.sidereal_year
-    return dhasa_info
+    return utils.dhasa_rows_as_jd(dhasa_info,const.sidereal_year,end_jd=start_jd) if as_jd else dhasa_info
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests._STOP_IF_ANY_TEST_FAILED = False
@@ -60,7 +60,7 @@ def _dhasa_start(jd,place,period,star_position_from_moon=1,divisional_chart_fact
     return start_date
         
 def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,years=1,months=1,sixty_hours=1,
-                      include_antardasa=True,dhasa_method=1):
+                      include_antardasa=True,dhasa_method=1,as_jd=False):
     """
         provides Tara dhasa bhukthi for a given date in julian day (includes birth time)
         @param dob: date of birth as tuple
@@ -76,6 +76,7 @@ def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,yea
         @param dhasa_method: 
             1=>Sanjay Rath method dhasa order 5,1,8,6,4,3,7,2,0  (Default)
             2=>Parasara method dhasa order 5,0,1,2,7,4,6,3,8
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start, duration]
           Example: [ [7, 5, '1915-02-09',0.25], [7, 0, '1917-06-10',0.25], ...]
     """
@@ -115,19 +116,17 @@ def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,chart_method=1,yea
             for bhukthi_lord in bhukthis:
                 _bhukthi_duration = dhasa_adhipathi_dict[bhukthi_lord]
                 factor = _bhukthi_duration *  _dhasa_lord_duration / human_life_span
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-                dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,_dhasa_duration))
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
+                dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,factor if as_jd else _dhasa_duration))
                 start_jd += factor * year_duration
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,_dhasa_duration))
             lord_duration = dhasa_adhipathi_dict[dhasa_lord]
             start_jd += lord_duration * year_duration
         dhasa_lord = _next_adhipati(dhasa_lord,dhasa_method=dhasa_method)
         _dhasa_duration = dhasa_adhipathi_dict[dhasa_lord]
-    return dhasa_info
+    return utils.dhasa_rows_as_jd(dhasa_info,year_duration,end_jd=start_jd) if as_jd else dhasa_info
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests._STOP_IF_ANY_TEST_FAILED = False
@@ -26,8 +26,11 @@
 
 import swisseph as swe
 from collections import OrderedDict as Dict
+from functools import lru_cache
+from types import MappingProxyType
 from jhora import const,utils
 from jhora.panchanga import drik
+from jhora.horoscope.dhasa import dhasa_tree
 from jhora.horoscope.chart import house
 year_duration = const.sidereal_year  # some say 360 days, others 365.25 or 365.2563 etc
 human_life_span_for_ashtottari_dhasa = 108
@@ -35,17 +38,31 @@ human_life_span_for_ashtottari_dhasa = 108
     {ashtottari adhipati:[(tithis),dasa_length]} 
 """
 ashtottari_adhipathi_list = [0,1,2,3,6,4,7,5]
-ashtottari_adhipathi_dict = {0:[(1,9,16,24),6],1:[(2,10,17,25),15],2:[(3,11,18,26),8],3:[(4,12,19,27),17],
-                             6:[(7,15,22),10],4:[(5,13,20,28),19],7:[(8,23,30),12],5:[(6,14,21,29),21]}
-def ashtottari_adhipathi(tithi_index):
-    for key,(tithi_list,durn) in ashtottari_adhipathi_dict.items():
+ashtottari_adhipathi_dict = MappingProxyType({0:[(1,9,16,24),6],1:[(2,10,17,25),15],2:[(3,11,18,26),8],3:[(4,12,19,27),17],
+                             6:[(7,15,22),10],4:[(5,13,20,28),19],7:[(8,23,30),12],5:[(6,14,21,29),21]})
+@lru_cache(maxsize=None)
+def ashtottari_period_table(use_tribhagi_variation=False):
+    """
+        Period table of a tithi ashtottari variation. Tables are read only and shared, never rescaled in place.
+        @param use_tribhagi_variation: True => dhasa durations are 1/3rd (rounded to 2 decimals) and repeat thrice
+        @return: (adhipathi_dict, human_life_span, dhasa_cycles)
+            adhipathi_dict: read only {ashtottari adhipati:((tithis),dasa_length)}
+    """
+    if not use_tribhagi_variation:
+        return ashtottari_adhipathi_dict, human_life_span_for_ashtottari_dhasa, 1
+    _tribhagi_factor = 1./3.
+    adhipathi_dict = MappingProxyType({k:(v1,round(v2*_tribhagi_factor,2)) for k,(v1,v2) in ashtottari_adhipathi_dict.items()})
+    return adhipathi_dict, human_life_span_for_ashtottari_dhasa*_tribhagi_factor, int(1/_tribhagi_factor)
+def ashtottari_adhipathi(tithi_index,use_tribhagi_variation=False):
+    adhipathi_dict,_,_ = ashtottari_period_table(use_tribhagi_variation)
+    for key,(tithi_list,durn) in adhipathi_dict.items():
         if tithi_index in tithi_list:
             return key,durn 
-def ashtottari_dasha_start_date(jd,place,tithi_index=1):
+def ashtottari_dasha_start_date(jd,place,tithi_index=1,use_tribhagi_variation=False):
     _,_,_,birth_time_hrs = utils.jd_to_gregorian(jd)
     tit = drik.tithi(jd, place,tithi_index=tithi_index)
     t_frac = utils.get_fraction(tit[1], tit[2], birth_time_hrs)
-    lord,res = ashtottari_adhipathi(tit[0])          # ruler of current nakshatra
+    lord,res = ashtottari_adhipathi(tit[0],use_tribhagi_variation)          # ruler of current nakshatra
     period_elapsed = (1-t_frac)*res*year_duration
     start_jd = jd - period_elapsed      # so many days before current day
     return [lord, start_jd]
@@ -54,55 +71,58 @@ def ashtottari_next_adhipati(lord,dirn=1):
     current = ashtottari_adhipathi_list.index(lord)
     next_index = (current + dirn) % len(ashtottari_adhipathi_list)
     return list(ashtottari_adhipathi_dict.keys())[next_index]
-def ashtottari_mahadasa(jd,place,tithi_index):
+def ashtottari_mahadasa(jd,place,tithi_index,use_tribhagi_variation=False):
     """
         returns a dictionary of all mahadashas and their start dates
         @return {mahadhasa_lord_index, (starting_year,starting_month,starting_day,starting_time_in_hours)}
     """
-    lord, start_date = ashtottari_dasha_start_date(jd,place,tithi_index)
+    lord, start_date = ashtottari_dasha_start_date(jd,place,tithi_index,use_tribhagi_variation)
+    adhipathi_dict,_,_ = ashtottari_period_table(use_tribhagi_variation)
     retval = Dict()
     for _ in range(len(ashtottari_adhipathi_list)):
         retval[lord] = start_date
-        lord_duration = ashtottari_adhipathi_dict[lord][1]
+        lord_duration = adhipathi_dict[lord][1]
         start_date += lord_duration * year_duration
         lord = ashtottari_next_adhipati(lord)
     return retval
-def ashtottari_bhukthi(dhasa_lord, start_date,antardhasa_option=3):
+def ashtottari_bhukthi(dhasa_lord, start_date,antardhasa_option=3,use_tribhagi_variation=False):
     """
         Compute all bhukthis of given nakshatra-lord of Mahadasa and its start date
     """
+    adhipathi_dict,human_life_span,_ = ashtottari_period_table(use_tribhagi_variation)
     lord = dhasa_lord
     if antardhasa_option in [3,4]:
         lord = ashtottari_next_adhipati(lord, dirn=1) 
     elif antardhasa_option in [5,6]:
         lord = ashtottari_next_adhipati(lord, dirn=-1) 
     dirn = 1 if antardhasa_option in [1,3,5] else -1
-    dhasa_lord_duration = ashtottari_adhipathi_dict[dhasa_lord][1]
+    dhasa_lord_duration = adhipathi_dict[dhasa_lord][1]
     retval = Dict()
     #lord = ashtottari_next_adhipati(dhasa_lord,dirn) # For Ashtottari first bhukkti starts from dhasa's next lord
     for _ in range(len(ashtottari_adhipathi_list)):
         retval[lord] = start_date
-        lord_duration = ashtottari_adhipathi_dict[lord][1]
-        factor = lord_duration * dhasa_lord_duration / human_life_span_for_ashtottari_dhasa
+        lord_duration = adhipathi_dict[lord][1]
+        factor = lord_duration * dhasa_lord_duration / human_life_span
         start_date += factor * year_duration
         lord = ashtottari_next_adhipati(lord,dirn)
     return retval
-def ashtottari_anthara(dhasa_lord, bhukthi_lord,bhukthi_lord_start_date):
+def ashtottari_anthara(dhasa_lord, bhukthi_lord,bhukthi_lord_start_date,use_tribhagi_variation=False):
     """
         Compute all bhukthis of given nakshatra-lord of Mahadasa, its bhukthi lord and bhukthi_lord's start date
     """
-    dhasa_lord_duration = ashtottari_adhipathi_dict[dhasa_lord][1]
+    adhipathi_dict,human_life_span,_ = ashtottari_period_table(use_tribhagi_variation)
+    dhasa_lord_duration = adhipathi_dict[dhasa_lord][1]
     retval = Dict()
     lord = ashtottari_next_adhipati(bhukthi_lord) # For Ashtottari first bhukkti starts from dhasa's next lord
     for _ in range(len(ashtottari_adhipathi_list)):
         retval[lord] = bhukthi_lord_start_date
-        lord_duration = ashtottari_adhipathi_dict[lord][1]
-        factor = lord_duration * dhasa_lord_duration / human_life_span_for_ashtottari_dhasa
+        lord_duration = adhipathi_dict[lord][1]
+        factor = lord_duration * dhasa_lord_duration / human_life_span
         bhukthi_lord_start_date += factor * year_duration
         lord = ashtottari_next_adhipati(lord)
     return retval
 def get_ashtottari_dhasa_bhukthi(jd, place,use_tribhagi_variation=False,include_antardhasa=True,
-                                 tithi_index=1,antardhasa_option=3): #antardhasa starts from next lord
+                                 tithi_index=1,antardhasa_option=3,as_jd=False): #antardhasa starts from next lord
     """
         provides Tithi Ashtottari dhasa bhukthi for a given date in julian day (includes birth time)
         This is Ashtottari Dhasa based on tithi instead of nakshathra
@@ -119,37 +139,62 @@ def get_ashtottari_dhasa_bhukthi(jd, place,use_tribhagi_variation=False,include_
             4 => next dhasa lord - backward
             5 => prev dhasa lord - forward
             6 => prev dhasa lord - backward
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start]
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
     """
-    global human_life_span_for_ashtottari_dhasa
-    _dhasa_cycles = 1
-    _tribhagi_factor = 1
-    if use_tribhagi_variation:
-        _tribhagi_factor = 1./3.
-        _dhasa_cycles = int(_dhasa_cycles/_tribhagi_factor)
-        human_life_span_for_ashtottari_dhasa *= _tribhagi_factor
-        for k,(v1,v2) in ashtottari_adhipathi_dict.items():
-            ashtottari_adhipathi_dict[k] = [v1,round(v2*_tribhagi_factor,2)]
-    dashas = ashtottari_mahadasa(jd,place,tithi_index)
+    adhipathi_dict,_life_span,_ = ashtottari_period_table(use_tribhagi_variation)
+    dashas = ashtottari_mahadasa(jd,place,tithi_index,use_tribhagi_variation)
     dhasa_bhukthi=[]
     for i in dashas:
         dhasa_lord = i
         if include_antardhasa:
-            bhukthis = ashtottari_bhukthi(i, dashas[i],antardhasa_option)
+            bhukthis = ashtottari_bhukthi(i, dashas[i],antardhasa_option,use_tribhagi_variation)
             for j in bhukthis:
                 bhukthi_lord = j
                 jd1 = bhukthis[j]
-                y, m, d, h = utils.jd_to_gregorian(jd1)
-                date_str = '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
-                dhasa_bhukthi.append([dhasa_lord,bhukthi_lord,date_str])
+                if as_jd:
+                    bhukthi_duration = adhipathi_dict[j][1]*adhipathi_dict[i][1]/_life_span
+                    dhasa_bhukthi.append([dhasa_lord,bhukthi_lord,jd1,bhukthi_duration])
+                else:
+                    dhasa_bhukthi.append([dhasa_lord,bhukthi_lord,utils.julian_day_to_date_time_string(jd1)])
         else:
             jd1 = dashas[i]
-            y, m, d, h = utils.jd_to_gregorian(jd1)
-            date_str = '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
-            dhasa_bhukthi.append([dhasa_lord,date_str])
+            if as_jd:
+                dhasa_bhukthi.append([dhasa_lord,jd1,adhipathi_dict[i][1]])
+            else:
+                dhasa_bhukthi.append([dhasa_lord,utils.julian_day_to_date_time_string(jd1)])
             
+    if as_jd:
+        dhasa_bhukthi = utils.dhasa_rows_as_jd(dhasa_bhukthi,year_duration)
     return dhasa_bhukthi
+def get_ashtottari_dhasa_tree(jd, place,use_tribhagi_variation=False,tithi_index=1,antardhasa_option=3,max_level=5):
+    """
+        provides Tithi Ashtottari dhasa as a lazy multi-level dhasa_tree.DhasaTree
+        Parameters are same as get_ashtottari_dhasa_bhukthi
+        @param max_level: deepest level of the tree (Default=5 Prana)
+        @return: dhasa_tree.DhasaTree
+    """
+    adhipathi_dict,_life_span,_dhasa_cycles = ashtottari_period_table(use_tribhagi_variation)
+    _dhasa_years = {k:v[1] for k,v in adhipathi_dict.items()}
+    lord, start_jd = ashtottari_dasha_start_date(jd,place,tithi_index,use_tribhagi_variation)
+    maha_dhasas = dhasa_tree.cyclic_maha_dhasas(lord, start_jd, _dhasa_years, ashtottari_next_adhipati,
+                                dhasa_cycles=_dhasa_cycles,year_duration=year_duration)
+    def _sub_lords(period):
+        _option = antardhasa_option if period.level==1 else 1
+        lord = period.lord
+        if _option in [3,4]:
+            lord = ashtottari_next_adhipati(lord, dirn=1)
+        elif _option in [5,6]:
+            lord = ashtottari_next_adhipati(lord, dirn=-1)
+        dirn = 1 if _option in [1,3,5] else -1
+        lords = []
+        for _ in range(len(ashtottari_adhipathi_list)):
+            lords.append(lord); lord = ashtottari_next_adhipati(lord,dirn)
+        return lords
+    return dhasa_tree.DhasaTree(maha_dhasas,
+                    dhasa_tree.proportional_sub_periods(_sub_lords, _dhasa_years, total_years=_life_span),
+                    max_level=max_level)
 '------ main -----------'
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
@@ -23,11 +23,14 @@
 Calculates Vimshottari (=120) Dasha-bhukthi-antara-sukshma-prana
 """
 from collections import OrderedDict as Dict
+from functools import lru_cache
+from types import MappingProxyType
 from jhora import const,utils
 from jhora.panchanga import drik
+from jhora.horoscope.dhasa import dhasa_tree
 year_duration = const.sidereal_year #const.tropical_year #  # some say 360 days, others 365.25 or 365.2563 etc
 vimsottari_adhipati = lambda nak,seed_star=3: const.vimsottari_adhipati_list[(nak-seed_star+3) % (len(const.vimsottari_adhipati_list))]
-vimsottari_dict = const.vimsottari_dict
+vimsottari_dict = MappingProxyType(dict(const.vimsottari_dict)) # read only - variations use their own tables
 human_life_span_for_vimsottari_dhasa = const.human_life_span_for_vimsottari_dhasa
 ### --- Vimoshatari functions
 def vimsottari_next_adhipati(lord,dir=1):
@@ -35,9 +38,68 @@ def vimsottari_next_adhipati(lord,dir=1):
     current = const.vimsottari_adhipati_list.index(lord)
     next_index = (current + dir) % len(const.vimsottari_adhipati_list)
     return const.vimsottari_adhipati_list[next_index]
+@lru_cache(maxsize=None)
+def vimsottari_period_table(use_tribhagi_variation=False):
+    """
+        Period table of a vimsottari variation. Tables are read only and shared, never rescaled in place.
+        @param use_tribhagi_variation: True => dhasa durations are 1/3rd (rounded to 2 decimals) and repeat thrice
+        @return: (dhasa_years, human_life_span, dhasa_cycles)
+            dhasa_years: read only {lord:dhasa years}
+    """
+    if not use_tribhagi_variation:
+        return vimsottari_dict, human_life_span_for_vimsottari_dhasa, 1
+    _tribhagi_factor = 1./3.
+    dhasa_years = MappingProxyType({k:round(v*_tribhagi_factor,2) for k,v in vimsottari_dict.items()})
+    return dhasa_years, human_life_span_for_vimsottari_dhasa*_tribhagi_factor, int(1/_tribhagi_factor)
+@lru_cache(maxsize=None)
+def _vimsottari_maha_dhasa_durations(dhasa_lord,use_tribhagi_variation=False):
+    """ @return: tuple of (maha_dhasa_lord, duration in days) for one cycle of lords starting from dhasa_lord """
+    dhasa_years,_,_ = vimsottari_period_table(use_tribhagi_variation)
+    durations = []; lord = dhasa_lord
+    for _ in range(len(const.vimsottari_adhipati_list)):
+        durations.append((lord,dhasa_years[lord] * year_duration))
+        lord = vimsottari_next_adhipati(lord)
+    return tuple(durations)
+@lru_cache(maxsize=None)
+def _vimsottari_bhukthi_durations(maha_lord,antardhasa_option=1,use_tribhagi_variation=False):
+    """ @return: tuple of (bhukthi_lord, duration in days) of the bhukthis of maha_lord """
+    dhasa_years,life_span,_ = vimsottari_period_table(use_tribhagi_variation)
+    lord = maha_lord
+    if antardhasa_option in [3,4]:
+        lord = vimsottari_next_adhipati(lord, dir=1) 
+    elif antardhasa_option in [5,6]:
+        lord = vimsottari_next_adhipati(lord, dir=-1) 
+    dir = 1 if antardhasa_option in [1,3,5] else -1
+    durations = []
+    for _ in range(len(const.vimsottari_adhipati_list)):
+        durations.append((lord,dhasa_years[lord] * dhasa_years[maha_lord] / life_span * year_duration))
+        lord = vimsottari_next_adhipati(lord,dir)
+    return tuple(durations)
+def _start_dates(start_date,durations):
+    """ @return: {lord:start_date} from a precomputed tuple of (lord,duration) """
+    retval = Dict()
+    for lord,duration in durations:
+        retval[lord] = start_date
+        start_date += duration
+    return retval
+@lru_cache(maxsize=4096)
+def vimsottari_dhasa_balance(planet_long,seed_star=3,use_tribhagi_variation=False):
+    """
+        Memoizable part of the dhasa start: depends only on the longitude of the star
+        @param planet_long: longitude (0..360) of the planet/lagna starting the dhasa (moon by default)
+        @return: (dhasa_lord, days of the dhasa already elapsed at that longitude)
+    """
+    one_star = (360 / 27.)        # 27 nakshatras span 360°
+    dhasa_years,_,_ = vimsottari_period_table(use_tribhagi_variation)
+    nak = int(planet_long / one_star); rem = (planet_long - nak * one_star)
+    lord = vimsottari_adhipati(nak,seed_star)          # ruler of current nakshatra
+    period = dhasa_years[lord]       # total years of nakshatra lord
+    period_elapsed = rem / one_star * period # years
+    period_elapsed *= year_duration        # days
+    return lord, period_elapsed
 
 def vimsottari_dasha_start_date(jd,place,divisional_chart_factor=1,chart_method=1,star_position_from_moon=1,seed_star=3,
-                                dhasa_starting_planet=1):
+                                dhasa_starting_planet=1,use_tribhagi_variation=False):
     """Returns the start date of the mahadasa which occured on or before `jd`"""
     y,m,d,fh = utils.jd_to_gregorian(jd); dob=drik.Date(y,m,d); tob=(fh,0,0)
     one_star = (360 / 27.)        # 27 nakshatras span 360°
@@ -70,67 +132,45 @@ def vimsottari_dasha_start_date(jd,place,divisional_chart_factor=1,chart_method=
         planet_long = planet_positions[2][1][0]*30+planet_positions[2][1][1]
     if dhasa_starting_planet==1:
         planet_long += (star_position_from_moon-1)*one_star
-    nak = int(planet_long / one_star); rem = (planet_long - nak * one_star)
-    lord = vimsottari_adhipati(nak,seed_star)          # ruler of current nakshatra
-    period = vimsottari_dict[lord]       # total years of nakshatra lord
-    #print('seed_star,nak,lord,period',seed_star,nak,lord,period)
-    period_elapsed = rem / one_star * period # years
-    period_elapsed *= year_duration        # days
+    lord, period_elapsed = vimsottari_dhasa_balance(planet_long,seed_star,use_tribhagi_variation)
     start_date = jd - period_elapsed      # so many days before current day
     return [lord, start_date]
 
 def vimsottari_mahadasa(jd,place,divisional_chart_factor=1,chart_method=1,star_position_from_moon=1,
-                        seed_star=3,dhasa_starting_planet=1):
+                        seed_star=3,dhasa_starting_planet=1,use_tribhagi_variation=False):
     """List all mahadashas and their start dates"""
     lord, start_date = vimsottari_dasha_start_date(jd,place,divisional_chart_factor=divisional_chart_factor,
                             chart_method=chart_method,star_position_from_moon=star_position_from_moon,seed_star=seed_star,
-                            dhasa_starting_planet=dhasa_starting_planet)
-    retval = Dict()
-    for i in range(9):
-        retval[lord] = start_date
-        start_date += vimsottari_dict[lord] * year_duration
-        lord = vimsottari_next_adhipati(lord)
-
-    return retval
-def _vimsottari_rasi_bhukthi(maha_lord,maha_lord_rasi,start_date):
+                            dhasa_starting_planet=dhasa_starting_planet,use_tribhagi_variation=use_tribhagi_variation)
+    return _start_dates(start_date, _vimsottari_maha_dhasa_durations(lord,use_tribhagi_variation))
+def _vimsottari_rasi_bhukthi(maha_lord,maha_lord_rasi,start_date,use_tribhagi_variation=False):
     """Compute all bhuktis of given nakshatra-lord of Mahadasa using rasi bhukthi variation
     and its start date"""
+    dhasa_years,_,_ = vimsottari_period_table(use_tribhagi_variation)
     retval = Dict()
-    bhukthi_duration = vimsottari_dict[maha_lord]/12
+    bhukthi_duration = dhasa_years[maha_lord]/12
     for bhukthi_rasi in [(maha_lord_rasi+h)%12 for h in range(12)]:
         retval[bhukthi_rasi] = start_date
         start_date += bhukthi_duration * year_duration
     return retval
     
-def _vimsottari_bhukti(maha_lord, start_date,antardhasa_option=1):
+def _vimsottari_bhukti(maha_lord, start_date,antardhasa_option=1,use_tribhagi_variation=False):
     """Compute all bhuktis of given nakshatra-lord of Mahadasa
     and its start date"""
-    lord = maha_lord
-    if antardhasa_option in [3,4]:
-        lord = vimsottari_next_adhipati(lord, dir=1) 
-    elif antardhasa_option in [5,6]:
-        lord = vimsottari_next_adhipati(lord, dir=-1) 
-    dir = 1 if antardhasa_option in [1,3,5] else -1
-    retval = Dict()
-    for i in range(9):
-        retval[lord] = start_date
-        factor = vimsottari_dict[lord] * vimsottari_dict[maha_lord] / human_life_span_for_vimsottari_dhasa
-        start_date += factor * year_duration
-        lord = vimsottari_next_adhipati(lord,dir)
-
-    return retval
+    return _start_dates(start_date, _vimsottari_bhukthi_durations(maha_lord,antardhasa_option,use_tribhagi_variation))
 
 # North Indian tradition: dasa-antardasa-pratyantardasa
 # South Indian tradition: dasa-bhukti-antara-sukshma
-def _vimsottari_antara(maha_lord, bhukti_lord, start_date):
+def _vimsottari_antara(maha_lord, bhukti_lord, start_date,use_tribhagi_variation=False):
     """Compute all antaradasas from given bhukit's start date.
     The bhukti's lord and its lord (mahadasa lord) must be given"""
+    dhasa_years,life_span,_ = vimsottari_period_table(use_tribhagi_variation)
     lord = bhukti_lord
     retval = Dict()
     for i in range(9):
         retval[lord] = start_date
-        factor = vimsottari_dict[lord] * (vimsottari_dict[maha_lord] / human_life_span_for_vimsottari_dhasa)
-        factor *= (vimsottari_dict[bhukti_lord] / human_life_span_for_vimsottari_dhasa)
+        factor = dhasa_years[lord] * (dhasa_years[maha_lord] / life_span)
+        factor *= (dhasa_years[bhukti_lord] / life_span)
         start_date += factor * year_duration
         lord = vimsottari_next_adhipati(lord)
 
@@ -161,7 +201,7 @@ def compute_vimsottari_antara_from(jd, mahadashas):
 def get_vimsottari_dhasa_bhukthi(jd,place,star_position_from_moon=1,use_tribhagi_variation=False,
                                  use_rasi_bhukthi_variation=False, include_antardhasa=True,
                                  divisional_chart_factor=1,chart_method=1,seed_star=3,antardhasa_option=1,
-                                 dhasa_starting_planet=1):
+                                 dhasa_starting_planet=1,as_jd=False):
     """
         provides Vimsottari dhasa bhukthi for a given date in julian day (includes birth time)
         @param jd: Julian day for birthdate and birth time
@@ -187,23 +227,16 @@ def get_vimsottari_dhasa_bhukthi(jd,place,star_position_from_moon=1,use_tribhagi
             6 => prev dhasa lord - backward
         @param dhasa_starting_planet 0=Sun 1=Moon(default)...8=Ketu, 'L'=Lagna
                                     M=Maandi, G=Gulika, T=Trisphuta, B=Bhindu, I=Indu, P=Pranapada
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start] if include_antardhasa=True
         @return: a list of [dhasa_lord,dhasa_start] if include_antardhasa=False
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
     """
-    global human_life_span_for_vimsottari_dhasa
     # jd is julian date with birth time included
-    _dhasa_cycles = 1
-    _tribhagi_factor = 1
-    if use_tribhagi_variation:
-        _tribhagi_factor = 1./3.
-        _dhasa_cycles = int(_dhasa_cycles/_tribhagi_factor)
-        human_life_span_for_vimsottari_dhasa *= _tribhagi_factor
-        for k,v in vimsottari_dict.items():
-            vimsottari_dict[k] = round(v*_tribhagi_factor,2)
+    dhasa_years,_,_dhasa_cycles = vimsottari_period_table(use_tribhagi_variation)
     dashas = vimsottari_mahadasa(jd,place,divisional_chart_factor=divisional_chart_factor,chart_method=chart_method,
                                  star_position_from_moon=star_position_from_moon,seed_star=seed_star,
-                                 dhasa_starting_planet=dhasa_starting_planet)
+                                 dhasa_starting_planet=dhasa_starting_planet,use_tribhagi_variation=use_tribhagi_variation)
     dl = list(dashas.values()); de = dl[1]
     y,m,h,_ = utils.jd_to_gregorian(jd); p_date1 = drik.Date(y,m,h)
     y,m,h,_ = utils.jd_to_gregorian(de); p_date2 = drik.Date(y,m,h)
@@ -218,24 +251,65 @@ def get_vimsottari_dhasa_bhukthi(jd,place,star_position_from_moon=1,use_tribhagi
                     from jhora.horoscope.chart import charts
                     planet_positions = charts.divisional_chart(jd, place,divisional_chart_factor=1)
                     maha_lord_rasi= planet_positions[i+1][1][0]
-                    bhuktis = _vimsottari_rasi_bhukthi(i, maha_lord_rasi, dashas[i])
+                    bhuktis = _vimsottari_rasi_bhukthi(i, maha_lord_rasi, dashas[i],use_tribhagi_variation)
+                    bhukthi_years = [dhasa_years[i]/12]*12
                 else:
-                    bhuktis = _vimsottari_bhukti(i, dashas[i],antardhasa_option=antardhasa_option)
-                for j in bhuktis:
+                    bhuktis = _vimsottari_bhukti(i, dashas[i],antardhasa_option=antardhasa_option,
+                                                 use_tribhagi_variation=use_tribhagi_variation)
+                    bhukthi_years = [bd/year_duration for _,bd in 
+                                     _vimsottari_bhukthi_durations(i,antardhasa_option,use_tribhagi_variation)]
+                for j,bhukthi_duration in zip(bhuktis,bhukthi_years):
                     bhukthi_lord = j
                     jd1 = bhuktis[j]
-                    y, m, d, h = utils.jd_to_gregorian(jd1)
-                    """ TODO: Need to figure out passing date and time string to UI, main.py and pvr_tests.py """
-                    date_str = '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
-                    dhasa_bukthi.append([dhasa_lord,bhukthi_lord,date_str]) 
+                    if as_jd:
+                        dhasa_bukthi.append([dhasa_lord,bhukthi_lord,jd1,bhukthi_duration])
+                    else:
+                        dhasa_bukthi.append([dhasa_lord,bhukthi_lord,utils.julian_day_to_date_time_string(jd1)]) 
                     #dhasa_bukthi[i][j] = [dhasa_lord,bhukthi_lord,bhukthi_start]
             else:
                 jd1 = dashas[i]
-                y, m, d, h = utils.jd_to_gregorian(jd1)
-                date_str = '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
-                dhasa_bukthi.append([dhasa_lord,date_str]) 
+                if as_jd:
+                    dhasa_bukthi.append([dhasa_lord,jd1,dhasa_years[i]])
+                else:
+                    dhasa_bukthi.append([dhasa_lord,utils.julian_day_to_date_time_string(jd1)]) 
+    if as_jd:
+        dhasa_bukthi = utils.dhasa_rows_as_jd(dhasa_bukthi,year_duration)
     return vim_bal,dhasa_bukthi
 
+def get_vimsottari_dhasa_tree(jd,place,star_position_from_moon=1,use_tribhagi_variation=False,
+                              divisional_chart_factor=1,chart_method=1,seed_star=3,antardhasa_option=1,
+                              dhasa_starting_planet=1,max_level=5):
+    """
+        provides Vimsottari dhasa as a lazy multi-level dhasa_tree.DhasaTree
+        (Maha dhasa, Antardhasa, Pratyantardhasa, Sookshma, Prana)
+        Parameters are same as get_vimsottari_dhasa_bhukthi (rasi bhukthi variation not supported)
+        @param max_level: deepest level of the tree (Default=5 Prana)
+        @return: dhasa_tree.DhasaTree
+          Example: tree.periods_at(jd_now) => [maha_dhasa, antardhasa, pratyantardhasa, sookshma, prana]
+    """
+    _dhasa_years, _life_span, _dhasa_cycles = vimsottari_period_table(use_tribhagi_variation)
+    lord, start_jd = vimsottari_dasha_start_date(jd,place,divisional_chart_factor=divisional_chart_factor,
+                            chart_method=chart_method,star_position_from_moon=star_position_from_moon,
+                            seed_star=seed_star,dhasa_starting_planet=dhasa_starting_planet,
+                            use_tribhagi_variation=use_tribhagi_variation)
+    maha_dhasas = dhasa_tree.cyclic_maha_dhasas(lord, start_jd, _dhasa_years, vimsottari_next_adhipati,
+                                                dhasa_cycles=_dhasa_cycles, year_duration=year_duration)
+    def _sub_lords(period):
+        _option = antardhasa_option if period.level==1 else 1
+        lord = period.lord
+        if _option in [3,4]:
+            lord = vimsottari_next_adhipati(lord, dir=1)
+        elif _option in [5,6]:
+            lord = vimsottari_next_adhipati(lord, dir=-1)
+        dir = 1 if _option in [1,3,5] else -1
+        lords = []
+        for _ in range(len(const.vimsottari_adhipati_list)):
+            lords.append(lord); lord = vimsottari_next_adhipati(lord,dir)
+        return lords
+    return dhasa_tree.DhasaTree(maha_dhasas,
+                    dhasa_tree.proportional_sub_periods(_sub_lords, _dhasa_years, total_years=_life_span),
+                    max_level=max_level)
+
 '------ main -----------'
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
@@ -22,8 +22,11 @@
 Calculates Yoga Vimsottari
 """
 from collections import OrderedDict as Dict
+from functools import lru_cache
+from types import MappingProxyType
 from jhora import const,utils
 from jhora.panchanga import drik
+from jhora.horoscope.dhasa import dhasa_tree
 sidereal_year = const.sidereal_year #const.savana_year #  # some say 360 days, others 365.25 or 365.2563 etc
 vimsottari_dict = { 8:[(3,12,21), 7], 5: [(4,13,22),20], 0:[(5,14,23), 6], 1:[(6,15,24), 10], 2:[(7,16,25), 7], 
                    7:[(8,17,26), 18], 4:[(9,18,27), 16], 6:[(1,10,19), 19], 3:[(2,11,20), 17] }
@@ -38,59 +41,84 @@ def vimsottari_next_adhipati(lord,dirn=1):
     current = const.vimsottari_adhipati_list.index(lord)
     next_index = (current + dirn) % len(const.vimsottari_adhipati_list)
     return const.vimsottari_adhipati_list[next_index]
+@lru_cache(maxsize=None)
+def yoga_vimsottari_period_table(use_tribhagi_variation=False):
+    """
+        Period table of a yoga vimsottari variation (read only, never rescaled in place)
+        @param use_tribhagi_variation: True => dhasa durations are 1/3rd (rounded to 2 decimals) and repeat thrice
+        @return: (dhasa_years, human_life_span, dhasa_cycles)
+            dhasa_years: read only {lord:dhasa years}
+    """
+    _tribhagi_factor = 1./3. if use_tribhagi_variation else 1
+    dhasa_years = MappingProxyType({k:round(durn*_tribhagi_factor,2) if use_tribhagi_variation else durn
+                                    for k,(_,durn) in vimsottari_dict.items()})
+    return dhasa_years, human_life_span_for_vimsottari_dhasa*_tribhagi_factor, int(1/_tribhagi_factor)
+@lru_cache(maxsize=None)
+def _yoga_vimsottari_durations(maha_lord,antardhasa_option=None,use_tribhagi_variation=False):
+    """
+        @param antardhasa_option: None => maha dhasas of one cycle of lords starting from maha_lord
+                                  1..6 => bhukthis of maha_lord
+        @return: tuple of (lord, duration in days)
+    """
+    dhasa_years,life_span,_ = yoga_vimsottari_period_table(use_tribhagi_variation)
+    lord = maha_lord; dirn = 1
+    if antardhasa_option in [3,4]:
+        lord = vimsottari_next_adhipati(lord, dirn=1) 
+    elif antardhasa_option in [5,6]:
+        lord = vimsottari_next_adhipati(lord, dirn=-1) 
+    if antardhasa_option is not None:
+        dirn = 1 if antardhasa_option in [1,3,5] else -1
+    durations = []
+    for _ in range(len(vimsottari_dict)):
+        if antardhasa_option is None:
+            durations.append((lord,dhasa_years[lord] * sidereal_year))
+        else:
+            durations.append((lord,dhasa_years[lord] * dhasa_years[maha_lord] / life_span * sidereal_year))
+        lord = vimsottari_next_adhipati(lord,dirn)
+    return tuple(durations)
+def _start_dates(start_date,durations):
+    """ @return: {lord:start_date} from a precomputed tuple of (lord,duration) """
+    retval = Dict()
+    for lord,duration in durations:
+        retval[lord] = start_date
+        start_date += duration
+    return retval
 
-def vimsottari_dasha_start_date(jd,place):
+def vimsottari_dasha_start_date(jd,place,use_tribhagi_variation=False):
     """Returns the start date of the mahadasa which occured on or before `jd`"""
     _,_,_,birth_time_hrs = utils.jd_to_gregorian(jd)
     _yoga = drik.yogam(jd, place)
     y_frac = utils.get_fraction(_yoga[1], _yoga[2], birth_time_hrs)
     #print('yoga',_yoga,'birth_time_hrs',birth_time_hrs,'yoga_fracion',y_frac)
-    lord,res = vimsottari_adhipathi(_yoga[0])          # ruler of current nakshatra
+    lord,_ = vimsottari_adhipathi(_yoga[0])          # ruler of current nakshatra
+    res = yoga_vimsottari_period_table(use_tribhagi_variation)[0][lord]
     period_elapsed = (1-y_frac)*res*sidereal_year
     start_jd = jd - period_elapsed      # so many days before current day
     #print('lord,res,period_elapsed,start_date',lord,res,period_elapsed,utils.jd_to_gregorian(start_date))
     return [lord, start_jd]
 
-def vimsottari_mahadasa(jdut1,place):
+def vimsottari_mahadasa(jdut1,place,use_tribhagi_variation=False):
     """List all mahadashas and their start dates"""
-    lord, start_date = vimsottari_dasha_start_date(jdut1,place)
-    retval = Dict()
-    for i in range(9):
-        retval[lord] = start_date; lord_duration = vimsottari_dict[lord][1]
-        start_date += lord_duration * sidereal_year
-        lord = vimsottari_next_adhipati(lord)
-    return retval
+    lord, start_date = vimsottari_dasha_start_date(jdut1,place,use_tribhagi_variation)
+    return _start_dates(start_date,_yoga_vimsottari_durations(lord,use_tribhagi_variation=use_tribhagi_variation))
 
-def _vimsottari_bhukti(maha_lord, start_date,antardhasa_option=1):
+def _vimsottari_bhukti(maha_lord, start_date,antardhasa_option=1,use_tribhagi_variation=False):
     """Compute all bhuktis of given nakshatra-lord of Mahadasa
     and its start date"""
-    lord = maha_lord
-    if antardhasa_option in [3,4]:
-        lord = vimsottari_next_adhipati(lord, dirn=1) 
-    elif antardhasa_option in [5,6]:
-        lord = vimsottari_next_adhipati(lord, dirn=-1) 
-    dirn = 1 if antardhasa_option in [1,3,5] else -1
-    dhasa_lord_duration = vimsottari_dict[maha_lord][1]
-    retval = Dict()
-    for _ in range(len(vimsottari_dict)):
-        retval[lord] = start_date; bhukthi_duration = vimsottari_dict[lord][1]
-        factor = bhukthi_duration * dhasa_lord_duration / human_life_span_for_vimsottari_dhasa
-        start_date += factor * sidereal_year
-        lord = vimsottari_next_adhipati(lord,dirn)
-
-    return retval
+    return _start_dates(start_date,_yoga_vimsottari_durations(maha_lord,antardhasa_option,use_tribhagi_variation))
 
 # North Indian tradition: dasa-antardasa-pratyantardasa
 # South Indian tradition: dasa-bhukti-antara-sukshma
-def _vimsottari_antara(maha_lord, bhukti_lord, start_date):
+def _vimsottari_antara(maha_lord, bhukti_lord, start_date,use_tribhagi_variation=False):
     """Compute all antaradasas from given bhukit's start date.
     The bhukti's lord and its lord (mahadasa lord) must be given"""
+    dhasa_years,life_span,_ = yoga_vimsottari_period_table(use_tribhagi_variation)
     lord = bhukti_lord
     retval = Dict()
     for _ in range(9):
         retval[lord] = start_date
-        factor = vimsottari_dict[lord] * (vimsottari_dict[maha_lord] / human_life_span_for_vimsottari_dhasa)
-        factor *= (vimsottari_dict[bhukti_lord] / human_life_span_for_vimsottari_dhasa)
+        factor = dhasa_years[lord] * (dhasa_years[maha_lord] / life_span)
+        factor *= (dhasa_years[bhukti_lord] / life_span)
         start_date += factor * sidereal_year
         lord = vimsottari_next_adhipati(lord)
 
@@ -118,7 +146,7 @@ def compute_vimsottari_antara_from(jd, mahadashas):
     antara = _vimsottari_antara(i, j, bhuktis[j])
     return (i, j, antara)
 
-def get_dhasa_bhukthi(jd,place,use_tribhagi_variation=False,antardhasa_option=1):
+def get_dhasa_bhukthi(jd,place,use_tribhagi_variation=False,antardhasa_option=1,as_jd=False):
     """
         provides Yoga Vimsottari dhasa bhukthi for a given date in julian day (includes birth time)
         This is vimsottari but based on yogam instead of nakshathra
@@ -132,21 +160,14 @@ def get_dhasa_bhukthi(jd,place,use_tribhagi_variation=False,antardhasa_option=1)
             4 => next dhasa lord - backward
             5 => prev dhasa lord - forward
             6 => prev dhasa lord - backward
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start] if include_antardhasa=True
         @return: a list of [dhasa_lord,dhasa_start] if include_antardhasa=False
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
     """
-    global human_life_span_for_vimsottari_dhasa
-    _dhasa_cycles = 1
-    _tribhagi_factor = 1
-    if use_tribhagi_variation:
-        _tribhagi_factor = 1./3.
-        _dhasa_cycles = int(_dhasa_cycles/_tribhagi_factor)
-        human_life_span_for_vimsottari_dhasa *= _tribhagi_factor
-        for k,v in vimsottari_dict.items():
-            vimsottari_dict[k] = round(v*_tribhagi_factor,2)
+    _,_,_dhasa_cycles = yoga_vimsottari_period_table(use_tribhagi_variation)
     _,_,_,tz = place
-    dashas = vimsottari_mahadasa(jd,place)#V4.2.9
+    dashas = vimsottari_mahadasa(jd,place,use_tribhagi_variation)#V4.2.9
     dl = list(dashas.values()); de = dl[1]
     y,m,h,_ = utils.jd_to_gregorian(jd); p_date1 = drik.Date(y,m,h)
     y,m,h,_ = utils.jd_to_gregorian(de); p_date2 = drik.Date(y,m,h)
@@ -154,18 +175,48 @@ def get_dhasa_bhukthi(jd,place,use_tribhagi_variation=False,antardhasa_option=1)
     dhasa_bukthi=[]
     for _ in range(_dhasa_cycles):
         for i in dashas:
-            bhuktis = _vimsottari_bhukti(i, dashas[i],antardhasa_option=antardhasa_option)
+            bhuktis = _vimsottari_bhukti(i, dashas[i],antardhasa_option=antardhasa_option,
+                                         use_tribhagi_variation=use_tribhagi_variation)
             dhasa_lord = i
-            for j in bhuktis:
+            bhukthi_durations = _yoga_vimsottari_durations(i,antardhasa_option,use_tribhagi_variation)
+            for j,(_,bhukthi_duration) in zip(bhuktis,bhukthi_durations):
                 bhukthi_lord = j
                 jd1 = bhuktis[j]
-                y, m, d, h = utils.jd_to_gregorian(jd1)
-                """ TODO: Need to figure out passing date and time string to UI, main.py and pvr_tests.py """
-                date_str = '%04d-%02d-%02d' %(y,m,d)+' '+utils.to_dms(h,as_string=True)
-                bhukthi_start = date_str
-                dhasa_bukthi.append([dhasa_lord,bhukthi_lord,bhukthi_start]) 
+                if as_jd:
+                    dhasa_bukthi.append([dhasa_lord,bhukthi_lord,jd1,bhukthi_duration/sidereal_year])
+                else:
+                    dhasa_bukthi.append([dhasa_lord,bhukthi_lord,utils.julian_day_to_date_time_string(jd1)]) 
+    if as_jd:
+        dhasa_bukthi = utils.dhasa_rows_as_jd(dhasa_bukthi,sidereal_year)
     return vim_bal,dhasa_bukthi
 
+def get_dhasa_tree(jd,place,use_tribhagi_variation=False,antardhasa_option=1,max_level=5):
+    """
+        provides Yoga Vimsottari dhasa as a lazy multi-level dhasa_tree.DhasaTree
+        Parameters are same as get_dhasa_bhukthi
+        @param max_level: deepest level of the tree (Default=5 Prana)
+        @return: dhasa_tree.DhasaTree
+    """
+    _dhasa_years,_life_span,_dhasa_cycles = yoga_vimsottari_period_table(use_tribhagi_variation)
+    lord, start_jd = vimsottari_dasha_start_date(jd,place,use_tribhagi_variation)
+    maha_dhasas = dhasa_tree.cyclic_maha_dhasas(lord, start_jd, _dhasa_years, vimsottari_next_adhipati,
+                                dhasa_cycles=_dhasa_cycles,year_duration=sidereal_year)
+    def _sub_lords(period):
+        _option = antardhasa_option if period.level==1 else 1
+        lord = period.lord
+        if _option in [3,4]:
+            lord = vimsottari_next_adhipati(lord, dirn=1)
+        elif _option in [5,6]:
+            lord = vimsottari_next_adhipati(lord, dirn=-1)
+        dirn = 1 if _option in [1,3,5] else -1
+        lords = []
+        for _ in range(len(const.vimsottari_adhipati_list)):
+            lords.append(lord); lord = vimsottari_next_adhipati(lord,dirn)
+        return lords
+    return dhasa_tree.DhasaTree(maha_dhasas,
+                    dhasa_tree.proportional_sub_periods(_sub_lords, _dhasa_years, total_years=_life_span),
+                    max_level=max_level)
+
 '------ main -----------'
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
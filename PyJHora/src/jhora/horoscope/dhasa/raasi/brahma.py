@@ -37,7 +37,7 @@ def _dhasa_duration(planet_positions, sign):
     elif const.house_strengths_of_planets[lord_of_6th][lord_house] == const._EXALTED_UCCHAM:
         _dd += 1
     return _dd
-def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_hours=1,include_antardhasa=True):
+def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_hours=1,include_antardhasa=True,as_jd=False):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE, 
                                                divisional_chart_factor=divisional_chart_factor, years=years, 
@@ -57,16 +57,14 @@ def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=
         if include_antardhasa:
             dd = duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * year_duration
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,duration))
             start_jd += duration * year_duration
-    return dhasa_info
+    return utils.dhasa_rows_as_jd(dhasa_info,year_duration,end_jd=start_jd) if as_jd else dhasa_info
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests.brahma_dhasa_test()
\ No newline at end of file
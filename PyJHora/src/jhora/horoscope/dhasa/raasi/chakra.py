@@ -64,7 +64,7 @@ def _dhasa_seed(jd,place,lagna_house,lagna_lord_house):
         kaala_period = 'ToNight'
         _dhasa_seed = lagna_house    
     return _dhasa_seed
-def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_hours=1,include_antardhasa=False):
+def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_hours=1,include_antardhasa=False,as_jd=False):
     jd_at_dob = utils.julian_day_number(dob, tob)
     jd_years = drik.next_solar_date(jd_at_dob, place, years=years, months=months,sixty_hours=months)
     from jhora.horoscope.chart import charts, house
@@ -78,16 +78,14 @@ def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=
         _bhukthi_duration = _dhasa_duration/12.0
         if include_antardhasa:
             for bhukthi_lord in [(dhasa_lord+h)%12 for h in range(12)]:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-                dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,round(_bhukthi_duration,2)))
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
+                dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,_bhukthi_duration if as_jd else round(_bhukthi_duration,2)))
                 start_jd += _bhukthi_duration * year_duration
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-            dhasa_info.append((dhasa_lord,dhasa_start,round(_dhasa_duration,2)))
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
+            dhasa_info.append((dhasa_lord,dhasa_start,_dhasa_duration if as_jd else round(_dhasa_duration,2)))
             start_jd += _dhasa_duration * year_duration
-    return dhasa_info
+    return utils.dhasa_rows_as_jd(dhasa_info,year_duration,end_jd=start_jd) if as_jd else dhasa_info
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests.chakra_test()
\ No newline at end of file
@@ -21,6 +21,7 @@
 from jhora import const,utils
 from jhora.horoscope.chart import charts, house
 from jhora.panchanga import drik
+from jhora.horoscope.dhasa.raasi import raasi_dhasa_kernel
 """
     1=> KN Rao method 
     2=> Parasara/PVN Rao Method - from https://vedicastrologer.org/articles/pp_chara_dasa.pdf
@@ -225,10 +226,11 @@ def _dhasa_progression_raghava_bhatta_method(planet_positions,gender=1):
         _dhasa_progression = [(dhasa_seed+h+4)%12 for h in range(12)]
     return _dhasa_progression
 def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_hours=1,include_antardhasa=True,
-                         chara_method=1,gender=0):
+                         chara_method=1,gender=0,as_jd=False):
     """
         chara_method = 1 => Parasara/PVN Rao Method of two cycles. 2nd cycle duration 12-1st duration
         chara_methos = 2 => KN Rao Single Cycle
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
     """
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, divisional_chart_factor=divisional_chart_factor)
@@ -236,25 +238,28 @@ def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=
     start_jd = jd_at_dob
     dhasas = []
     _dhasa_cycles = 1 if chara_method==2 else 2
+    if chara_method==1:
+        """ KN Rao method durations are the narayana durations of the raasi dhasa kernel """
+        durations = raasi_dhasa_kernel.RaasiDhasaTables([planet_positions]).narayana_durations[0].tolist()
+    else:
+        durations = [_dhasa_duration_pvnrao_method(planet_positions, lord) for lord in range(12)]
     for dc in range(_dhasa_cycles):
         for lord in dhasa_progression:
-            dd = _dhasa_duration_knrao_method(planet_positions, lord) if chara_method==1 else _dhasa_duration_pvnrao_method(planet_positions, lord)
+            dd = durations[lord]
             if dc==1: # 2nd cycle for chara_method=1
                 dd = 12.0-dd
             bhukthis = _antardhasa(dhasa_progression)
             if include_antardhasa:
                 ddb = dd/12
                 for bhukthi in bhukthis:
-                    y,m,d,h = utils.jd_to_gregorian(start_jd)
-                    dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                    dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                     dhasas.append((lord,bhukthi,dhasa_start,ddb))
                     start_jd += ddb * one_year_days
             else:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasas.append((lord,dhasa_start,dd))
                 start_jd += dd * one_year_days
-    return dhasas
+    return utils.dhasa_rows_as_jd(dhasas,one_year_days,end_jd=start_jd) if as_jd else dhasas
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests._STOP_IF_ANY_TEST_FAILED = False
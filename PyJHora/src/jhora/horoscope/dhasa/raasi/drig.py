@@ -21,16 +21,17 @@
 """ Computes Drig Dhasa from the chart """
 from jhora import const,utils
 from jhora.horoscope.chart import house,charts
-from jhora.horoscope.dhasa.raasi import narayana
-def drig_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,include_antardhasa=True):
+from jhora.horoscope.dhasa.raasi import raasi_dhasa_kernel
+def drig_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,include_antardhasa=True,as_jd=False):
     jd = utils.julian_day_number(dob,tob)
     planet_positions = charts.divisional_chart(jd, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE, divisional_chart_factor=divisional_chart_factor)
-    return drig_dhasa(planet_positions, dob,tob,include_antardhasa=include_antardhasa)
-def drig_dhasa(planet_positions,dob,tob,include_antardhasa=True):
+    return drig_dhasa(planet_positions, dob,tob,include_antardhasa=include_antardhasa,as_jd=as_jd)
+def drig_dhasa(planet_positions,dob,tob,include_antardhasa=True,as_jd=False):
     """
         computes drig dhasa from the chart
         @param chart: chart list 1-D. Format ['1/2','3/L',...,'',5/6/7','9','0'] # 12 houses with planets and Lagnam
         @param dob: tuple of date of birth format: (year,month,day)
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: list of drig dhasa from date of birth 
           Format: [ [dhasa_lord, dhasa_start_date, dhasa_end_date, [bhukthi_lord1, bhukthi_lord2...], dhasa_duration],...]
           Example: [[2, '1912-1-1', '1916-1-1', [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 0, 1], 4], 
@@ -49,20 +50,20 @@ def drig_dhasa(planet_positions,dob,tob,include_antardhasa=True):
         #print(s,dp)
         dhasa_progression.append(dp)
     dhasa_progression = sum(dhasa_progression,[])
+    tables = raasi_dhasa_kernel.RaasiDhasaTables([planet_positions])
+    durations = tables.narayana_durations[0].tolist()
     dhasa_info = []
     for dhasa_lord in dhasa_progression:
-        dhasa_duration = round(narayana._dhasa_duration(planet_positions,dhasa_lord),2)
+        dhasa_duration = round(durations[dhasa_lord],2)
         if include_antardhasa:
-            bhukthis = _antardhasa(dhasa_lord,p_to_h)
+            bhukthis = tables.bhukthis(0,dhasa_lord)
             dd = dhasa_duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,dhasa_duration))
             start_jd += dhasa_duration * const.sidereal_year
     # Second cycle
@@ -75,28 +76,19 @@ def drig_dhasa(planet_positions,dob,tob,include_antardhasa=True):
         if dhasa_duration <=0: # no need for second cycle as first cycle had 12 years
             continue
         if include_antardhasa:
-            bhukthis = _antardhasa(dhasa_lord,p_to_h)
+            bhukthis = tables.bhukthis(0,dhasa_lord)
             dd = dhasa_duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,dhasa_duration))
             start_jd += dhasa_duration * const.sidereal_year
         if total_dhasa_duration >= const.human_life_span_for_narayana_dhasa:
             break
-    return dhasa_info
-def _antardhasa(antardhasa_seed_rasi,p_to_h):
-    direction = -1
-    if p_to_h[6]==antardhasa_seed_rasi or antardhasa_seed_rasi in const.odd_signs: # Forward
-        direction = 1
-    if p_to_h[8]==antardhasa_seed_rasi:
-        direction *= -1
-    return [(antardhasa_seed_rasi+direction*i)%12 for i in range(12)]
+    return utils.dhasa_rows_as_jd(dhasa_info,const.sidereal_year,end_jd=start_jd) if as_jd else dhasa_info
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests._STOP_IF_ANY_TEST_FAILED = False
@@ -23,44 +23,30 @@ from jhora import const, utils
 from jhora.panchanga import drik
 from jhora.horoscope.chart import house, charts
 """ TODO: Dhasa Progression does not seem to match with JHora """
-def _get_dhasa_progression(planet_longitude):
-    nakshatra,paadham,_ = drik.nakshatra_pada(planet_longitude)
-    nakshatra -= 1
-    paadham -= 1
-    kalachakra_index = 0
-    if nakshatra in const.savya_stars_1:
-        kalachakra_index = 0
-    elif nakshatra in const.savya_stars_2:
-        kalachakra_index = 1
-    elif nakshatra in const.apasavya_stars_1:
-        kalachakra_index = 2
-    else:
-        kalachakra_index = 3
+one_star = (360.0/27)
+one_paadha = (360.0 / 108)
+""" Kalachakra index (0=savya_1, 1=savya_2, 2=apasavya_1, 3=apasavya_2) of each of the 27 stars """
+_kalachakra_index_of_star = [next(k for k,stars in enumerate(const.kalachakra_stars) if n in stars) for n in range(27)]
+""" Savya/Apasavya group that follows the 4th paadha of a star """
+_kalachakra_index_after_4th_paadha = [1,0,3,2]
+def antardhasa(dhasa_index_at_birth,dp_index,paramayush,kc_index,paadham):
+    dp_begin = kc_index*9*4+paadham*9+dhasa_index_at_birth+dp_index
+    antardhasa_progression=const.kalachakra_rasis_list[dp_begin:dp_begin+9]
+    antardhasa_duration = [const.kalachakra_dhasa_duration[r] for r in antardhasa_progression]
+    """ TODO: handle if above is empty list [] """
+    if len(antardhasa_duration)==0:
+        return []
+    dhasa_duration = antardhasa_duration[0]
+    antardhasa_fraction = dhasa_duration/sum(antardhasa_duration)
+    antardhasa_duration = [(ad * antardhasa_fraction) for ad in antardhasa_duration]
+    return [antardhasa_progression,antardhasa_duration]
+def _dhasa_periods_from_index_at_birth(kalachakra_index,paadham,dhasa_index_at_birth):
+    """ [[dhasa_rasi,[antardhasa_rasis,antardhasa_durations],dhasa_duration],...] when birth falls in dhasa_index_at_birth """
     dhasa_progression = const.kalachakra_rasis[kalachakra_index][paadham]
     dhasa_paramayush = const.kalachakra_paramayush[kalachakra_index][paadham]
-    dhasa_duration = [const.kalachakra_dhasa_duration[r] for r in dhasa_progression]
-    one_star = (360.0/27)
-    one_paadha = (360.0 / 108)
-    nak_start_long = nakshatra*one_star + paadham * one_paadha
-    nak_travel_fraction = (planet_longitude-nak_start_long)/one_paadha
-    dhasa_duration_cumulative = np.cumsum(dhasa_duration)
-    paramayush_completed = nak_travel_fraction * dhasa_paramayush
-    dhasa_index_at_birth = next(x[0] for x in enumerate(dhasa_duration_cumulative) if x[1] > paramayush_completed)
-    dhasa_remaining_at_birth = dhasa_duration_cumulative[dhasa_index_at_birth]-paramayush_completed
-    kalachakra_index_next = kalachakra_index
+    kalachakra_index_next = _kalachakra_index_after_4th_paadha[kalachakra_index] if paadham==3 else kalachakra_index
     paadham_next = (paadham+1)%4
-    if paadham==3:
-        if kalachakra_index == 0:
-            kalachakra_index_next = 1
-        elif kalachakra_index == 1:
-            kalachakra_index_next = 0
-        elif kalachakra_index == 2:
-            kalachakra_index_next = 3
-        elif kalachakra_index == 3:
-            kalachakra_index_next = 2
     dhasa_progression = dhasa_progression[dhasa_index_at_birth:]+const.kalachakra_rasis[kalachakra_index_next][paadham_next][:dhasa_index_at_birth]
-    dhasa_duration = [const.kalachakra_dhasa_duration[r] for r in dhasa_progression]
-    dhasa_duration[0] = dhasa_remaining_at_birth
     dhasa_periods = []
     for i,dp in enumerate(dhasa_progression):
         ad = antardhasa(dhasa_index_at_birth,i, dhasa_paramayush, kalachakra_index_next, paadham)
@@ -68,24 +54,40 @@ def _get_dhasa_progression(planet_longitude):
             Temporary Fix if ad = empty list
         """
         if len(ad)==0: ad=[dhasa_progression,[const.kalachakra_dhasa_duration[r] for r in dhasa_progression]]
-        dhasa_periods.append([dp,ad,dhasa_duration[i]])
+        dhasa_periods.append([dp,ad,const.kalachakra_dhasa_duration[dp]])
     return dhasa_periods
-def antardhasa(dhasa_index_at_birth,dp_index,paramayush,kc_index,paadham):
-    dp_begin = kc_index*9*4+paadham*9+dhasa_index_at_birth+dp_index
-    antardhasa_progression=const.kalachakra_rasis_list[dp_begin:dp_begin+9]
-    antardhasa_duration = [const.kalachakra_dhasa_duration[r] for r in antardhasa_progression]
-    """ TODO: handle if above is empty list [] """
-    if len(antardhasa_duration)==0:
-        return []
-    dhasa_duration = antardhasa_duration[0]
-    antardhasa_fraction = dhasa_duration/sum(antardhasa_duration)
-    antardhasa_duration = [(ad * antardhasa_fraction) for ad in antardhasa_duration]
-    return [antardhasa_progression,antardhasa_duration]
-def kalachakra_dhasa(planet_longitude,jd,include_antardhasa=True):
+""" 
+    Precomputed tables of the 108 paadhas (index = nakshatra*4+paadham)
+    _pada_paramayush[p]: paramayush of the paadha
+    _pada_cumulative_durations[p]: cumulative dhasa durations of the paadha's progression
+    _pada_dhasa_periods[p][i]: dhasa periods (with antardhasa orderings) when birth falls in i-th dhasa of the paadha
+"""
+_pada_kalachakra_index = [_kalachakra_index_of_star[p//4] for p in range(108)]
+_pada_paramayush = [const.kalachakra_paramayush[_pada_kalachakra_index[p]][p%4] for p in range(108)]
+_pada_cumulative_durations = np.cumsum([[const.kalachakra_dhasa_duration[r] for r in const.kalachakra_rasis[_pada_kalachakra_index[p]][p%4]]
+                                        for p in range(108)],axis=1)
+_kalachakra_dhasa_periods = [[[_dhasa_periods_from_index_at_birth(kc,pd,i) for i in range(9)] for pd in range(4)] for kc in range(4)]
+_pada_dhasa_periods = [_kalachakra_dhasa_periods[_pada_kalachakra_index[p]][p%4] for p in range(108)]
+def _get_dhasa_progression(planet_longitude):
+    nakshatra,paadham,_ = drik.nakshatra_pada(planet_longitude)
+    nakshatra -= 1
+    paadham -= 1
+    pada_index = nakshatra*4 + paadham
+    nak_start_long = nakshatra*one_star + paadham * one_paadha
+    nak_travel_fraction = (planet_longitude-nak_start_long)/one_paadha
+    dhasa_duration_cumulative = _pada_cumulative_durations[pada_index]
+    paramayush_completed = nak_travel_fraction * _pada_paramayush[pada_index]
+    dhasa_index_at_birth = int(np.searchsorted(dhasa_duration_cumulative, paramayush_completed, side='right'))
+    dhasa_remaining_at_birth = dhasa_duration_cumulative[dhasa_index_at_birth]-paramayush_completed
+    dhasa_periods = [[dp,[list(ad[0]),list(ad[1])],dd] for dp,ad,dd in _pada_dhasa_periods[pada_index][dhasa_index_at_birth]]
+    dhasa_periods[0][-1] = dhasa_remaining_at_birth
+    return dhasa_periods
+def kalachakra_dhasa(planet_longitude,jd,include_antardhasa=True,as_jd=False):
     """
         Kalachara Dhasa calculation
         @param planet_longitude: Longitude of planet (default=moon) at the time of Date/time of birth as float
         @param dob: Date of birth as tuple (year,month,day)
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: list of [dhasa_rasi,dhasa_rasi_start_date, dhasa_rasi_end_date,[abtadhasa_rasis],dhasa_rasi_duration]
         Example: [[7, '1946-12-2', '1955-12-2', [7, 8, 9, 10, 11, 0, 1, 2, 3, 4, 5, 6], 9], [8, '1955-12-2', '1964-12-2', [8, 9, 10, 11, 0, 1, 2, 3, 4, 5, 6, 7], 9], ...]
     """
@@ -100,20 +102,18 @@ def kalachakra_dhasa(planet_longitude,jd,include_antardhasa=True):
         if include_antardhasa:
             for b in range(len(ad[0])):
                 bhukthi_lord = ad[0][b]; bhukthi_duration = ad[1][b] 
-                y,m,d,h = utils.jd_to_gregorian(dhasa_start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-                dp_new.append([ds,bhukthi_lord,dhasa_start,round(bhukthi_duration,2)])
+                dhasa_start = dhasa_start_jd if as_jd else utils.julian_day_to_date_time_string(dhasa_start_jd)
+                dp_new.append([ds,bhukthi_lord,dhasa_start,bhukthi_duration if as_jd else round(bhukthi_duration,2)])
                 dhasa_start_jd += bhukthi_duration*const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(dhasa_start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-            dp_new.append([ds,dhasa_start,round(dd,2)])
+            dhasa_start = dhasa_start_jd if as_jd else utils.julian_day_to_date_time_string(dhasa_start_jd)
+            dp_new.append([ds,dhasa_start,dd if as_jd else round(dd,2)])
         dhasa_duration_in_days = dd*const.sidereal_year
         dhasa_start_jd += dhasa_duration_in_days
     dhasa_periods = dp_new[:]
-    return dhasa_periods
+    return utils.dhasa_rows_as_jd(dhasa_periods,const.sidereal_year) if as_jd else dhasa_periods
 def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,dhasa_starting_planet=1,
-                      include_antardhasa=True,star_position_from_moon=1):
+                      include_antardhasa=True,star_position_from_moon=1,as_jd=False):
     """
         returns kalachakra dhasa bhukthi
         @param dob = Date of Birth as drik.Date tuple
@@ -126,6 +126,7 @@ def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,dhasa_starting_pla
             8 => Adhana Star (8th constellation from moon)
         @param dhasa_starting_planet 0=Sun 1=Moon(default)...8=Ketu, 'L'=Lagna
                                     M=Maandi, G=Gulika, T=Trisphuta, B=Bhindu, I=Indu, P=Pranapada
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: a list of [dhasa_lord,bhukthi_lord,bhukthi_start] if include_antardhasa=True
         @return: a list of [dhasa_lord,dhasa_start] if include_antardhasa=False
           Example: [ [7, 5, '1915-02-09'], [7, 0, '1917-06-10'], [7, 1, '1918-02-08'],...]
@@ -162,7 +163,7 @@ def get_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,dhasa_starting_pla
     if dhasa_starting_planet==1:
         one_star = (360 / 27.)        # 27 nakshatras span 360°
         planet_long += (star_position_from_moon-1)*one_star
-    return kalachakra_dhasa(planet_long, jd,include_antardhasa=include_antardhasa)
+    return kalachakra_dhasa(planet_long, jd,include_antardhasa=include_antardhasa,as_jd=as_jd)
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     utils.set_language('en')
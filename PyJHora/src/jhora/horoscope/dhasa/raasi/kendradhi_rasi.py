@@ -20,12 +20,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 from jhora import const, utils
 from jhora.horoscope.chart import charts, house
-from jhora.horoscope.dhasa.raasi import narayana
+from jhora.horoscope.dhasa.raasi import raasi_dhasa_kernel
 """ Also called Lagna Kendradi Raasi Dhasa """
 """ This file also finds Karaka Kendraddi Rasi Dasa - See karaka_kendradhi_rasi_dhasa() """
-def lagna_kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=1):
-    return kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=divisional_chart_factor)
-def kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=1,include_antardhasa=True):
+def lagna_kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=1,as_jd=False):
+    return kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=divisional_chart_factor,as_jd=as_jd)
+def kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=1,include_antardhasa=True,as_jd=False):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, divisional_chart_factor=divisional_chart_factor)
     p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
@@ -46,21 +46,21 @@ def kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=1,include_antardh
     ks = sum(house.kendras()[:3],[])
     #print('ks',ks)
     dhasa_progression = [(dhasa_seed_sign+direction*(k-1))%12 for k in ks]
+    tables = raasi_dhasa_kernel.RaasiDhasaTables([planet_positions])
+    durations = tables.narayana_durations[0].tolist()
     dhasa_info = []
     start_jd = jd_at_dob
     for dhasa_lord in dhasa_progression:
-        dhasa_duration = narayana._dhasa_duration(planet_positions,dhasa_lord)
+        dhasa_duration = durations[dhasa_lord]
         if include_antardhasa:
-            bhukthis = _antardhasa(dhasa_lord,p_to_h)
+            bhukthis = tables.bhukthis(0,dhasa_lord)
             dd = dhasa_duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,dhasa_duration))
             start_jd += dhasa_duration * const.sidereal_year
     # Second cycle
@@ -72,22 +72,20 @@ def kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=1,include_antardh
         if dhasa_duration <=0: # no need for second cycle as first cycle had 12 years
             continue
         if include_antardhasa:
-            bhukthis = _antardhasa(dhasa_lord,p_to_h)
+            bhukthis = tables.bhukthis(0,dhasa_lord)
             dd = dhasa_duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,dhasa_duration))
             start_jd += dhasa_duration * const.sidereal_year
         if total_dhasa_duration >= const.human_life_span_for_narayana_dhasa:
             break
-    return dhasa_info
-def karaka_kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=1,karaka_index=1,include_antardhasa=True):
+    return utils.dhasa_rows_as_jd(dhasa_info,const.sidereal_year,end_jd=start_jd) if as_jd else dhasa_info
+def karaka_kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=1,karaka_index=1,include_antardhasa=True,as_jd=False):
     if karaka_index not in range(1,9):
         print('Karaka Index should be in the range (1..8). Index 1 assumed')
         karaka_index = 1
@@ -109,21 +107,21 @@ def karaka_kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=1,karaka_i
         direction = -1
     ks = sum(house.kendras()[:3],[])
     dhasa_progression = [(dhasa_seed_sign+direction*(k-1))%12 for k in ks]
+    tables = raasi_dhasa_kernel.RaasiDhasaTables([planet_positions])
+    durations = tables.narayana_durations[0].tolist()
     dhasa_info = []
     start_jd = jd_at_dob
     for dhasa_lord in dhasa_progression:
-        dhasa_duration = narayana._dhasa_duration(planet_positions,dhasa_lord)
+        dhasa_duration = durations[dhasa_lord]
         if include_antardhasa:
-            bhukthis = _antardhasa(dhasa_lord,p_to_h)
+            bhukthis = tables.bhukthis(0,dhasa_lord)
             dd = dhasa_duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,dhasa_duration))
             start_jd += dhasa_duration * const.sidereal_year
     # Second cycle
@@ -135,29 +133,20 @@ def karaka_kendradhi_rasi_dhasa(dob,tob,place,divisional_chart_factor=1,karaka_i
         if dhasa_duration <=0: # no need for second cycle as first cycle had 12 years
             continue
         if include_antardhasa:
-            bhukthis = _antardhasa(dhasa_lord,p_to_h)
+            bhukthis = tables.bhukthis(0,dhasa_lord)
             dd = dhasa_duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,dhasa_duration))
             start_jd += dhasa_duration * const.sidereal_year
         if total_dhasa_duration >= const.human_life_span_for_narayana_dhasa:
             break
-    return dhasa_info
+    return utils.dhasa_rows_as_jd(dhasa_info,const.sidereal_year,end_jd=start_jd) if as_jd else dhasa_info
     
-def _antardhasa(antardhasa_seed_rasi,p_to_h):
-    direction = -1
-    if p_to_h[6]==antardhasa_seed_rasi or antardhasa_seed_rasi in const.odd_signs: # Forward
-        direction = 1
-    if p_to_h[8]==antardhasa_seed_rasi:
-        direction *= -1
-    return [(antardhasa_seed_rasi+direction*i)%12 for i in range(12)]
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests.kendradhi_rasi_test()
\ No newline at end of file
@@ -21,12 +21,12 @@
 from jhora import const, utils
 from jhora.horoscope.chart import charts, house
 from jhora.horoscope.dhasa.raasi import narayana
-def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_hours=1,include_antardhasa=True):
+def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_hours=1,include_antardhasa=True,as_jd=False):
     jd_at_dob = utils.julian_day_number(dob, tob)
     navamsa_planet_positions = charts.divisional_chart(jd_at_dob, place, divisional_chart_factor=9)
     dhasa_seed_sign = navamsa_planet_positions[0][1][0]
     planet_positions = charts.divisional_chart(jd_at_dob, place, divisional_chart_factor=divisional_chart_factor)
-    return narayana._narayana_dhasa_calculation(planet_positions,dhasa_seed_sign,dob,tob,place,years=years,months=months,sixty_hours=sixty_hours,include_antardhasa=include_antardhasa,varsha_narayana=False)
+    return narayana._narayana_dhasa_calculation(planet_positions,dhasa_seed_sign,dob,tob,place,years=years,months=months,sixty_hours=sixty_hours,include_antardhasa=include_antardhasa,varsha_narayana=False,as_jd=as_jd)
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests._STOP_IF_ANY_TEST_FAILED = False
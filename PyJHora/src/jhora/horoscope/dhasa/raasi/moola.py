@@ -22,12 +22,13 @@ from jhora import const, utils
 from jhora.horoscope.chart import house, charts
 from jhora.horoscope.dhasa.raasi import narayana
 """ Also called Lagna Kendradi Rasi Dhasa """
-def moola_dhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_hours=1,include_antardhasa=True):
+def moola_dhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_hours=1,include_antardhasa=True,as_jd=False):
     """
         calculate Lagna Kendraadhi dhasa aka Moola Dhasa
         @param chart: house_to_planet_list
           Example: ['','','','','2','7','1/5','0','3/4','L','','6/8'] 1st element is Aries and last is Pisces
         @param dob: Date of birth as a tuple e.g. (1999,12,31)  
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: 2D list of [dhasa_lord,dhasa_start,[Bhukthi_lord1,bhukthi_lord2,], dhasa_duraation
           Example: [ [7, '1993-6-1', '1996-6-1', [7, 8, 9, 10, 11, 0, 1, 2, 3, 4, 5, 6], 3], ...]
     """
@@ -58,8 +59,7 @@ def moola_dhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_h
     for sign in dhasa_progression:
         dhasa_duration = narayana._dhasa_duration(pp,sign)
         dhasa_end = dhasa_start+dhasa_duration*const.sidereal_year
-        y,m,d,h = utils.jd_to_gregorian(dhasa_start)
-        dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+        dhasa_start = dhasa_start if as_jd else utils.julian_day_to_date_time_string(dhasa_start)
         if include_antardhasa:
             antardhasa = _antardhasa(sign,p_to_h)#)+' '+str(dhasa_duration)+' months each'
             dhasa_periods.append((sign,dhasa_start,antardhasa,dhasa_duration))
@@ -78,8 +78,7 @@ def moola_dhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_h
             #dhasa_duration = 12
             continue
         dhasa_end = dhasa_start+dhasa_duration*const.sidereal_year
-        y,m,d,h = utils.jd_to_gregorian(dhasa_start)
-        dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+        dhasa_start = dhasa_start if as_jd else utils.julian_day_to_date_time_string(dhasa_start)
         if include_antardhasa:
             antardhasa = _antardhasa(sign,p_to_h)#)+' '+str(dhasa_duration)+' months each'
             dhasa_periods.append((sign,dhasa_start,antardhasa,dhasa_duration))
@@ -91,6 +90,9 @@ def moola_dhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_h
         #print('total_dhasa_duration',total_dhasa_duration,dhasa_end)
         if total_dhasa_duration >= const.human_life_span_for_narayana_dhasa:
             break
+    if as_jd: # antardhasa list moves ahead of the start julian day => (sign,[antardhasa],start_jd,end_jd,duration_years)
+        dhasa_rows = [(row[0],*row[2:-1],row[1],row[-1]) for row in dhasa_periods]
+        return utils.dhasa_rows_as_jd(dhasa_rows,const.sidereal_year,end_jd=dhasa_start)
     return dhasa_periods
 def _antardhasa(antardhasa_seed_rasi,p_to_h):
     direction = -1
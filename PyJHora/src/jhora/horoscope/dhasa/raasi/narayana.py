@@ -21,10 +21,10 @@
 from jhora import const,utils
 from jhora.horoscope.chart import charts, house
 from jhora.panchanga import drik
+from jhora.horoscope.dhasa.raasi import raasi_dhasa_kernel
 year_duration = const.sidereal_year
 def _dhasa_duration(planet_positions,sign,varsha_narayana=False):
     p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
-    h_to_p = utils.get_house_to_planet_dict_from_planet_to_house_dict(p_to_h)
     lord_of_sign = house.house_owner_from_planet_positions(planet_positions, sign)
     house_of_lord = p_to_h[lord_of_sign]
     dhasa_period = 0
@@ -48,34 +48,45 @@ def _dhasa_duration(planet_positions,sign,varsha_narayana=False):
     if varsha_narayana:
         dhasa_period *= 3
     return dhasa_period
-def _narayana_dhasa_calculation(planet_positions,dhasa_seed_sign,dob,tob,place,years=1, months=1, sixty_hours=1,include_antardhasa=True,varsha_narayana=False):
-    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
+def _narayana_dhasa_calculation(planet_positions,dhasa_seed_sign,dob,tob,place,years=1, months=1, sixty_hours=1,include_antardhasa=True,varsha_narayana=False,as_jd=False):
+    """ Lords, stronger rasis, durations and antardhasas of the chart are looked up from the raasi dhasa kernel tables """
+    tables = raasi_dhasa_kernel.RaasiDhasaTables([planet_positions])
+    jd_at_dob = utils.julian_day_number(dob, tob)
+    dhasa_start_jd = drik.next_solar_date(jd_at_dob, place, years=years, months=months, sixty_hours=sixty_hours)
+    return _narayana_dhasa_from_tables(tables,0,dhasa_seed_sign,dhasa_start_jd,include_antardhasa,varsha_narayana,as_jd)
+def _narayana_dhasa_from_tables(tables,chart,dhasa_seed_sign,dhasa_start_jd,include_antardhasa=True,varsha_narayana=False,as_jd=False):
+    """
+        Narayana dhasa periods of one chart of raasi_dhasa_kernel.RaasiDhasaTables
+        @param chart: index of the chart in tables
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
+    """
+    saturn_house = tables.planet_rasis[chart,7]; ketu_house = tables.planet_rasis[chart,9]
     dhasa_factor = year_duration
     if varsha_narayana:
         dhasa_factor /= 360
     dhasa_progression = const.narayana_dhasa_normal_progression[dhasa_seed_sign]
-    if p_to_h[8]==dhasa_seed_sign:
+    if ketu_house==dhasa_seed_sign:
         dhasa_progression = const.narayana_dhasa_ketu_exception_progression[dhasa_seed_sign]
-    elif p_to_h[6]==dhasa_seed_sign:
+    elif saturn_house==dhasa_seed_sign:
         dhasa_progression = const.narayana_dhasa_saturn_exception_progression[dhasa_seed_sign]
+    durations = tables.narayana_durations[chart].tolist()
+    antardhasa_seeds = tables.narayana_antardhasa_seeds()[chart].tolist()
     dhasa_periods = []
-    jd_at_dob = utils.julian_day_number(dob, tob)
-    dhasa_start_jd = drik.next_solar_date(jd_at_dob, place, years=years, months=months, sixty_hours=sixty_hours)
-    for dhasa_lord in dhasa_progression:
-        dhasa_duration = _dhasa_duration(planet_positions,dhasa_lord,varsha_narayana)
-        bhukthis = _narayana_antardhasa(planet_positions,dhasa_lord)#_narayana_antardhasa(dhasa_lord,p_to_h)
+    def _append_periods(dhasa_lord,dhasa_duration,dhasa_start_jd):
         if include_antardhasa:
             dhasa_duration /= 12
-            for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(dhasa_start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            for bhukthi_lord in tables.bhukthis(chart,antardhasa_seeds[dhasa_lord]):
+                dhasa_start = dhasa_start_jd if as_jd else utils.julian_day_to_date_time_string(dhasa_start_jd)
                 dhasa_periods.append((dhasa_lord,bhukthi_lord,dhasa_start,dhasa_duration))
                 dhasa_start_jd += dhasa_duration * dhasa_factor
         else:
-            y,m,d,h = utils.jd_to_gregorian(dhasa_start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = dhasa_start_jd if as_jd else utils.julian_day_to_date_time_string(dhasa_start_jd)
             dhasa_periods.append((dhasa_lord,dhasa_start,dhasa_duration))
             dhasa_start_jd += dhasa_duration * dhasa_factor
+        return dhasa_start_jd
+    for dhasa_lord in dhasa_progression:
+        dhasa_duration = durations[dhasa_lord]*3 if varsha_narayana else durations[dhasa_lord]
+        dhasa_start_jd = _append_periods(dhasa_lord, dhasa_duration, dhasa_start_jd)
     # Second cycle
     total_dhasa_duration = sum([row[-1] for row in dhasa_periods ])
     for c,dhasa_lord in enumerate(dhasa_progression):
@@ -83,29 +94,17 @@ def _narayana_dhasa_calculation(planet_positions,dhasa_seed_sign,dob,tob,place,y
         total_dhasa_duration += dhasa_duration
         if dhasa_duration <=0: # no need for second cycle as first cycle had 12 years
             continue
-        bhukthis = _narayana_antardhasa(planet_positions,dhasa_lord)#_narayana_antardhasa(dhasa_lord,p_to_h)
-        if include_antardhasa:
-            dhasa_duration /= 12
-            for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(dhasa_start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-                dhasa_periods.append((dhasa_lord,bhukthi_lord,dhasa_start,dhasa_duration))
-                dhasa_start_jd += dhasa_duration * dhasa_factor
-        else:
-            y,m,d,h = utils.jd_to_gregorian(dhasa_start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-            dhasa_periods.append((dhasa_lord,dhasa_start,dhasa_duration))
-            dhasa_start_jd += dhasa_duration * dhasa_factor
+        dhasa_start_jd = _append_periods(dhasa_lord, dhasa_duration, dhasa_start_jd)
         if varsha_narayana:
             if total_dhasa_duration >= const.human_life_span_for_narayana_dhasa*3:
                 break
         else:
             if total_dhasa_duration >= const.human_life_span_for_narayana_dhasa:
                 break
-    return dhasa_periods
-def narayana_dhasa_for_divisional_chart(dob,tob,place,years=1, months=1, sixty_hours=1,divisional_chart_factor=1,include_antardhasa=True):
+    return utils.dhasa_rows_as_jd(dhasa_periods,dhasa_factor,end_jd=dhasa_start_jd) if as_jd else dhasa_periods
+def narayana_dhasa_for_divisional_chart(dob,tob,place,years=1, months=1, sixty_hours=1,divisional_chart_factor=1,include_antardhasa=True,as_jd=False):
     if divisional_chart_factor==1:
-        return narayana_dhasa_for_rasi_chart(dob, tob, place, years, months, sixty_hours, include_antardhasa)
+        return narayana_dhasa_for_rasi_chart(dob, tob, place, years, months, sixty_hours, include_antardhasa, as_jd)
     # Get Rasi Chart first
     jd_at_dob = utils.julian_day_number(dob,tob)
     planet_positions_rasi = charts.divisional_chart(jd_at_dob, place)
@@ -126,8 +125,38 @@ def narayana_dhasa_for_divisional_chart(dob,tob,place,years=1, months=1, sixty_h
     h_to_p_varga = utils.get_house_planet_list_from_planet_positions(varga_planet_positions)
     seventh_house = (lord_sign+7-1)%12
     dhasa_seed_sign = house.stronger_rasi_from_planet_positions(varga_planet_positions, lord_sign, seventh_house)
-    return _narayana_dhasa_calculation(varga_planet_positions,dhasa_seed_sign,dob,tob,place,years=years, months=months, sixty_hours=sixty_hours,include_antardhasa=include_antardhasa,varsha_narayana=False)
-def narayana_dhasa_for_rasi_chart(dob,tob,place,years=1,months=1,sixty_hours=1,include_antardhasa=True):
+    return _narayana_dhasa_calculation(varga_planet_positions,dhasa_seed_sign,dob,tob,place,years=years, months=months, sixty_hours=sixty_hours,include_antardhasa=include_antardhasa,varsha_narayana=False,as_jd=as_jd)
+def narayana_dhasa_for_all_divisional_charts(dob,tob,place,divisional_chart_factors=None,years=1,months=1,sixty_hours=1,
+                                             include_antardhasa=True,as_jd=False):
+    """
+        Narayana dhasa of many divisional charts at once.
+        The rasi chart is computed once, the vargas are derived from it and the lords, stronger rasis,
+        durations and antardhasas of all the vargas come from one raasi_dhasa_kernel.RaasiDhasaTables.
+        @param divisional_chart_factors: list of divisional chart factors (Default=None => const.division_chart_factors)
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
+        @return: dict {divisional_chart_factor: narayana dhasa periods} 
+            periods are same as narayana_dhasa_for_divisional_chart(...,divisional_chart_factor=...)
+    """
+    dcfs = const.division_chart_factors if divisional_chart_factors is None else divisional_chart_factors
+    jd_at_dob = utils.julian_day_number(dob, tob)
+    planet_positions_rasi = charts.rasi_chart(jd_at_dob, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE)
+    varga_positions = [charts.divisional_positions_from_rasi_positions(planet_positions_rasi, divisional_chart_factor=dcf)
+                       for dcf in dcfs]
+    tables = raasi_dhasa_kernel.RaasiDhasaTables([planet_positions_rasi]+varga_positions)
+    asc_house = planet_positions_rasi[0][1][0]
+    dhasa_start_jd = drik.next_solar_date(jd_at_dob, place, years=years, months=months, sixty_hours=sixty_hours)
+    dhasas = {}
+    for chart,dcf in enumerate(dcfs,start=1):
+        if dcf==1:
+            lord_sign = asc_house
+        else:
+            """ Rasi occupied (in the varga) by the lord of the dcf-th house from lagna in rasi chart is the varga lagna """
+            lord_of_seed_house = int(tables.dhasa_lords[0,(asc_house+dcf-1)%12])
+            lord_sign = int(tables.planet_rasis[chart,lord_of_seed_house+1])
+        dhasa_seed_sign = tables.stronger_rasi(chart, lord_sign, (lord_sign+6)%12)
+        dhasas[dcf] = _narayana_dhasa_from_tables(tables,chart,dhasa_seed_sign,dhasa_start_jd,include_antardhasa,as_jd=as_jd)
+    return dhasas
+def narayana_dhasa_for_rasi_chart(dob,tob,place,years=1,months=1,sixty_hours=1,include_antardhasa=True,as_jd=False):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.rasi_chart(jd_at_dob, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE)
     h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions)
@@ -135,30 +164,8 @@ def narayana_dhasa_for_rasi_chart(dob,tob,place,years=1,months=1,sixty_hours=1,i
     asc_house = p_to_h[const._ascendant_symbol]
     seventh_house = (asc_house+7-1)%12
     dhasa_seed_sign = house.stronger_rasi_from_planet_positions(planet_positions, asc_house, seventh_house)
-    return _narayana_dhasa_calculation(planet_positions,dhasa_seed_sign,dob,tob,place,years=years,months=months,sixty_hours=sixty_hours,include_antardhasa=include_antardhasa,varsha_narayana=False)
-def _narayana_antardhasa(planet_positions,dhasa_rasi):
-    _DEBUG_ = False
-    if _DEBUG_:print('dhasa_rasi',utils.RAASI_LIST[dhasa_rasi])
-    lord_of_dhasa_rasi = house.house_owner_from_planet_positions(planet_positions, dhasa_rasi, check_during_dhasa=True)
-    if _DEBUG_:print('lord_of_dhasa_rasi',utils.PLANET_NAMES[lord_of_dhasa_rasi])
-    house_of_dhasa_rasi_lord = planet_positions[lord_of_dhasa_rasi+1][1][0]
-    if _DEBUG_:print('house_of_dhasa_rasi_lord',utils.RAASI_LIST[house_of_dhasa_rasi_lord])
-    lord_of_7thhouse_of_dhasa_rasi = house.house_owner_from_planet_positions(planet_positions, (dhasa_rasi+7)%12, check_during_dhasa=True)
-    if _DEBUG_:print('lord_of_7thhouse_of_dhasa_rasi',utils.PLANET_NAMES[lord_of_7thhouse_of_dhasa_rasi])
-    house_of_dhasa_rasi_lord_7thHouse = planet_positions[lord_of_7thhouse_of_dhasa_rasi+1][1][0]
-    if _DEBUG_:print('house_of_dhasa_rasi_lord_7thHouse',utils.RAASI_LIST[house_of_dhasa_rasi_lord_7thHouse])
-    antardhasa_seed_rasi = house.stronger_rasi_from_planet_positions(planet_positions, house_of_dhasa_rasi_lord, house_of_dhasa_rasi_lord_7thHouse)
-    if _DEBUG_:print('stronger antardhasa_seed_rasi',utils.RAASI_LIST[antardhasa_seed_rasi])
-    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
-    return _narayana_antardhasa_old(antardhasa_seed_rasi,p_to_h)
-def _narayana_antardhasa_old(antardhasa_seed_rasi,p_to_h):
-    direction = -1
-    if p_to_h[6]==antardhasa_seed_rasi or antardhasa_seed_rasi in const.odd_signs: # Forward
-        direction = 1
-    if p_to_h[8]==antardhasa_seed_rasi:
-        direction *= -1
-    return [(antardhasa_seed_rasi+direction*i)%12 for i in range(12)]
-def varsha_narayana_dhasa_bhukthi(dob,tob,place,years=1,months=1,sixty_hours=1,divisional_chart_factor=1,include_antardhasa=True):
+    return _narayana_dhasa_calculation(planet_positions,dhasa_seed_sign,dob,tob,place,years=years,months=months,sixty_hours=sixty_hours,include_antardhasa=include_antardhasa,varsha_narayana=False,as_jd=as_jd)
+def varsha_narayana_dhasa_bhukthi(dob,tob,place,years=1,months=1,sixty_hours=1,divisional_chart_factor=1,include_antardhasa=True,as_jd=False):
     jd_at_dob = utils.julian_day_number(dob, tob)
     jd_at_years = drik.next_solar_date(jd_at_dob, place, years=years)
     rasi_planet_positions = charts.rasi_chart(jd_at_years, place)
@@ -170,7 +177,7 @@ def varsha_narayana_dhasa_bhukthi(dob,tob,place,years=1,months=1,sixty_hours=1,d
     h_to_p_varga = utils.get_house_to_planet_dict_from_planet_to_house_dict(p_to_h_varga)
     annual_house_owner_in_varga = house.house_owner_from_planet_positions(varga_planet_positions,annual_house,check_during_dhasa=True)
     dhasa_seed_sign = p_to_h_varga[annual_house_owner_in_varga]
-    nd = _narayana_dhasa_calculation(varga_planet_positions, dhasa_seed_sign, dob,tob,place,years=years,months=months,sixty_hours=sixty_hours,include_antardhasa=include_antardhasa,varsha_narayana=True)
+    nd = _narayana_dhasa_calculation(varga_planet_positions, dhasa_seed_sign, dob,tob,place,years=years,months=months,sixty_hours=sixty_hours,include_antardhasa=include_antardhasa,varsha_narayana=True,as_jd=as_jd)
     return nd
     
 if __name__ == "__main__":
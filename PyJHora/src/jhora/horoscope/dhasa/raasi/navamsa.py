@@ -33,7 +33,7 @@ Birth in Sign    Ar    Ta    Ge    Cn    Le    Vi    Li    Sc    Sg    Cp    Aq
 dhasa_adhipati_list = [0,4,6,10,0,4,6,10,0,4,6,10]
 antardhasa_list = [6,0,8,10,4,8,6,0,8,10,4,8]
 dhasa_duration = 9
-def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=9,years=1,months=1,sixty_hours=1,include_antardhasa=True):
+def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=9,years=1,months=1,sixty_hours=1,include_antardhasa=True,as_jd=False):
     jd_at_dob = utils.julian_day_number(dob, tob)
     planet_positions = charts.divisional_chart(jd_at_dob, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE, 
                                                divisional_chart_factor=divisional_chart_factor, years=years, 
@@ -53,16 +53,14 @@ def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=9,years=1,months=
         if include_antardhasa:
             dd = duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,duration))
             start_jd += duration * sidereal_year
-    return dhasa_info
+    return utils.dhasa_rows_as_jd(dhasa_info,sidereal_year,end_jd=start_jd) if as_jd else dhasa_info
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests.navamsa_dhasa_test()
\ No newline at end of file
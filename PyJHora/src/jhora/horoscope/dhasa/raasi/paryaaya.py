@@ -59,7 +59,7 @@ def _dhasa_lords(planet_positions,dhasa_seed):
             dhasa_lords = [(sr-h+13)%12 for h in [1,7,2,8,3,9,4,10,5,11,6,12]]
     return dhasa_lords
 def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=6,years=1,months=1,sixty_hours=1,include_antardhasa=True,
-                         use_tribhagi_variation=False):
+                         use_tribhagi_variation=False,as_jd=False):
     _dhasa_cycles = 2
     _tribhagi_factor = 1
     if use_tribhagi_variation:
@@ -83,16 +83,14 @@ def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=6,years=1,months=
             if include_antardhasa:
                 dd = duration/12
                 for bhukthi_lord in bhukthis:
-                    y,m,d,h = utils.jd_to_gregorian(start_jd)
-                    dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                    dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                     dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                     start_jd += dd * sidereal_year
             else:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,dhasa_start,duration))
                 start_jd += duration * sidereal_year
-    return dhasa_info
+    return utils.dhasa_rows_as_jd(dhasa_info,sidereal_year,end_jd=start_jd) if as_jd else dhasa_info
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests.paryaaya_dhasa_test()
\ No newline at end of file
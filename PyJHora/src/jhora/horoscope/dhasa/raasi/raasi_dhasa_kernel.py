@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Copyright (C) Open Astro Technologies, USA.
+# Modified by Sundar Sundaresan, USA. carnaticmusicguru2015@comcast.net
+# Downloaded from https://github.com/naturalstupid/PyJHora
+
+# This file is part of the "PyJHora" Python library
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Shared raasi dhasa kernel.
+    Sign lords, stronger rasi comparisons, narayana type dhasa durations and antardhasa directions
+    of one or more charts (for example all vargas of a birth) are computed together as numpy tables.
+    Narayana, Drig, Kendradhi Rasi, Sudasa and Chara dhasas read their sequences and
+    durations from these tables instead of evaluating the rules sign by sign.
+"""
+import numpy as np
+from jhora import const
+from jhora.horoscope.chart import house
+_rasis = np.arange(12)
+_odd_signs = np.isin(_rasis, const.odd_signs)
+_even_footed_signs = np.isin(_rasis, const.even_footed_signs)
+_house_owners = np.array(const.house_owners)
+_house_strengths = np.array(const.house_strengths_of_planets)
+""" Scorpio and Aquarius have two lords - the stronger one of the chart is the lord """
+_co_lords = {7:(2,8), 10:(6,7)}
+class RaasiDhasaTables:
+    """
+        Raasi dhasa tables of one or more charts. The chart is the first axis of every table.
+        @param planet_positions_list: list of planet_positions (one per chart) in the format
+            [['L',(rasi,long)],[0,(rasi,long)],...]]
+        Tables:
+            planet_rasis: (N,10) rasi of Lagna (index 0) and of planet p (index p+1)
+            lords: (N,12) lord of each sign - same as house.house_owner_from_planet_positions
+            dhasa_lords: (N,12) same as house.house_owner_from_planet_positions(...,check_during_dhasa=True)
+            stronger_rasis: (N,12,12) same as house.stronger_rasi_from_planet_positions (see house._stronger_rasi_tables)
+            narayana_durations: (N,12) narayana dhasa years of each sign - same as narayana._dhasa_duration
+            bhukthi_directions: (N,12) +1/-1 direction of the antardhasas counted from each sign
+    """
+    def __init__(self,planet_positions_list):
+        self.planet_positions_list = list(planet_positions_list)
+        n_charts = len(self.planet_positions_list)
+        self.planet_rasis = np.array([[rasi for _,(rasi,_) in pp[:10]] for pp in self.planet_positions_list]).reshape(n_charts,10)
+        self.planet_longitudes = np.array([[long for _,(_,long) in pp[:10]] for pp in self.planet_positions_list]).reshape(n_charts,10)
+        self.lords = np.tile(_house_owners,(n_charts,1)); self.dhasa_lords = self.lords.copy()
+        for c,pp in enumerate(self.planet_positions_list):
+            for sign,(planet1,planet2) in _co_lords.items():
+                self.lords[c,sign] = house.stronger_planet_from_planet_positions(pp, planet1, planet2)
+                self.dhasa_lords[c,sign] = house.stronger_planet_from_planet_positions(pp, planet1, planet2, check_during_dhasa=True)
+        charts_index = np.arange(n_charts)[:,None]
+        self.lord_rasis = self.planet_rasis[charts_index,self.lords+1]
+        self.dhasa_lord_rasis = self.planet_rasis[charts_index,self.dhasa_lords+1]
+        self.stronger_rasis = house._stronger_rasi_tables(self.planet_rasis[:,1:], self.planet_longitudes[:,1:], self.lords)
+        self.narayana_durations = self._narayana_durations()
+        saturn_rasis = self.planet_rasis[:,7:8]; ketu_rasis = self.planet_rasis[:,9:10]
+        directions = np.where((saturn_rasis == _rasis) | _odd_signs, 1, -1)
+        self.bhukthi_directions = np.where(ketu_rasis == _rasis, -directions, directions)
+    def __len__(self):
+        return len(self.planet_positions_list)
+    def _narayana_durations(self):
+        """ Narayana dhasa years of every sign (lord counted from sign, forward for odd footed signs) """
+        count = np.where(_even_footed_signs, (_rasis - self.lord_rasis) % 12, (self.lord_rasis - _rasis) % 12)
+        durations = np.where(count <= 0, 12, count)
+        strength = _house_strengths[self.lords, self.lord_rasis]
+        durations = durations + (strength == const._EXALTED_UCCHAM) - (strength == const._DEBILITATED_NEECHAM)
+        return durations
+    def stronger_rasi(self,chart,rasi1,rasi2):
+        """ @return: stronger of rasi1 and rasi2 in chart (index of planet_positions_list) """
+        return int(self.stronger_rasis[chart,rasi1,rasi2])
+    def bhukthis(self,chart,seed_rasi):
+        """ @return: list of 12 antardhasa rasis starting from seed_rasi in the chart's antardhasa direction """
+        direction = int(self.bhukthi_directions[chart,seed_rasi])
+        return [(seed_rasi+direction*i)%12 for i in range(12)]
+    def narayana_antardhasa_seeds(self):
+        """
+            (N,12) narayana antardhasa seed of every dhasa rasi: stronger of the rasis occupied by the lords
+            of the dhasa rasi and of its (dhasa_rasi+7)%12 rasi
+        """
+        lord_rasis = self.dhasa_lord_rasis
+        seventh_lord_rasis = lord_rasis[:,(_rasis+7)%12]
+        return np.take_along_axis(self.stronger_rasis.reshape(len(self),144), lord_rasis*12+seventh_lord_rasis, axis=1)
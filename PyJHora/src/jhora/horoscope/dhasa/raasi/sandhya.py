@@ -34,7 +34,7 @@ _sandhya_duration = [10 for _ in range(12)]
 _panchaka_duration = [60/31,30/31,30/31,30/31,20/31,20/31,20/31,20/31,20/31,20/31,20/31,20/31]
 
 def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=1,sixty_hours=1,
-                         include_antardhasa=False,use_panchaka_variation=False):
+                         include_antardhasa=False,use_panchaka_variation=False,as_jd=False):
     jd_at_dob = utils.julian_day_number(dob, tob)
     pp = charts.divisional_chart(jd_at_dob, place, divisional_chart_factor=divisional_chart_factor, years=years, months=months,sixty_hours=sixty_hours)
     _dhasa_seed = pp[0][1][0]
@@ -45,23 +45,20 @@ def get_dhasa_antardhasa(dob,tob,place,divisional_chart_factor=1,years=1,months=
         if include_antardhasa:
             bhukthi_duration = dhasa_duration/12.0
             for bhukthi_lord in [(dhasa_lord+h)%12 for h in range(12)]:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,round(bhukthi_duration,2)))
                 start_jd += bhukthi_duration * const.sidereal_year
         elif use_panchaka_variation:
             for b,bhukthi_lord in enumerate([(dhasa_lord+h)%12 for h in range(12)]):
                 bhukthi_duration = _panchaka_duration[b]
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,round(bhukthi_duration,2)))
                 start_jd += bhukthi_duration * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,round(dhasa_duration,2)))
             start_jd += dhasa_duration * const.sidereal_year
-    return dhasa_info
+    return utils.dhasa_rows_as_jd(dhasa_info,const.sidereal_year,end_jd=start_jd) if as_jd else dhasa_info
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
     pvr_tests.sandhya_test()        
\ No newline at end of file
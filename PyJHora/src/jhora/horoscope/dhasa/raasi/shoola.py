@@ -21,16 +21,17 @@
 from jhora import const, utils
 from jhora.horoscope.chart import house,charts
 """ This is different from Nirayana Shoola Dhasa """
-def shoola_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,include_antardhasa=True):
+def shoola_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,include_antardhasa=True,as_jd=False):
     jd = utils.julian_day_number(dob,tob)
     planet_positions = charts.divisional_chart(jd, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE, divisional_chart_factor=divisional_chart_factor)
-    return shoola_dhasa(planet_positions,dob,tob,include_antardhasa=include_antardhasa)
-def shoola_dhasa(planet_positions,dob,tob,include_antardhasa=True):
+    return shoola_dhasa(planet_positions,dob,tob,include_antardhasa=include_antardhasa,as_jd=as_jd)
+def shoola_dhasa(planet_positions,dob,tob,include_antardhasa=True,as_jd=False):
     """
         calculate Shoola Dhasa
         @param chart: house_to_planet_list
           Example: ['','','','','2','7','1/5','0','3/4','L','','6/8'] 1st element is Aries and last is Pisces
         @param dob: Date of birth as a tuple e.g. (1999,12,31)  
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: 2D list of [dhasa_lord,dhasa_start,[Bhukthi_lord1,bhukthi_lord2,], dhasa_duraation
           Example: [ [7, '1993-6-1', '1996-6-1', [7, 8, 9, 10, 11, 0, 1, 2, 3, 4, 5, 6], 3], ...]
     """
@@ -59,13 +60,11 @@ def shoola_dhasa(planet_positions,dob,tob,include_antardhasa=True):
             bhukthis = _antardhasa(dhasa_lord,p_to_h)
             dd = dhasa_duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,dhasa_duration))
             start_jd += dhasa_duration * const.sidereal_year
     # Second cycle
@@ -81,18 +80,16 @@ def shoola_dhasa(planet_positions,dob,tob,include_antardhasa=True):
             bhukthis = _antardhasa(dhasa_lord,p_to_h)
             dd = dhasa_duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
                 dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
                 start_jd += dd * const.sidereal_year
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
             dhasa_info.append((dhasa_lord,dhasa_start,dhasa_duration))
             start_jd += dhasa_duration * const.sidereal_year
         if total_dhasa_duration >= const.human_life_span_for_narayana_dhasa:
             break
-    return dhasa_info
+    return utils.dhasa_rows_as_jd(dhasa_info,const.sidereal_year,end_jd=start_jd) if as_jd else dhasa_info
 def _shoola_dhasa(chart,dob):
     """
         calculate Shoola Dhasa
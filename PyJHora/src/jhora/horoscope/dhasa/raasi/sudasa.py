@@ -21,7 +21,7 @@
 from jhora import const,utils
 from jhora.panchanga import drik
 from jhora.horoscope.chart import house
-from jhora.horoscope.dhasa.raasi import narayana
+from jhora.horoscope.dhasa.raasi import raasi_dhasa_kernel
 from jhora.horoscope.chart import charts
 year_duration = const.sidereal_year
 """
@@ -30,15 +30,15 @@ year_duration = const.sidereal_year
     But same example data in JHora give different dhasa/bhukthi values
     Not Clear what JHora's algorithm is
 """
-def sudasa_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,include_antardhasa=True):
+def sudasa_dhasa_bhukthi(dob,tob,place,divisional_chart_factor=1,include_antardhasa=True,as_jd=False):
     jd = utils.julian_day_number(dob, tob)
     sl = drik.sree_lagna(jd, place, divisional_chart_factor=divisional_chart_factor)
     sree_lagna_house = sl[0]
     sree_lagna_longitude = sl[1]
     #print('sree_lagna_house',sree_lagna_house,'sree_lagna_longitude',sree_lagna_longitude)
     planet_positions = charts.divisional_chart(jd, place, ayanamsa_mode=const._DEFAULT_AYANAMSA_MODE, divisional_chart_factor=divisional_chart_factor)
-    return sudasa_dhasa_from_planet_positions(planet_positions,sree_lagna_house,sree_lagna_longitude,dob,tob,include_antardhasa=include_antardhasa)
-def sudasa_dhasa_from_planet_positions(planet_positions,sree_lagna_house,sree_lagna_longitude,dob,tob,include_antardhasa=True):
+    return sudasa_dhasa_from_planet_positions(planet_positions,sree_lagna_house,sree_lagna_longitude,dob,tob,include_antardhasa=include_antardhasa,as_jd=as_jd)
+def sudasa_dhasa_from_planet_positions(planet_positions,sree_lagna_house,sree_lagna_longitude,dob,tob,include_antardhasa=True,as_jd=False):
     """
         calculate Sudasa Dhasa
         @param chart: house_to_planet_list
@@ -47,6 +47,7 @@ def sudasa_dhasa_from_planet_positions(planet_positions,sree_lagna_house,sree_la
         @param sree_lagna_longitude: Longitude of Sree Lagna 
             Note: one can get sree lagna information from drik.sree_lagna()
         @param dob: Date of birth as a tuple e.g. (1999,12,31)  
+        @param as_jd: True => rows of (lords...,start_jd,end_jd,duration_years) instead of date strings (Default=False)
         @return: 2D list of [dhasa_lord,dhasa_start,[Bhukthi_lord1,bhukthi_lord2,], dhasa_duraation
           Example: [ [7, '1993-6-1', '1996-6-1', [7, 8, 9, 10, 11, 0, 1, 2, 3, 4, 5, 6], 3], ...]
     """
@@ -70,55 +71,49 @@ def sudasa_dhasa_from_planet_positions(planet_positions,sree_lagna_house,sree_la
     elif p_to_h[8]==sree_lagna_house:
         direction *= -1
     dhasa_progression = [(sree_lagna_house+direction*(k-1))%12 for k in ks]
-    dhasa_info = []
+    tables = raasi_dhasa_kernel.RaasiDhasaTables([planet_positions])
+    durations = tables.narayana_durations[0].tolist()
+    dhasa_info = []; row_durations = []
     for s,dhasa_lord in enumerate(dhasa_progression):
-        dhasa_duration = round(narayana._dhasa_duration(planet_positions,dhasa_lord),2)
+        dhasa_duration = round(durations[dhasa_lord],2)
         if s==0: dhasa_duration *= sl_frac_left
         if include_antardhasa:
-            bhukthis = _antardhasa(dhasa_lord,p_to_h)
+            bhukthis = tables.bhukthis(0,dhasa_lord)
             dd = dhasa_duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-                dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,round(dd,2)))
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
+                dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,round(dd,2))); row_durations.append(dd)
                 start_jd += dd * year_duration
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-            dhasa_info.append((dhasa_lord,dhasa_start,round(dhasa_duration,2)))
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
+            dhasa_info.append((dhasa_lord,dhasa_start,round(dhasa_duration,2))); row_durations.append(dhasa_duration)
             start_jd += dhasa_duration * year_duration
     # Second cycle
     dhasa_start = start_jd
     total_dhasa_duration = sum([row[-1] for row in dhasa_info ])
     for c,dhasa_lord in enumerate(dhasa_progression):
-        dhasa_duration = (12 - narayana._dhasa_duration(planet_positions,dhasa_lord)) if c==0 else (12 - dhasa_info[c][-1])
+        dhasa_duration = (12 - durations[dhasa_lord]) if c==0 else (12 - dhasa_info[c][-1])
         dhasa_duration = round(dhasa_duration,2)
         total_dhasa_duration += dhasa_duration
         if dhasa_duration <=0: # no need for second cycle as first cycle had 12 years
             continue
         if include_antardhasa:
-            bhukthis = _antardhasa(dhasa_lord,p_to_h)
+            bhukthis = tables.bhukthis(0,dhasa_lord)
             dd = dhasa_duration/12
             for bhukthi_lord in bhukthis:
-                y,m,d,h = utils.jd_to_gregorian(start_jd)
-                dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-                dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd))
+                dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
+                dhasa_info.append((dhasa_lord,bhukthi_lord,dhasa_start,dd)); row_durations.append(dd)
                 start_jd += dd * year_duration
         else:
-            y,m,d,h = utils.jd_to_gregorian(start_jd)
-            dhasa_start = '%04d-%02d-%02d' %(y,m,d) +' '+utils.to_dms(h, as_string=True)
-            dhasa_info.append((dhasa_lord,dhasa_start,dhasa_duration))
+            dhasa_start = start_jd if as_jd else utils.julian_day_to_date_time_string(start_jd)
+            dhasa_info.append((dhasa_lord,dhasa_start,dhasa_duration)); row_durations.append(dhasa_duration)
             start_jd += dhasa_duration * year_duration
         if total_dhasa_duration >= const.human_life_span_for_narayana_dhasa:
             break
+    if as_jd:
+        """ rounded durations of the rows above decide the second cycle - numeric rows carry the unrounded ones """
+        return utils.dhasa_rows_as_jd([(*row[:-1],dd) for row,dd in zip(dhasa_info,row_durations)],year_duration,end_jd=start_jd)
     return dhasa_info
-def _antardhasa(antardhasa_seed_rasi,p_to_h):
-    direction = -1
-    if p_to_h[6]==antardhasa_seed_rasi or antardhasa_seed_rasi in const.odd_signs: # Forward
-        direction = 1
-    if p_to_h[8]==antardhasa_seed_rasi:
-        direction *= -1
-    return [(antardhasa_seed_rasi+direction*i)%12 for i in range(12)]
 if __name__ == "__main__":
     dob = (1996,12,7);tob = (10,34,0);place = drik.Place('Chennai',13.0878,80.2785,5.5)
     jd = utils.julian_day_number(dob, tob)
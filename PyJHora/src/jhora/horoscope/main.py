@@ -934,38 +934,40 @@ class Horoscope():
         return [hb1, pvb1, dvb1]
     def _get_vimsopaka_bala(self,dob,tob,place_as_tuple):
         jd_at_dob = utils.julian_day_number(dob, tob)
-        sv = charts.vimsopaka_shadvarga_of_planets(jd_at_dob, place_as_tuple)
+        varga_balas = charts.varga_balas_of_planets(jd_at_dob, place_as_tuple)['vimsopaka']
+        sv = varga_balas['shadvarga']
         sv1 = {}
         for p in range(9):
             sv1[utils.PLANET_NAMES[p]]=utils.SHADVARGAMSA_NAMES[sv[p][0]]+'\n('+sv[p][1]+ ')\n'+str(round(sv[p][2],1))
-        sv = charts.vimsopaka_sapthavarga_of_planets(jd_at_dob, place_as_tuple)
+        sv = varga_balas['sapthavarga']
         sv2 = {}
         for p in range(9):
             sv2[utils.PLANET_NAMES[p]]=utils.SAPTAVARGAMSA_NAMES[sv[p][0]]+'\n('+sv[p][1]+ ')\n'+str(round(sv[p][2],1))
-        sv = charts.vimsopaka_dhasavarga_of_planets(jd_at_dob, place_as_tuple)
+        sv = varga_balas['dhasavarga']
         dv = {}
         for p in range(9):
             dv[utils.PLANET_NAMES[p]]=utils.DHASAVARGAMSA_NAMES[sv[p][0]]+'\n('+sv[p][1]+ ')\n'+str(round(sv[p][2],1))
-        sv = charts.vimsopaka_shodhasavarga_of_planets(jd_at_dob, place_as_tuple)
+        sv = varga_balas['shodhasavarga']
         sv3 = {}
         for p in range(9):
             sv3[utils.PLANET_NAMES[p]]=utils.SHODASAVARGAMSA_NAMES[sv[p][0]]+'\n('+sv[p][1]+ ')\n'+str(round(sv[p][2],1))
         return [sv1,sv2,dv,sv3]
     def _get_vaiseshikamsa_bala(self,dob,tob,place_as_tuple):
         jd_at_dob = utils.julian_day_number(dob, tob)
-        sv = charts.vaiseshikamsa_shadvarga_of_planets(jd_at_dob, place_as_tuple)
+        varga_balas = charts.varga_balas_of_planets(jd_at_dob, place_as_tuple)['vaiseshikamsa']
+        sv = varga_balas['shadvarga']
         sv1 = {}
         for p in range(9):
             sv1[utils.PLANET_NAMES[p]]=utils.SHADVARGAMSA_NAMES[sv[p][0]]+'\n('+sv[p][1]+ ')\n'+str(round(sv[p][2],1))
-        sv = charts.vaiseshikamsa_sapthavarga_of_planets(jd_at_dob, place_as_tuple)
+        sv = varga_balas['sapthavarga']
         sv2 = {}
         for p in range(9):
             sv2[utils.PLANET_NAMES[p]]=utils.SAPTAVARGAMSA_NAMES[sv[p][0]]+'\n('+sv[p][1]+ ')\n'+str(round(sv[p][2],1))
-        sv = charts.vaiseshikamsa_dhasavarga_of_planets(jd_at_dob, place_as_tuple)
+        sv = varga_balas['dhasavarga']
         dv = {}
         for p in range(9):
             dv[utils.PLANET_NAMES[p]]=utils.DHASAVARGAMSA_NAMES[sv[p][0]]+'\n('+sv[p][1]+ ')\n'+str(round(sv[p][2],1))
-        sv = charts.vaiseshikamsa_shodhasavarga_of_planets(jd_at_dob, place_as_tuple)
+        sv = varga_balas['shodhasavarga']
         sv3 = {}
         for p in range(9):
             sv3[utils.PLANET_NAMES[p]]=utils.SHODASAVARGAMSA_NAMES[sv[p][0]]+'\n('+sv[p][1]+ ')\n'+str(round(sv[p][2],1))
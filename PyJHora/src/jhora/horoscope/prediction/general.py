@@ -18,7 +18,6 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import json
 from jhora.horoscope.chart import charts, house
 from jhora import utils, const
 from jhora.panchanga import drik
@@ -27,72 +26,86 @@ _lang_path = const._LANGUAGE_PATH
 def get_prediction_resources(language='en'):
     """
         get resources from prediction_msgs_<lang>.txt
+        The resource file is read only once per language and shared (read-only) by all callers
         @param language: Two letter language code. en, hi, ka, ta, te
-        @return json strings from the resource file as dictionary 
+        @return json strings from the resource file as read-only dictionary 
     """
-    json_file = _lang_path + const._DEFAULT_PREDICTION_JSON_FILE_PREFIX+language+'.json'
-    f = open(json_file,"r",encoding="utf-8")
-    msgs = json.load(f)
-    return msgs
-
-def _get_general_lagna_rasi_prediction(jd,place,prediction_msgs,language=const._DEFAULT_LANGUAGE):
-    janma_rasi = drik.raasi(jd, place)[0]-1
+    return utils.get_language_json_resources(const._DEFAULT_PREDICTION_JSON_FILE_PREFIX,language)
+def find_prediction_factors(jd_at_dob,place):
+    """
+        Get the language independent chart factors used for general predictions
+        Use render_prediction_results to get the language specific predictions
+        @param jd_at_dob: Julian day number at the date/time of birth
+        @param place: struct (plave name, latitude, longitude, timezone)
+        @return: dict of 
+            'janma_rasi': janma rasi index (0..11)
+            'planets_in_houses': [house of planet from lagna (1..12) for planets Sun..Ketu]
+            'lords_in_houses': [house (1..12) where lord of house#h (h=1..12) is placed]
+    """
+    janma_rasi = drik.raasi(jd_at_dob, place)[0]-1
+    planet_positions = charts.rasi_chart(jd_at_dob, place)
+    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
+    lagna_house = p_to_h['L']
+    planets_in_houses = [house.get_relative_house_of_planet(lagna_house,p_to_h[planet]) for planet in [*range(9)]]
+    lords_in_houses = [house.get_relative_house_of_planet(lagna_house,p_to_h[const._house_owners_list[(h+lagna_house)%12]])
+                            for h in [*range(12)]]
+    return {'janma_rasi':janma_rasi,'planets_in_houses':planets_in_houses,'lords_in_houses':lords_in_houses}
+def _get_general_lagna_rasi_prediction(janma_rasi,prediction_msgs,res):
     results = {}
     source_count = 2
     for s in range(source_count):
-        ks = utils.resource_strings['janma_rasi_str']+'_'+str(s+1)
-        results[ks] = "<html><b>"+utils.resource_strings['general_prediction_str']+"</b><br>"
+        ks = res['janma_rasi_str']+'_'+str(s+1)
+        results[ks] = "<html><b>"+res['general_prediction_str']+"</b><br>"
         #results[ks] += "<b>"+prediction_msgs['general_prediction_caution']+"</b><br>"
         results[ks] += "<b>"+prediction_msgs['janma_raasi_'+str(s+1)]['source']+"</b><br>"
         pdict = prediction_msgs['janma_raasi_'+str(s+1)][str(janma_rasi+1)]
         for k,v in pdict.items():
             results[ks] += "<b>"+k+"</b><br>"+v+"<br>"
     return results
-def _get_planets_in_houses_prediction(planet_positions,prediction_msgs):
-    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
-    lagna_house = p_to_h['L']
-    ks = utils.resource_strings['planets_str']
+def _get_planets_in_houses_prediction(planets_in_houses,prediction_msgs,res,planet_names):
+    ks = res['planets_str']
     results = {}
     results[ks] = "<html>"#<b>"+ks+"</b><br>"
     #results[ks] += "<b>"+utils.resource_strings['general_prediction_caution']+"</b><br>"
     planet_msgs = prediction_msgs['planets_in_houses']
     #print('planet msgs',planet_msgs)
-    for planet in [*range(9)]:
-        planet_house = house.get_relative_house_of_planet(lagna_house,p_to_h[planet])
+    for planet,planet_house in enumerate(planets_in_houses):
         pl_msg = planet_msgs[str(planet_house)][planet]
         #print(planet,planet_house,pl_msg)
-        key = utils.PLANET_NAMES[planet]+'-'+utils.resource_strings['house_str']+'#'+str(planet_house)+":"
+        key = planet_names[planet]+'-'+res['house_str']+'#'+str(planet_house)+":"
         results[ks] += "<b>"+key+"</b><br>"+pl_msg+"<br>"
     return results
-def _get_lords_in_houses_prediction(planet_positions,prediction_msgs):
-    p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
-    lagna_house = p_to_h['L']
-    ks = utils.resource_strings['houses_str']
+def _get_lords_in_houses_prediction(lords_in_houses,prediction_msgs,res):
+    ks = res['houses_str']
     results = {}
     results[ks] = "<html>"#<b>"+ks+"</b><br>"
     #results[ks] += "<b>"+utils.resource_strings['general_prediction_caution']+"</b><br>"
     planet_msgs = prediction_msgs['lord_of_a_house_joining_lord_of_another_house']
     #print('planet msgs',planet_msgs)
-    for h in [*range(12)]:
-        lord = const._house_owners_list[(h+lagna_house)%12]
-        house_of_lord = house.get_relative_house_of_planet(lagna_house,p_to_h[lord])
+    for h,house_of_lord in enumerate(lords_in_houses):
         key = "Lord of House#"+str(h+1)+" in house#"+str(house_of_lord)
         #print('key',key)
         pl_msg = planet_msgs[str(h+1)][house_of_lord-1]
         results[ks] += "<b>"+key+"</b><br>"+pl_msg+"<br>"
     return results
-def get_prediction_details(jd_at_dob,place,language=const._DEFAULT_LANGUAGE):
+def render_prediction_results(prediction_factors,language=const._DEFAULT_LANGUAGE):
+    """
+        Get language specific predictions from the language independent results of find_prediction_factors
+        @param prediction_factors: dict returned by find_prediction_factors
+        @param language: two letter language code (en, hi, ka, ta, te)
+        @return: dict of {prediction title in language: prediction details as html string}
+    """
     prediction_msgs = get_prediction_resources(language=language)
-    #print('prediction keys',prediction_msgs.keys())
+    res = utils.get_language_messages(language)
+    planet_names = utils.get_language_lists(language)['PLANET_NAMES']
     results = {}
-    planet_positions = charts.rasi_chart(jd_at_dob, place)
-    results1 = _get_general_lagna_rasi_prediction(jd_at_dob,place,prediction_msgs,language=language)
-    results.update(results1)
-    results2 = _get_planets_in_houses_prediction(planet_positions,prediction_msgs)
-    results.update(results2)
-    results3 = _get_lords_in_houses_prediction(planet_positions,prediction_msgs)
-    results.update(results3)
+    results.update(_get_general_lagna_rasi_prediction(prediction_factors['janma_rasi'],prediction_msgs,res))
+    results.update(_get_planets_in_houses_prediction(prediction_factors['planets_in_houses'],prediction_msgs,
+                                                     res,planet_names))
+    results.update(_get_lords_in_houses_prediction(prediction_factors['lords_in_houses'],prediction_msgs,res))
     return results
+def get_prediction_details(jd_at_dob,place,language=const._DEFAULT_LANGUAGE):
+    return render_prediction_results(find_prediction_factors(jd_at_dob, place),language=language)
 if __name__ == "__main__":
     lang = 'te'
     utils.set_language(lang)
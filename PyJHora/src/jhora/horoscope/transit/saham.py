@@ -18,8 +18,10 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import numpy as np
 from jhora import const, utils
-from jhora.horoscope.chart import house
+from jhora.panchanga import drik
+from jhora.horoscope.chart import house, charts
 """
     Saham calculation
     saham has a formula that looks like A – B + C. What this means is that we take the
@@ -602,6 +604,108 @@ def _is_C_between_B_to_A(a_long,b_long,c_long):
         elif next_n == a_rasi:
             break
     return c_rasi_found
+def _is_C_between_B_to_A_array(a_long,b_long,c_long):
+    """ _is_C_between_B_to_A of arrays of longitudes (rasi 12 and above is never met - same as the rasi loop) """
+    a_rasi = (a_long/30).astype(int); b_rasi = (b_long/30).astype(int); c_rasi = (c_long/30).astype(int)
+    a_count = np.where(a_rasi < 12, (a_rasi-b_rasi)%12, 12); a_count = np.where(a_count==0, 12, a_count)
+    c_count = np.where(c_rasi < 12, (c_rasi-b_rasi)%12, 12); c_count = np.where(c_count==0, 12, c_count)
+    return (c_count < 12) & (c_count <= a_count)
+def _a_minus_b_plus_c(a_long,b_long,c_long):
+    """ A - B + C (+30 if C is not between B and A) of arrays of longitudes """
+    return a_long - b_long + c_long + 30*~_is_C_between_B_to_A_array(a_long,b_long,c_long)
+def _saham_array(a_long,b_long,c_long,night_time_birth=None):
+    """ A - B + C of day births and B - A + C of night births (night_time_birth=None => A - B + C for all) """
+    saham_long = _a_minus_b_plus_c(a_long, b_long, c_long)
+    if night_time_birth is not None:
+        saham_long = np.where(night_time_birth, _a_minus_b_plus_c(b_long, a_long, c_long), saham_long)
+    return saham_long % 360
+def saham_table(planet_positions_list,night_time_birth=False):
+    """
+        All sahams of const._saham_list for many charts (for example annual charts of many years) in one pass.
+        Longitudes, house lords and the A - B + C rule are evaluated once for all the charts as numpy arrays.
+        @param planet_positions_list: list of planet_positions [['L',(rasi,long)],[0,(rasi,long)],...]]
+        @param night_time_birth: True/False for all the charts or a list of True/False one per chart
+        @return: dict {saham_name: [saham longitude of each chart]} 
+            saham longitude is same as <saham_name>_saham(planet_positions,night_time_birth)
+    """
+    n_charts = len(planet_positions_list)
+    night = np.broadcast_to(np.asarray(night_time_birth,dtype=bool),(n_charts,))
+    longs = np.array([[saham_longitude(pp,p) for p in range(10)] for pp in planet_positions_list]).reshape(n_charts,10)
+    " Only Scorpio and Aquarius lords depend on the chart (same as house.house_owner_from_planet_positions) "
+    lords = np.tile(const.house_owners,(n_charts,1))
+    for c,pp in enumerate(planet_positions_list):
+        lords[c,7] = house.stronger_planet_from_planet_positions(pp, 2, 8)
+        lords[c,10] = house.stronger_planet_from_planet_positions(pp, 6, 7)
+    charts_index = np.arange(n_charts)
+    lagna_rasi = longs[:,0] // 30
+    _lord_long = lambda houses_from_lagna: longs[charts_index,lords[charts_index,((lagna_rasi+houses_from_lagna-1)%12).astype(int)]+1]
+    _sign_lord_long = lambda p: longs[charts_index,lords[charts_index,(longs[:,p+1]//30).astype(int)]+1]
+    lagna,sun,moon,mars,mercury,jupiter,venus,saturn = (longs[:,p] for p in range(8))
+    sahams = {}
+    sahams['punya'] = punya = _saham_array(moon, sun, lagna, night)
+    sahams['vidya'] = _saham_array(sun, moon, lagna, night)
+    sahams['yasas'] = _saham_array(jupiter, punya, lagna, night)
+    sahams['mitra'] = _saham_array(jupiter, punya, venus, night)
+    sahams['mahatmaya'] = _saham_array(punya, mars, lagna, night)
+    sahams['asha'] = _saham_array(saturn, mars, lagna, night)
+    " Jupiter - Mars + Lagna (day/night swapped) if Mars owns lagna "
+    mars_owns_lagna = lords[charts_index,lagna_rasi.astype(int)] == 2
+    samartha_lord_long = np.where(mars_owns_lagna, jupiter, _lord_long(1))
+    sahams['samartha'] = _saham_array(mars, samartha_lord_long, lagna, night ^ mars_owns_lagna)
+    sahams['bhratri'] = _saham_array(jupiter, saturn, lagna)
+    sahams['gaurava'] = _saham_array(jupiter, moon, sun, night)
+    sahams['pithri'] = sahams['rajya'] = _saham_array(saturn, sun, lagna, night)
+    sahams['maathri'] = _saham_array(moon, venus, lagna, night)
+    sahams['puthra'] = _saham_array(jupiter, moon, lagna, night)
+    sahams['jeeva'] = _saham_array(saturn, jupiter, lagna, night)
+    sahams['karma'] = _saham_array(mars, mercury, lagna, night)
+    sahams['roga'] = (lagna - moon + lagna) % 360
+    sahams['kali'] = _saham_array(jupiter, mars, lagna, night)
+    sahams['sastra'] = sastra = _saham_array(jupiter, saturn, mercury, night)
+    sahams['bandhu'] = _saham_array(mercury, moon, lagna, night)
+    sahams['mrithyu'] = _saham_array(lagna+210, moon, lagna)
+    sahams['paradesa'] = _saham_array(lagna+240.0, _lord_long(9), lagna)
+    sahams['artha'] = _saham_array(lagna+30.0, _lord_long(2), lagna)
+    sahams['paradara'] = _saham_array(venus, sun, lagna, night)
+    sahams['vanika'] = _saham_array(moon, mercury, lagna, night)
+    sahams['karyasiddhi'] = np.where(night, _saham_array(saturn, moon, _sign_lord_long(1)),
+                                     _saham_array(saturn, sun, _sign_lord_long(0)))
+    sahams['vivaha'] = _saham_array(venus, saturn, lagna, night)
+    sahams['santapa'] = _saham_array(saturn, moon, lagna+150, night)
+    sahams['sraddha'] = _saham_array(venus, mars, lagna, night)
+    sahams['preethi'] = _saham_array(sastra, punya, lagna, night)
+    " As in jadya_saham only the night value is reduced to 0..360 "
+    sahams['jadya'] = np.where(night, _a_minus_b_plus_c(saturn, mars, mercury) % 360, _a_minus_b_plus_c(mars, saturn, mercury))
+    sahams['vyaapaara'] = _saham_array(mars, saturn, lagna)
+    sahams['sathru'] = _saham_array(mars, saturn, lagna, night)
+    sahams['jalapatna'] = _saham_array(np.full(n_charts,105.0), saturn, lagna, night)
+    sahams['bandhana'] = _saham_array(punya, saturn, lagna, night)
+    sahams['apamrithyu'] = _saham_array(lagna+210, mars, lagna, night)
+    sahams['laabha'] = _saham_array(lagna+300.0, _lord_long(11), lagna, night)
+    return {saham_name:sahams[saham_name].tolist() for saham_name in const._saham_list}
+def all_sahams(planet_positions,night_time_birth=False):
+    """
+        @return: dict {saham_name: saham longitude} of all sahams of const._saham_list for one chart
+    """
+    return {saham_name:longs[0] for saham_name,longs in saham_table([planet_positions], night_time_birth).items()}
+def annual_sahams(jd_at_dob,place,years=range(1,2),divisional_chart_factor=1):
+    """
+        All sahams of the Tajaka annual charts of many years
+        @param jd_at_dob: Julian Day nummber at date/time of birth
+        @param place: drik.Place struct (place,latitude,longitude,time_zone)
+        @param years: iterable of years after dob (Default=range(1,2) => year of birth)
+        @param divisional_chart_factor: 1=Rasi, 9=Navamsa etc
+        @return: dict {years: {saham_name: saham longitude}}
+            night_time_birth of each year is decided by the time of its varsha pravesh
+    """
+    years = list(years)
+    solar_jds = drik.next_solar_dates(jd_at_dob, place, [(y,1,1) for y in years])
+    planet_positions_list = [charts.divisional_chart(jd_years, place, divisional_chart_factor=divisional_chart_factor)
+                             for jd_years in solar_jds]
+    night_time_births = [not (drik.sunrise(jd_years, place)[2] <= jd_years < drik.sunset(jd_years, place)[2])
+                         for jd_years in solar_jds]
+    table = saham_table(planet_positions_list, night_time_births)
+    return {y:{saham_name:longs[i] for saham_name,longs in table.items()} for i,y in enumerate(years)}
      
 if __name__ == "__main__":
     from jhora.tests import pvr_tests
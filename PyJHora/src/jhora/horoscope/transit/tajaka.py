@@ -446,6 +446,42 @@ def sixty_hour_chart(jd_at_dob,place,divisional_chart_factor=1,years=1,months=1,
     #jd_years = jd_at_dob + (years + (months/12.0)+(sixty_hour_count/144.0))*year_value
     cht = _get_tajaka_chart(jd_years,place,divisional_chart_factor)
     return cht,[(y,m,d),utils.to_dms(fh)]
+def annual_charts(jd_at_dob,place,years=range(1,2),divisional_chart_factors=None,include_monthly_charts=False,
+                  include_sixty_hour_charts=False,calculation_type='drik'):
+    """
+        Tajaka annual charts (and optionally monthly and sixty hour charts) of many years in one call.
+        Sun's longitude at birth is found once, all the solar returns are searched together (drik.next_solar_dates)
+        and the varga charts of each solar return are derived from its rasi chart.
+        @param jd_at_dob: Julian Day nummber at date/time of birth
+        @param place: should be a struct os drik.Place (place,latitude,longitude,time_sone_factor)
+        @param years: iterable of years after dob (Default=range(1,2) => year of birth)
+        @param divisional_chart_factors: list of divisional chart factors (Default=None => [1] Rasi chart only)
+        @param include_monthly_charts: True => also include the monthly (maasa pravesh) charts 2..12 of each year
+        @param include_sixty_hour_charts: True => also include the sixty hour charts 2..12 of each month
+        @param calculation_type: 'drik' (default) or 'ss' (surya sidhantha - all the rasi charts computed together
+            by surya_sidhantha.planet_positions_series)
+        @return: dict {(years,months,sixty_hour_count):{divisional_chart_factor:(planet_positions,[(y,m,d),(h,m,s)])}}
+            (years,1,1) is the annual chart - same as annual_chart(jd_at_dob,place,divisional_chart_factor,years)
+            (years,months,1) is the monthly chart - same as monthly_chart(jd_at_dob,place,divisional_chart_factor,years,months)
+            (years,months,count) is same as sixty_hour_chart(jd_at_dob,place,divisional_chart_factor,years,months,count)
+    """
+    dcfs = [1] if divisional_chart_factors is None else divisional_chart_factors
+    month_range = range(1,13) if include_monthly_charts else range(1,2)
+    sixty_hour_range = range(1,13) if include_sixty_hour_charts else range(1,2)
+    solar_periods = [(y,m,s) for y in years for m in month_range for s in sixty_hour_range]
+    solar_jds = drik.next_solar_dates(jd_at_dob, place, solar_periods)
+    if calculation_type.lower()=='ss':
+        from jhora.panchanga import surya_sidhantha
+        rasi_charts = surya_sidhantha.planet_positions_series(solar_jds, place)
+    else:
+        rasi_charts = [charts.rasi_chart(jd_years, place) for jd_years in solar_jds]
+    tajaka_charts = {}
+    for solar_period,jd_years,planet_positions in zip(solar_periods,solar_jds,rasi_charts):
+        y,m,d,fh = utils.jd_to_gregorian(jd_years)
+        solar_date = [(y,m,d),utils.to_dms(fh)]
+        tajaka_charts[solar_period] = {dcf:(charts.divisional_positions_from_rasi_positions(planet_positions,
+                                                        divisional_chart_factor=dcf),solar_date) for dcf in dcfs}
+    return tajaka_charts
 def _get_lord_candidates(planet_positions,years_from_dob,natal_lagna_house,night_time_birth):
     tajaka_chart_p_to_h = utils.get_planet_house_dictionary_from_planet_positions(planet_positions)
     tajaka_chart_h_to_p = utils.get_house_to_planet_dict_from_planet_to_house_dict(tajaka_chart_p_to_h)
@@ -34,6 +34,7 @@ import swisseph as swe
 from _datetime import datetime, timedelta
 from datetime import date
 import math, os, warnings
+import contextvars
 from jhora import utils, const
 
 """ Since datetime does not accept BC year values Use the following stucture to represent dates """
@@ -61,6 +62,11 @@ def set_sideral_planets():
     
 #PLANET_NAMES= ['Suriyan', 'Chandran', 'Sevvay','Budhan','Viyaazhan','VeLLi','Sani','Raahu','Kethu','Uranus','Neptune']
 _ayanamsa_mode = const._DEFAULT_AYANAMSA_MODE
+""" Active charts.ChartSnapshot of the current thread/task context (see charts.use_chart_snapshot) """
+_chart_snapshot = contextvars.ContextVar('chart_snapshot', default=None)
+def _snapshot_value(name,jd,place):
+    snapshot = _chart_snapshot.get()
+    return None if snapshot is None else snapshot.panchanga_value(name, jd, place)
 _ayanamsa_value = None
 def _ayanamsa_surya_siddhantha_model(jd):
     maha_yuga_years = 4320000
@@ -347,6 +353,8 @@ def sunrise(jd, place):
         @return [sunrise time as local time in float hours, local time string, and sunrise julian number]
             e.g. [6.5,'06:30 AM',2450424.94]
     """
+    _snapshot_sunrise = _snapshot_value('sunrise', jd, place)
+    if _snapshot_sunrise is not None: return _snapshot_sunrise
     # First convert jd to UTC
     y, m, d,_  = jd_to_gregorian(jd)
     jd_utc = utils.gregorian_to_jd(Date(y, m, d))
@@ -409,6 +417,20 @@ def night_length(jd, place):
         @return: night length in float hours. e.g. 12.125
     """
     return (24.0 + sunrise(jd+1, place)[0] - sunset(jd, place)[0])
+def sunrise_sunset_table(jd,place,day_count=1):
+    """
+        Sunrise and sunset of consecutive days - computed once and shared by the day schedules
+        (day/night lengths of the days without repeated sunrise/sunset calls)
+        @param jd: Julian Day Number of the first date
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @param day_count: number of days. Entry of the day after the last day is also returned (for night length)
+        @return: list of (midnight_jd, sunrise_hours, sunset_hours) of day_count+1 days
+            midnight_jd: local julian day number of the start of the date
+            sunrise_hours, sunset_hours: local time in float hours
+    """
+    y, m, d,_  = jd_to_gregorian(jd)
+    first_jd = utils.gregorian_to_jd(Date(y, m, d))
+    return [(first_jd+day, sunrise(first_jd+day, place)[0], sunset(first_jd+day, place)[0]) for day in range(day_count+1)]
 def sunset(jd, place,gauri_choghadiya_setting=False):
     """
         Sunset when centre of disc is at horizon for given date and place
@@ -566,6 +588,9 @@ def tithi(jd,place,tithi_index=1,planet1=const._MOON, planet2=const._SUN,cycle=1
     """
         TODO: Handle similar to JHora if planets are same
     """
+    if (tithi_index,planet1,planet2,cycle)==(1,const._MOON,const._SUN,1):
+        _snapshot_tithi = _snapshot_value('tithi', jd, place)
+        if _snapshot_tithi is not None: return _snapshot_tithi
     if const.use_planet_speed_for_panchangam_end_timings:
         return tithi_using_planet_speed(jd, place, tithi_index, planet1, planet2, cycle)
     else:
@@ -723,6 +748,8 @@ def nakshatra(jd,place):
           next nakshatra index and next nakshatra time is additionally returned if two nakshatras on same day 
           nakshatra number = [1..27]  Aswini to Revathi
     """
+    _snapshot_nak = _snapshot_value('nakshatra', jd, place)
+    if _snapshot_nak is not None: return _snapshot_nak
     _nak = _get_nakshathra(jd, place)
     _nak_prev = _get_nakshathra(jd-1, place)
     _nak_no = _nak[0]; _pad_no = _nak[1]; _nak_start = _nak_prev[2]; _nak_end = _nak[2]
@@ -816,6 +843,9 @@ def _get_yogam(jd,place,planet1=const._MOON,planet2=const._SUN,tithi_index=1,cyc
         answer += [yogam_no, ends]
     return answer
 def yogam(jd,place,tithi_index=1,planet1=const._MOON,planet2=const._SUN,cycle=1):
+    if (tithi_index,planet1,planet2,cycle)==(1,const._MOON,const._SUN,1):
+        _snapshot_yogam = _snapshot_value('yogam', jd, place)
+        if _snapshot_yogam is not None: return _snapshot_yogam
     if not const.use_planet_speed_for_panchangam_end_timings: return yogam_old(jd, place)
     _,_,_,jd_hours = utils.jd_to_gregorian(jd)
     def _get_yogam_new(jd):
@@ -1137,27 +1167,9 @@ def gauri_choghadiya(jd, place):
         @param place: Place as struct ('Place',latitude,longitude,timezone)
         @return: [(chogadiyua type,start_time_string,end_time_string)...]
     """
-    srise = sunrise(jd, place); sset = sunset(jd,place,gauri_choghadiya_setting=True)
-    day_dur = (sset[0] - srise[0])/24
-    end_times = []; start_time = srise[1]
-    _vaara = vaara(jd)
-    for i in range(1, 9):
-        gt = srise[2]+(i*day_dur)/8; _,_,_,fh = utils.jd_to_gregorian(gt); end_time = utils.to_dms(fh)
-        gc_type = const.gauri_choghadiya_day_table[_vaara][i-1]
-        end_times.append((gc_type,start_time,end_time))
-        start_time = end_time
-    
-    # Night duration = time from today's sunset to tomorrow's sunrise
-    srise = sunrise(jd+1,place); night_dur = (24+srise[0] - sset[0])/24
-    for i in range(1, 9):
-        gt = sset[2]+(i*night_dur)/8; _,_,_,fh = utils.jd_to_gregorian(gt); end_time = utils.to_dms(fh)
-        gc_type = const.gauri_choghadiya_night_table[_vaara][i-1]
-        end_times.append((gc_type,start_time,end_time))
-        start_time = end_time
-    
-    return end_times
+    return DaySchedule(jd, place).gauri_choghadiya()
 def amrit_kaalam(jd,place):
-    return [(gb,ge) for gc,gb,ge in gauri_choghadiya(jd, place) if gc==3]
+    return DaySchedule(jd, place).amrit_kaalam()
 def shubha_hora(jd, place):
     """
         Get end times of Shubha Hora for the given julian day
@@ -1166,26 +1178,22 @@ def shubha_hora(jd, place):
         @param place: Place as struct ('Place',latitude,longitude,timezone)
         @return: [(hora_planet,start_time_string,end_time_string)...]
     """
-    srise = sunrise(jd, place); sset = sunset(jd,place,gauri_choghadiya_setting=True)
-    day_dur = (sset[0] - srise[0])/24
-    end_times = []; start_time = srise[1]
-    _vaara = vaara(jd)
-    for i in range(1, 13):
-        gt = srise[2]+(i*day_dur)/12; _,_,_,fh = utils.jd_to_gregorian(gt); end_time = utils.to_dms(fh)
-        gc_type = const.shubha_hora_day_table[i-1][_vaara]
-        end_times.append((gc_type,start_time,end_time))
-        start_time = end_time
-    
-    # Night duration = time from today's sunset to tomorrow's sunrise
-    srise = sunrise(jd+1,place); night_dur = (24+srise[0] - sset[0])/24
-    for i in range(1, 13):
-        gt = sset[2]+(i*night_dur)/12; _,_,_,fh = utils.jd_to_gregorian(gt); end_time = utils.to_dms(fh)
-        gc_type = const.shubha_hora_night_table[i-1][_vaara]
-        end_times.append((gc_type,start_time,end_time))
-        start_time = end_time
-    
-    return end_times
+    return DaySchedule(jd, place).shubha_hora()
 
+# Offsets (fraction of day length from sunrise) of trikalam - value in each array is for given weekday (0 = sunday, etc.)
+trikalam_offsets = { 'raahu kaalam': [0.875, 0.125, 0.75, 0.5, 0.625, 0.375, 0.25],
+                     'gulikai': [0.75, 0.625, 0.5, 0.375, 0.25, 0.125, 0.0],
+                     'yamagandam': [0.5, 0.375, 0.25, 0.125, 0.0, 0.75, 0.625] }
+# There is one durmuhurtam on Sun, Wed, Sat; the rest have two
+# Offsets from sunrise 10.4 means 6 + 10.4 = 16.4 = 4:24 PM
+# Ref: Panchangam Calculations - Karanam Ramakumar
+durmuhurtam_offsets = [[10.4, 0.0],  # Sunday
+                       [6.4, 8.8],   # Monday
+                       [2.4, 4.8],   # Tuesday, [day_duration , night_duration]
+                       [5.6, 0.0],   # Wednesday
+                       [4.0, 8.8],   # Thursday
+                       [2.4, 6.4],   # Friday
+                       [1.6, 0.0]]   # Saturday
 def trikalam(jd, place, option='raahu kaalam'):
     """
         Get tri kaalam (Raahu kaalam, yama kandam and Kuligai Kaalam) for the given Julian day
@@ -1198,22 +1206,7 @@ def trikalam(jd, place, option='raahu kaalam'):
             gulikai_kaalam = lambda jd, place: trikalam(jd, place, 'gulikai')
         @return: start and end time of requested tri column - as list e.g. [start_time, end_time]
     """
-    srise = sunrise(jd, place)[0] # V4.3.0
-    day_dur = day_length(jd, place)
-    weekday = vaara(jd)
-    
-    # value in each array is for given weekday (0 = sunday, etc.)
-    offsets = { 'raahu kaalam': [0.875, 0.125, 0.75, 0.5, 0.625, 0.375, 0.25],
-                'gulikai': [0.75, 0.625, 0.5, 0.375, 0.25, 0.125, 0.0],
-                'yamagandam': [0.5, 0.375, 0.25, 0.125, 0.0, 0.75, 0.625] }
-    
-    start_time = srise + day_dur * offsets[option][weekday]
-    end_time = start_time + 0.125 * day_dur
-    
-    start_time = utils.to_dms(start_time)
-    end_time = utils.to_dms(end_time)
-    
-    return [start_time, end_time] # decimal hours to H:M:S
+    return DaySchedule(jd, place).trikalam(option)
 
 raahu_kaalam = lambda jd, place: trikalam(jd, place, 'raahu kaalam')
 yamaganda_kaalam = lambda jd, place: trikalam(jd, place, 'yamagandam')
@@ -1226,40 +1219,7 @@ def durmuhurtam(jd, place):
         @param place: Place as struct ('Place',latitude,longitude,timezone)
         @return: start and end time of dhur muhurtham - as list e.g. [start_time, end_time]
     """
-    # Night = today's sunset to tomorrow's sunrise
-    srise = sunrise(jd, place)[0]; day_dur = day_length(jd,place); night_dur = night_length(jd,place)
-    sset = sunset(jd,place)[0]
-    weekday = vaara(jd)
-    
-    # There is one durmuhurtam on Sun, Wed, Sat; the rest have two
-    # Offsets from sunrise 10.4 means 6 + 10.4 = 16.4 = 4:24 PM
-    # Ref: Panchangam Calculations - Karanam Ramakumar
-    offsets = [[10.4, 0.0],  # Sunday
-               [6.4, 8.8],   # Monday
-               [2.4, 4.8],   # Tuesday, [day_duration , night_duration]
-               [5.6, 0.0],   # Wednesday
-               [4.0, 8.8],   # Thursday
-               [2.4, 6.4],   # Friday
-               [1.6, 0.0]]   # Saturday
-    
-    # second durmuhurtam of tuesday uses night_duration instead of day_duration
-    dur = [day_dur, day_dur]
-    base = [srise, srise]
-    if weekday == 2:  dur[1] = night_dur; base[1] = sset
-    
-    # compute start and end timings
-    start_times = [0, 0]
-    end_times = [0, 0]
-    answer = []
-    for i in range(0, 2):
-        offset = offsets[weekday][i]
-        if offset != 0.0:
-            start_times[i] = base[i] + dur[i] * offsets[weekday][i] / 12
-            end_times[i] = start_times[i] + day_dur * 0.8 / 12
-            start_times[i] = utils.to_dms(start_times[i])
-            end_times[i] = utils.to_dms(end_times[i])
-            answer += [start_times[i],end_times[i]]
-    return answer
+    return DaySchedule(jd, place).durmuhurtam()
 
 def abhijit_muhurta(jd, place):
     """
@@ -1269,16 +1229,7 @@ def abhijit_muhurta(jd, place):
         @param place: Place as struct ('Place',latitude,longitude,timezone)
         @return: start and end time of Abhijit muhurta - as list e.g. [start_time, end_time]
     """
-    _, lat, lon, tz = place
-    srise = sunrise(jd,place)[0]; sset = sunset(jd,place)[0] 
-    day_dur = day_length(jd, place)
-    
-    start_time = srise + 7 / 15 * day_dur
-    end_time = srise + 8 / 15 * day_dur
-    start_time = utils.to_dms(start_time)
-    end_time = utils.to_dms(end_time)
-    # to local time
-    return [start_time, end_time]
+    return DaySchedule(jd, place).abhijit_muhurta()
 
 # 'jd' can be any time: ex, 2015-09-19 14:20 UTC
 # today = swe.julday(2015, 9, 19, 14 + 20./60)
@@ -2256,19 +2207,30 @@ def next_solar_date(jd_at_dob,place,years=1,months=1,sixty_hours=1):
         @return: julian number for the matching solar date
     """
     if (years==1 and months==1 and sixty_hours==1): return jd_at_dob
-    sun_long_at_dob = dhasavarga(jd_at_dob, place,divisional_chart_factor=1)[0][1]
-    sun_long_at_dob = sun_long_at_dob[0]*30+sun_long_at_dob[1]
-    (y,m,d,fh) = swe.revjul(jd_at_dob)
-    #print((int(sun_long_at_dob/30),utils.to_dms(sun_long_at_dob%30,is_lat_long='plong')),(y,m,d,utils.to_dms(fh)))
-    sun_long_extra = ((years-1)*360+(months-1)*30+(sixty_hours-1)*2.5)%360
-    jd_extra = int(((years-1)+(months-1)/12+(sixty_hours-1)/144)*const.tropical_year) #const.sidereal_year)
-    #print('jd_extra',jd_extra)
-    jd_next = jd_at_dob+jd_extra
-    #print('jd_next',jd_next,swe.revjul(jd_next))
-    #print('sun_long_extra',sun_long_extra)
-    sun_long_next = (sun_long_at_dob+sun_long_extra)%360
-    #print((years,months,sixty_hours),(int(sun_long_next/30),utils.to_dms(sun_long_next%30,is_lat_long='plong')),(y,m,d,utils.to_dms(fh)))
-    return __next_solar_jd(jd_next,place, sun_long_next)
+    return next_solar_dates(jd_at_dob, place, [(years,months,sixty_hours)])[0]
+def next_solar_dates(jd_at_dob,place,solar_periods):
+    """
+        next_solar_date for many (years,months,sixty_hours) at once. 
+        Sun's longitude at birth is computed only once and each solar return is searched from its tropical year estimate
+        @param jd_at_dob: Julian number at the time of birth
+        @param place: Place Struct ('place',latitude,longitude,timezone)
+        @param solar_periods: list of (years,months,sixty_hours) - see next_solar_date for their meaning
+        @return: list of julian numbers - same as next_solar_date(jd_at_dob,place,years,months,sixty_hours) for each period
+    """
+    sun_long_at_dob = None
+    solar_jds = []
+    for years,months,sixty_hours in solar_periods:
+        if (years==1 and months==1 and sixty_hours==1):
+            solar_jds.append(jd_at_dob); continue
+        if sun_long_at_dob is None:
+            sun_long_at_dob = dhasavarga(jd_at_dob, place,divisional_chart_factor=1)[0][1]
+            sun_long_at_dob = sun_long_at_dob[0]*30+sun_long_at_dob[1]
+        sun_long_extra = ((years-1)*360+(months-1)*30+(sixty_hours-1)*2.5)%360
+        jd_extra = int(((years-1)+(months-1)/12+(sixty_hours-1)/144)*const.tropical_year) #const.sidereal_year)
+        jd_next = jd_at_dob+jd_extra
+        sun_long_next = (sun_long_at_dob+sun_long_extra)%360
+        solar_jds.append(__next_solar_jd(jd_next,place, sun_long_next))
+    return solar_jds
 def next_annual_solar_date_approximate(dob,tob,years):
     week_days = ['Sunday','Monday','Tuesday','Wednesday','Thursday','Friday','Saturday']
     tobh = (tob[0]+tob[1]/60+tob[2]/3600)/24
@@ -2888,17 +2850,9 @@ def tamil_yogam(jd, place,check_special_yogas=True,use_sringeri_panchanga_versio
     if naks in const.sarvartha_siddha_yoga[wday]: return len(const.tamil_yoga_names)-1,nak[2],nak[3]
     return yi,nak[2],nak[3],yi
 def brahma_muhurtha(jd, place):
-    dl = day_length(jd, place); nl = night_length(jd, place)
-    dm = dl/15.0 ; nm = nl/15.0
-    sunrise_hours = sunrise(jd, place)[0]
-    bm_start = sunrise_hours-2*nm; bm_end = sunrise_hours-nm
-    return bm_start,bm_end
+    return DaySchedule(jd, place).brahma_muhurtha()
 def godhuli_muhurtha(jd, place):
-    dl = day_length(jd, place); nl = night_length(jd, place)
-    dm = dl/15.0 ; nm = nl/15.0
-    sunset_hours = sunset(jd, place)[0]
-    bm_start = sunset_hours-0.25*dm; bm_end = sunset_hours+0.25*nm
-    return bm_start,bm_end
+    return DaySchedule(jd, place).godhuli_muhurtha()
 def sandhya_periods(jd,place):
     """
         returns three sandhya periods: - each (Ghati is 1/30th of day length)
@@ -2906,44 +2860,21 @@ def sandhya_periods(jd,place):
             Madhyaahna - 1.5 ghatis before noon and 1.5 ghatis after noon
             Saayam - 1 ghati before sunset and 2 after sunset
     """
-    dl = day_length(jd, place); ghati = dl/30.
-    sunrise_hours = sunrise(jd, place)[0]; sunset_hours = sunset(jd, place)[0]
-    noon = sunrise_hours+0.5*dl
-    ps = (sunrise_hours-2*ghati, sunrise_hours+ghati)
-    ms = (noon-1.5*ghati, noon+1.5*ghati)
-    ss = (sunset_hours-ghati,sunset_hours+2*ghati)
-    return ps,ms,ss
+    return DaySchedule(jd, place).sandhya_periods()
 def vijaya_muhurtha(jd,place):
-    dl = day_length(jd, place); gd = dl/30.
-    nl = night_length(jd, place); gn = nl/30.0
-    sunrise_hours = sunrise(jd, place)[0]; sunset_hours = sunset(jd, place)[0]
-    noon = sunrise_hours+0.5*dl; _midnight = sunset_hours+0.5*nl
-    vmd = (noon-gd, noon+gd)
-    vmn = (_midnight-gn, _midnight+gn)
-    return vmd,vmn
+    return DaySchedule(jd, place).vijaya_muhurtha()
 def nishita_kaala(jd,place):
     """ Eighth muhurtha of the night """
-    nl = night_length(jd, place); gn = nl/30.0
-    sunset_hours = sunset(jd, place)[0]
-    return sunset_hours+7*gn, sunset_hours+8*gn
+    return DaySchedule(jd, place).nishita_kaala()
 def tamil_jaamam(jd,place):
     """ 
         In Tamil 1 jaamam = 3 muhurthas. 10 jaamam = 1 day (5 jaamam) and night (5 jaamam)
         8th jaamam = 3rd muhurtha of night
     """
-    dl = day_length(jd, place); day_jaamam = dl/5
-    nl = night_length(jd, place); night_jaamam = nl/5
-    sunrise_hours = sunrise(jd, place)[0]
-    sunset_hours = sunset(jd, place)[0]
-    jaamam = [(sunrise_hours+j*day_jaamam,sunrise_hours+(j+1)*day_jaamam) for j in range(5)]
-    jaamam += [(sunset_hours+j*night_jaamam,sunset_hours+(j+1)*night_jaamam) for j in range(5)]
-    return jaamam
+    return DaySchedule(jd, place).tamil_jaamam()
 def nishita_muhurtha(jd,place):
     """ 2 ghathis around midnight """
-    nl = night_length(jd, place); gn = nl/30.0
-    sunset_hours = sunset(jd, place)[0]
-    _midnight = sunset_hours+0.5*nl
-    return _midnight-gn,_midnight+gn
+    return DaySchedule(jd, place).nishita_muhurtha()
 def thaaraabalam(jd,place,return_only_good_stars=True):
     """
     thaarabalam_names = [('Paramitra','Good'),('Janma','Not Good'),('Sampatha','Very Good'),('Vipatha','Bad'),
@@ -2960,14 +2891,122 @@ def thaaraabalam(jd,place,return_only_good_stars=True):
         tb_dict[tb_div].append(birth_star) 
     return gtb if return_only_good_stars else tb_dict
 def muhurthas(jd, place):
-    dl = day_length(jd, place); day_muhurtha = dl/15
-    nl = night_length(jd, place); night_muhurtha = nl/15
-    sunrise_hours = sunrise(jd, place)[0]
-    sunset_hours = sunset(jd, place)[0]
-    _muhurthas = [(sunrise_hours+j*day_muhurtha,sunrise_hours+(j+1)*day_muhurtha) for j in range(15)]#Fixed V4.3.6
-    _muhurthas += [(sunset_hours+j*night_muhurtha,sunset_hours+(j+1)*night_muhurtha) for j in range(15)]#Fixed 4.3.6
-    _mh_list = [(mk,const.muhurthas_of_the_day[mk],_muhurthas[mh]) for mh,mk in enumerate(const.muhurthas_of_the_day.keys()) ]
-    return _mh_list
+    return DaySchedule(jd, place).muhurthas()
+class DaySchedule:
+    """
+        Day and night segmentation of a date computed once (sunrise, sunset and next day sunrise)
+        and the muhurta period tables derived from it - trikalam, durmuhurtam, abhijit muhurta, gauri choghadiya,
+        shubha hora, brahma/godhuli/vijaya muhurtha, nishita kaala/muhurtha, sandhya periods, muhurthas, tamil jaamam.
+        The module functions of the same names return the values of DaySchedule(jd, place)
+        @param jd: Julian Day Number of the date/time
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+    """
+    def __init__(self,jd,place):
+        self.jd = jd; self.place = place
+        self.sunrise = sunrise(jd, place)
+        self.sunset = sunset(jd, place)
+        y, m, d,_  = jd_to_gregorian(jd)
+        " local julian day of sunset (same as sunset(jd,place,gauri_choghadiya_setting=True)[2]) "
+        self.sunset_jd = utils.julian_day_number((y,m,d), tuple(utils.to_dms(self.sunset[0], as_string=False)))
+        self.next_sunrise = sunrise(jd+1, place)
+        self.weekday = vaara(jd)
+        self.sunrise_hours = self.sunrise[0]; self.sunset_hours = self.sunset[0]
+        self.day_length = self.sunset_hours - self.sunrise_hours
+        self.night_length = 24.0 + self.next_sunrise[0] - self.sunset_hours
+    def _day_night_periods(self,day_table,night_table,divisions):
+        """ @return: [(table_value,start_time_string,end_time_string)...] of equal divisions of day and night """
+        periods = []; start_time = self.sunrise[1]
+        for base_jd,duration,table in [(self.sunrise[2],self.day_length/24,day_table),(self.sunset_jd,self.night_length/24,night_table)]:
+            for i in range(1, divisions+1):
+                gt = base_jd+(i*duration)/divisions; _,_,_,fh = utils.jd_to_gregorian(gt); end_time = utils.to_dms(fh)
+                periods.append((table[i-1],start_time,end_time))
+                start_time = end_time
+        return periods
+    def midday(self):
+        """ @return: same as midday(jd,place) """
+        _,_,_,srh = utils.jd_to_gregorian(self.sunrise[2])
+        _,_,_,ssh = utils.jd_to_gregorian(self.sunset[2])
+        return 0.5*(srh+ssh), 0.5*(self.sunrise[2]+self.sunset[2])
+    def gauri_choghadiya(self):
+        """ @return: [(chogadiya type,start_time_string,end_time_string)...] """
+        return self._day_night_periods(const.gauri_choghadiya_day_table[self.weekday],
+                                       const.gauri_choghadiya_night_table[self.weekday], 8)
+    def amrit_kaalam(self):
+        """ @return: [(start_time_string,end_time_string)...] of amrit choghadiya """
+        return [(gb,ge) for gc,gb,ge in self.gauri_choghadiya() if gc==3]
+    def shubha_hora(self):
+        """ @return: [(hora_planet,start_time_string,end_time_string)...] """
+        return self._day_night_periods([row[self.weekday] for row in const.shubha_hora_day_table],
+                                       [row[self.weekday] for row in const.shubha_hora_night_table], 12)
+    def trikalam(self,option='raahu kaalam'):
+        """ @return: [start_time, end_time] of 'raahu kaalam', 'gulikai' or 'yamagandam' """
+        start_time = self.sunrise_hours + self.day_length * trikalam_offsets[option][self.weekday]
+        end_time = start_time + 0.125 * self.day_length
+        return [utils.to_dms(start_time), utils.to_dms(end_time)]
+    raahu_kaalam = lambda self: self.trikalam('raahu kaalam')
+    yamaganda_kaalam = lambda self: self.trikalam('yamagandam')
+    gulikai_kaalam = lambda self: self.trikalam('gulikai')
+    def durmuhurtam(self):
+        """ @return: [start_time, end_time,...] of dhur muhurthams """
+        # second durmuhurtam of tuesday uses night_duration instead of day_duration
+        dur = [self.day_length, self.day_length]
+        base = [self.sunrise_hours, self.sunrise_hours]
+        if self.weekday == 2:  dur[1] = self.night_length; base[1] = self.sunset_hours
+        answer = []
+        for i in range(0, 2):
+            offset = durmuhurtam_offsets[self.weekday][i]
+            if offset != 0.0:
+                start_time = base[i] + dur[i] * offset / 12
+                end_time = start_time + self.day_length * 0.8 / 12
+                answer += [utils.to_dms(start_time),utils.to_dms(end_time)]
+        return answer
+    def abhijit_muhurta(self):
+        """ @return: [start_time, end_time] of abhijit muhurta (8th of the 15 day muhurtas) """
+        start_time = self.sunrise_hours + 7 / 15 * self.day_length
+        end_time = self.sunrise_hours + 8 / 15 * self.day_length
+        return [utils.to_dms(start_time), utils.to_dms(end_time)]
+    def brahma_muhurtha(self):
+        """ @return: (start_hours, end_hours) of brahma muhurtha """
+        nm = self.night_length/15.0
+        return self.sunrise_hours-2*nm, self.sunrise_hours-nm
+    def godhuli_muhurtha(self):
+        """ @return: (start_hours, end_hours) of godhuli muhurtha """
+        dm = self.day_length/15.0 ; nm = self.night_length/15.0
+        return self.sunset_hours-0.25*dm, self.sunset_hours+0.25*nm
+    def sandhya_periods(self):
+        """ @return: pratah, madhyaahna and saayam sandhya periods as (start_hours, end_hours) """
+        ghati = self.day_length/30.
+        noon = self.sunrise_hours+0.5*self.day_length
+        ps = (self.sunrise_hours-2*ghati, self.sunrise_hours+ghati)
+        ms = (noon-1.5*ghati, noon+1.5*ghati)
+        ss = (self.sunset_hours-ghati,self.sunset_hours+2*ghati)
+        return ps,ms,ss
+    def vijaya_muhurtha(self):
+        """ @return: day and night vijaya muhurthas as (start_hours, end_hours) """
+        gd = self.day_length/30.; gn = self.night_length/30.0
+        noon = self.sunrise_hours+0.5*self.day_length; _midnight = self.sunset_hours+0.5*self.night_length
+        return (noon-gd, noon+gd), (_midnight-gn, _midnight+gn)
+    def nishita_kaala(self):
+        """ @return: (start_hours, end_hours) of eighth muhurtha of the night """
+        gn = self.night_length/30.0
+        return self.sunset_hours+7*gn, self.sunset_hours+8*gn
+    def nishita_muhurtha(self):
+        """ @return: (start_hours, end_hours) of 2 ghathis around midnight """
+        gn = self.night_length/30.0
+        _midnight = self.sunset_hours+0.5*self.night_length
+        return _midnight-gn,_midnight+gn
+    def tamil_jaamam(self):
+        """ @return: [(start_hours, end_hours)...] of 5 day and 5 night jaamams """
+        day_jaamam = self.day_length/5; night_jaamam = self.night_length/5
+        jaamam = [(self.sunrise_hours+j*day_jaamam,self.sunrise_hours+(j+1)*day_jaamam) for j in range(5)]
+        jaamam += [(self.sunset_hours+j*night_jaamam,self.sunset_hours+(j+1)*night_jaamam) for j in range(5)]
+        return jaamam
+    def muhurthas(self):
+        """ @return: [(muhurtha_name,auspicious(1)/inauspicious(0),(start_hours, end_hours))...] of 15 day and 15 night muhurthas """
+        day_muhurtha = self.day_length/15; night_muhurtha = self.night_length/15
+        _muhurthas = [(self.sunrise_hours+j*day_muhurtha,self.sunrise_hours+(j+1)*day_muhurtha) for j in range(15)]
+        _muhurthas += [(self.sunset_hours+j*night_muhurtha,self.sunset_hours+(j+1)*night_muhurtha) for j in range(15)]
+        return [(mk,const.muhurthas_of_the_day[mk],_muhurthas[mh]) for mh,mk in enumerate(const.muhurthas_of_the_day.keys()) ]
 def udhaya_lagna_muhurtha(jd,place):
     """
         returns ascendant entry jd into each of 12 rasis from given date/time
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Copyright (C) Open Astro Technologies, USA.
+# Modified by Sundar Sundaresan, USA. carnaticmusicguru2015@comcast.net
+# Downloaded from https://github.com/naturalstupid/PyJHora
+
+# This file is part of the "PyJHora" Python library
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+    Muhurtha window search
+    Each criterion (tithi, nakshatra, thaara/chandra balam, lagna, raahu kaalam etc) is a sorted stream of
+    (start_jd,end_jd) intervals built from the transition generators (see jhora.panchanga.transitions).
+    Streams are intersected/united lazily, so only the windows asked for are computed.
+    Hora and gauri choghadiya periods of a date range are generated from one sunrise/sunset table
+    and can be packed into arrays (see period_table) for bulk export and lookup by bisection (see period_at).
+    NOTE: All julian days of this module are local julian days (of the place)
+"""
+import heapq
+import numpy as np
+from jhora import const, utils
+from jhora.panchanga import drik, transitions
+_good_thaara_balam = [0,2,4,6,8] # count_stars(birth_star,star)%9 - Paramitra,Sampatha,Kshema,Sadhana,Mitra
+_good_chandra_balam = [1,3,6,7,10] # count_rasis(birth_rasi,moon_rasi)
+_default_exclusions = ['raahu kaalam','yamagandam','durmuhurtam','varjyam']
+_varjyam_duration_factor = 1.6/24 # varjyam lasts 1.6/24 of the nakshathra
+_good_hora_lords = [1,3,4,5] # Moon, Mercury, Jupiter, Venus (see const.shubha_hora_day_table)
+_good_choghadiyas = [1,2,3,5] # Chara, Laabha, Amrit, Shubha (see const.gauri_choghadiya_types)
+def intersect(*interval_streams):
+    """
+        Lazy intersection of interval streams
+        @param interval_streams: iterables of (start_jd,end_jd) - each sorted and non-overlapping
+        @return: yields (start_jd,end_jd) intervals common to all streams
+    """
+    iterators = [iter(stream) for stream in interval_streams]
+    try:
+        current = [next(iterator) for iterator in iterators]
+    except StopIteration:
+        return
+    while True:
+        start_jd = max(interval[0] for interval in current); end_jd = min(interval[1] for interval in current)
+        if start_jd < end_jd: yield (start_jd, end_jd)
+        for i,interval in enumerate(current):
+            if interval[1] == end_jd:
+                try:
+                    current[i] = next(iterators[i])
+                except StopIteration:
+                    return
+def union(*interval_streams):
+    """
+        Lazy union of interval streams
+        @param interval_streams: iterables of (start_jd,end_jd) - each sorted by start_jd
+        @return: yields merged (start_jd,end_jd) intervals covered by any of the streams
+    """
+    current = None
+    for start_jd,end_jd in heapq.merge(*interval_streams):
+        if current is None:
+            current = [start_jd, end_jd]
+        elif start_jd <= current[1]:
+            current[1] = max(current[1], end_jd)
+        else:
+            yield tuple(current); current = [start_jd, end_jd]
+    if current is not None: yield tuple(current)
+def complement(interval_stream,start_jd,end_jd):
+    """
+        Lazy complement of an interval stream within start_jd and end_jd
+        @param interval_stream: iterable of (start_jd,end_jd) - sorted and non-overlapping
+        @return: yields (start_jd,end_jd) intervals between start_jd and end_jd not covered by the stream
+    """
+    jd = start_jd
+    for interval_start,interval_end in interval_stream:
+        if interval_end <= jd: continue
+        if interval_start >= end_jd: break
+        if interval_start > jd: yield (jd, interval_start)
+        jd = max(jd, interval_end)
+    if jd < end_jd: yield (jd, end_jd)
+def _local_intervals(element_occurrences,place):
+    _tz = place.timezone/24
+    for _,start_jd_utc,end_jd_utc in element_occurrences:
+        yield (start_jd_utc+_tz, end_jd_utc+_tz)
+def _daily_intervals(place,start_jd,end_jd,intervals_of_the_day):
+    """ intervals_of_the_day(midnight_jd,place) for each day from the day before start_jd (night periods spill over) """
+    day_jd = utils.gregorian_to_jd(drik.Date(*drik.jd_to_gregorian(start_jd)[:3])) - 1
+    while day_jd < end_jd:
+        yield from intervals_of_the_day(day_jd, place)
+        day_jd += 1
+tithi_intervals = lambda place,start_jd,end_jd,tithis: _local_intervals(
+                    transitions.tithi_occurrences(tithis, start_jd-place.timezone/24, end_jd-place.timezone/24), place)
+nakshatra_intervals = lambda place,start_jd,end_jd,nakshatras: _local_intervals(
+                    transitions.nakshatra_occurrences(nakshatras, start_jd-place.timezone/24, end_jd-place.timezone/24), place)
+yoga_intervals = lambda place,start_jd,end_jd,yogas: _local_intervals(
+                    transitions.yoga_occurrences(yogas, start_jd-place.timezone/24, end_jd-place.timezone/24), place)
+def thaara_balam_intervals(place,start_jd,end_jd,birth_star):
+    """ intervals of the nakshatras with good thaara balam for birth_star [1..27] (see drik.thaaraabalam) """
+    good_stars = [star for star in range(1,28) if utils.count_stars(birth_star,star)%9 in _good_thaara_balam]
+    return nakshatra_intervals(place, start_jd, end_jd, good_stars)
+def chandra_balam_intervals(place,start_jd,end_jd,birth_rasi):
+    """ intervals of moon rasi with good chandra balam for birth_rasi [0..11] (see drik.chandrabalam) """
+    good_rasis = [rasi+1 for rasi in range(12) if utils.count_rasis(birth_rasi,rasi) in _good_chandra_balam]
+    return _local_intervals(transitions.lunar_rasi_occurrences(good_rasis, start_jd-place.timezone/24,
+                                                                 end_jd-place.timezone/24), place)
+def lagna_intervals(place,start_jd,end_jd,lagnas):
+    """ intervals of udhaya lagna in lagnas [0..11] (see drik.udhaya_lagna_muhurtha) """
+    _tz = place.timezone/24
+    lagna_phase = lambda jd_utc: (lambda asc: asc[0]*30+asc[1])(drik.ascendant(jd_utc+_tz, place))
+    return _local_intervals(transitions.occurrences(lagna_phase, 30.0, 360.9856, [lagna+1 for lagna in lagnas],
+                                                    start_jd-_tz, end_jd-_tz), place)
+def _trikalam_of_the_day(day_jd,place,option):
+    sunrise_jd = day_jd + drik.sunrise(day_jd, place)[0]/24; day_dur = drik.day_length(day_jd, place)/24
+    start_jd = sunrise_jd + day_dur * drik.trikalam_offsets[option][drik.vaara(day_jd)]
+    return [(start_jd, start_jd + 0.125*day_dur)]
+def _durmuhurtam_of_the_day(day_jd,place):
+    srise = drik.sunrise(day_jd, place)[0]; sset = drik.sunset(day_jd, place)[0]
+    day_dur = sset - srise; night_dur = drik.night_length(day_jd, place)
+    weekday = drik.vaara(day_jd)
+    """ second durmuhurtam of tuesday uses night_duration instead of day_duration """
+    base = [srise, sset if weekday == 2 else srise]; dur = [day_dur, night_dur if weekday == 2 else day_dur]
+    intervals = []
+    for i,offset in enumerate(drik.durmuhurtam_offsets[weekday]):
+        if offset == 0.0: continue
+        start_jd = day_jd + (base[i] + dur[i]*offset/12)/24
+        intervals.append((start_jd, start_jd + day_dur*0.8/12/24))
+    return intervals
+trikalam_intervals = lambda place,start_jd,end_jd,option='raahu kaalam': _daily_intervals(place, start_jd, end_jd,
+                                            lambda day_jd,place: _trikalam_of_the_day(day_jd, place, option))
+raahu_kaalam_intervals = lambda place,start_jd,end_jd: trikalam_intervals(place, start_jd, end_jd, 'raahu kaalam')
+yamagandam_intervals = lambda place,start_jd,end_jd: trikalam_intervals(place, start_jd, end_jd, 'yamagandam')
+gulikai_intervals = lambda place,start_jd,end_jd: trikalam_intervals(place, start_jd, end_jd, 'gulikai')
+durmuhurtam_intervals = lambda place,start_jd,end_jd: _daily_intervals(place, start_jd, end_jd, _durmuhurtam_of_the_day)
+def varjyam_intervals(place,start_jd,end_jd):
+    """ varjyam intervals from the nakshatra transitions (see drik.varjyam) - Moolam has two varjyams """
+    for start_jd_nak,end_jd_nak in nakshatra_intervals(place, start_jd-1, end_jd, list(range(1,28))):
+        nak = drik.nakshatra_pada(drik.lunar_longitude(0.5*(start_jd_nak+end_jd_nak)-place.timezone/24))[0]
+        nak_durn = end_jd_nak - start_jd_nak
+        nak_facs = const.amrita_gadiya_varjyam_star_map[nak-1][1]
+        for nak_fac in (nak_facs if isinstance(nak_facs,tuple) else (nak_facs,)):
+            varjyam_start = start_jd_nak + nak_fac/24*nak_durn
+            yield (varjyam_start, varjyam_start + _varjyam_duration_factor*nak_durn)
+exclusion_intervals = {'raahu kaalam':raahu_kaalam_intervals, 'yamagandam':yamagandam_intervals,
+                       'gulikai':gulikai_intervals, 'durmuhurtam':durmuhurtam_intervals, 'varjyam':varjyam_intervals}
+def _day_night_periods(place,start_jd,end_jd,divisions,day_lords,night_lords,good_lords):
+    """
+        Equal divisions of day (sunrise to sunset) and night (sunset to next sunrise) of each day (generator)
+        Sunrise/sunset of all the days are computed once (see drik.sunrise_sunset_table)
+        @param divisions: number of periods in day and in night (12 for hora, 8 for choghadiya)
+        @param day_lords, night_lords: functions of weekday returning lords of the day and night periods
+        @param good_lords: lords of auspicious periods
+        @return: yields (start_jd,end_jd,lord,quality) of periods overlapping start_jd and end_jd
+            quality = 1 auspicious, 0 inauspicious
+    """
+    first_day_jd = utils.gregorian_to_jd(drik.Date(*drik.jd_to_gregorian(start_jd)[:3])) - 1 # night periods spill over
+    day_count = max(1, int(np.ceil(end_jd - first_day_jd)))
+    day_table = drik.sunrise_sunset_table(first_day_jd, place, day_count)
+    for (day_jd,sunrise_hours,sunset_hours),(next_day_jd,next_sunrise_hours,_) in zip(day_table,day_table[1:]):
+        weekday = drik.vaara(day_jd)
+        sunrise_jd = day_jd + sunrise_hours/24; sunset_jd = day_jd + sunset_hours/24
+        next_sunrise_jd = next_day_jd + next_sunrise_hours/24
+        for base_jd,duration,lords in [(sunrise_jd,sunset_jd-sunrise_jd,day_lords(weekday)),
+                                       (sunset_jd,next_sunrise_jd-sunset_jd,night_lords(weekday))]:
+            for i in range(divisions):
+                period_start = base_jd + i*duration/divisions; period_end = base_jd + (i+1)*duration/divisions
+                if period_end <= start_jd: continue
+                if period_start > end_jd: return
+                yield (period_start, period_end, lords[i], int(lords[i] in good_lords))
+hora_periods = lambda place,start_jd,end_jd: _day_night_periods(place, start_jd, end_jd, 12,
+                    lambda weekday: [hora[weekday] for hora in const.shubha_hora_day_table],
+                    lambda weekday: [hora[weekday] for hora in const.shubha_hora_night_table], _good_hora_lords)
+""" hora periods (start_jd,end_jd,lord,quality) - lord [0..6] = Sun..Saturn (see drik.shubha_hora) """
+choghadiya_periods = lambda place,start_jd,end_jd: _day_night_periods(place, start_jd, end_jd, 8,
+                    lambda weekday: const.gauri_choghadiya_day_table[weekday],
+                    lambda weekday: const.gauri_choghadiya_night_table[weekday], _good_choghadiyas)
+""" gauri choghadiya periods (start_jd,end_jd,type,quality) - type [0..6] see const.gauri_choghadiya_types """
+def period_table(periods):
+    """
+        Compact array form of periods
+        @param periods: iterable of (start_jd,end_jd,lord,quality) sorted by time (see hora_periods, choghadiya_periods)
+        @return: (start_jds, end_jds, lords, qualities) as numpy arrays
+    """
+    periods = list(periods)
+    return (np.array([period[0] for period in periods], dtype=float), np.array([period[1] for period in periods], dtype=float),
+            np.array([period[2] for period in periods], dtype=int), np.array([period[3] for period in periods], dtype=int))
+def period_at(table,jd):
+    """
+        @param table: (start_jds, end_jds, lords, qualities) (see period_table)
+        @param jd: Julian Day Number
+        @return: index of the period in effect at jd (None if jd is outside the table)
+    """
+    index = int(np.searchsorted(table[0], jd, side='right')) - 1
+    return index if index >= 0 and jd < table[1][index] else None
+def muhurtha_windows(place,start_jd,end_jd,tithis=None,nakshatras=None,yogas=None,birth_star=None,birth_rasi=None,
+                     lagnas=None,exclusions=_default_exclusions,minimum_duration=0.0):
+    """
+        Find time windows satisfying all the given criteria (generator)
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @param start_jd: Julian Day Number of the start of the search
+        @param end_jd: Julian Day Number of the end of the search
+        @param tithis: list of allowed tithis [1..30] (None = any)
+        @param nakshatras: list of allowed nakshatras [1..27] (None = any)
+        @param yogas: list of allowed yogas [1..27] (None = any)
+        @param birth_star: birth nakshatra [1..27] - windows with good thaara balam (None = not checked)
+        @param birth_rasi: birth (moon) rasi [0..11] - windows with good chandra balam (None = not checked)
+        @param lagnas: list of allowed udhaya lagnas [0..11] (None = any)
+        @param exclusions: periods to be avoided - any of 'raahu kaalam','yamagandam','gulikai','durmuhurtam','varjyam'
+            Default: 'raahu kaalam','yamagandam','durmuhurtam','varjyam'
+        @param minimum_duration: minimum duration of a window in hours
+        @return: yields (window_start_jd, window_end_jd) in time order
+    """
+    streams = [[(start_jd, end_jd)]]
+    if tithis: streams.append(tithi_intervals(place, start_jd, end_jd, tithis))
+    if nakshatras: streams.append(nakshatra_intervals(place, start_jd, end_jd, nakshatras))
+    if yogas: streams.append(yoga_intervals(place, start_jd, end_jd, yogas))
+    if birth_star is not None: streams.append(thaara_balam_intervals(place, start_jd, end_jd, birth_star))
+    if birth_rasi is not None: streams.append(chandra_balam_intervals(place, start_jd, end_jd, birth_rasi))
+    if lagnas: streams.append(lagna_intervals(place, start_jd, end_jd, lagnas))
+    if exclusions:
+        excluded = union(*[exclusion_intervals[exclusion](place, start_jd, end_jd) for exclusion in exclusions])
+        streams.append(complement(excluded, start_jd, end_jd))
+    """ consecutive allowed elements (e.g. tithi 2 followed by tithi 3) are merged into one interval """
+    for window_start,window_end in intersect(*[union(stream) for stream in streams]):
+        if (window_end - window_start)*24 >= minimum_duration: yield (window_start, window_end)
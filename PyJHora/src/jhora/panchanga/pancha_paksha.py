@@ -22,9 +22,9 @@
     Module for Pancha Paksha Sastra
 """
 
-import pandas as pd
+import csv
 from jhora import utils, const
-from jhora.panchanga import drik, pancha_paksha
+from jhora.panchanga import drik, pancha_paksha, transitions
 
 PP_DB_FILE = const.ROOT_DIR+ '/data/pancha_pakshi_db.csv'
 IMAGE_PATH = const._IMAGES_PATH + const._sep
@@ -65,26 +65,66 @@ def _get_paksha(jd,place):
     return 1 if _tithi <= 15 else 2
 def _get_birth_bird_from_nakshathra(birth_star,_paksha):
     return pancha_pakshi_stars_birds_paksha[birth_star-1][_paksha-1]
+""" Columns of the database with float values (other columns are integer indices) """
+_FLOAT_COLUMNS = [_DURATION_FACTOR, _POWER_FACTOR]
+_pancha_pakshi_db = None
+def _load_pancha_pakshi_db(db_file=PP_DB_FILE):
+    """
+        Load pancha pakshi database once into a table indexed by (nakshathra bird, weekday, paksha)
+        @return: dict {(bird_index,weekday_index,paksha_index): [row,...]} (0 based indices as in the database)
+            rows (day time rows followed by night time rows) in the order of the database file
+    """
+    pp_db = {}
+    with open(db_file, encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f); next(reader)
+        for row in reader:
+            row = [float(v) if c in _FLOAT_COLUMNS else int(v) for c,v in enumerate(row[:_LAST_COL_FOR_READING+1])]
+            pp_db.setdefault((row[_NAK_BIRD_INDEX],row[_WEEK_DAY_INDEX],row[_PAKSHA_INDEX]),[]).append(row)
+    return pp_db
 def get_matching_pancha_pakshi_data_from_db(bird_index,weekday_index,paksha_index):
-    pp_db = pd.read_csv(PP_DB_FILE,index_col=None, encoding='utf-8',usecols=range(_LAST_COL_FOR_READING+1))
-    search_criteria = (
-        (pp_db.iloc[:,_NAK_BIRD_INDEX] == bird_index - 1) &
-        (pp_db.iloc[:,_WEEK_DAY_INDEX] == weekday_index - 1) &
-        (pp_db.iloc[:,_PAKSHA_INDEX] == paksha_index - 1)
-    )
-    search_results = pp_db[search_criteria]
-    result_list = search_results.values.tolist()
-    return result_list
+    global _pancha_pakshi_db
+    if _pancha_pakshi_db is None: _pancha_pakshi_db = _load_pancha_pakshi_db()
+    return [row[:] for row in _pancha_pakshi_db.get((bird_index-1,weekday_index-1,paksha_index-1),[])]
+def pancha_pakshi_schedule(start_date,day_count,place,nakshathra_bird_index):
+    """
+        Pancha pakshi periods of consecutive days (each day from sunrise to next sunrise)
+        Sunrise/sunset of all days are taken from one drik.sunrise_sunset_table
+        @param start_date: Date of the first day as tuple (year,month,day)
+        @param day_count: number of days
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @param nakshathra_bird_index: nakshathra pakshi [1..5] (see _get_birth_bird_from_nakshathra)
+        @return: list of (start_jd,end_jd,daynight_index,main_bird,main_activity,sub_bird,sub_activity,
+                          relation,power_factor,effect,rating)
+            start_jd,end_jd: local julian days; other values are the 0 based indices/values of the database
+    """
+    rise_set = drik.sunrise_sunset_table(utils.gregorian_to_jd(drik.Date(*start_date)), place, day_count)
+    schedule = []
+    for (day_jd,sunrise_hours,sunset_hours),(_,next_sunrise_hours,_) in zip(rise_set,rise_set[1:]):
+        sunrise_jd = day_jd + sunrise_hours/24
+        period_lengths = [(sunset_hours-sunrise_hours)/24/5, (24+next_sunrise_hours-sunset_hours)/24/5]
+        weekday_index = drik.vaara(sunrise_jd)+1
+        paksha_index = 1 if transitions.tithi_phase(sunrise_jd - place.timezone/24) < 180 else 2
+        time_from_jd = sunrise_jd
+        for wdi,pi,dni,mbi,mai,sbi,sai,df,reli,pf,efi,rtng,_,_ in \
+                get_matching_pancha_pakshi_data_from_db(nakshathra_bird_index,weekday_index,paksha_index):
+            time_to_jd = time_from_jd + period_lengths[dni]*df
+            schedule.append((time_from_jd,time_to_jd,dni,mbi,mai,sbi,sai,reli,pf,efi,rtng))
+            time_from_jd = time_to_jd
+    return schedule
 def construct_pancha_pakshi_information(dob=None,tob=None,place=None,nakshathra_bird_index=None):
     jd = utils.julian_day_number(dob,tob)
-    sunrise_jd = drik.sunrise(jd, place)[-1]
-    if jd < sunrise_jd:
-        jd -= 1
-        sunrise_jd = drik.sunrise(jd, place)[-1]
+    rise_set = drik.sunrise_sunset_table(jd-1, place, day_count=2)
+    if jd < rise_set[1][0] + rise_set[1][1]/24:
+        jd -= 1; rise_set = rise_set[:2]
+    else:
+        rise_set = rise_set[1:]
+    (day_jd,sunrise_hours,sunset_hours),(_,next_sunrise_hours,_) = rise_set
+    sunrise_jd = day_jd + sunrise_hours/24
     weekday_index = drik.vaara(jd)+1
-    paksha_index = pancha_paksha._get_paksha(jd, place)
-    day_length = drik.day_length(jd, place)
-    night_length = drik.night_length(jd, place)
+    """ paksha at the given time from the moon phase (tithi <= 15 => sukla paksha) """
+    paksha_index = 1 if transitions.tithi_phase(jd - place.timezone/24) < 180 else 2
+    day_length = sunset_hours - sunrise_hours
+    night_length = 24.0 + next_sunrise_hours - sunset_hours
     day_inc = day_length/5.0; night_inc = night_length/5.0
     result_list = pancha_paksha.get_matching_pancha_pakshi_data_from_db(nakshathra_bird_index,weekday_index,paksha_index)
     headers = ['starts_at','ends_at','duration','main_bird','main_activity','sub_bird','sub_activity','relation',
@@ -24,6 +24,7 @@
     WORK STILL IN PROGRESS - NOT WORKING FOR SOME PLANETS YET
 """
 import math
+import numpy as np
 from jhora import utils, const
 from jhora.panchanga import drik as drik
 import swisseph as swe
@@ -41,7 +42,8 @@ def kali_ahargana(jd):
     kad = int(jd - const.mahabharatha_tithi_julian_day) # (jd - 588466)
     wday = int(kad) % 7
     wdayjd = drik.vaara(jd)
-    winc = (wdayjd - 5 - wday)
+    """ Kali epoch is a Friday (5): smallest correction (-3..3 days) that brings the count to the weekday of jd """
+    winc = (wdayjd - 5 - wday + 3) % 7 - 3
     wdayc = (wday + winc + 5) % 7
     assert wdayc==wdayjd
     return kad+winc
@@ -270,7 +272,7 @@ def _mandaphala_planet(jd,planet,planet_mean_long):
         planet_true_motion_correction = corrected_periphery*planet_mean_motion*tab_sine_diff/(360*225)
         planet_true_motion = planet_mean_motion + mandakendra_sign * planet_true_motion_correction
         #print(p_id,'planet_true_motion',planet_mean_motion,planet_true_motion_correction,corrected_periphery,tab_sine_diff,utils.to_dms(planet_true_motion,is_lat_long='plong')) 
-        mandaphala_correction = mandakendra_sign * rectified_periphery*sind(mandakendra)
+        mandaphala_correction = rectified_periphery*sind(mandakendra)
     else:
         Po,Pe = const.planet_mandaphala_periphery_modern[planet]
         corrected_periphery = Pe - (Pe-Po) * abs(sind(mandakendra))
@@ -390,6 +392,119 @@ def planet_positions(jd,place:drik.Place):
     planet_positions_ss = [[const._ascendant_symbol,[asc[0],asc[1]]]] + planet_positions_ss
     #print('planet_positions_ss',planet_positions_ss)
     return planet_positions_ss
+""" Vectorized Surya sidhantha engine - all planets for arrays of julian days at once """
+_ss_planets = drik.planet_list[:]
+_ss_sun = _ss_planets.index(const._SUN); _ss_moon = _ss_planets.index(const._MOON)
+_ss_mandaphala_planets = [const._SUN, const._MOON, const._MARS, const._MERCURY, const._JUPITER, const._VENUS, const._SATURN]
+_ss_sighra_planets = [const._MARS, const._MERCURY, const._JUPITER, const._VENUS, const._SATURN]
+def _kali_ahargana_array(jds):
+    """ kali_ahargana of array of julian days """
+    jds = np.asarray(jds, dtype=float)
+    kad = np.trunc(jds - const.mahabharatha_tithi_julian_day)
+    wdayjd = np.array([drik.vaara(jd) for jd in jds.ravel()], dtype=float).reshape(jds.shape)
+    return kad + (wdayjd - 5 - kad % 7 + 3) % 7 - 3
+def mean_longitudes(jds,place:drik.Place):
+    """
+        Surya sidhantha mean longitudes (after desantara correction) of all planets - same as _planet_mean_longitude
+        @param jds: list/array of Julian Day Numbers
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @return: array of shape (len(jds),9) of mean longitudes of planets in the order of drik.planet_list
+    """
+    kan = _kali_ahargana_array(jds)
+    mean_longs = np.empty(kan.shape+(len(_ss_planets),))
+    for p_id,planet in enumerate(_ss_planets):
+        mean_daily_motion = round(const.planet_mean_revolutions_at_kali[planet] / const.civil_days_in_mahayuga * 360,7)
+        mean_long = ((kan * mean_daily_motion) + 360) % 360
+        if planet in [const._RAHU, const._KETU]:
+            mean_long = 180.0 - mean_long
+        if planet == const._KETU:
+            mean_long = (180.0 + mean_long) % 360
+        mean_longs[...,p_id] = (mean_long + _desantara_correction(place, planet) + 360.0) % 360
+    return mean_longs
+def _mandaphala_array(kan,planet,planet_mean_long):
+    """ _mandaphala_planet of arrays of kali ahargana and planet mean longitudes """
+    mandocca_motion = (kan / (const.civil_days_in_mahayuga) * const.madocca_revolutions[planet]*360) % 360
+    planet_mandocca = const.manodcca_positions_at_kali[planet] + mandocca_motion
+    mandakendra = (planet_mandocca - planet_mean_long + 360) % 360
+    Po,Pe = const.planet_mandaphala_periphery_modern[planet]
+    sin_mandakendra = np.sin(np.radians(mandakendra))
+    corrected_periphery = Pe - (Pe-Po) * np.abs(sin_mandakendra)
+    return const.mandakendrajya_indian_sine_radius/360.0 * corrected_periphery * sin_mandakendra
+def _sighraphala_array(planet,planet_mean_long,sun_mean_long):
+    """ sighra correction (sighraphala) of arrays of planet and sun mean longitudes """
+    if planet in [const._MERCURY, const._VENUS]:
+        m = (planet_mean_long - sun_mean_long + 360) % 360
+    else:
+        m = (sun_mean_long - planet_mean_long + 360) % 360
+    sin_m = np.sin(np.radians(m)); cos_m = np.cos(np.radians(m))
+    Po,Pe = const.planet_sighra_peripheries[planet]
+    r = (Pe - (Pe-Po) * np.abs(sin_m))/360.0
+    R = const.mandakendrajya_indian_sine_radius * 60.0
+    dohphala = r * R * sin_m
+    sphutakoti = R + r * R * cos_m
+    sighrakarna = np.sqrt(sphutakoti*sphutakoti+dohphala*dohphala)
+    return np.degrees(np.arcsin(dohphala/sighrakarna))
+def true_longitudes(jds,place:drik.Place,mean_longs=None):
+    """
+        Surya sidhantha true longitudes of all planets - same as _planet_true_longitude
+        @param jds: list/array of Julian Day Numbers
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @param mean_longs: mean longitudes (see mean_longitudes) if already computed
+        @return: array of shape (len(jds),9) of true longitudes of planets in the order of drik.planet_list
+    """
+    kan = _kali_ahargana_array(jds)
+    if mean_longs is None: mean_longs = mean_longitudes(jds, place)
+    true_longs = mean_longs.copy()
+    sun_mean_long = mean_longs[...,_ss_sun]
+    sun_mandaphala = _mandaphala_array(kan, const._SUN, sun_mean_long)
+    for planet in _ss_mandaphala_planets:
+        p_id = _ss_planets.index(planet); MP = mean_longs[...,p_id]
+        mandaphala = sun_mandaphala if planet == const._SUN else _mandaphala_array(kan, planet, MP)
+        if planet in _ss_sighra_planets:
+            SE = _sighraphala_array(planet, MP, sun_mean_long)
+            P2 = MP + 0.5 * SE + 0.5 * mandaphala
+            true_longs[...,p_id] = (MP + _mandaphala_array(kan, planet, P2) + SE + 360) % 360
+        else:
+            bhujantara = const.daily_mean_motions[planet]*sun_mandaphala/360
+            true_longs[...,p_id] = (MP + mandaphala + bhujantara + 360) % 360
+    return true_longs
+def planet_positions_series(jds,place:drik.Place):
+    """
+        Surya sidhantha planet positions (charts) of many julian days computed together
+        @param jds: list/array of Julian Day Numbers
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @return: list of planet_positions (same as planet_positions) one per julian day
+    """
+    true_longs = true_longitudes(jds, place)
+    positions_series = []
+    for jd,longs in zip(jds,true_longs.tolist()):
+        planet_positions_ss = [[p_id,[int(long/30),long%30]] for p_id,long in enumerate(longs)]
+        asc = ascendant_new(jd, place, longs[_ss_sun])
+        positions_series.append([[const._ascendant_symbol,[asc[0],asc[1]]]] + planet_positions_ss)
+    return positions_series
+def solar_months_and_dates(start_date,day_count,place:drik.Place):
+    """
+        Surya sidhantha solar (tamil) month and day of consecutive days - same as solar_month_and_date
+        @param start_date: Date of the first day as tuple (year,month,day)
+        @param day_count: number of days
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @return: list of (tamil_month [0..11], day of the month) one per day
+    """
+    """ days before the first day are needed to find the first day of its solar month """
+    look_back = 33
+    jd_start = utils.julian_day_number(start_date, (10,0,0))
+    jds = jd_start + np.arange(-look_back, day_count)
+    solar_months = (true_longitudes(jds, place)[:,_ss_sun] // 30).astype(int)
+    """ A solar month starts on the day the Sun is in a different rasi than on the previous day """
+    month_start = np.where(np.concatenate([[False], solar_months[1:] != solar_months[:-1]]), np.arange(len(jds)), -1)
+    month_start = np.maximum.accumulate(month_start)
+    months_and_dates = []
+    for d in range(look_back, look_back+day_count):
+        if month_start[d] < 0:
+            months_and_dates.append(solar_month_and_date(utils.jd_to_gregorian(jds[d])[:3], place))
+        else:
+            months_and_dates.append((int(solar_months[d]), int(d - month_start[d]) + 1))
+    return months_and_dates
 def _lunar_evection(sun_mean_longitude, moon_mean_longitude):
     pass
 def _declination_of_sun_1(jd):
@@ -456,15 +571,16 @@ def solar_month_and_date(panchanga_date,place,base_time=0,use_utc=True): # V4.4.
     sr = _planet_true_longitude(jd, place, const._SUN, solar_mean_long)
     tamil_month = int(sr/30)
     daycount=1
+    """ Count back to the first day of the month - the previous day has the Sun in another rasi """
     while True:
-        if sr%30<1 and sr%30>0:
-            break
         jd -= 1
         #jd_base = sunset(jd, place)[2] if base_time==0 else (sunrise(jd,place)[2] if base_time==1 else midday(jd, place)[1])
         #jd_utc = jd_base - place.timezone/24 if use_utc else jd_base
         #sr = solar_longitude(jd_utc)
         solar_mean_long = _planet_mean_longitude(jd, place, const._SUN)
         sr = _planet_true_longitude(jd, place, const._SUN, solar_mean_long)
+        if int(sr/30) != tamil_month:
+            break
         daycount+=1
     return tamil_month, daycount
 def _balachandra_rao_basic_program():
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+# Copyright (C) Open Astro Technologies, USA.
+# Modified by Sundar Sundaresan, USA. carnaticmusicguru2015@comcast.net
+# Downloaded from https://github.com/naturalstupid/PyJHora
+
+# This file is part of the "PyJHora" Python library
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+    Transition timelines of panchanga elements.
+    Tithi, karana, nakshatra, yoga and sankranti times over a date range are solved once with a phase root finder
+    (next transition predicted from the mean daily rate and refined by secant steps) instead of
+    evaluating the panchanga element day by day.
+    NOTE: All julian days of this module are UTC julian days (i.e. local julian day - place.timezone/24)
+"""
+from jhora.panchanga import drik
+""" Phase functions (degrees 0..360) of the panchanga elements at UTC julian day """
+tithi_phase = lambda jd_utc: drik.lunar_phase(jd_utc)
+nakshatra_phase = lambda jd_utc: drik.lunar_longitude(jd_utc)
+yoga_phase = lambda jd_utc: (drik.lunar_longitude(jd_utc) + drik.solar_longitude(jd_utc)) % 360
+sankranti_phase = lambda jd_utc: drik.solar_longitude(jd_utc)
+""" (arc in degrees, mean daily rate in degrees) of the phase functions """
+_one_tithi = (12.0, 12.1908); _one_karana = (6.0, 12.1908); _one_nakshatra = (360/27, 13.1764); _one_yoga = (360/27, 14.1620); _one_rasi = (30.0, 0.9856); _one_lunar_rasi = (30.0, 13.1764)
+_MAX_ITERATIONS = 20
+_JD_TOLERANCE = 1.0e-7 # ~ 10 milli seconds
+def phase_time(phase_function,target_phase,jd_guess,mean_rate):
+    """
+        Phase root finder
+        @param phase_function: function of UTC julian day returning phase angle in degrees (increasing with time)
+        @param target_phase: phase angle in degrees to be reached
+        @param jd_guess: UTC julian day close to the time phase reaches target_phase
+        @param mean_rate: mean daily rate of the phase (degrees/day) - used for the first step
+        @return: UTC julian day (nearest to jd_guess) at which the phase equals target_phase
+    """
+    _phase_error = lambda jd: (phase_function(jd) - target_phase + 180) % 360 - 180
+    jd = jd_guess; error = _phase_error(jd); rate = mean_rate
+    for _ in range(_MAX_ITERATIONS):
+        step = -error / rate
+        jd_next = jd + step; error_next = _phase_error(jd_next)
+        if abs(step) < _JD_TOLERANCE: return jd_next
+        if error_next != error: rate = (error_next - error) / (jd_next - jd)
+        if rate <= 0: rate = mean_rate
+        jd, error = jd_next, error_next
+    return jd
+def transitions(phase_function,arc,mean_rate,start_jd_utc,end_jd_utc):
+    """
+        Arcs traversed by the phase between two julian days
+        @param phase_function: function of UTC julian day returning phase angle in degrees (increasing with time)
+        @param arc: arc of one element in degrees (e.g. 12 for tithi)
+        @param mean_rate: mean daily rate of the phase (degrees/day)
+        @param start_jd_utc: UTC julian day of the start of the range
+        @param end_jd_utc: UTC julian day of the end of the range
+        @return: list of (element_number,start_jd_utc,end_jd_utc) of every element overlapping the range
+            element_number is 1 based (e.g. 1..30 for tithi)
+    """
+    element_count = round(360/arc)
+    phase = phase_function(start_jd_utc)
+    element = int(phase // arc) % element_count
+    start_jd = phase_time(phase_function, element*arc, start_jd_utc - (phase - element*arc)/mean_rate, mean_rate)
+    timeline = []
+    while start_jd < end_jd_utc:
+        next_element = (element+1) % element_count
+        end_jd = phase_time(phase_function, next_element*arc, start_jd + arc/mean_rate, mean_rate)
+        timeline.append((element+1, start_jd, end_jd))
+        element = next_element; start_jd = end_jd
+    return timeline
+tithi_timeline = lambda start_jd_utc,end_jd_utc: transitions(tithi_phase, *_one_tithi, start_jd_utc, end_jd_utc)
+karana_timeline = lambda start_jd_utc,end_jd_utc: transitions(tithi_phase, *_one_karana, start_jd_utc, end_jd_utc)
+nakshatra_timeline = lambda start_jd_utc,end_jd_utc: transitions(nakshatra_phase, *_one_nakshatra, start_jd_utc, end_jd_utc)
+yoga_timeline = lambda start_jd_utc,end_jd_utc: transitions(yoga_phase, *_one_yoga, start_jd_utc, end_jd_utc)
+sankranti_timeline = lambda start_jd_utc,end_jd_utc: transitions(sankranti_phase, *_one_rasi, start_jd_utc, end_jd_utc)
+def occurrences(phase_function,arc,mean_rate,element_numbers,start_jd_utc,end_jd_utc):
+    """
+        Occurrences of selected elements between two julian days (generator)
+        Next occurrence is predicted from the mean daily rate and its start/end solved by the phase root finder,
+        so the cost scales with the number of occurrences and not with the number of days
+        @param phase_function: function of UTC julian day returning phase angle in degrees (increasing with time)
+        @param arc: arc of one element in degrees (e.g. 12 for tithi)
+        @param mean_rate: mean daily rate of the phase (degrees/day)
+        @param element_numbers: list of 1 based element numbers to be searched (e.g. [11,26] for ekadhashi tithis)
+        @param start_jd_utc: UTC julian day of the start of the range
+        @param end_jd_utc: UTC julian day of the end of the range
+        @return: yields (element_number,start_jd_utc,end_jd_utc) in time order of every occurrence
+            in progress at start_jd_utc or starting before end_jd_utc
+    """
+    element_count = round(360/arc)
+    _elements_ahead = lambda element,from_element: (element-1-from_element) % element_count
+    phase = phase_function(start_jd_utc) % 360
+    element = int(phase // arc) % element_count
+    if element+1 in element_numbers:
+        target = element+1; jd_guess = start_jd_utc - (phase - element*arc)/mean_rate
+    else:
+        target = min(element_numbers, key=lambda e: _elements_ahead(e,element))
+        jd_guess = start_jd_utc + (((target-1)*arc - phase) % 360)/mean_rate
+    while True:
+        start_jd = phase_time(phase_function, (target-1)*arc, jd_guess, mean_rate)
+        if start_jd >= end_jd_utc: return
+        end_jd = phase_time(phase_function, (target*arc) % 360, start_jd + arc/mean_rate, mean_rate)
+        yield (target, start_jd, end_jd)
+        element = target % element_count
+        target = min(element_numbers, key=lambda e: _elements_ahead(e,element))
+        jd_guess = end_jd + _elements_ahead(target,element)*arc/mean_rate
+tithi_occurrences = lambda tithi_numbers,start_jd_utc,end_jd_utc: occurrences(tithi_phase, *_one_tithi, tithi_numbers, start_jd_utc, end_jd_utc)
+nakshatra_occurrences = lambda nakshatra_numbers,start_jd_utc,end_jd_utc: occurrences(nakshatra_phase, *_one_nakshatra, nakshatra_numbers, start_jd_utc, end_jd_utc)
+yoga_occurrences = lambda yoga_numbers,start_jd_utc,end_jd_utc: occurrences(yoga_phase, *_one_yoga, yoga_numbers, start_jd_utc, end_jd_utc)
+lunar_rasi_occurrences = lambda rasi_numbers,start_jd_utc,end_jd_utc: occurrences(nakshatra_phase, *_one_lunar_rasi, rasi_numbers, start_jd_utc, end_jd_utc)
+def lunations(tithi_timeline_list):
+    """
+        Lunation catalog from a tithi timeline
+        @param tithi_timeline_list: tithi timeline (see tithi_timeline)
+        @return: list of (new_moon_jd_utc, rasi) of the new moons (start of sukla prathama) in the timeline
+            rasi [0..11] is the rasi of Sun/Moon at the new moon
+    """
+    return [(start_jd, int(drik.lunar_longitude(start_jd)/30)) for tithi,start_jd,_ in tithi_timeline_list if tithi==1]
+def element_at(timeline,jd_utc):
+    """
+        @param timeline: list of (element_number,start_jd_utc,end_jd_utc) sorted by time
+        @param jd_utc: UTC julian day
+        @return: index of the timeline entry in effect at jd_utc (None if jd_utc is outside the timeline)
+    """
+    lo, hi = 0, len(timeline)
+    while lo < hi:
+        mid = (lo+hi)//2
+        if timeline[mid][1] <= jd_utc: lo = mid+1
+        else: hi = mid
+    index = lo-1
+    return index if index >= 0 and jd_utc < timeline[index][2] else None
@@ -23,10 +23,12 @@
 
 from itertools import combinations
 from jhora.panchanga import drik as panchanga
-from jhora.horoscope.chart import charts
+from jhora.panchanga import transitions
 from jhora import utils, const
 import swisseph as swe
 import datetime
+import math
+import numpy as np
 """
     TODO: Convert all return values [(Date,start_time,end_time,tag),...] 
     Note: end_time is optional but last item should be tag which contains descrption of the vratha
@@ -168,6 +170,38 @@ def pradosham_dates(panchanga_place,panchanga_start_date,panchanga_end_date=None
         if panchanga_end_date is None :
             return special_vratha_dates
     return special_vratha_dates
+def _candidate_day_offsets(element_occurrences,panchanga_place,first_jd,day_count):
+    """
+        Day offsets from first_jd on which a day by day check can find any of the element occurrences
+        (days within a day of an occurrence). Other days need not be checked.
+        @param element_occurrences: iterable of (element_number,start_jd_utc,end_jd_utc) (see transitions.occurrences)
+        @param first_jd: local julian day of the first day check
+        @param day_count: number of days to check
+        @return: sorted list of day offsets in range(day_count)
+    """
+    _tz = panchanga_place.timezone/24
+    day_offsets = set()
+    for _,start_jd,end_jd in element_occurrences:
+        first_offset = max(0, math.floor(start_jd + _tz - first_jd) - 1)
+        last_offset = min(day_count - 1, math.ceil(end_jd + _tz - first_jd) + 1)
+        day_offsets.update(range(first_offset, last_offset + 1))
+    return sorted(day_offsets)
+def _day_by_day_hits(first_jd,day_offsets,skip_days,check_day):
+    """
+        Day by day check restricted to the candidate days
+        @param first_jd: local julian day of the first day check
+        @param day_offsets: sorted candidate day offsets from first_jd (see _candidate_day_offsets)
+        @param skip_days: days skipped after each hit
+        @param check_day: function(jd) returning the hit of the day or None
+        @return: yields hits
+    """
+    next_offset = 0
+    for day_offset in day_offsets:
+        if day_offset < next_offset: continue
+        day_hit = check_day(first_jd + day_offset)
+        if day_hit is None: continue
+        yield day_hit
+        next_offset = day_offset + skip_days + 1
 def tithi_dates(panchanga_place,panchanga_start_date,panchanga_end_date=None,tithi_index_list=None,tag_t=''):
     """ TODO For Amavasya select Date that has amavasya spreads in the afternoon """ 
     jd = utils.julian_day_number(panchanga_start_date, (6.5,0,0))
@@ -179,71 +213,68 @@ def tithi_dates(panchanga_place,panchanga_start_date,panchanga_end_date=None,tit
         _end_date = utils.next_panchanga_day(_start_date, 365)
     else:
         _end_date = panchanga.Date(panchanga_end_date.year,panchanga_end_date.month,panchanga_end_date.day)
-    cur_date = _start_date
     cur_jd = swe.julday(panchanga_start_date.year,panchanga_start_date.month,panchanga_start_date.day,sunrise_hours)
     end_jd = swe.julday(_end_date.year,_end_date.month,_end_date.day,sunrise_hours)
-    special_vratha_dates = []
     skip_days = 14
     if len(tithi_index_list) > 1:
         skip_days = 1
-    while cur_jd < end_jd:
+    def _tithi_of_the_day(cur_jd):
         cur_tithi = panchanga.tithi(cur_jd, panchanga_place)
         cur_date = panchanga.jd_to_gregorian(cur_jd)[0:3]
         if cur_tithi[0] in tithi_index_list:
-            #print('cur tithi',cur_date,cur_tithi,len(cur_tithi))
-            starts_at = cur_tithi[1]
-            ends_at = cur_tithi[2]
-            paksha = 0 if cur_tithi[0]<=15 else 1
-            tag = utils.PAKSHA_LIST[paksha]+' / '+utils.TITHI_LIST[cur_tithi[0]-1]
-            if tag_t not in tag: tag += tag_t
-            special_vratha_dates.append((cur_date,starts_at,ends_at,tag))
-            if panchanga_end_date is None :
-                return special_vratha_dates
-            cur_jd += skip_days
+            tithi_no, starts_at, ends_at = cur_tithi[0:3]
         elif len(cur_tithi) > 3 and cur_tithi[3] in tithi_index_list:
-            #print('cur tithi',cur_date,cur_tithi,len(cur_tithi))        
-            starts_at = cur_tithi[4]
-            ends_at = cur_tithi[5]
-            paksha = 0 if cur_tithi[3]<=15 else 1
-            tag = utils.PAKSHA_LIST[paksha]+' / '+utils.TITHI_LIST[cur_tithi[3]-1]
-            if tag_t not in tag: tag += tag_t
-            special_vratha_dates.append((cur_date,starts_at,ends_at,tag))
-            if panchanga_end_date is None :
-                return special_vratha_dates
-            cur_jd += skip_days
-        cur_jd += 1 
+            tithi_no, starts_at, ends_at = cur_tithi[3:6]
+        else:
+            return None
+        paksha = 0 if tithi_no<=15 else 1
+        tag = utils.PAKSHA_LIST[paksha]+' / '+utils.TITHI_LIST[tithi_no-1]
+        if tag_t not in tag: tag += tag_t
+        return (cur_date,starts_at,ends_at,tag)
+    day_count = round(end_jd - cur_jd)
+    _tz = panchanga_place.timezone/24
+    tithi_occurrences = transitions.tithi_occurrences(tithi_index_list, cur_jd - _tz - 1, end_jd - _tz + 1)
+    day_offsets = _candidate_day_offsets(tithi_occurrences, panchanga_place, cur_jd, day_count)
+    special_vratha_dates = []
+    for vratha_date in _day_by_day_hits(cur_jd, day_offsets, skip_days, _tithi_of_the_day):
+        special_vratha_dates.append(vratha_date)
+        if panchanga_end_date is None :
+            return special_vratha_dates
     return special_vratha_dates
 def nakshathra_dates(panchanga_place,panchanga_start_date,panchanga_end_date=None,nakshathra_index_list=None):
-    res = utils.resource_strings
     _start_date = panchanga.Date(panchanga_start_date.year,panchanga_start_date.month,panchanga_start_date.day)
     if panchanga_end_date is None :
         _end_date = utils.next_panchanga_day(_start_date, 365)
     else:
         _end_date = panchanga.Date(panchanga_end_date.year,panchanga_end_date.month,panchanga_end_date.day)
-    cur_date = _start_date
     cur_jd = swe.julday(panchanga_start_date.year,panchanga_start_date.month,panchanga_start_date.day,0.0)
     end_jd = swe.julday(_end_date.year,_end_date.month,_end_date.day,0.0)
-    special_vratha_dates = []
     skip_days = 26
     if len(nakshathra_index_list) > 1:
         skip_days = 1
-    while cur_jd < end_jd:
+    def _nakshathra_of_the_day(cur_jd):
         current_nakshathra = panchanga.nakshatra(cur_jd, panchanga_place)
+        if current_nakshathra[0] not in nakshathra_index_list:
+            return None
         cur_date = panchanga.jd_to_gregorian(cur_jd)[0:3]
-        if current_nakshathra[0] in nakshathra_index_list and cur_date not in special_vratha_dates:
-            starts_at = current_nakshathra[1]
-            ends_at = current_nakshathra[2]
-            tag = utils.NAKSHATRA_LIST[current_nakshathra[0]-1]
-            special_vratha_dates.append((cur_date,starts_at,ends_at,tag))
-            if ends_at < 0:
-                days = int(abs(ends_at)//24)+1
-                new_ends_at = abs(ends_at)%24
-                new_cur_date = utils.previous_panchanga_day(panchanga.Date(cur_date[0],cur_date[1],cur_date[2]), minus_days=days)
-                special_vratha_dates[-1]= (new_cur_date,starts_at,new_ends_at,tag)
-            if panchanga_end_date is None :
-                return special_vratha_dates
-            cur_jd += skip_days
-        cur_jd += 1 
+        starts_at = current_nakshathra[1]
+        ends_at = current_nakshathra[2]
+        tag = utils.NAKSHATRA_LIST[current_nakshathra[0]-1]
+        if ends_at < 0:
+            days = int(abs(ends_at)//24)+1
+            new_ends_at = abs(ends_at)%24
+            new_cur_date = utils.previous_panchanga_day(panchanga.Date(cur_date[0],cur_date[1],cur_date[2]), minus_days=days)
+            return (new_cur_date,starts_at,new_ends_at,tag)
+        return (cur_date,starts_at,ends_at,tag)
+    day_count = round(end_jd - cur_jd)
+    _tz = panchanga_place.timezone/24
+    nakshathra_occurrences = transitions.nakshatra_occurrences(nakshathra_index_list, cur_jd - _tz - 1, end_jd - _tz + 1)
+    day_offsets = _candidate_day_offsets(nakshathra_occurrences, panchanga_place, cur_jd, day_count)
+    special_vratha_dates = []
+    for vratha_date in _day_by_day_hits(cur_jd, day_offsets, skip_days, _nakshathra_of_the_day):
+        special_vratha_dates.append(vratha_date)
+        if panchanga_end_date is None :
+            return special_vratha_dates
     return special_vratha_dates
 def yoga_dates(panchanga_place,panchanga_start_date,panchanga_end_date=None,yoga_index_list=None,tag_y=''):
     res = utils.resource_strings
@@ -253,118 +284,136 @@ def yoga_dates(panchanga_place,panchanga_start_date,panchanga_end_date=None,yoga
         _end_date = utils.next_panchanga_day(_start_date, 365)
     else:
         _end_date = panchanga.Date(panchanga_end_date.year,panchanga_end_date.month,panchanga_end_date.day)
-    cur_date = _start_date
     cur_jd = swe.julday(panchanga_start_date.year,panchanga_start_date.month,panchanga_start_date.day,0.0)
     end_jd = swe.julday(_end_date.year,_end_date.month,_end_date.day,0.0)
-    special_vratha_dates = []
     skip_days = 26
     if len(yoga_index_list) > 0:
         skip_days = 1
-    while cur_jd < end_jd:
+    def _yoga_of_the_day(cur_jd):
         cur_yoga = panchanga.yogam(cur_jd, panchanga_place)
+        if cur_yoga[0] not in yoga_index_list:
+            return None
         cur_date = panchanga.jd_to_gregorian(cur_jd)[0:3]
-        if cur_yoga[0] in yoga_index_list:
-            ends_at = cur_yoga[1]; tag = utils.YOGAM_LIST[cur_yoga[0]-1] +' '+res['yogam_str']
-            if tag_y not in tag: tag += tag_y
-            special_vratha_dates.append((cur_date,ends_at,tag))
-            if panchanga_end_date is None :
-                return special_vratha_dates
-            cur_jd += skip_days
-        cur_jd += 1 
-    return special_vratha_dates
-def _get_planets_in_conjunction(planet_positions,minimum_separation_longitude):
-    """ Exlcude Lagnam, Sun, Moon, Rahu and Ketu  planet_positions[3:8] """
-    planets_in_conjunction = []
-    pcomb = combinations(range(2,7),2) # Planets from Mars to Saturn
-    for p1,p2 in pcomb:
-        p1_long = planet_positions[p1+1][1][0]*30+planet_positions[p1+1][1][1]
-        p2_long = planet_positions[p2+1][1][0]*30+planet_positions[p2+1][1][1]
-        if abs(p1_long-p2_long) < minimum_separation_longitude:
-            print(p1,p1_long,p2,p2_long)
-            planets_in_conjunction.append((p1,p2))
-    return planets_in_conjunction    
-def _get_planets_in_conjunction_same_house(planet_positions,minimum_separation_longitude):
-    """ Exlcude Lagnam, Sun, Moon, Rahu and Ketu  planet_positions[3:8] """
-    planets_in_conjunction = []
-    h_to_p = utils.get_house_planet_list_from_planet_positions(planet_positions[1:8])
-    #print(h_to_p)
-    for h,pls in enumerate(h_to_p):
-        ps = [int(p) for p in pls.split('/') if p.isdigit()]
-        coms = combinations(ps,2)
-        #print(h,pls,ps)
-        for p1, p2 in coms:
-            p1_long = planet_positions[p1+1][1][0]*30+planet_positions[p1+1][1][1]
-            p2_long = planet_positions[p2+1][1][0]*30+planet_positions[p2+1][1][1]
-            if abs(p1_long-p2_long) < minimum_separation_longitude:
-                print(h,p1,p1_long,p2,p2_long)
-                planets_in_conjunction.append((h,[p1,p2]))
-    return planets_in_conjunction
-def conjunctions(panchanga_place,panchanga_start_date,panchanga_end_date,minimum_separation_longitude,planets_in_same_house=False):
-    #if planets_in_same_house:
-    #    minimum_separation_longitude = 30.0
-    _start_date = panchanga.Date(panchanga_start_date.year,panchanga_start_date.month,panchanga_start_date.day)
-    _end_date = panchanga.Date(panchanga_end_date.year,panchanga_end_date.month,panchanga_end_date.day)
-    cur_date = _start_date
-    #cur_jd = swe.julday(panchanga_start_date.year,panchanga_start_date.month,panchanga_start_date.day,0.0)
-    #end_jd = swe.julday(panchanga_end_date.year,panchanga_end_date.month,panchanga_end_date.day,0.0)
-    cur_jd = utils.julian_day_number(panchanga_start_date, (0,0,0))
-    end_jd = utils.julian_day_number(panchanga_end_date, (0,0,0))
+        ends_at = cur_yoga[1]; tag = utils.YOGAM_LIST[cur_yoga[0]-1] +' '+res['yogam_str']
+        if tag_y not in tag: tag += tag_y
+        return (cur_date,ends_at,tag)
+    day_count = round(end_jd - cur_jd)
+    _tz = panchanga_place.timezone/24
+    yoga_occurrences = transitions.yoga_occurrences(yoga_index_list, cur_jd - _tz - 1, end_jd - _tz + 1)
+    day_offsets = _candidate_day_offsets(yoga_occurrences, panchanga_place, cur_jd, day_count)
     special_vratha_dates = []
-    while cur_jd < end_jd:
-        cur_date = panchanga.jd_to_gregorian(cur_jd)[0:3] # Ignore time
-        planet_positions = charts.divisional_chart(cur_jd, panchanga_place)
-        if planets_in_same_house:
-            result_local = _get_planets_in_conjunction_same_house(planet_positions,minimum_separation_longitude)
+    for vratha_date in _day_by_day_hits(cur_jd, day_offsets, skip_days, _yoga_of_the_day):
+        special_vratha_dates.append(vratha_date)
+        if panchanga_end_date is None :
+            return special_vratha_dates
+    return special_vratha_dates
+""" Maximum daily speeds (degrees/day, direct or retrograde) of Sun..Ketu - used to size the conjunction search grid """
+_planet_max_daily_speeds = [1.02, 15.4, 0.8, 2.2, 0.25, 1.27, 0.13, 0.2, 0.2]
+_conjunction_planets = [2,3,4,5,6] # Mars to Saturn
+_conjunction_jd_tolerance = 1.0e-6
+def _planet_longitude(jd_utc,planet):
+    if planet==8: return panchanga.ketu(panchanga.sidereal_longitude(jd_utc, panchanga.planet_list[7]))
+    return panchanga.sidereal_longitude(jd_utc, panchanga.planet_list[planet])
+_separation = lambda long1,long2: np.abs((np.asarray(long1)-long2+180)%360-180)
+_pair_separation = lambda jd_utc,p1,p2: float(_separation(_planet_longitude(jd_utc,p1),_planet_longitude(jd_utc,p2)))
+def _minimum_separation(p1,p2,jd1,jd2):
+    """ Golden section search of the minimum separation of planets p1/p2 between UTC julian days jd1 and jd2 """
+    golden = (5**0.5-1)/2
+    jd_c = jd2 - golden*(jd2-jd1); jd_d = jd1 + golden*(jd2-jd1)
+    sep_c = _pair_separation(jd_c,p1,p2); sep_d = _pair_separation(jd_d,p1,p2)
+    while jd2 - jd1 > _conjunction_jd_tolerance:
+        if sep_c < sep_d:
+            jd2, jd_d, sep_d = jd_d, jd_c, sep_c
+            jd_c = jd2 - golden*(jd2-jd1); sep_c = _pair_separation(jd_c,p1,p2)
+        else:
+            jd1, jd_c, sep_c = jd_c, jd_d, sep_d
+            jd_d = jd1 + golden*(jd2-jd1); sep_d = _pair_separation(jd_d,p1,p2)
+    jd = 0.5*(jd1+jd2)
+    return jd, _pair_separation(jd,p1,p2)
+def _separation_crossing(p1,p2,separation,jd1,jd2):
+    """ Bisection: UTC julian day between jd1 and jd2 at which separation of planets p1/p2 crosses the separation """
+    below1 = _pair_separation(jd1,p1,p2) < separation
+    while jd2 - jd1 > _conjunction_jd_tolerance:
+        jd = 0.5*(jd1+jd2)
+        if (_pair_separation(jd,p1,p2) < separation) == below1: jd1 = jd
+        else: jd2 = jd
+    return 0.5*(jd1+jd2)
+def _pair_close_approaches(p1,p2,jds,separations,minimum_separation_longitude):
+    """
+        Close approaches of planets p1/p2 from their separations sampled on the grid of UTC julian days jds
+        @return: [(p1,p2,entry_jd_utc,exit_jd_utc,minimum_jd_utc,minimum_separation),...]
+    """
+    sample_count = len(jds); sample_indices = np.arange(sample_count)
+    left = np.r_[np.inf, separations[:-1]]; right = np.r_[separations[1:], np.inf]
+    minima = np.flatnonzero((separations <= left) & (separations < right))
+    above = separations >= minimum_separation_longitude
+    last_above = np.maximum.accumulate(np.where(above, sample_indices, -1))
+    next_above = np.minimum.accumulate(np.where(above, sample_indices, sample_count)[::-1])[::-1]
+    approaches = {}
+    for i in minima:
+        minimum_jd, minimum_sep = _minimum_separation(p1, p2, jds[max(i-1,0)], jds[min(i+1,sample_count-1)])
+        if minimum_sep >= minimum_separation_longitude: continue
+        k = min(np.searchsorted(jds, minimum_jd, side='right')-1, sample_count-1)
+        j = last_above[k]; m = next_above[k+1] if k+1 < sample_count else sample_count
+        entry_jd = jds[0] if j < 0 else _separation_crossing(p1, p2, minimum_separation_longitude, jds[j], min(jds[j+1], minimum_jd))
+        exit_jd = jds[-1] if m >= sample_count else _separation_crossing(p1, p2, minimum_separation_longitude, max(jds[m-1], minimum_jd), jds[m])
+        if (j,m) not in approaches or minimum_sep < approaches[(j,m)][-1]:
+            approaches[(j,m)] = (p1, p2, entry_jd, exit_jd, minimum_jd, minimum_sep)
+    return list(approaches.values())
+def _same_rasi_clusters(approaches,timezone_days):
+    """
+        Group close approaches (with local julian days) whose planets are in the same rasi at the minimum
+        and whose entry/exit overlap into clusters
+        @param timezone_days: place timezone in days (local julian day - UTC julian day)
+        @return: [(rasi,[planets],entry_jd,exit_jd,[approaches]),...]
+    """
+    clusters = []
+    for approach in sorted(approaches, key=lambda a: a[2]):
+        p1, p2, entry_jd, exit_jd, minimum_jd, _ = approach
+        rasi = [int(_planet_longitude(minimum_jd - timezone_days, p) // 30) for p in (p1, p2)]
+        if rasi[0] != rasi[1]: continue
+        for cluster in clusters:
+            if cluster[0] == rasi[0] and entry_jd <= cluster[3]:
+                cluster[1].update((p1,p2)); cluster[3] = max(cluster[3], exit_jd); cluster[4].append(approach)
+                break
         else:
-            result_local = _get_planets_in_conjunction(planet_positions,minimum_separation_longitude)
-        if result_local:
-            special_vratha_dates.append((cur_date,result_local))
-        cur_jd += 1 
-    return utils.flatten_list(special_vratha_dates)
-def _get_conjunction_time_1(jd,place,p1,p2):
-    tz = place.timezone
-    yjd, mjd, djd, _ = utils.jd_to_gregorian(jd)
-    jd_utc = utils.gregorian_to_jd(panchanga.Date(yjd, mjd, djd))
-    n=24; offsets = [s/n for s in range(-n,n)]
-    rise = panchanga.sunrise(jd, place)[2]
-    p1_long = [];p2_long=[]
-    ya = 0;
-    for t in offsets:
-        pp = charts.rasi_chart(jd+(t/24.0/60.0),place)
-        p1_long=pp[p1+1][1][0]*30+pp[p1+1][1][1]
-        p2_long=pp[p2+1][1][0]*30+pp[p2+1][1][1]
-        print(utils.to_dms((jd + t -jd_utc) * 24 + tz),utils.to_dms(p1_long,is_lat_long='plong'),utils.to_dms(p2_long,is_lat_long='plong'))
-        if abs(p1_long-p2_long)<.01:
-            print('found matching long')
-            ya = t; return ya;
-    #print('p1_long',[utils.to_dms(p1l,is_lat_long='plong') for p1l in p1_long])
-    #print('p2_long',[utils.to_dms(p2l,is_lat_long='plong') for p2l in p2_long])
-    #long_diff = [ p1 - p2 for (p1, p2) in zip(p1_long, p2_long) ]
-    #y = long_diff; x= offsets;
-    #ya = utils.inverse_lagrange(x, y, 0.0)
-    vt = (rise + ya -jd_utc) * 24 + tz
-    return ya# vt
-def _get_conjunction_time(jd,place,p1,p2):
-    tz = place.timezone
-    yjd, mjd, djd, _ = utils.jd_to_gregorian(jd)
-    jd_utc = utils.gregorian_to_jd(panchanga.Date(yjd, mjd, djd))
-    #jd_utc = jd - tz/24. ### It appears this way calculating jd_utc is incorrect
-    n=10; offsets = [s/n for s in range(0,n)]
-    rise = panchanga.sunrise(jd, place)[2]
-    p1_long = [];p2_long=[]
-    for t in offsets:
-        pp = charts.rasi_chart(rise+t,place)
-        p1_long.append(pp[p1+1][1][0]*30+pp[p1+1][1][1])
-        p2_long.append(pp[p2+1][1][0]*30+pp[p2+1][1][1])
-    #print('p1_long',[utils.to_dms(p1l,is_lat_long='plong') for p1l in p1_long])
-    #print('p2_long',[utils.to_dms(p2l,is_lat_long='plong') for p2l in p2_long])
-    long_diff = [ abs(p1 - p2) for (p1, p2) in zip(p1_long, p2_long) ]
-    print(long_diff)
-    y = long_diff; x= offsets;
-    ya = utils.inverse_lagrange(x, y, 0.0)
-    vt = (rise + ya -jd_utc) * 24 + tz
-    print(utils.to_dms(vt,as_string=True))
-    return ya# vt
+            clusters.append([rasi[0], {p1,p2}, entry_jd, exit_jd, [approach]])
+    return [(rasi, sorted(planets), entry_jd, exit_jd, cluster_approaches) for rasi,planets,entry_jd,exit_jd,cluster_approaches in clusters]
+def conjunctions(panchanga_place,panchanga_start_date,panchanga_end_date,minimum_separation_longitude,planets_in_same_house=False,planets=None):
+    """
+        Close approaches (conjunctions) of planet pairs between dates
+        Separations of all pairs are computed as arrays over a grid whose step is sized by the fastest relative speed,
+        entry/exit of the separation threshold are solved by bisection and the minimum by golden section search
+        @param panchanga_place: Place struct ('place',latitude,longitude,timezone)
+        @param panchanga_start_date: Date struct (y,m,d)
+        @param panchanga_end_date: Date struct (y,m,d)
+        @param minimum_separation_longitude: separation (degrees) within which planets are in conjunction
+        @param planets_in_same_house: True - group approaches of planets in the same rasi into clusters
+        @param planets: list of planet indices (0=Sun..8=Ketu) Default: Mars to Saturn
+        @return: planets_in_same_house=False: [(p1,p2,entry_jd,exit_jd,minimum_jd,minimum_separation),...] in time order of minimum_jd
+                    entry_jd/exit_jd are start/end of the range if the planets are already/still within the separation
+                planets_in_same_house=True: [(rasi,[planets],entry_jd,exit_jd,[approaches of the cluster]),...]
+                All julian days are local julian days (of panchanga_place)
+    """
+    _tz = panchanga_place.timezone/24
+    if planets is None: planets = _conjunction_planets
+    planet_pairs = [(p1,p2) for p1,p2 in combinations(planets,2) if {p1,p2} != {7,8}]
+    if len(planet_pairs) == 0: return []
+    start_jd_utc = utils.julian_day_number(panchanga_start_date, (0,0,0)) - _tz
+    end_jd_utc = utils.julian_day_number(panchanga_end_date, (0,0,0)) - _tz
+    max_relative_speed = max(_planet_max_daily_speeds[p1]+_planet_max_daily_speeds[p2] for p1,p2 in planet_pairs)
+    grid_step = min(1.0, minimum_separation_longitude/max_relative_speed)
+    jds = np.append(np.arange(start_jd_utc, end_jd_utc, grid_step), end_jd_utc)
+    longitudes = {p:np.array([_planet_longitude(jd,p) for jd in jds]) for p in planets}
+    approaches = []
+    for p1,p2 in planet_pairs:
+        separations = _separation(longitudes[p1], longitudes[p2])
+        approaches += _pair_close_approaches(p1, p2, jds, separations, minimum_separation_longitude)
+    approaches = sorted([(p1, p2, entry_jd+_tz, exit_jd+_tz, minimum_jd+_tz, minimum_sep)
+                         for p1,p2,entry_jd,exit_jd,minimum_jd,minimum_sep in approaches], key=lambda a: a[4])
+    if planets_in_same_house:
+        return _same_rasi_clusters(approaches, _tz)
+    return approaches
 def search(panchanga_place,panchanga_start_date,panchanga_end_date=None,tithi_index=None,nakshathra_index=None,
            yoga_index=None,tamil_month_index=None,description='',festival_name_contains=None):
     _special_vratha_dates = []
@@ -640,79 +689,305 @@ def tithi_pravesha(birth_date:panchanga.Date=None,birth_time:tuple=None,birth_pl
     return tp
 
 import csv
+import hashlib
+import json
+import os
+import tempfile
+from itertools import product
 
 # Global variable to store festival data
 festival_data = []
+""" festival_data compiled into hash indexes {calendar_type:{criteria_keys:{criteria_values:[row_index,...]}}} """
+_festival_index = {}
+_festival_criteria_keys = ['Tithi','Nakshatra','tamil_month','tamil_day','vaara','adhik_maasa']
+_FESTIVAL_INDEX_FORMAT = 2 # Change when _compile_festival_index output changes - cached indexes of other formats are not used
 
 # Function to load festival data from CSV file
 def load_festival_data(file_path=const._FESTIVAL_FILE):
-    global festival_data
+    """
+        Loads festival csv file into festival_data and compiles its hash index.
+        Compiled index is cached (json) in const._FESTIVAL_INDEX_CACHE_DIR keyed by the index format and the hash of the csv file.
+        A cache file that cannot be read or is not valid is ignored and rebuilt.
+    """
+    global festival_data, _festival_index
+    with open(file_path, mode='rb') as file:
+        csv_hash = hashlib.sha256(file.read()).hexdigest()
+    cache_file = os.path.join(const._FESTIVAL_INDEX_CACHE_DIR,'festival_index_v'+str(_FESTIVAL_INDEX_FORMAT)+'_'+csv_hash+'.json')
+    cached = _read_festival_index_cache(cache_file, csv_hash)
+    if cached is not None:
+        festival_data, _festival_index = cached
+        return
     with open(file_path, mode='r', encoding='utf-8-sig') as file:
         reader = csv.DictReader(file)
         festival_data = [row for row in reader]
-def _get_criteria_for_the_day(jd,place,use_purnimanta_system=None):
-    y,m,d,_ = utils.jd_to_gregorian(jd); date_in = panchanga.Date(y,m,d)
-    _tithi_returned = panchanga.tithi(jd, place)
-    _tithis = [_tithi_returned[0],_tithi_returned[3]] if len(_tithi_returned)>3 else [_tithi_returned[0]]
-    _naks = panchanga.nakshatra(jd, place)
-    _nak_ids = [_naks[0],_naks[3]] if len(_naks)>3 else [_naks[0]]
-    tm = None; td = None; adhik_maasa = None; _vaara = panchanga.vaara(jd)+1
-    day_id = panchanga.vaara(jd)
-    if use_purnimanta_system is None:
-        tm,td = panchanga.tamil_solar_month_and_date(date_in, place)
-    else:
-        tm,td,_,adhik_maasa,_ = panchanga.lunar_month_date(jd,place,
-                                                use_purnimanta_system=use_purnimanta_system)
-        tm -= 1
-    criteria = {
-        'Tithi': _tithis,
-        'Nakshatra': _nak_ids,
-        'tamil_month': tm+1,
-        'tamil_day': td,
-        'vaara':day_id+1,
-        'adhik_maasa':adhik_maasa,
-    }
-    return criteria
+    _festival_index = _compile_festival_index(festival_data)
+    _write_festival_index_cache(cache_file, csv_hash, festival_data, _festival_index)
+def _read_festival_index_cache(cache_file,csv_hash):
+    """ @return: (festival_data, festival_index) from cache_file or None if the cache is missing or not valid """
+    try:
+        with open(cache_file, mode='r', encoding='utf-8') as file:
+            cache = json.load(file)
+        if cache['format'] != _FESTIVAL_INDEX_FORMAT or cache['csv_hash'] != csv_hash: return None
+        rows = cache['festival_data']
+        if not isinstance(rows,list) or not all(isinstance(row,dict) for row in rows): return None
+        festival_index = {}
+        for calendar_type,criteria_keys,criteria_values,row_indices in cache['festival_index']:
+            if not set(criteria_keys) <= set(_festival_criteria_keys) or len(criteria_keys) != len(criteria_values) or \
+                    not all(isinstance(r,int) and 0 <= r < len(rows) for r in row_indices):
+                return None
+            festival_index.setdefault(int(calendar_type),{}).setdefault(tuple(criteria_keys),{})[
+                                                        tuple(float(value) for value in criteria_values)] = list(row_indices)
+        return rows, festival_index
+    except Exception: # any unreadable/invalid cache is a cache miss
+        return None
+def _write_festival_index_cache(cache_file,csv_hash,rows,festival_index):
+    """ Writes the compiled index to a temporary file and renames it to cache_file (readers never see partial files) """
+    cache = {'format':_FESTIVAL_INDEX_FORMAT, 'csv_hash':csv_hash, 'festival_data':rows,
+             'festival_index':[[calendar_type,list(criteria_keys),list(criteria_values),row_indices]
+                               for calendar_type,criteria_tables in festival_index.items()
+                               for criteria_keys,criteria_table in criteria_tables.items()
+                               for criteria_values,row_indices in criteria_table.items()]}
+    temp_file = None
+    try:
+        os.makedirs(const._FESTIVAL_INDEX_CACHE_DIR,exist_ok=True)
+        fd, temp_file = tempfile.mkstemp(dir=const._FESTIVAL_INDEX_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, mode='w', encoding='utf-8') as file:
+            json.dump(cache, file)
+        os.replace(temp_file, cache_file)
+    except OSError:
+        if temp_file is not None and os.path.exists(temp_file): os.remove(temp_file)
+def _compile_festival_index(rows):
+    """
+        Festival rows indexed by calendar_type, the criteria keys the row specifies and their values.
+        Criteria left empty in the row match any value. Rows with non-numeric criteria never match and are not indexed.
+    """
+    festival_index = {}
+    for r,row in enumerate(rows):
+        criteria_keys = tuple(key for key in _festival_criteria_keys if row.get(key))
+        try:
+            criteria_values = tuple(float(row[key]) for key in criteria_keys)
+        except ValueError:
+            continue
+        festival_index.setdefault(int(row['calendar_type']),{}).setdefault(criteria_keys,{}).setdefault(criteria_values,[]).append(r)
+    return festival_index
+def _get_festival_rows(criteria,calendar_index):
+    """ @return: indices of festival rows of calendar_index matching the criteria of the day """
+    day_values = {key:(value if isinstance(value,list) else [value]) for key,value in criteria.items()}
+    row_indices = []
+    for criteria_keys,criteria_table in calendar_index.items():
+        try:
+            values = [[float(v) for v in day_values[key]] for key in criteria_keys]
+        except (TypeError,ValueError): # criteria not available for the day (e.g. adhik_maasa in solar calendar)
+            continue
+        for criteria_values in set(product(*values)):
+            row_indices += criteria_table.get(criteria_values,[])
+    return row_indices
 def get_festivals_between_the_dates(start_date:panchanga.Date, end_date:panchanga.Date, place:panchanga.Place,
                                     festival_name_contains=None):
-    #global festival_data
-    #if len(festival_data) == 0: load_festival_data(const._FESTIVAL_FILE)
+    """
+        @return: list of (date_as_tuple, [festival_rows]) for every day between the dates (see festival_calendar)
+    """
+    day_festivals = {}
+    for festival_date,row,_,_ in festival_calendar(start_date, end_date, place, festival_name_contains=festival_name_contains):
+        day_festivals.setdefault(festival_date,[]).append(row)
     start_jd = utils.julian_day_number(start_date, (12,0,0))
     end_jd = utils.julian_day_number(end_date, (12,0,0))
     matching_festivals = []
     while start_jd <= end_jd:
-        mfd = get_festivals_of_the_day(start_jd, place,festival_name_contains=festival_name_contains)
-        matching_festivals.append((utils.jd_to_gregorian(start_jd),mfd))
+        festival_date = utils.jd_to_gregorian(start_jd)
+        matching_festivals.append((festival_date,day_festivals.get(tuple(festival_date[:3]),[])))
         start_jd += 1
     return matching_festivals
 def get_festivals_of_the_day(jd,place,festival_name_contains=None):
+    """
+        Festivals of the day of jd. Criteria of the day are the same as festival_calendar (time of jd is not used),
+        so a festival falls on the same date whether it is looked up by the day or from the calendar.
+        @param jd: Julian day number of the date
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @param festival_name_contains: only festivals whose english name contains this string (Default=None => all)
+        @return: list of festival rows of the day
+    """
+    y,m,d,_ = utils.jd_to_gregorian(jd); festival_date = panchanga.Date(y,m,d)
+    return [row for _,row,_,_ in festival_calendar(festival_date, festival_date, place,
+                                                   festival_name_contains=festival_name_contains)]
+def _festival_name_rows(festival_name_contains):
+    """ @return: indices of festival rows whose english name contains festival_name_contains (None => all rows) """
+    if festival_name_contains is None: return None
+    return {r for r,row in enumerate(festival_data) if festival_name_contains.casefold() in row['Festival_en'].casefold()}
+def _festival_calendar_types(name_rows=None):
+    """ Only calendar types having (name matching) festivals need the criteria of the day """
+    return sorted(ct for ct,calendar_index in _festival_index.items()
+                  if name_rows is None or any(r in name_rows for table in calendar_index.values() for rows in table.values() for r in rows))
+def festival_calendar(start_date:panchanga.Date, end_date:panchanga.Date, place:panchanga.Place,
+                      festival_name_contains=None):
+    """
+        Festivals between the dates (generator) - all the days of the range are evaluated together.
+        Day by day criteria of the solar, amanta and purnimanta calendars are derived from one tithi timeline
+        (whose new moons form the lunation catalog), one nakshatra timeline and one series of sunset solar longitudes
+        (sankranti days) and then matched against the festival index.
+        Criteria of a day:
+            Tithi: tithi in force at 12:00 local time and the next tithi if it starts before the midnight of the date
+            Nakshatra: nakshatra in force at 12:00 local time; vaara of the date
+            lunar month/day and adhik maasa at sunrise; tamil month/day as panchanga.tamil_solar_month_and_date
+            Tithi start/end times are exact transition times. So a tithi starting a few minutes before midnight
+            belongs to the date, even when panchanga.tithi (end time from planet speeds at 12:00) ends it after midnight.
+        @param start_date: Start Date as struct (year,month,day)
+        @param end_date: End Date as struct (year,month,day)
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @param festival_name_contains: only festivals whose english name contains this string (Default=None => all)
+        @return: generator of (date, festival_row, starts_at, ends_at) in date order
+            date as tuple (year,month,day)
+            starts_at, ends_at: local hours (from the midnight of the date) of the tithi/nakshatra of the festival
+                (sunrise to next sunrise for festivals that are not tithi/nakshatra based)
+    """
     global festival_data
     if len(festival_data) == 0: load_festival_data(const._FESTIVAL_FILE)
-    matching_festivals = []
-    criteria_list = [_get_criteria_for_the_day(jd, place, use_purnimanta_system=c) for c in [None,False,True]]
-    check_rows = festival_data if festival_name_contains is None \
-        else [row for row in festival_data if festival_name_contains.casefold() in row['Festival_en'].casefold()]
-    for row in check_rows:#festival_data:
-        criteria = criteria_list[int(row['calendar_type'])]
-        #print(row['Festival_name'],utils.jd_to_gregorian(jd),criteria)
-        match = True
-        for key, value in criteria.items():
-            if row.get(key):
-                try:
-                    # Convert both to float for comparison (handles empty strings gracefully)
-                    if isinstance(value,list):
-                        match = match and any([float(row[key]) ==float(v) for v in value])# == float(value)
-                    else:
-                        match = match and float(row[key]) == float(value)
-                    if festival_name_contains is not None:
-                        match = match and festival_name_contains.casefold() in row['Festival_en'].casefold()
-                        #print(row['Festival_en'],festival_name_contains,match)
-                except:
-                    match = False
-                    break
-        if match:
-            matching_festivals.append(row)
-    return matching_festivals
+    name_rows = _festival_name_rows(festival_name_contains)
+    if name_rows is not None and len(name_rows)==0: return
+    calendar_types = _festival_calendar_types(name_rows)
+    start_jd = utils.julian_day_number(start_date, (12,0,0)); end_jd = utils.julian_day_number(end_date, (12,0,0))
+    day_count = int(round(end_jd - start_jd)) + 1
+    if day_count <= 0: return
+    tables = _calendar_tables(start_date, day_count, place, include_tamil_months=0 in calendar_types)
+    yield from _festival_days(tables, place, calendar_types, name_rows)
+def _calendar_tables(start_date,day_count,place,include_tamil_months=True):
+    """
+        Tables shared by the calendar functions (festival_calendar, monthly_panchanga) for day_count days from start_date
+        @return: dict of
+            'noon_jds': local julian days of 12:00 of the days
+            'tithis', 'nakshatras': tithi and nakshatra timelines (see transitions.tithi_timeline)
+            'lunations': lunation catalog [((rasi,next_rasi),new_moon_jd,next_new_moon_jd),...]
+            'sunrises': sunrise julian days of the days and of the day after
+            'tamil_months': [(tamil_month,tamil_day),...] of the days (None if not include_tamil_months)
+            All julian days except noon_jds are UTC julian days
+    """
+    tz_days = place.timezone/24
+    start_jd = utils.julian_day_number(start_date, (12,0,0)); end_jd = start_jd + day_count - 1
+    """ Lunations before the first and after the last sunrise are needed for the lunar months """
+    tithis = transitions.tithi_timeline(start_jd - tz_days - 32, end_jd - tz_days + 32)
+    new_moons = transitions.lunations(tithis)
+    return {'noon_jds': [start_jd+d for d in range(day_count)], 'tithis': tithis,
+            'lunations': [((rasi,next_rasi),nm_jd,next_nm_jd) for (nm_jd,rasi),(next_nm_jd,next_rasi) in zip(new_moons,new_moons[1:])],
+            'nakshatras': transitions.nakshatra_timeline(start_jd - tz_days - 1, end_jd - tz_days + 2),
+            'sunrises': [panchanga.sunrise(start_jd+d, place)[2] - tz_days for d in range(day_count+1)],
+            'tamil_months': _tamil_months_and_days(start_date, day_count, place) if include_tamil_months else None}
+def _lunar_month_of_the_day(tables,day,use_purnimanta_system=False):
+    """ @return: (lunar_month [0..11], lunar_day [1..30], adhik_maasa) at sunrise of the day (index) of the calendar tables """
+    sunrise_jd = tables['sunrises'][day]; tithis = tables['tithis']; lunations = tables['lunations']
+    sunrise_tithi = tithis[transitions.element_at(tithis, sunrise_jd)][0]
+    this_solar_month,next_solar_month = lunations[transitions.element_at(lunations, sunrise_jd)][0]
+    lunar_month = (this_solar_month+1)%12; lunar_day = sunrise_tithi
+    if use_purnimanta_system:
+        if lunar_day > 15: lunar_month = (lunar_month+1)%12
+        lunar_day = (lunar_day - 16)%30 + 1
+    return lunar_month, lunar_day, this_solar_month == next_solar_month
+def _festival_days(tables,place,calendar_types,name_rows=None):
+    """ festival_calendar from the calendar tables - yields (date, festival_row, starts_at, ends_at) """
+    tz_days = place.timezone/24
+    tithis = tables['tithis']; nakshatras = tables['nakshatras']; sunrise_jds = tables['sunrises']
+    for d,noon_jd in enumerate(tables['noon_jds']):
+        day_start_utc = noon_jd - 0.5 - tz_days
+        _hours = lambda jd_utc: (jd_utc - day_start_utc)*24
+        ti = transitions.element_at(tithis, noon_jd - tz_days)
+        day_tithis = [tithis[ti]] + ([tithis[ti+1]] if tithis[ti][2] < day_start_utc + 1 else [])
+        nak = nakshatras[transitions.element_at(nakshatras, noon_jd - tz_days)]
+        vaara = panchanga.vaara(noon_jd)+1
+        criteria = {'Tithi': [t for t,_,_ in day_tithis], 'Nakshatra': [nak[0]], 'vaara':vaara}
+        row_indices = set()
+        for calendar_type in calendar_types:
+            if calendar_type == 0:
+                tm,td = tables['tamil_months'][d]; adhik_maasa = None
+            else:
+                tm,td,adhik_maasa = _lunar_month_of_the_day(tables, d, use_purnimanta_system=(calendar_type == 2))
+            criteria.update({'tamil_month':tm+1, 'tamil_day':td, 'adhik_maasa':adhik_maasa})
+            row_indices.update(_get_festival_rows(criteria, _festival_index[calendar_type]))
+        if name_rows is not None: row_indices &= name_rows
+        if len(row_indices)==0: continue
+        festival_date = tuple(utils.jd_to_gregorian(noon_jd)[:3])
+        for r in sorted(row_indices):
+            row = festival_data[r]
+            if row.get('Tithi') and float(row['Tithi']) in [t for t,_,_ in day_tithis]:
+                _,t_start,t_end = next(t for t in day_tithis if t[0]==float(row['Tithi']))
+            elif row.get('Nakshatra'):
+                _,t_start,t_end = nak
+            else:
+                t_start,t_end = sunrise_jds[d],sunrise_jds[d+1]
+            yield festival_date, row, _hours(t_start), _hours(t_end)
+def monthly_panchanga(year,month,place,use_purnimanta_system=False):
+    """
+        Panchanga of all the days of a month - computed together from one set of transition timelines,
+        one sunrise/sunset table and one lunation catalog (see festival_calendar)
+        @param year: year
+        @param month: month [1..12]
+        @param place: Place as struct ('Place',latitude,longitude,timezone)
+        @param use_purnimanta_system: True - lunar month/day as purnimanta, False - amanta (default)
+        @return: list of dict per day with keys
+            'date': (year,month,day), 'vaara': [0..6] (0=Sunday), 'sunrise', 'sunset': local hours
+            'tithi','karana','nakshatra','yoga': [(number,start_hours,end_hours),...] in force at sunrise and
+                the ones starting before the next sunrise (hours from the midnight of the date)
+                number: tithi [1..30], karana [1..60], nakshatra [1..27], yoga [1..27]
+            'moon_phase': moon phase angle (degrees) at sunrise, 'moon_illumination': illuminated fraction [0..1] at sunrise
+            'lunar_month': [0..11], 'lunar_day': [1..30], 'adhik_maasa': True/False - at sunrise
+            'tamil_month': [0..11], 'tamil_day': tamil (solar) month and day
+            'festivals': festival rows of the day (see get_festivals_of_the_day)
+    """
+    global festival_data
+    if len(festival_data) == 0: load_festival_data(const._FESTIVAL_FILE)
+    start_date = panchanga.Date(year,month,1)
+    next_month_date = panchanga.Date(year+1,1,1) if month == 12 else panchanga.Date(year,month+1,1)
+    day_count = int(round(utils.gregorian_to_jd(next_month_date) - utils.gregorian_to_jd(start_date)))
+    tables = _calendar_tables(start_date, day_count, place)
+    tz_days = place.timezone/24
+    start_jd_utc = tables['noon_jds'][0] - tz_days
+    limb_timelines = {'tithi':tables['tithis'], 'nakshatra':tables['nakshatras'],
+                      'karana':transitions.karana_timeline(start_jd_utc - 1, start_jd_utc + day_count + 1),
+                      'yoga':transitions.yoga_timeline(start_jd_utc - 1, start_jd_utc + day_count + 1)}
+    day_festivals = {}
+    for festival_date,row,_,_ in _festival_days(tables, place, _festival_calendar_types()):
+        day_festivals.setdefault(festival_date,[]).append(row)
+    month_panchanga = []
+    for d,noon_jd in enumerate(tables['noon_jds']):
+        day_start_utc = noon_jd - 0.5 - tz_days
+        sunrise_jd = tables['sunrises'][d]; next_sunrise_jd = tables['sunrises'][d+1]
+        day_info = {'date':tuple(utils.jd_to_gregorian(noon_jd)[:3]), 'vaara':panchanga.vaara(noon_jd),
+                    'sunrise':(sunrise_jd - day_start_utc)*24, 'sunset':panchanga.sunset(noon_jd, place)[0]}
+        for limb,timeline in limb_timelines.items():
+            i = transitions.element_at(timeline, sunrise_jd); day_info[limb] = []
+            while i < len(timeline) and timeline[i][1] < next_sunrise_jd:
+                number,start_jd,end_jd = timeline[i]
+                day_info[limb].append((number, (start_jd - day_start_utc)*24, (end_jd - day_start_utc)*24))
+                i += 1
+        moon_phase = transitions.tithi_phase(sunrise_jd)
+        day_info['moon_phase'] = moon_phase
+        day_info['moon_illumination'] = 0.5*(1-math.cos(math.radians(moon_phase)))
+        lunar_month,lunar_day,adhik_maasa = _lunar_month_of_the_day(tables, d, use_purnimanta_system)
+        tamil_month,tamil_day = tables['tamil_months'][d]
+        day_info.update({'lunar_month':lunar_month, 'lunar_day':lunar_day, 'adhik_maasa':adhik_maasa,
+                         'tamil_month':tamil_month, 'tamil_day':tamil_day,
+                         'festivals':day_festivals.get(day_info['date'],[])})
+        month_panchanga.append(day_info)
+    return month_panchanga
+def _tamil_months_and_days(start_date,day_count,place):
+    """
+        Tamil (solar) month and day of day_count days from start_date - same as panchanga.tamil_solar_month_and_date
+        Sun longitudes at sunset of the days (and of one month before start_date) are computed once
+        and tamil day is counted from the latest day whose sunset is in the first degree of a rasi (sankranti day)
+    """
+    if const.tamil_month_method != 3:
+        return [panchanga.tamil_solar_month_and_date(utils.next_panchanga_day(start_date, d), place) for d in range(day_count)]
+    _back_days = 33
+    jd_10am = utils.julian_day_number(start_date, (10,0,0))
+    sunset_longitudes = [panchanga.solar_longitude(panchanga.sunset(jd_10am+d, place)[2] - place.timezone/24)
+                         for d in range(-_back_days, day_count)]
+    tamil_months = []; sankranti_day = None
+    for d,sl in enumerate(sunset_longitudes):
+        if sl%30<1 and sl%30>0: sankranti_day = d
+        if d < _back_days: continue
+        if sankranti_day is None:
+            tamil_months.append(panchanga.tamil_solar_month_and_date(utils.next_panchanga_day(start_date, d-_back_days), place))
+        else:
+            tamil_months.append((int(sl/30), d-sankranti_day+1))
+    return tamil_months
 # Function to get festival row based on input parameters
 def get_festival(tithi=None, nakshatra=None, tamil_month=None, tamil_day=None,vaara=None,adhik_maasa=None):
     """
@@ -23,7 +23,10 @@
     contains common functions used by various PyJHora modules
 """
 import os
+import sys
 import codecs
+import functools
+from types import MappingProxyType
 import warnings
 import geocoder
 import requests
@@ -375,17 +378,20 @@ def get_house_planet_list_from_planet_positions(planet_positions):
 def set_ephemeris_data_path(data_path=const._ephe_path):
     swe.set_ephe_path(data_path)
 def set_language(language=const._DEFAULT_LANGUAGE):
+    """
+        Set the default language of the module level resources (resource_strings, PLANET_NAMES, RAASI_LIST etc)
+        Resource files are read only once per language (see get_language_messages and get_language_lists)
+        @param language: Two letter language code. en, hi, ka, ml, ta, te
+    """
     global resource_strings
     #print('language',language)
     if language in const.available_languages.values():
         #print('default language set to',language)
         const._DEFAULT_LANGUAGE = language
-        language_list_file = const._LANGUAGE_PATH+const._DEFAULT_LANGUAGE_LIST_STR+language+'.txt'
-        #print('language_list_file',language_list_file)
-        language_message_file = const._LANGUAGE_PATH+const._DEFAULT_LANGUAGE_MSG_STR+language+'.txt'
-        
-        get_resource_lists(language_list_file)
-        resource_strings = get_resource_messages(language_message_file=language_message_file)
+        module = sys.modules[__name__]
+        for var_name, var_value in get_language_lists(language).items():
+            setattr(module, var_name, list(var_value))
+        resource_strings = dict(get_language_messages(language))
 def _read_resource_messages_from_file(message_file):
     if not os.path.exists(message_file):
         print('Error: List Types File:'+message_file+' does not exist. Script aborted.')
@@ -413,23 +419,9 @@ def get_resource_messages(language_message_file=const._LANGUAGE_PATH + const._DE
     return res
 resource_strings = get_resource_messages(const._LANGUAGE_PATH+const._DEFAULT_LANGUAGE_MSG_STR+const._DEFAULT_LANGUAGE+'.txt')
 def _read_resource_lists_from_file(language_list_file):
-    import sys,os
     module = sys.modules[__name__]
-    file_path = language_list_file
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"The file {file_path} does not exist.")
-    #print('_read_resource_lists_from_file')
-    with open(file_path, 'r',encoding='utf-8') as file: # V4.5.0
-        for line in file:
-            line = line.strip()
-            if line.startswith("###"):
-                continue
-            elif "=" in line:
-                var_name, var_value = line.split("=")
-                var_name = var_name.strip()
-                var_value = var_value.split(',')
-                setattr(module, var_name, var_value)
-                #print('length of',var_name,len(var_value))
+    for var_name, var_value in _parse_resource_lists_file(language_list_file).items():
+        setattr(module, var_name, list(var_value))
 def get_resource_lists(language_list_file=const._LANGUAGE_PATH + const._DEFAULT_LANGUAGE_LIST_STR + const._DEFAULT_LANGUAGE + '.txt'):
     """
         Retrieve resource list from language specific resource list file
@@ -442,6 +434,57 @@ def get_resource_lists(language_list_file=const._LANGUAGE_PATH + const._DEFAULT_
                  SHADVARGAMSA_NAMES,SAPTAVARGAMSA_NAMES,DHASAVARGAMSA_NAMES,SHODASAVARGAMSA_NAMES]
     """
     _read_resource_lists_from_file(language_list_file)
+def _parse_resource_lists_file(language_list_file):
+    if not os.path.exists(language_list_file):
+        raise FileNotFoundError(f"The file {language_list_file} does not exist.")
+    list_values = {}
+    with open(language_list_file, 'r',encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line.startswith("###") or "=" not in line:
+                continue
+            var_name, var_value = line.split("=")
+            list_values[var_name.strip()] = tuple(var_value.split(','))
+    return list_values
+def _freeze_resource(resource):
+    """ Convert json resource (dict/list) recursively into read-only mappingproxy/tuple """
+    if isinstance(resource, dict):
+        return MappingProxyType({k:_freeze_resource(v) for k,v in resource.items()})
+    if isinstance(resource, list):
+        return tuple(_freeze_resource(v) for v in resource)
+    return resource
+@functools.lru_cache(maxsize=None)
+def get_language_messages(language=const._DEFAULT_LANGUAGE):
+    """
+        Get message strings (msg_strings_<lang>.txt) of a language without changing the default language
+        The file is read once per language and the same read-only dictionary is shared by all callers/threads
+        @param language: Two letter language code. en, hi, ka, ml, ta, te
+        @return: read-only dictionary of message keys with language specific values
+    """
+    message_file = const._LANGUAGE_PATH+const._DEFAULT_LANGUAGE_MSG_STR+language+'.txt'
+    return MappingProxyType(_read_resource_messages_from_file(message_file))
+@functools.lru_cache(maxsize=None)
+def get_language_lists(language=const._DEFAULT_LANGUAGE):
+    """
+        Get resource lists (list_values_<lang>.txt) of a language without changing the default language
+        The file is read once per language and the same read-only dictionary is shared by all callers/threads
+        @param language: Two letter language code. en, hi, ka, ml, ta, te
+        @return: read-only dictionary {'PLANET_NAMES':(...),'RAASI_LIST':(...),...} 
+    """
+    list_file = const._LANGUAGE_PATH+const._DEFAULT_LANGUAGE_LIST_STR+language+'.txt'
+    return MappingProxyType(_parse_resource_lists_file(list_file))
+@functools.lru_cache(maxsize=None)
+def get_language_json_resources(json_file_prefix, language=const._DEFAULT_LANGUAGE):
+    """
+        Get json resources such as yoga_msgs_<lang>.json, dosha_msgs_<lang>.json of a language
+        The file is read once per language and the same read-only resource is shared by all callers/threads
+        @param json_file_prefix: json file prefix. For example const._DEFAULT_YOGA_JSON_FILE_PREFIX
+        @param language: Two letter language code. en, hi, ka, ml, ta, te
+        @return: read-only json resource (dictionaries as mappingproxy and lists as tuples)
+    """
+    json_file = const._LANGUAGE_PATH + json_file_prefix + language + '.json'
+    with open(json_file,"r",encoding="utf-8") as f:
+        return _freeze_resource(json.load(f))
 # Convert 23d 30' 30" to 23.508333 degrees
 from_dms = lambda degs, mins, secs: degs + mins/60 + secs/3600
 from_dms_to_str = lambda dms_list: str(dms_list[0])+const._degree_symbol + str(dms_list[1])+const._minute_symbol + str(dms_list[2])+const._second_symbol
@@ -1065,6 +1108,30 @@ def julian_day_to_date_time_string(jd):
     jy,jm,jd,jfh = jd_to_gregorian(jd)
     ret = "{:04d}-{:02d}-{:02d} {}".format(jy,jm,jd,to_dms(jfh,as_string=True))
     return ret
+def dhasa_rows_as_jd(dhasa_rows,year_duration=const.sidereal_year,end_jd=None):
+    """
+        Numeric dhasa rows for as_jd=True output of dhasa functions
+        @param dhasa_rows: dhasa rows with start julian day in place of the start date string
+            and the row's own (unrounded) duration in years as the last element
+            [(dhasa_lord,[bhukthi_lord,...],start_jd,duration),...]
+        @param year_duration: days in one dhasa year (Default=const.sidereal_year)
+        @param end_jd: expected end julian day of the last row (Default=None)
+        @return: [(dhasa_lord,[bhukthi_lord,...],start_jd,end_jd,duration_years),...]
+            end_jd of a row is start_jd + duration * year_duration. The start_jd of the next row 
+            (end_jd for the last row) is used only as a check - if it is within a second of that end 
+            it is taken as the end so that adjoining rows meet exactly.
+            Rows that do not adjoin (e.g. repeated cycles of tribhagi lists) keep their own end.
+    """
+    _one_second = 1.0/86400
+    next_starts = [row[-2] for row in dhasa_rows[1:]] + [end_jd]
+    rows = []
+    for row,next_start in zip(dhasa_rows,next_starts):
+        start_jd,duration = row[-2],row[-1]
+        row_end_jd = start_jd + duration*year_duration
+        if next_start is not None and abs(next_start-row_end_jd) < _one_second:
+            row_end_jd = next_start
+        rows.append((*row[:-2],start_jd,row_end_jd,duration))
+    return rows
 def get_nakshathra_list_with_abhijith():
     return [NAKSHATRA_LIST[s] for s in range(20)]+[NAKSHATRA_LIST[27]]+[NAKSHATRA_LIST[s] for s in range(20,27)]
 karana_lord = lambda karana_index: [_karana_lord for _karana_lord,kar_list in const.karana_lords.items() if karana_index in kar_list[0]][0]
@@ -1258,7 +1325,8 @@ def is_planet_in_moolatrikona(planet_id, p_pos_tuple=None, chart_1d_house=None,
     # Priority 3: Zodiac check from 1D house index
     return chart_1d_house == m_sign
 def is_planet_in_exalation(planet,planet_house,planet_positions=None,enforce_deep_exaltation=True):
-    if planet_positions is not None and enforce_deep_exaltation:
+    """ Rahu/Ketu (co-lords of Aquarius/Scorpio) have no deep exaltation longitude - their sign strength is used """
+    if planet_positions is not None and enforce_deep_exaltation and planet < len(const.planet_deep_exaltation_longitudes):
         sign_idx, lon_in_sign = planet_positions[planet + 1][1]
         abs_longitude = (sign_idx * 30) + lon_in_sign
         deep_ex_lon = const.planet_deep_exaltation_longitudes[planet]
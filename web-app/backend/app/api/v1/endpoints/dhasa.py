@@ -3,9 +3,12 @@ Dhasa calculation endpoints
 All 47 types of dhasa systems
 """
 from fastapi import APIRouter, HTTPException, Query
-from app.models.schemas import DhasaRequest, ErrorResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.models.schemas import DhasaRequest, AllDhasaRequest, ErrorResponse
 from app.services.dhasa_service import DhasaService
 from typing import Dict, Any
+import json
 
 router = APIRouter()
 dhasa_service = DhasaService()
@@ -23,7 +26,8 @@ async def get_vimsottari_dhasa(request: DhasaRequest):
             request.include_antardhasa,
             request.ayanamsa,
             request.max_sub_level or 2,
-            request.focus_mahadasha_index
+            request.focus_mahadasha_index,
+            request.focus_period_path
         )
         return result
     except Exception as e:
@@ -46,7 +50,8 @@ async def get_graha_dhasa(dhasa_type: str, request: DhasaRequest):
             request.include_antardhasa,
             request.ayanamsa,
             request.max_sub_level or 2,
-            request.focus_mahadasha_index
+            request.focus_mahadasha_index,
+            request.focus_period_path
         )
         return result
     except Exception as e:
@@ -75,6 +80,34 @@ async def get_raasi_dhasa(dhasa_type: str, request: DhasaRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/all")
+async def get_all_dhasas(request: AllDhasaRequest):
+    """
+    Calculate every graha, raasi and annual dhasa for one chart.
+    The chart is computed once and shared by all systems, which run in parallel.
+    Streams newline-delimited JSON, one line per dhasa system as soon as it finishes.
+    """
+    try:
+        results = dhasa_service.iter_all_dhasas(
+            request.birth_details.dict(),
+            request.include_antardhasa,
+            request.ayanamsa,
+            request.max_sub_level or 2,
+            request.years or 1
+        )
+        # The first result waits on the process pool - keep the event loop free meanwhile
+        first = await run_in_threadpool(next, results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    def _lines():
+        yield json.dumps(first, default=str) + "\n"
+        for result in results:
+            yield json.dumps(result, default=str) + "\n"
+    
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
 @router.post("/applicable", response_model=Dict[str, Any])
 async def get_applicable_dhasas(request: DhasaRequest):
     """
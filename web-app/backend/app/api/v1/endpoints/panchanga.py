@@ -3,7 +3,7 @@ Panchanga API endpoints
 """
 from fastapi import APIRouter, HTTPException
 from app.models.schemas import (
-    PanchangaRequest, PanchangaResponse,
+    PanchangaRequest, PanchangaResponse, PanchangaMonthRequest,
     ChartRequest, ChartResponse,
     ErrorResponse
 )
@@ -44,6 +44,26 @@ async def calculate_panchanga(request: PanchangaRequest):
         raise HTTPException(status_code=500, detail=f"Calculation error: {str(e)}")
 
 
+@router.post("/month", response_model=Dict[str, Any])
+async def calculate_month_panchanga(request: PanchangaMonthRequest):
+    """
+    Calculate panchanga for all days of a month in one batch
+    
+    Returns per day tithi, nakshatra, yoga, karana (with end times), sunrise, sunset,
+    moon phase, lunar month (adhika status) and festivals
+    """
+    try:
+        result = PanchangaService.get_month_panchanga(
+            year=request.year,
+            month=request.month,
+            place_data=request.place.model_dump(),
+            ayanamsa=request.ayanamsa or "LAHIRI"
+        )
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Calculation error: {str(e)}")
+
+
 @router.post("/planets", response_model=Dict[str, Any])
 async def get_planet_positions(request: PanchangaRequest):
     """
@@ -77,6 +77,22 @@ class PanchangaRequest(BaseModel):
         return v.upper()
 
 
+class PanchangaMonthRequest(BaseModel):
+    """Request for Panchanga of all days of a month"""
+    year: int = Field(..., description="Year")
+    month: int = Field(..., ge=1, le=12, description="Month (1-12)")
+    place: PlaceModel
+    ayanamsa: Optional[str] = Field(default="LAHIRI", description="Ayanamsa mode")
+
+    @field_validator('ayanamsa')
+    @classmethod
+    def normalize_ayanamsa(cls, v: Optional[str]) -> str:
+        """Normalize ayanamsa to uppercase"""
+        if v is None:
+            return "LAHIRI"
+        return v.upper()
+
+
 class ChartRequest(BaseModel):
     """Request for chart calculations"""
     birth_details: BirthDetailsModel
@@ -109,6 +125,25 @@ class DhasaRequest(BaseModel):
         default=None,
         description="If provided, only returns the tree for this specific Mahadasha index (0-8 for Vimsottari)"
     )
+    focus_period_path: Optional[List[int]] = Field(
+        default=None,
+        description="Lord indices from the Mahadasha down to the period being drilled into; "
+                    "only the periods on this path are expanded below the Antardasha level"
+    )
+
+
+class AllDhasaRequest(BaseModel):
+    """Request for all dhasa systems of one chart"""
+    birth_details: BirthDetailsModel
+    ayanamsa: Optional[str] = Field(default="LAHIRI", description="Ayanamsa mode")
+    include_antardhasa: Optional[bool] = Field(default=True, description="Include sub-periods")
+    max_sub_level: Optional[int] = Field(
+        default=2,
+        ge=1,
+        le=6,
+        description="Maximum nested dhasa level (1=Mahadasa … 6=Deha)"
+    )
+    years: Optional[int] = Field(default=1, ge=1, description="Year of life for annual dhasas (1 = year of birth)")
 
 
 class MatchRequest(BaseModel):
@@ -5,16 +5,19 @@ Handles all 47 types of dhasa systems
 import sys
 import os
 import inspect
+import threading
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Add PyJHora to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../../PyJHora/src'))
 
 from jhora.panchanga import drik
+from jhora.horoscope.chart import charts
 from jhora.horoscope.dhasa.graha import (
     vimsottari, ashtottari, yogini, shodasottari, dwadasottari,
     dwisatpathi, panchottari, sataatbika, chathuraaseethi_sama,
-    shastihayani, shattrimsa_sama, naisargika, tara, karaka, aayu
+    shastihayani, shattrimsa_sama, naisargika, tara, karaka, aayu, applicability
 )
 from jhora.horoscope.dhasa.raasi import (
     narayana, kendradhi_rasi, sudasa, drig, nirayana, shoola,
@@ -24,9 +27,31 @@ from jhora.horoscope.dhasa.raasi import (
 )
 from jhora.horoscope.dhasa.annual import mudda, patyayini
 from jhora import utils, const
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+# Process pool for bulk dhasa computation - created on first use, shut down by the app lifespan handler
+_dhasa_executor = None
+_dhasa_executor_lock = threading.Lock()
+
+
+def get_dhasa_executor() -> ProcessPoolExecutor:
+    """Process pool of iter_all_dhasas (created on first call)"""
+    global _dhasa_executor
+    with _dhasa_executor_lock:
+        if _dhasa_executor is None:
+            _dhasa_executor = ProcessPoolExecutor(max_workers=max(1, min(8, os.cpu_count() or 1)))
+        return _dhasa_executor
+
+
+def shutdown_dhasa_executor() -> None:
+    """Shut down the process pool of iter_all_dhasas if it was started"""
+    global _dhasa_executor
+    with _dhasa_executor_lock:
+        if _dhasa_executor is not None:
+            _dhasa_executor.shutdown(wait=True, cancel_futures=True)
+            _dhasa_executor = None
+
 
 class DhasaService:
     """Service for all Dhasa calculations"""
@@ -78,6 +103,19 @@ class DhasaService:
         'patyayini': ('Patyayini', patyayini),
     }
     
+    # Conditional graha dhasas: applicability name (jhora applicability module) -> dhasa type
+    CONDITIONAL_GRAHA_DHASAS = {
+        'ashtottari': 'ashtottari',
+        'chaturaaseeti_sama': 'chathuraaseethi_sama',
+        'dwadasottari': 'dwadasottari',
+        'dwisatpathi': 'dwisatpathi',
+        'panchottari': 'panchottari',
+        'satabdika': 'sataatbika',
+        'shashtisama': 'shastihayani',
+        'shattrimsa_sama': 'shattrimsa_sama',
+        'shodasottari': 'shodasottari',
+    }
+    
     PLANET_NAMES = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu']
     RASI_NAMES = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 
                   'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
@@ -114,18 +152,22 @@ class DhasaService:
                             include_antardhasa: bool = True,
                             ayanamsa: str = "LAHIRI",
                             max_sub_levels: int = 2,
-                            focus_mahadasha_index: Optional[int] = None) -> Dict[str, Any]:
+                            focus_mahadasha_index: Optional[int] = None,
+                            focus_period_path: Optional[List[int]] = None) -> Dict[str, Any]:
         """Calculate Vimsottari Dhasa"""
-        return self._compute_graha_dhasa('vimsottari', birth_details, include_antardhasa, ayanamsa, max_sub_levels, focus_mahadasha_index)
+        return self._compute_graha_dhasa('vimsottari', birth_details, include_antardhasa, ayanamsa, max_sub_levels,
+                                         focus_mahadasha_index, focus_period_path)
     
     def get_any_graha_dhasa(self, birth_details: Dict[str, Any], 
                            dhasa_type: str,
                            include_antardhasa: bool = True,
                            ayanamsa: str = "LAHIRI",
                            max_sub_levels: int = 2,
-                           focus_mahadasha_index: Optional[int] = None) -> Dict[str, Any]:
+                           focus_mahadasha_index: Optional[int] = None,
+                           focus_period_path: Optional[List[int]] = None) -> Dict[str, Any]:
         """Calculate any Graha (Nakshatra) based dhasa"""
-        return self._compute_graha_dhasa(dhasa_type, birth_details, include_antardhasa, ayanamsa, max_sub_levels, focus_mahadasha_index)
+        return self._compute_graha_dhasa(dhasa_type, birth_details, include_antardhasa, ayanamsa, max_sub_levels,
+                                         focus_mahadasha_index, focus_period_path)
     
     def get_any_raasi_dhasa(self, birth_details: Dict[str, Any], 
                            dhasa_type: str,
@@ -135,14 +177,84 @@ class DhasaService:
         """Calculate any Raasi based dhasa"""
         return self._compute_raasi_dhasa(dhasa_type, birth_details, include_antardhasa, ayanamsa, max_sub_levels)
     
+    def get_any_annual_dhasa(self, birth_details: Dict[str, Any],
+                            dhasa_type: str,
+                            include_antardhasa: bool = True,
+                            ayanamsa: str = "LAHIRI",
+                            years: int = 1) -> Dict[str, Any]:
+        """Calculate any annual (Tajaka) dhasa for the given year of life (1 = year of birth)"""
+        return self._compute_annual_dhasa(dhasa_type, birth_details, include_antardhasa, ayanamsa, years)
+    
+    def iter_all_dhasas(self, birth_details: Dict[str, Any],
+                        include_antardhasa: bool = True,
+                        ayanamsa: str = "LAHIRI",
+                        max_sub_levels: int = 2,
+                        years: int = 1,
+                        parallel: bool = True):
+        """
+        Calculate every graha, raasi and annual dhasa from one chart snapshot.
+        The rasi/varga positions, sunrise, tithi, yoga and nakshatra of the birth are computed once
+        and shared by all systems. With parallel=True the systems run in the process pool and
+        each result is yielded as soon as it finishes (completion order, not registry order).
+        """
+        self._set_ayanamsa(ayanamsa)
+        dob, tob, place = self._parse_birth_details(birth_details)
+        snapshot = charts.ChartSnapshot(utils.julian_day_number(dob, tob), place, ayanamsa_mode=ayanamsa.upper())
+        jobs = (
+            [('graha', dhasa_type) for dhasa_type in self.GRAHA_DHASAS] +
+            [('raasi', dhasa_type) for dhasa_type in self.RAASI_DHASAS] +
+            [('annual', dhasa_type) for dhasa_type in self.ANNUAL_DHASAS]
+        )
+        args = (birth_details, include_antardhasa, ayanamsa, max_sub_levels, years)
+        
+        if not parallel:
+            for category, dhasa_type in jobs:
+                yield _compute_dhasa_from_snapshot(snapshot, category, dhasa_type, *args)
+            return
+        
+        executor = get_dhasa_executor()
+        futures = {
+            executor.submit(_compute_dhasa_from_snapshot, snapshot, category, dhasa_type, *args): (category, dhasa_type)
+            for category, dhasa_type in jobs
+        }
+        for future in as_completed(futures):
+            category, dhasa_type = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {'category': category, 'dhasa_key': dhasa_type, 'error': str(e)}
+    
+    def compute_dhasa(self, category: str, dhasa_type: str, birth_details: Dict[str, Any],
+                      include_antardhasa: bool = True,
+                      ayanamsa: str = "LAHIRI",
+                      max_sub_levels: int = 2,
+                      years: int = 1) -> Dict[str, Any]:
+        """Calculate one dhasa of the given category ('graha', 'raasi' or 'annual')"""
+        if category == 'graha':
+            return self._compute_graha_dhasa(dhasa_type, birth_details, include_antardhasa, ayanamsa, max_sub_levels)
+        if category == 'raasi':
+            return self._compute_raasi_dhasa(dhasa_type, birth_details, include_antardhasa, ayanamsa, max_sub_levels)
+        if category == 'annual':
+            return self._compute_annual_dhasa(dhasa_type, birth_details, include_antardhasa, ayanamsa, years)
+        return {'error': f'Unknown dhasa category: {category}', 'dhasa_type': dhasa_type}
+    
     def get_all_applicable_dhasas(self, birth_details: Dict[str, Any],
                                  ayanamsa: str = "LAHIRI") -> Dict[str, Any]:
         """Get list of all applicable dhasas for the chart"""
+        self._set_ayanamsa(ayanamsa)
+        dob, tob, place = self._parse_birth_details(birth_details)
+        applicable = set(applicability.applicability_check(dob, tob, place))
+        conditional = {
+            dhasa_type: name in applicable
+            for name, dhasa_type in self.CONDITIONAL_GRAHA_DHASAS.items()
+        }
+        graha_dhasas = [dhasa_type for dhasa_type in self.GRAHA_DHASAS if conditional.get(dhasa_type, True)]
         result = {
-            'graha_dhasas': list(self.GRAHA_DHASAS.keys()),
+            'graha_dhasas': graha_dhasas,
             'raasi_dhasas': list(self.RAASI_DHASAS.keys()),
             'annual_dhasas': list(self.ANNUAL_DHASAS.keys()),
-            'total_count': len(self.GRAHA_DHASAS) + len(self.RAASI_DHASAS) + len(self.ANNUAL_DHASAS)
+            'conditional_dhasas': conditional,
+            'total_count': len(graha_dhasas) + len(self.RAASI_DHASAS) + len(self.ANNUAL_DHASAS)
         }
         
         return result
@@ -150,7 +262,8 @@ class DhasaService:
     def _compute_graha_dhasa(self, dhasa_type: str, birth_details: Dict[str, Any],
                              include_antardhasa: bool, ayanamsa: str,
                              max_sub_levels: int = 2,
-                             focus_mahadasha_index: Optional[int] = None) -> Dict[str, Any]:
+                             focus_mahadasha_index: Optional[int] = None,
+                             focus_period_path: Optional[List[int]] = None) -> Dict[str, Any]:
         if dhasa_type not in self.GRAHA_DHASAS:
             return {'error': f'Unknown graha dhasa type: {dhasa_type}', 'dhasa_type': dhasa_type}
         
@@ -163,7 +276,8 @@ class DhasaService:
             ayanamsa,
             category='graha',
             max_sub_levels=max_sub_levels,
-            focus_mahadasha_index=focus_mahadasha_index
+            focus_mahadasha_index=focus_mahadasha_index,
+            focus_period_path=focus_period_path
         )
         
         if 'error' in calculation:
@@ -214,26 +328,63 @@ class DhasaService:
             'include_antardhasa': include_antardhasa
         }
     
+    def _compute_annual_dhasa(self, dhasa_type: str, birth_details: Dict[str, Any],
+                              include_antardhasa: bool, ayanamsa: str,
+                              years: int = 1) -> Dict[str, Any]:
+        if dhasa_type not in self.ANNUAL_DHASAS:
+            return {'error': f'Unknown annual dhasa type: {dhasa_type}', 'dhasa_type': dhasa_type}
+        
+        dhasa_name, dhasa_module = self.ANNUAL_DHASAS[dhasa_type]
+        calculation = self._calculate_dhasa_periods(
+            dhasa_module,
+            dhasa_type,
+            birth_details,
+            include_antardhasa,
+            ayanamsa,
+            category='graha',
+            years=years
+        )
+        
+        if 'error' in calculation:
+            return {
+                'error': calculation['error'],
+                'dhasa_type': dhasa_name
+            }
+        
+        return {
+            'dhasa_type': dhasa_name,
+            'birth_date': birth_details['date'],
+            'birth_time': birth_details['time'],
+            'years': years,
+            'periods': calculation['periods'],
+            'include_antardhasa': include_antardhasa
+        }
+    
     def _calculate_dhasa_periods(self, dhasa_module, dhasa_type: str,
                                  birth_details: Dict[str, Any],
                                  include_antardhasa: bool,
                                  ayanamsa: str,
                                  category: str,
                                  max_sub_levels: int = 2,
-                                 focus_mahadasha_index: Optional[int] = None) -> Dict[str, Any]:
+                                 focus_mahadasha_index: Optional[int] = None,
+                                 years: int = 1,
+                                 focus_period_path: Optional[List[int]] = None) -> Dict[str, Any]:
         self._set_ayanamsa(ayanamsa)
         resolver = self._resolve_dhasa_callable(dhasa_module, dhasa_type)
         
         if resolver is None:
             return {'error': f'No calculation function found for {dhasa_type}'}
         
-        execution = self._execute_dhasa_callable(resolver, birth_details, include_antardhasa)
+        execution = self._execute_dhasa_callable(resolver, birth_details, include_antardhasa, years)
         periods_raw = execution.get('periods_raw')
         
         if not periods_raw:
             return {'error': f'{dhasa_type} calculation returned no periods'}
         
-        formatted_periods = self._format_periods_general(periods_raw, category)
+        if execution.get('as_jd'):
+            formatted_periods = self._format_jd_periods(periods_raw, category)
+        else:
+            formatted_periods = self._format_periods_general(periods_raw, category)
         if (
             dhasa_type == 'vimsottari'
             and include_antardhasa
@@ -243,7 +394,8 @@ class DhasaService:
             deep_periods = self._compute_vimsottari_multi_level(
                 birth_details,
                 max_sub_levels,
-                focus_mahadasha_index
+                focus_mahadasha_index,
+                focus_period_path
             )
             if deep_periods:
                 formatted_periods = deep_periods
@@ -369,87 +521,46 @@ class DhasaService:
 
     def _compute_vimsottari_multi_level(self, birth_details: Dict[str, Any],
                                         max_sub_levels: int,
-                                        focus_mahadasha_index: Optional[int] = None) -> List[Dict[str, Any]]:
+                                        focus_mahadasha_index: Optional[int] = None,
+                                        focus_period_path: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         if max_sub_levels <= 1:
             return []
         
         dob, tob, place = self._parse_birth_details(birth_details)
         jd = utils.julian_day_number(dob, tob)
         try:
-            dashas = vimsottari.vimsottari_mahadasa(jd, place)
+            tree = vimsottari.get_vimsottari_dhasa_tree(jd, place, max_level=max_sub_levels)
         except Exception:
             return []
         
-        periods = []
-        for maha_lord, start_jd in dashas.items():
-            if focus_mahadasha_index is not None and maha_lord != focus_mahadasha_index:
-                continue
-            
-            duration_years = vimsottari.vimsottari_dict.get(maha_lord)
-            if duration_years is None:
-                continue
-            period = {
-                'planet': self._label_from_index(maha_lord, self.PLANET_NAMES, 'Planet'),
-                'start_date': self._format_datetime_output(self._jd_to_datetime(start_jd)),
-                'end_date': self._format_datetime_output(
-                    self._jd_to_datetime(start_jd + duration_years * const.sidereal_year)
-                ),
-                'duration_years': duration_years,
-                'planet_index': maha_lord
-            }
-            sub_periods = self._build_vimsottari_subperiods(
-                maha_lord,
-                start_jd,
-                duration_years,
-                current_depth=1,
-                max_depth=max_sub_levels
-            )
-            if sub_periods:
-                period['sub_periods'] = sub_periods
-            periods.append(period)
-        
-        return periods
+        focus_path = tuple(focus_period_path or ())
+        if not focus_path and focus_mahadasha_index is not None:
+            focus_path = (focus_mahadasha_index,)
+        return [
+            self._format_dhasa_tree_period(maha, focus_path)
+            for maha in tree.maha_dhasas()
+            if not focus_path or maha.lord == focus_path[0]
+        ]
     
-    def _build_vimsottari_subperiods(self, reference_lord: int,
-                                     start_jd: float,
-                                     parent_duration_years: float,
-                                     current_depth: int,
-                                     max_depth: int) -> List[Dict[str, Any]]:
-        if current_depth >= max_depth:
-            return []
-        
+    def _format_dhasa_tree_period(self, period, focus_path: Tuple[int, ...] = ()) -> Dict[str, Any]:
+        """
+        Format a dhasa tree period. Antardhasas are always listed; deeper levels are expanded
+        only for the periods on focus_path (lords from the mahadasha down), so the tree
+        generates just the levels being drilled into.
+        """
+        formatted = {
+            'planet': self._label_from_index(period.lord, self.PLANET_NAMES, 'Planet'),
+            'start_date': self._format_datetime_output(self._jd_to_datetime(period.start)),
+            'end_date': self._format_datetime_output(self._jd_to_datetime(period.end)),
+            'duration_years': period.duration / const.sidereal_year,
+            'planet_index': period.lord
+        }
         sub_periods = []
-        lord = reference_lord
-        current_start = start_jd
-        human_span = vimsottari.human_life_span_for_vimsottari_dhasa
-        
-        for _ in range(9):
-            ratio = vimsottari.vimsottari_dict.get(lord)
-            if ratio is None:
-                break
-            duration_years = parent_duration_years * (ratio / human_span)
-            end_jd = current_start + duration_years * const.sidereal_year
-            period = {
-                'planet': self._label_from_index(lord, self.PLANET_NAMES, 'Planet'),
-                'start_date': self._format_datetime_output(self._jd_to_datetime(current_start)),
-                'end_date': self._format_datetime_output(self._jd_to_datetime(end_jd)),
-                'duration_years': duration_years,
-                'planet_index': lord
-            }
-            child_periods = self._build_vimsottari_subperiods(
-                lord,
-                current_start,
-                duration_years,
-                current_depth=current_depth + 1,
-                max_depth=max_depth
-            )
-            if child_periods:
-                period['sub_periods'] = child_periods
-            sub_periods.append(period)
-            current_start = end_jd
-            lord = vimsottari.vimsottari_next_adhipati(lord)
-        
-        return sub_periods
+        if period.level == 1 or period.lords == focus_path[:period.level]:
+            sub_periods = [self._format_dhasa_tree_period(child, focus_path) for child in period.sub_periods()]
+        if sub_periods:
+            formatted['sub_periods'] = sub_periods
+        return formatted
 
     def _compute_yogini_multi_level(self, birth_details: Dict[str, Any],
                                     max_sub_levels: int,
@@ -579,6 +690,7 @@ class DhasaService:
             'get_dhasa_antardhasa',
             'dhasa_bhukthi',
             'dhasa_bhukti',
+            f'{dhasa_type}_dhasa',
         ]
         
         for name in candidates:
@@ -597,7 +709,7 @@ class DhasaService:
         return None
     
     def _execute_dhasa_callable(self, func, birth_details: Dict[str, Any],
-                                include_antardhasa: bool) -> Dict[str, Any]:
+                                include_antardhasa: bool, years: int = 1) -> Dict[str, Any]:
         """Execute the located callable with the correct parameters."""
         dob, tob, place = self._parse_birth_details(birth_details)
         jd = utils.julian_day_number(dob, tob)
@@ -623,6 +735,13 @@ class DhasaService:
                 call_kwargs[name] = birth_details
             elif name == 'ayanamsa':
                 call_kwargs[name] = birth_details.get('ayanamsa', 'LAHIRI')
+            elif name == 'years':
+                call_kwargs[name] = years
+            elif name == 'jd_years':
+                call_kwargs[name] = drik.next_solar_date(jd, place, years=years)
+            elif name == 'as_jd':
+                # Numeric rows of (lords..., start_jd, end_jd, duration_years) - formatted once in _format_jd_periods
+                call_kwargs[name] = True
         
         result = func(**call_kwargs) if call_kwargs else func()
         
@@ -645,7 +764,8 @@ class DhasaService:
             'dob': dob,
             'tob': tob,
             'place': place,
-            'jd': jd
+            'jd': jd,
+            'as_jd': call_kwargs.get('as_jd', False)
         }
     
     def _format_periods_general(self, raw_periods, category: str) -> List[Dict[str, Any]]:
@@ -658,6 +778,9 @@ class DhasaService:
             return raw_periods
         
         if isinstance(first_entry, (list, tuple)):
+            if len(first_entry) == 3 and isinstance(first_entry[1], list) and first_entry[1] \
+                    and isinstance(first_entry[1][0], (list, tuple)):
+                return self._format_bhukthi_list_periods(raw_periods, category)
             string_like_count = sum(1 for value in first_entry if isinstance(value, str))
             has_nested = any(isinstance(value, (list, tuple)) and not isinstance(value, str) for value in first_entry[3:])
             if string_like_count >= 2 or has_nested:
@@ -668,6 +791,84 @@ class DhasaService:
         
         return []
     
+    def _format_jd_periods(self, raw_periods, category: str) -> List[Dict[str, Any]]:
+        """
+        Format rows of (lord, [sub_lord, ...], start_jd, end_jd, duration_years) returned with as_jd=True.
+        Consecutive rows of the same lord form one period at each level (sub_periods nest for deeper levels);
+        starts and ends come straight from the julian days.
+        """
+        names = self.PLANET_NAMES if category == 'graha' else self.RASI_NAMES
+        fallback_label = 'Planet' if category == 'graha' else 'Rasi'
+        
+        def _label(index):
+            return 'Lagna' if index == const._ascendant_symbol else self._label_from_index(index, names, fallback_label)
+        
+        def _lord_count(row):
+            lords = row[:-3]
+            return next((i for i, lord in enumerate(lords) if isinstance(lord, (list, tuple))), len(lords))
+        
+        def _groups(rows, level):
+            groups: List[List[Any]] = []
+            for row in rows:
+                # rows ending at this level (below the top) are periods on their own
+                if not groups or groups[-1][0][level] != row[level] or (level > 0 and _lord_count(row) == level + 1):
+                    groups.append([])
+                groups[-1].append(row)
+            return groups
+        
+        def _format_level(rows, level):
+            periods = []
+            for group in _groups(rows, level):
+                item = {
+                    'planet': _label(group[0][level]),
+                    'start_date': self._format_datetime_output(self._jd_to_datetime(group[0][-3])),
+                    'end_date': self._format_datetime_output(self._jd_to_datetime(group[-1][-2])),
+                    'duration_years': round(sum(row[-1] for row in group), 4),
+                }
+                if level == 0:
+                    if category == 'graha':
+                        item['planet_index'] = self._safe_int(group[0][0])
+                    else:
+                        item['rasi'] = item['planet']
+                        item['rasi_index'] = self._safe_int(group[0][0])
+                sub_rows = [row for row in group if _lord_count(row) > level + 1]
+                if sub_rows:
+                    item['sub_periods'] = _format_level(sub_rows, level + 1)
+                periods.append(item)
+            return periods
+        
+        return _format_level(raw_periods, 0)
+    
+    def _format_bhukthi_list_periods(self, raw_periods, category: str) -> List[Dict[str, Any]]:
+        """Format rows of [lord, [[bhukthi_lord, start], ...], duration_in_days] (e.g. Patyayini)"""
+        names = self.PLANET_NAMES if category == 'graha' else self.RASI_NAMES
+        fallback_label = 'Planet' if category == 'graha' else 'Rasi'
+        
+        def _label(index):
+            return 'Lagna' if index == const._ascendant_symbol else self._label_from_index(index, names, fallback_label)
+        
+        formatted = []
+        for row in raw_periods:
+            lord, bhukthis, duration_days = row
+            starts = [self._parse_date_value(start) for _, start in bhukthis]
+            end = starts[0] + timedelta(days=duration_days)
+            sub_ends = starts[1:] + [end]
+            formatted.append({
+                'planet': _label(lord),
+                'start_date': self._format_datetime_output(starts[0]),
+                'end_date': self._format_datetime_output(end),
+                'duration_days': round(duration_days, 4),
+                'sub_periods': [
+                    {
+                        'planet': _label(bhukthi_lord),
+                        'start_date': self._format_datetime_output(sub_start),
+                        'end_date': self._format_datetime_output(sub_end)
+                    }
+                    for (bhukthi_lord, _), sub_start, sub_end in zip(bhukthis, starts, sub_ends)
+                ]
+            })
+        return formatted
+    
     def _format_flat_dhasa_periods(self, raw_periods, category: str) -> List[Dict[str, Any]]:
         entries = []
         for row in raw_periods:
@@ -841,3 +1042,14 @@ class DhasaService:
         y, m, d, fractional_hours = utils.jd_to_gregorian(jd)
         return datetime(y, m, d) + timedelta(hours=fractional_hours)
 
+
+def _compute_dhasa_from_snapshot(snapshot, category: str, dhasa_type: str,
+                                 birth_details: Dict[str, Any],
+                                 include_antardhasa: bool, ayanamsa: str,
+                                 max_sub_levels: int, years: int) -> Dict[str, Any]:
+    """Worker for DhasaService.iter_all_dhasas: one dhasa system with the shared chart snapshot active"""
+    with charts.use_chart_snapshot(snapshot):
+        result = DhasaService().compute_dhasa(
+            category, dhasa_type, birth_details, include_antardhasa, ayanamsa, max_sub_levels, years
+        )
+    return {'category': category, 'dhasa_key': dhasa_type, **result}
@@ -10,9 +10,10 @@ import time
 # Add PyJHora to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../../../PyJHora/src'))
 
-from jhora.panchanga import drik
+from jhora.panchanga import drik, muhurtha
 from jhora import utils, const
 from typing import Dict, Any, Tuple
+from functools import lru_cache
 import swisseph as swe
 
 _AGENT_DEBUG_LOG_PATH = r"o:\savitur\.cursor\debug.log"
@@ -487,14 +488,17 @@ class PanchangaService:
             return "N/A"
 
     @staticmethod
-    def _get_kaala_lord_yama(jd: float, place: Any) -> Dict[str, Any]:
+    def _get_kaala_lord_yama(jd: float, place: Any, schedule: Any = None) -> Dict[str, Any]:
         """
         Calculate Kaala Lord (Lord of the Yama - 1/8th of Day/Night)
+        schedule: drik.DaySchedule of jd (sunrise/sunset are taken from it when given)
         Returns: { 'lord': 'Lord Name', 'start': 'HH:MM:SS', 'end': 'HH:MM:SS' }
         """
         try:
-            sunrise_res = drik.sunrise(jd, place)
-            sunset_res = drik.sunset(jd, place)
+            if schedule is None:
+                schedule = drik.DaySchedule(jd, place)
+            sunrise_res = schedule.sunrise
+            sunset_res = schedule.sunset
             sunrise_jd = sunrise_res[2]
             sunset_jd = sunset_res[2]
             
@@ -511,7 +515,7 @@ class PanchangaService:
             # Check if current time is after sunset (tonight)
             elif jd > sunset_jd:
                 # Use today's sunset and next sunrise
-                next_sunrise_res = drik.sunrise(jd + 1, place)
+                next_sunrise_res = schedule.next_sunrise
                 start_jd = sunset_jd
                 end_jd = next_sunrise_res[2]
                 is_day = False
@@ -572,106 +576,35 @@ class PanchangaService:
         except Exception as e:
             return None
 
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _get_hora_table(place: Any, day_jd: float) -> Tuple:
+        """
+        Hora periods from the night before to the night of the date (day_jd = local midnight JD)
+        as (start_jds, end_jds, lords, qualities) arrays. Sunrise/sunset of the days are computed once per date.
+        """
+        return muhurtha.period_table(muhurtha.hora_periods(place, day_jd, day_jd + 1))
+
     @staticmethod
     def _get_hora_lord_details(jd: float, place: Any) -> Dict[str, Any]:
         """
-        Calculate Hora Lord (1/24th of day) with time range.
-        Standard Hora: 1 hour approx from Sunrise.
-        Sequence: Weekday Lord, then 6th, 6th...
-        Cycle: Sun, Ven, Mer, Mon, Sat, Jup, Mar. (Reverse Chaldean).
+        Calculate Hora Lord (1/12th of day or night) with time range.
+        Sequence: Weekday Lord at sunrise, then Sun, Ven, Mer, Mon, Sat, Jup, Mar. (Reverse Chaldean).
+        The hora at jd is found by bisection in the hora table of the date (see muhurtha.hora_periods).
         """
         try:
-            # Determine Sunrise (start of day)
-            sunrise_res = drik.sunrise(jd, place)
-            sunrise_jd = sunrise_res[2]
-            
-            # If Before Sunrise, it belongs to previous day sequence but continued?
-            # Or use Previous Sunrise?
-            # Hora cycle resets at Sunrise.
-            if jd < sunrise_jd:
-                 prev_sunrise_res = drik.sunrise(jd - 1, place)
-                 base_sunrise_jd = prev_sunrise_res[2]
-                 weekday = drik.vaara(jd - 1)
-            else:
-                 base_sunrise_jd = sunrise_jd
-                 weekday = drik.vaara(jd)
-            
-            # Validating Weekday match
-            # If standard date is Fri, but time < sunrise, it's Thu.
-            # logic above handles it.
-            
-            # Hora Length: (Next Sunrise - Base Sunrise) / 24 ? 
-            # Or (Sunset-Sunrise)/12 + (NextSunrise-Sunset)/12? (Variable Hora)
-            # JHora usually uses Variable Hora (Hora = 1/2 duration).
-            # Let's calculate day/night length.
-            
-            sunset_res = drik.sunset(base_sunrise_jd, place)
-            sunset_jd = sunset_res[2]
-            next_sunrise_res = drik.sunrise(base_sunrise_jd + 1, place)
-            next_sunrise_jd = next_sunrise_res[2]
-            
-            day_len = sunset_jd - base_sunrise_jd
-            night_len = next_sunrise_jd - sunset_jd
-            
-            day_hora_len = day_len / 12.0
-            night_hora_len = night_len / 12.0
-            
-            elapsed = jd - base_sunrise_jd
-            
-            # Determine if Day or Night Hora
-            if elapsed < day_len:
-                # Day Hora
-                hora_idx = int(elapsed / day_hora_len)
-                start_time_jd = base_sunrise_jd + hora_idx * day_hora_len
-                end_time_jd = base_sunrise_jd + (hora_idx + 1) * day_hora_len
-                # Global index from sunrise
-                global_idx = hora_idx
-            else:
-                # Night Hora
-                night_elapsed = elapsed - day_len
-                hora_idx_night = int(night_elapsed / night_hora_len)
-                start_time_jd = sunset_jd + hora_idx_night * night_hora_len
-                end_time_jd = sunset_jd + (hora_idx_night + 1) * night_hora_len
-                global_idx = 12 + hora_idx_night
-            
-            # Lord Logic:
-            # 1st Hora = Weekday Lord.
-            # Next = 6th Lord (Chaldean Order check).
-            # Chaldean: Saturn(6), Jupiter(4), Mars(2), Sun(0), Venus(5), Mercury(3), Moon(1).
-            # Order in distance/speed.
-            # Sequence: Sun -> Ven -> Mer -> Mon -> Sat -> Jup -> Mar -> Sun...
-            # 0(Sun) -> 5(Ven) -> 3(Mer) -> 1(Mon) -> 6(Sat) -> 4(Jup) -> 2(Mar).
-            # Cycle Map: {0:5, 5:3, 3:1, 1:6, 6:4, 4:2, 2:0}
-            
-            # Easy Formula: Lord Index = (Weekday_Lord_Index + Global_IDX * 5) % 7 ? No.
-            # Weekday Order: Sun, Mon, Tue, Wed, Thu, Fri, Sat
-            # Hora Order: Sun, Ven, Mer, Mon, Sat, Jup, Mar.
-            # Let's use loop or array.
-            
-            # Standard List: [Sun, Mon, Mar, Mer, Jup, Ven, Sat]
-            # Next lord is previous in Chaldean order?
-            # Let's just hardcode the cycle:
-            # Sun(0) -> Ven(5) -> Mer(3) -> Mon(1) -> Sat(6) -> Jup(4) -> Mar(2) -> Sun(0)
-            hora_cycle = [0, 5, 3, 1, 6, 4, 2] # Indices in [Sun..Sat]
-            
-            # Find start index in hora_cycle
-            # Weekday Lord is always the ruler of the first Hora.
-            # E.g. Thu(4).
-            try:
-                start_ptr = hora_cycle.index(weekday)
-            except:
-                start_ptr = 0
-            
-            current_ptr = (start_ptr + global_idx) % 7
-            lord_idx = hora_cycle[current_ptr]
+            day_jd = utils.gregorian_to_jd(drik.Date(*utils.jd_to_gregorian(jd)[:3]))
+            hora_table = PanchangaService._get_hora_table(place, day_jd)
+            index = muhurtha.period_at(hora_table, jd)
+            if index is None:
+                return None
             
             names = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
-            lord_name = names[lord_idx]
-            
+            # Period JDs are local JDs
             return {
-                'lord': lord_name,
-                'start': PanchangaService._jd_to_local_time_string(start_time_jd, place),
-                'end': PanchangaService._jd_to_local_time_string(end_time_jd, place)
+                'lord': names[hora_table[2][index]],
+                'start': PanchangaService._format_time_from_hours(utils.jd_to_gregorian(hora_table[0][index])[3]),
+                'end': PanchangaService._format_time_from_hours(utils.jd_to_gregorian(hora_table[1][index])[3])
             }
         except Exception:
             return None
@@ -891,6 +824,9 @@ class PanchangaService:
         # Calculate Julian day
         jd = utils.julian_day_number(dob, tob)
         
+        # Day/night segmentation (sunrise, sunset, next sunrise) shared by the day timings below
+        schedule = drik.DaySchedule(jd, place)
+        
         result = {}
         
         # Tamil Calendar
@@ -927,7 +863,7 @@ class PanchangaService:
         
         # Tamil Jaamam
         try:
-            tamil_jaamam = drik.tamil_jaamam(jd, place)
+            tamil_jaamam = schedule.tamil_jaamam()
             formatted_jaamam = []
             if tamil_jaamam:
                 for start, end in tamil_jaamam:
@@ -1239,7 +1175,7 @@ class PanchangaService:
         
         # Midday and Midnight
         try:
-            midday_time = drik.midday(jd, place)
+            midday_time = schedule.midday()
             midnight_time = drik.midnight(jd, place)
             
             md_t = midday_time[1] if isinstance(midday_time, tuple) else midday_time
@@ -1253,8 +1189,8 @@ class PanchangaService:
         
         # Day and Night Length
         try:
-            day_len = drik.day_length(jd, place)
-            night_len = drik.night_length(jd, place)
+            day_len = schedule.day_length
+            night_len = schedule.night_length
             # Format as HH:MM:SS
             result['day_length'] = cls._format_time_from_hours(day_len)
             result['night_length'] = cls._format_time_from_hours(night_len)
@@ -1264,9 +1200,9 @@ class PanchangaService:
         
         # Gauri Choghadiya (Current)
         try:
-            choghadiya = drik.gauri_choghadiya(jd, place)
+            choghadiya = schedule.gauri_choghadiya()
             if choghadiya and isinstance(choghadiya, list):
-                # drik.gauri_choghadiya returns: [(gc_type, start_time_string, end_time_string), ...]
+                # schedule.gauri_choghadiya returns: [(gc_type, start_time_string, end_time_string), ...]
                 # gc_type: 0=Amrita, 1=Chala, 2=Roga, 3=Amrit (note: 0 and 3 both are Amrita)
                 # Format: [(type, start_str, end_str), ...] where times are in "HH:MM:SS" format
                 
@@ -1356,7 +1292,7 @@ class PanchangaService:
             
         # Shubha Hora
         try:
-            shubha_hora = drik.shubha_hora(jd, place)
+            shubha_hora = schedule.shubha_hora()
             result['shubha_hora'] = shubha_hora
         except:
             result['shubha_hora'] = None
@@ -1371,7 +1307,7 @@ class PanchangaService:
             
         # Kaala Lord (Now mapped to Yama Lord)
         try:
-            kl = cls._get_kaala_lord_yama(jd, place)
+            kl = cls._get_kaala_lord_yama(jd, place, schedule)
             if kl:
                 result['kaala_lord'] = kl['lord']
             else:
@@ -1502,9 +1438,12 @@ class PanchangaService:
         # Calculate Julian day
         jd = utils.julian_day_number(dob, tob)
         
+        # Day/night segmentation (sunrise, sunset, next sunrise) shared by all the timings
+        schedule = drik.DaySchedule(jd, place)
+        
         # Brahma Muhurta (auspicious time before sunrise)
         try:
-            brahma_muhurta = drik.brahma_muhurtha(jd, place)
+            brahma_muhurta = schedule.brahma_muhurtha()
             brahma_data = {
                 "start": cls._jd_to_time_string(brahma_muhurta[0]),
                 "end": cls._jd_to_time_string(brahma_muhurta[1]),
@@ -1515,7 +1454,7 @@ class PanchangaService:
         
         # Durmuhurta (inauspicious periods)
         try:
-            durmuhurta_times = drik.durmuhurtam(jd, place)
+            durmuhurta_times = schedule.durmuhurtam()
             # durmuhurta returns list of JD values
             if len(durmuhurta_times) >= 2:
                 durmuhurta_data = {
@@ -1529,7 +1468,7 @@ class PanchangaService:
         
         # Nishita Kala (midnight period)
         try:
-            nishita = drik.nishita_kaala(jd, place)
+            nishita = schedule.nishita_kaala()
             nishita_data = {
                 "start": cls._jd_to_time_string(nishita[0]),
                 "end": cls._jd_to_time_string(nishita[1]),
@@ -1540,7 +1479,7 @@ class PanchangaService:
         
         # Vijaya Muhurta (victory time)
         try:
-            vijaya = drik.vijaya_muhurtha(jd, place)
+            vijaya = schedule.vijaya_muhurtha()
             if len(vijaya) >= 2:
                 vijaya_data = {
                     "start": cls._jd_to_time_string(vijaya[0]),
@@ -1554,7 +1493,7 @@ class PanchangaService:
         
         # Godhuli Muhurta (twilight period)
         try:
-            godhuli = drik.godhuli_muhurtha(jd, place)
+            godhuli = schedule.godhuli_muhurtha()
             godhuli_data = {
                 "start": cls._jd_to_time_string(godhuli[0]),
                 "end": cls._jd_to_time_string(godhuli[1]),
@@ -1565,9 +1504,9 @@ class PanchangaService:
         
         # All 30 muhurthas (15 day + 15 night)
         try:
-            muhurthas_list = drik.muhurthas(jd, place)
+            muhurthas_list = schedule.muhurthas()
             muhurthas_data = []
-            # drik.muhurthas returns list of tuples: (name, quality_code, (start_jd, end_jd))
+            # schedule.muhurthas returns list of tuples: (name, quality_code, (start_jd, end_jd))
             # quality_code: 0=Bad (e.g. Rudra), 1=Good (e.g. Mitra) - based on investigation
             
             for idx, item in enumerate(muhurthas_list):
@@ -2031,6 +1970,73 @@ class PanchangaService:
                 'error': str(e)
             }
     
+    LUNAR_MONTH_NAMES = [
+        'Chaitra', 'Vaisakha', 'Jyeshtha', 'Ashadha', 'Shravana', 'Bhadrapada',
+        'Ashvina', 'Kartika', 'Margashirsha', 'Pausha', 'Magha', 'Phalguna'
+    ]
+    
+    @classmethod
+    def get_month_panchanga(cls, year: int, month: int, place_data: Dict[str, Any],
+                            ayanamsa: str = "LAHIRI") -> Dict[str, Any]:
+        """
+        Get panchanga for all days of a month
+        
+        All days are computed together (vratha.monthly_panchanga) from one set of
+        transition timelines, sunrise table and lunation catalog instead of
+        calculating the panchanga day by day
+        """
+        from jhora.panchanga import vratha
+        # Set ayanamsa
+        const._DEFAULT_AYANAMSA_MODE = ayanamsa
+        drik.set_ayanamsa_mode(ayanamsa)
+        
+        # Create place
+        place = drik.Place(
+            place_data['name'],
+            place_data['latitude'],
+            place_data['longitude'],
+            place_data['timezone']
+        )
+        
+        def limb_periods(periods, names):
+            return [{
+                'index': number,
+                'name': names(number),
+                'start': cls._format_time_from_hours(start_hours),
+                'end': cls._format_time_from_hours(end_hours)
+            } for number, start_hours, end_hours in periods]
+        
+        days = []
+        for day in vratha.monthly_panchanga(year, month, place):
+            lunar_month_name = cls.LUNAR_MONTH_NAMES[day['lunar_month']]
+            if day['adhik_maasa']:
+                lunar_month_name = f"Adhika {lunar_month_name}"
+            days.append({
+                'date': '%04d-%02d-%02d' % day['date'],
+                'vaara': cls.VAARA_NAMES[day['vaara']],
+                'sunrise': cls._format_time_from_hours(day['sunrise']),
+                'sunset': cls._format_time_from_hours(day['sunset']),
+                'tithi': limb_periods(day['tithi'], cls._tithi_display_name),
+                'nakshatra': limb_periods(day['nakshatra'], lambda n: cls.NAKSHATRA_NAMES[n - 1]),
+                'yoga': limb_periods(day['yoga'], lambda n: cls.YOGA_NAMES[n - 1]),
+                'karana': limb_periods(day['karana'], lambda n: cls.KARANA_NAMES[n - 1]),
+                'moon_phase': round(day['moon_phase'], 2),
+                'moon_illumination': round(day['moon_illumination'], 3),
+                'lunar_month': [day['lunar_month'] + 1, lunar_month_name],
+                'lunar_day': day['lunar_day'],
+                'adhik_maasa': day['adhik_maasa'],
+                'tamil_month': [day['tamil_month'] + 1, cls.TAMIL_MONTHS[day['tamil_month']]],
+                'tamil_day': day['tamil_day'],
+                'festivals': [festival['Festival_en'] for festival in day['festivals']]
+            })
+        
+        return {
+            'year': year,
+            'month': month,
+            'place': place_data,
+            'days': days
+        }
+    
     @staticmethod
     def _is_retrograde(jd: float, planet_index: int) -> bool:
         """
@@ -59,7 +59,6 @@ class StrengthService:
             # Returns: [sthana, kaala, dig, cheshta, naisargika, drik, sum_virupas, sum_rupas, percent_strength]
             sb_data = strength.shad_bala(jd, place, ayanamsa_mode=ayanamsa.upper())
             
-            print(f"DEBUG shad_bala type: {type(sb_data)}, length: {len(sb_data)}")
             
             sthana_bala = sb_data[0]
             kaala_bala = sb_data[1]
@@ -85,7 +84,6 @@ class StrengthService:
                     'percent_strength': round(float(percent_strength[i]) * 100, 2)
                 }
             
-            print(f"DEBUG Shadbala values: {shadbala_values}")
             return {
                 'birth_date': birth_details['date'],
                 'birth_time': birth_details['time'],
@@ -112,20 +110,11 @@ class StrengthService:
             # Get planet positions
             planet_positions = charts.divisional_chart(jd, place, divisional_chart_factor=divisional_factor)
             
-            print(f"DEBUG: planet_positions type: {type(planet_positions)}")
-            print(f"DEBUG: planet_positions: {planet_positions}")
             
             house_to_planet_list = utils.get_house_planet_list_from_planet_positions(planet_positions)
-            print(f"DEBUG: house_to_planet_list: {house_to_planet_list}")
-            p_to_h_debug = utils.get_planet_to_house_dict_from_chart(house_to_planet_list)
-            print(f"DEBUG: p_to_h from chart: {p_to_h_debug}")
             
             bav, sav, pav = ashtakavarga.get_ashtaka_varga(house_to_planet_list)
             
-            print(f"DEBUG: bav type: {type(bav)}, length: {len(bav) if hasattr(bav, '__len__') else 'N/A'}")
-            print(f"DEBUG: sav type: {type(sav)}, length: {len(sav) if hasattr(sav, '__len__') else 'N/A'}")
-            print(f"DEBUG: sav value: {sav}")
-            print(f"DEBUG: pav type: {type(pav)}, length: {len(pav) if hasattr(pav, '__len__') else 'N/A'}")
             
             return {
                 'birth_date': birth_details['date'],
@@ -247,13 +236,13 @@ class StrengthService:
         try:
             from jhora.horoscope.chart import charts
             
-            # Get all 4 Vimsopaka variants (returns dicts with integer keys)
-            shadvarga = charts.vimsopaka_shadvarga_of_planets(jd, place)
-            sapthavarga = charts.vimsopaka_sapthavarga_of_planets(jd, place)
-            dhasavarga = charts.vimsopaka_dhasavarga_of_planets(jd, place)
-            shodhasavarga = charts.vimsopaka_shodhasavarga_of_planets(jd, place)
+            # Get all 4 Vimsopaka variants from one varga snapshot (returns dicts with integer keys)
+            vimsopaka = charts.varga_balas_of_planets(jd, place)['vimsopaka']
+            shadvarga = vimsopaka['shadvarga']
+            sapthavarga = vimsopaka['sapthavarga']
+            dhasavarga = vimsopaka['dhasavarga']
+            shodhasavarga = vimsopaka['shodhasavarga']
             
-            print(f"DEBUG dhasavarga type: {type(dhasavarga)}, value: {dhasavarga}")
             
             # Format results - these return dicts with integer keys (0..8 = Sun..Saturn, Rahu, Ketu)
             def format_vimsopaka(varga_dict):
@@ -296,7 +285,6 @@ class StrengthService:
         try:
             pvb = strength.pancha_vargeeya_bala(jd, place)
             
-            print(f"DEBUG pancha_vargeeya_bala type: {type(pvb)}, value: {pvb}")
             
             # pancha_vargeeya_bala returns a dict with integer keys
             result = {}
@@ -327,7 +315,6 @@ class StrengthService:
         try:
             dvb = strength.dwadhasa_vargeeya_bala(jd, place)
             
-            print(f"DEBUG dwadhasa_vargeeya_bala type: {type(dvb)}, value: {dvb}")
             
             # dwadhasa_vargeeya_bala returns a dict with integer keys
             result = {}
@@ -357,7 +344,6 @@ class StrengthService:
         try:
             hb = strength.harsha_bala(dob, tob, place)
             
-            print(f"DEBUG harsha_bala type: {type(hb)}, value: {hb}")
             
             # harsha_bala returns a dict with integer keys
             result = {}
@@ -389,7 +375,6 @@ class StrengthService:
             # Get Ishta Phala (returns a list)
             ishta_phala = strength._ishta_phala(jd, place)
             
-            print(f"DEBUG ishta_phala type: {type(ishta_phala)}, value: {ishta_phala}")
             
             # Kashta Phala is (60 - Ishta Phala)
             kashta_phala = [60 - ip for ip in ishta_phala]
@@ -0,0 +1,122 @@
+from app.services.dhasa_service import DhasaService
+
+# Sample birth details for testing
+birth_details = {
+    "date": "1990-01-01",
+    "time": "12:00:00",
+    "place": {
+        "name": "Chennai",
+        "latitude": 13.0827,
+        "longitude": 80.2707,
+        "timezone": 5.5
+    }
+}
+
+dhasa_service = DhasaService()
+
+def test_iter_all_dhasas_covers_every_system():
+    results = {r["dhasa_key"]: r for r in dhasa_service.iter_all_dhasas(birth_details, parallel=False)}
+    expected = set(DhasaService.GRAHA_DHASAS) | set(DhasaService.RAASI_DHASAS) | set(DhasaService.ANNUAL_DHASAS)
+    assert set(results) == expected
+    assert results["narayana"]["category"] == "raasi"
+    assert "periods" in results["patyayini"]
+
+def test_iter_all_dhasas_matches_single_dhasa():
+    # The shared chart snapshot must not change any individual result
+    single = dhasa_service.get_vimsottari_dhasa(birth_details)
+    results = {r["dhasa_key"]: r for r in dhasa_service.iter_all_dhasas(birth_details)}
+    assert results["vimsottari"]["periods"] == single["periods"]
+
+def test_iter_all_dhasas_snapshot_uses_requested_ayanamsa(monkeypatch):
+    from jhora.horoscope.chart import charts
+    from jhora.panchanga import drik
+    snapshot_ayanamsas = []
+    class RecordingSnapshot(charts.ChartSnapshot):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            snapshot_ayanamsas.append((self.ayanamsa_mode, self.panchanga_ayanamsa_mode))
+    monkeypatch.setattr(charts, "ChartSnapshot", RecordingSnapshot)
+    try:
+        results = {r["dhasa_key"]: r for r in dhasa_service.iter_all_dhasas(birth_details, ayanamsa="raman", parallel=False)}
+        assert snapshot_ayanamsas == [("RAMAN", "RAMAN")]
+        for category, dhasa_type in [("graha", "vimsottari"), ("graha", "ashtottari"), ("raasi", "narayana")]:
+            single = dhasa_service.compute_dhasa(category, dhasa_type, birth_details, ayanamsa="raman")
+            assert results[dhasa_type]["periods"] == single["periods"]
+    finally:
+        drik.set_ayanamsa_mode("LAHIRI")
+
+def test_applicable_dhasas_reflect_chart():
+    data = dhasa_service.get_all_applicable_dhasas(birth_details, "LAHIRI")
+    conditional = data["conditional_dhasas"]
+    assert set(conditional) == set(DhasaService.CONDITIONAL_GRAHA_DHASAS.values())
+    for dhasa_type, applicable in conditional.items():
+        assert (dhasa_type in data["graha_dhasas"]) == applicable
+    assert "vimsottari" in data["graha_dhasas"]
+
+def test_numeric_dhasa_periods_are_contiguous():
+    # as_jd rows carry their own end julian day - every period ends where the next one starts
+    result = dhasa_service.get_any_raasi_dhasa(birth_details, "narayana")
+    periods = result["periods"]
+    for period in periods:
+        subs = period["sub_periods"]
+        assert subs[0]["start_date"] == period["start_date"]
+        assert subs[-1]["end_date"] == period["end_date"]
+        for sub, next_sub in zip(subs, subs[1:]):
+            assert sub["end_date"] == next_sub["start_date"]
+    for period, next_period in zip(periods, periods[1:]):
+        assert period["end_date"] == next_period["start_date"]
+
+def test_numeric_dhasa_periods_nest_deeper_levels():
+    # (maha lord, bhukthi lord, antara lord, start_jd, end_jd, duration_years)
+    rows = [(0, 1, 2, 2450000.0, 2450100.0, 100/365.2563), (0, 1, 3, 2450100.0, 2450200.0, 100/365.2563),
+            (0, 4, 4, 2450200.0, 2450300.0, 100/365.2563), (5, 6, 0, 2450300.0, 2450400.0, 100/365.2563)]
+    periods = dhasa_service._format_jd_periods(rows, 'graha')
+    assert [p["planet_index"] for p in periods] == [0, 5]
+    assert len(periods[0]["sub_periods"]) == 2
+    assert len(periods[0]["sub_periods"][0]["sub_periods"]) == 2
+    assert periods[0]["sub_periods"][1]["sub_periods"][0]["end_date"] == periods[0]["end_date"]
+    assert periods[0]["sub_periods"][0]["duration_years"] == round(200/365.2563, 4)
+    assert periods[0]["sub_periods"][0]["sub_periods"][0]["duration_years"] == round(100/365.2563, 4)
+
+def test_deep_vimsottari_levels_expand_only_along_focus_path():
+    def _expanded(periods):
+        return [p for p in periods if "sub_periods" in p]
+    periods = dhasa_service.get_vimsottari_dhasa(birth_details, max_sub_levels=6)["periods"]
+    assert len(periods) == 9
+    assert all(len(p["sub_periods"]) == 9 and not _expanded(p["sub_periods"]) for p in periods)
+    maha = periods[3]["planet_index"]; antara = periods[3]["sub_periods"][2]["planet_index"]
+    focused = dhasa_service.get_vimsottari_dhasa(birth_details, max_sub_levels=6,
+                                                 focus_period_path=[maha, antara])["periods"]
+    assert [p["planet_index"] for p in focused] == [maha]
+    assert [p["planet_index"] for p in _expanded(focused[0]["sub_periods"])] == [antara]
+    pratyantaras = _expanded(focused[0]["sub_periods"])[0]["sub_periods"]
+    assert len(pratyantaras) == 9 and not _expanded(pratyantaras)
+    assert pratyantaras[0]["start_date"] == periods[3]["sub_periods"][2]["start_date"]
+
+def test_chart_snapshot_is_not_shared_across_threads():
+    import threading
+    from jhora import utils
+    from jhora.horoscope.chart import charts
+    from jhora.panchanga import drik
+    place = drik.Place("Chennai", 13.0827, 80.2707, 5.5)
+    snapshot = charts.ChartSnapshot(utils.julian_day_number((1990, 1, 1), (12, 0, 0)), place)
+    seen_in_other_thread = []
+    with charts.use_chart_snapshot(snapshot):
+        assert drik._chart_snapshot.get() is snapshot
+        thread = threading.Thread(target=lambda: seen_in_other_thread.append(drik._chart_snapshot.get()))
+        thread.start(); thread.join()
+    assert seen_in_other_thread == [None]
+    assert drik._chart_snapshot.get() is None
+
+def test_all_dhasas_endpoint_streams_results():
+    from fastapi.testclient import TestClient
+    from main import app
+    with TestClient(app) as client:
+        response = client.post("/api/v1/dhasa/all", json={"birth_details": birth_details})
+        assert response.status_code == 200
+        lines = [line for line in response.text.splitlines() if line]
+        expected = set(DhasaService.GRAHA_DHASAS) | set(DhasaService.RAASI_DHASAS) | set(DhasaService.ANNUAL_DHASAS)
+        assert len(lines) == len(expected)
+    # the lifespan handler shut the process pool down
+    from app.services import dhasa_service as dhasa_service_module
+    assert dhasa_service_module._dhasa_executor is None
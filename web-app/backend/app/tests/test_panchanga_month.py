@@ -0,0 +1,25 @@
+from app.services.panchanga_service import PanchangaService
+
+place = {
+    "name": "Chennai",
+    "latitude": 13.0827,
+    "longitude": 80.2707,
+    "timezone": 5.5
+}
+
+def test_get_month_panchanga():
+    data = PanchangaService.get_month_panchanga(2024, 2, place, "LAHIRI")
+    assert len(data["days"]) == 29
+    first_day = data["days"][0]
+    assert first_day["date"] == "2024-02-01"
+    assert first_day["vaara"] == "Thursday"
+    for key in ["sunrise", "sunset", "tithi", "nakshatra", "yoga", "karana",
+                "moon_phase", "lunar_month", "adhik_maasa", "festivals"]:
+        assert key in first_day
+    assert first_day["tithi"][0]["end"] is not None
+
+def test_get_month_panchanga_new_moon():
+    data = PanchangaService.get_month_panchanga(2024, 3, place, "LAHIRI")
+    # Amavasya at sunrise of 10 Mar 2024 and Phalguna starts on 11 Mar (amanta)
+    assert data["days"][9]["tithi"][0]["index"] == 30
+    assert data["days"][10]["lunar_month"] == [12, "Phalguna"]
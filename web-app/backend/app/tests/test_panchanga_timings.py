@@ -0,0 +1,38 @@
+from app.services.panchanga_service import PanchangaService
+from jhora import utils
+from jhora.panchanga import drik
+
+place = {
+    "name": "Chennai",
+    "latitude": 13.0827,
+    "longitude": 80.2707,
+    "timezone": 5.5
+}
+
+def test_get_additional_timings():
+    data = PanchangaService.get_additional_timings("2024-03-12", "10:30:00", place, "LAHIRI")
+    assert len(data["all_muhurthas"]) == 30
+    assert data["all_muhurthas"][0]["name"] == "Rudra"
+    assert data["all_muhurthas"][15]["period"] == "night"
+    for key in ["brahma_muhurta", "durmuhurta", "nishita_kala", "godhuli_muhurta"]:
+        assert data[key]["start"] is not None
+
+def test_get_additional_timings_single_rise_set_calls(monkeypatch):
+    calls = []
+    rise_trans = drik.swe.rise_trans
+    def _counted_rise_trans(*args, **kwargs):
+        calls.append(args)
+        return rise_trans(*args, **kwargs)
+    monkeypatch.setattr(drik.swe, "rise_trans", _counted_rise_trans)
+    PanchangaService.get_additional_timings("2024-03-12", "10:30:00", place, "LAHIRI")
+    # sunrise, sunset and next day sunrise
+    assert len(calls) == 3
+
+def test_hora_lord_details_matches_shubha_hora():
+    drik_place = drik.Place(place["name"], place["latitude"], place["longitude"], place["timezone"])
+    jd = utils.julian_day_number((2024, 3, 12), (10, 30, 0))
+    hora = PanchangaService._get_hora_lord_details(jd, drik_place)
+    names = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
+    # 5th hora of the day (10:19 - 11:19)
+    assert hora["lord"] == names[drik.shubha_hora(jd, drik_place)[4][0]]
+    assert hora["start"] < "10:30:00" < hora["end"]
@@ -3,9 +3,19 @@ PyJHora Web API
 FastAPI backend for Vedic Astrology calculations
 """
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_router
+from app.services.dhasa_service import shutdown_dhasa_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan - releases the dhasa process pool on shutdown"""
+    yield
+    shutdown_dhasa_executor()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -13,7 +23,8 @@ app = FastAPI(
     description="Vedic Astrology Calculations API - Panchanga, Charts, Dhasa, Yogas, and more",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS configuration - environment-based
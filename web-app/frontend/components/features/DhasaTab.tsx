@@ -112,7 +112,8 @@ export default function DhasaTab({ birthData, compact = false }: DhasaTabProps)
         include_antardhasa: true,
         ayanamsa: birthData.ayanamsa,
         max_sub_level: 6,
-        focus_mahadasha_index: rootIdx
+        focus_mahadasha_index: rootIdx,
+        focus_period_path: [...path, period].map(p => (p as any).planet_index)
       });
       queryClient.setQueryData(['dhasa', birthData.date, birthData.time, birthData.place?.latitude, birthData.place?.longitude, birthData.ayanamsa, dhasaType], (old: DhasaResponse | undefined) => {
         if (!old) return old;
@@ -8,6 +8,7 @@ export interface DhasaRequest {
   ayanamsa?: string;
   max_sub_level?: number;
   focus_mahadasha_index?: number;
+  focus_period_path?: number[];
 }
 
 export interface DhasaPeriod {